@@ -464,6 +464,7 @@ from ._lazy_attach import lazy_attach
 from ._lazy_attach_stub import lazy_attach_stub
 from ._load_cppimportable_module import load_cppimportable_module
 from ._log_context_duration import log_context_duration
+from ._log_disk_usage import log_disk_usage
 from ._log_memory_usage import log_memory_usage
 from ._log_once_in_a_row import log_once_in_a_row
 from ._make_intersecting_subsets import make_intersecting_subsets
@@ -767,6 +768,7 @@ __all__ = [
     "lazy_attach_stub",
     "load_cppimportable_module",
     "log_context_duration",
+    "log_disk_usage",
     "log_memory_usage",
     "log_once_in_a_row",
     "make_intersecting_subsets",
@@ -0,0 +1,28 @@
+import logging
+import os
+import pathlib
+import shutil
+import typing
+
+
+def log_disk_usage(path: str, logger: typing.Callable = logging.info) -> None:
+    """Log disk use of files under directory `path`, and free space on its
+    file system."""
+    if "HSTRAT_LOG_DISK_USAGE" in os.environ:
+        try:
+            sizes = [
+                entry.stat().st_size
+                for entry in pathlib.Path(path).rglob("*")
+                if entry.is_file()
+            ]
+            usage = shutil.disk_usage(path)
+            message = (
+                f"disk usage of {path}: "
+                f"{sum(sizes) / 2**20:.1f} MiB in {len(sizes)} file(s), "
+                f"{usage.free / 2**30:.1f} GiB free "
+                f"of {usage.total / 2**30:.1f} GiB"
+            )
+        except OSError as e:
+            message = f"logging disk use failed: {e}"
+
+        logger(message)
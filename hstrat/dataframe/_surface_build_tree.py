@@ -1,11 +1,132 @@
+from concurrent import futures
+import itertools
 import logging
 import typing
 
+from downstream import dataframe as dstream_dataframe
 import polars as pl
 
+from .._auxiliary_lib import log_context_duration
 from ..phylogenetic_inference.tree.trie_postprocess import NopTriePostprocessor
 from ._surface_postprocess_trie import surface_postprocess_trie
-from ._surface_unpack_reconstruct import surface_unpack_reconstruct
+from ._surface_unpack_reconstruct import (
+    _coalesce_dstream_data_id,
+    _get_mp_context,
+    surface_unpack_reconstruct,
+)
+
+
+def _calc_founder_keys(
+    df: pl.DataFrame,
+    exploded_slice_size: int,
+    mp_context: str,
+    mp_pool_size: int,
+) -> typing.Optional[pl.DataFrame]:
+    """Key genomes by their differentiae at trunk ranks (i.e., `dstream_Tbar`
+    less than `dstream_S`) retained by all genomes.
+
+    Genomes with distinct keys diverge within the trunk, so fall in separate
+    trees after trunk deletion. Returns None if no trunk rank is retained by
+    all genomes, or a DataFrame with 'dstream_data_id' and 'founder_key'
+    columns otherwise.
+    """
+    df = dstream_dataframe.unpack_data_packed(
+        df.select("data_hex", pl.col("^(dstream|downstream)_.*$")),
+        mp_context=mp_context,
+        mp_pool_size=mp_pool_size,
+    )
+    if df.is_empty():
+        return None
+
+    dstream_S = df["dstream_S"].max()
+    slice_size = max(exploded_slice_size // dstream_S, 1)
+    trunk = pl.concat(
+        dstream_dataframe.explode_lookup_unpacked(
+            df_slice, value_type="uint64"
+        )
+        .filter(pl.col("dstream_Tbar") < dstream_S)
+        .select("dstream_data_id", "dstream_Tbar", "dstream_value")
+        for df_slice in df.iter_slices(slice_size)
+    )
+
+    # genomes retaining no trunk rank at all must also be counted
+    num_genomes = df.height
+    common_Tbars = (
+        trunk.group_by("dstream_Tbar")
+        .len()
+        .filter(pl.col("len") == num_genomes)["dstream_Tbar"]
+    )
+    if common_Tbars.is_empty():
+        return None
+
+    return (
+        trunk.filter(pl.col("dstream_Tbar").is_in(common_Tbars.implode()))
+        .sort("dstream_data_id", "dstream_Tbar")
+        .group_by("dstream_data_id", maintain_order=True)
+        .agg(
+            founder_key=pl.col("dstream_value").cast(pl.String).str.join(","),
+        )
+    )
+
+
+def _partition_by_founder(
+    df: pl.DataFrame,
+    exploded_slice_size: int,
+    mp_context: str,
+    mp_pool_size: int,
+) -> typing.List[pl.DataFrame]:
+    """Split genomes into groups that reconstruct to independent trees after
+    trunk deletion.
+
+    Assigns `dstream_data_id` up front, if not provided, so that ids match
+    reconstruction over the unpartitioned genomes.
+    """
+    df = _coalesce_dstream_data_id(df.lazy().collect())
+    founder_keys = _calc_founder_keys(
+        df,
+        exploded_slice_size=exploded_slice_size,
+        mp_context=mp_context,
+        mp_pool_size=mp_pool_size,
+    )
+    if founder_keys is None:
+        logging.warning(
+            "no trunk rank retained by all genomes, "
+            "skipping founder partitioning",
+        )
+        return [df]
+
+    return (
+        df.join(founder_keys, on="dstream_data_id", how="left")
+        .sort("founder_key", maintain_order=True)
+        .partition_by("founder_key", maintain_order=True, include_key=False)
+    )
+
+
+def _surface_build_tree_impl(
+    df: pl.DataFrame,
+    unpack_reconstruct_kwargs: typing.Dict[str, typing.Any],
+    postprocess_trie_kwargs: typing.Dict[str, typing.Any],
+) -> pl.DataFrame:
+    """Implementation detail for `surface_build_tree`, applied to all genomes
+    or to each founder partition."""
+    logging.info("surface_build_tree running surface_unpack_reconstruct...")
+    df = surface_unpack_reconstruct(df, **unpack_reconstruct_kwargs)
+
+    logging.info("surface_build_tree running surface_postprocess_trie...")
+    return surface_postprocess_trie(df, **postprocess_trie_kwargs)
+
+
+def _concat_forests(dfs: typing.List[pl.DataFrame]) -> pl.DataFrame:
+    """Concatenate contiguously-numbered phylogenies, offsetting ids so they
+    do not overlap."""
+    offsets = itertools.accumulate((len(df) for df in dfs), initial=0)
+    return pl.concat(
+        (
+            df.with_columns(pl.col("id", "ancestor_id") + offset)
+            for df, offset in zip(dfs, offsets)
+        ),
+        how="vertical_relaxed",
+    )
 
 
 def surface_build_tree(
@@ -14,13 +135,17 @@ def surface_build_tree(
     collapse_unif_freq: int = 1,
     check_trie_invariant_freq: int = 0,
     check_trie_invariant_after_collapse_unif: bool = False,
+    check_trie_invariant_full: bool = False,
     drop_dstream_metadata: typing.Optional[bool] = None,
     exploded_slice_size: int = 1_000_000,
     mp_context: str = "spawn",
     mp_pool_size: int = 1,
+    num_threads: int = 1,
     pa_source_type: str = "memory_map",
     shuffle_over_same_T_seed: typing.Optional[int] = None,
     delete_trunk: bool = True,
+    partition_by_founder: bool = False,
+    partition_pool_size: int = 1,
     trie_postprocessor: typing.Callable = NopTriePostprocessor(),
     # ^^^ NopTriePostprocessor is stateless, so is safe as default value
 ) -> pl.DataFrame:
@@ -95,6 +220,11 @@ def surface_build_tree(
         When greater than 1, a multiprocessing pool is used with ordered
         results via ``Pool.imap``.
 
+    num_threads : int, default 1
+        Number of threads for inserting exploded slices into the trie.
+
+        Output is identical to single-threaded construction.
+
     pa_source_type : str, default 'memory_map'
         PyArrow type to use for exploded chunks (i.e., "memory_map" or
         "OSFile").
@@ -111,6 +241,22 @@ def surface_build_tree(
         for founding ancestor(s), by segregating subtrees with distinct
         founding strata into independent trees.
 
+    partition_by_founder : bool, default False
+        Should genomes be split by founding strata before reconstruction?
+
+        Genomes are keyed by their differentiae at trunk ranks retained by
+        all genomes. Because genomes with distinct keys fall in separate trees
+        after trunk deletion, each partition is reconstructed independently
+        and resulting trees are concatenated with non-overlapping ids. Requires
+        `delete_trunk`. Output is equivalent to unpartitioned reconstruction,
+        up to node ordering and id assignment.
+
+    partition_pool_size : int, default 1
+        Number of worker processes for reconstructing founder partitions in
+        parallel.
+
+        When 1, partitions are reconstructed serially in the calling process.
+
     trie_postprocessor : Callable, default `hstrat.NopTriePostprocessor()`
         Tree postprocess functor.
 
@@ -154,27 +300,67 @@ def surface_build_tree(
     """
     logging.info("surface_build_tree begin")
 
-    logging.info("surface_build_tree running surface_unpack_reconstruct...")
-    df = surface_unpack_reconstruct(
-        df,
+    if partition_by_founder and not delete_trunk:
+        raise ValueError("partition_by_founder requires delete_trunk")
+
+    unpack_reconstruct_kwargs = dict(
         collapse_unif_freq=collapse_unif_freq,
         check_trie_invariant_freq=check_trie_invariant_freq,
         check_trie_invariant_after_collapse_unif=check_trie_invariant_after_collapse_unif,
+        check_trie_invariant_full=check_trie_invariant_full,
         drop_dstream_metadata=drop_dstream_metadata,
         exploded_slice_size=exploded_slice_size,
         mp_context=mp_context,
         mp_pool_size=mp_pool_size,
+        num_threads=num_threads,
         pa_source_type=pa_source_type,
         shuffle_over_same_T_seed=shuffle_over_same_T_seed,
     )
-
-    logging.info("surface_build_tree running surface_postprocess_trie...")
-    df = surface_postprocess_trie(
-        df,
+    postprocess_trie_kwargs = dict(
         delete_trunk=delete_trunk,
         drop_dstream_metadata=drop_dstream_metadata,
         trie_postprocessor=trie_postprocessor,
     )
 
+    if not partition_by_founder:
+        df = _surface_build_tree_impl(
+            df, unpack_reconstruct_kwargs, postprocess_trie_kwargs
+        )
+        logging.info("surface_build_tree complete")
+        return df
+
+    with log_context_duration("_partition_by_founder", logging.info):
+        partitions = _partition_by_founder(
+            df,
+            exploded_slice_size=exploded_slice_size,
+            mp_context=mp_context,
+            mp_pool_size=mp_pool_size,
+        )
+    logging.info(f"surface_build_tree found {len(partitions)} partitions")
+
+    if partition_pool_size == 1 or len(partitions) == 1:
+        dfs = [
+            _surface_build_tree_impl(
+                partition, unpack_reconstruct_kwargs, postprocess_trie_kwargs
+            )
+            for partition in partitions
+        ]
+    else:
+        with futures.ProcessPoolExecutor(
+            max_workers=partition_pool_size,
+            mp_context=_get_mp_context(mp_context),
+        ) as executor:
+            dfs = [
+                *executor.map(
+                    _surface_build_tree_impl,
+                    partitions,
+                    itertools.repeat(unpack_reconstruct_kwargs),
+                    itertools.repeat(postprocess_trie_kwargs),
+                ),
+            ]
+
+    with log_context_duration("_concat_forests", logging.info):
+        df = _concat_forests(dfs)
+
     logging.info("surface_build_tree complete")
     return df
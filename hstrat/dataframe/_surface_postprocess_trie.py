@@ -1,18 +1,23 @@
 import functools
 import gc
+import inspect
 import logging
 import os
 import typing
 import warnings
 
+import numpy as np
 from pandas import testing as pdt
-from phyloframe import legacy as pfl
 import polars as pl
 from tqdm import tqdm
 
 from .._auxiliary_lib import (
     get_sole_scalar_value_polars,
     is_in_unit_test,
+    jit,
+    jit_numba_dict_t,
+    jit_numpy_int64_t,
+    jit_numpy_uint8_t,
     log_context_duration,
     log_memory_usage,
     render_polars_snapshot,
@@ -46,19 +51,171 @@ def _apply_empty_output_schema(
     return df
 
 
+@jit(nopython=True)
+def _calc_ancestor_rows(
+    ids: np.ndarray,
+    ancestor_ids: np.ndarray,
+) -> np.ndarray:
+    """Translate ancestor ids to row positions, for asexual phylogeny."""
+    num_rows = len(ids)
+    ancestor_rows = np.empty(num_rows, dtype=np.int64)
+    if num_rows == 0:
+        return ancestor_rows
+
+    max_id = np.max(ids)
+    if max_id > num_rows * 5:
+        reassignment = jit_numba_dict_t.empty(
+            key_type=jit_numpy_int64_t,
+            value_type=jit_numpy_int64_t,
+        )
+        for i, id_ in enumerate(ids):
+            reassignment[np.int64(id_)] = i
+        for i, ancestor_id in enumerate(ancestor_ids):
+            ancestor_rows[i] = reassignment[np.int64(ancestor_id)]
+    else:
+        reassignment_ = np.empty(max_id + 1, dtype=np.int64)
+        for i, id_ in enumerate(ids):
+            reassignment_[id_] = i
+        for i, ancestor_id in enumerate(ancestor_ids):
+            ancestor_rows[i] = reassignment_[ancestor_id]
+
+    return ancestor_rows
+
+
+@jit(nopython=True)
+def _delete_trunk_prefix_roots_contiguous(
+    ids: np.ndarray,
+    ancestor_ids: np.ndarray,
+    ranks: np.ndarray,
+    dstream_S: int,
+) -> typing.Tuple[bool, np.ndarray, int, np.ndarray]:
+    """Fused equivalent of assigning contiguous ids, deleting trunk nodes with
+    rank less than `dstream_S` - 1, assigning contiguous ids again, then
+    prefixing roots with rank greater than `dstream_S`, for asexual phylogeny.
+
+    Returns whether trunk is contiguous, a mask of rows to keep, the number of
+    prefix roots to prepend, and kept rows' ancestor ids after prepending
+    prefix roots and contiguous reassignment (i.e., row positions among
+    prefix roots then kept rows). Other return values are empty if trunk is
+    not contiguous.
+    """
+    num_rows = len(ids)
+    ancestor_rows = _calc_ancestor_rows(ids, ancestor_ids)
+
+    is_trunk = ranks < dstream_S - 1
+    for i in range(num_rows):
+        if is_trunk[i] and not is_trunk[ancestor_rows[i]]:
+            return False, np.zeros(0, dtype=np.bool_), 0, ancestor_rows[:0]
+
+    # number kept rows, making children of deleted trunk into roots, and
+    # count roots to be prefixed
+    keep_filter = ~is_trunk
+    new_rows = np.empty(num_rows, dtype=np.int64)
+    num_kept = 0
+    num_prefixed = 0
+    for i in range(num_rows):
+        if keep_filter[i]:
+            new_rows[i] = num_kept
+            num_kept += 1
+            if is_trunk[ancestor_rows[i]] or ancestor_rows[i] == i:
+                ancestor_rows[i] = i
+                if ranks[i] > dstream_S:
+                    num_prefixed += 1
+
+    # no topological order required, as all kept rows were numbered above
+    new_ancestor_ids = np.empty(num_kept, dtype=np.int64)
+    num_prefixes_assigned = 0
+    for i in range(num_rows):
+        if keep_filter[i]:
+            ancestor_row = ancestor_rows[i]
+            if ancestor_row == i and ranks[i] > dstream_S:
+                new_ancestor_ids[new_rows[i]] = num_prefixes_assigned
+                num_prefixes_assigned += 1
+            else:
+                new_ancestor_ids[new_rows[i]] = (
+                    num_prefixed + new_rows[ancestor_row]
+                )
+
+    return True, keep_filter, num_prefixed, new_ancestor_ids
+
+
+@jit(nopython=True)
+def _collapse_unifurcations_contiguous(
+    ids: np.ndarray,
+    ancestor_ids: np.ndarray,
+) -> typing.Tuple[bool, np.ndarray, np.ndarray]:
+    """Fused equivalent of assigning contiguous ids, collapsing
+    unifurcations, then assigning contiguous ids again, for asexual phylogeny.
+
+    Returns whether phylogeny is topologically sorted, a mask of rows to keep,
+    and kept rows' ancestor ids after contiguous reassignment (i.e., row
+    positions among kept rows). Other return values are empty if phylogeny is
+    not topologically sorted.
+    """
+    num_rows = len(ids)
+    ancestor_rows = _calc_ancestor_rows(ids, ancestor_ids)
+    if num_rows == 0:
+        return True, np.zeros(0, dtype=np.bool_), ancestor_rows
+
+    ref_counts = np.zeros(num_rows, dtype=jit_numpy_uint8_t)
+    for i, ancestor_row in enumerate(ancestor_rows):
+        if ancestor_row > i:
+            return False, np.zeros(0, dtype=np.bool_), ancestor_rows[:0]
+        # cap to prevent overflow
+        ref_counts[ancestor_row] = min(ref_counts[ancestor_row] + 1, 2)
+
+    # percolate ancestors over unifurcations and number kept rows in one
+    # sweep; ancestors precede descendants, so are already numbered
+    keep_filter = np.empty(num_rows, dtype=np.bool_)
+    new_ids = np.empty(num_rows, dtype=np.int64)
+    new_ancestor_ids = np.empty(num_rows, dtype=np.int64)
+    num_kept = 0
+    for i in range(num_rows):
+        ancestor_row = ancestor_rows[i]
+        if ref_counts[ancestor_row] == 1:  # root ok
+            # percolate ancestor over self
+            ancestor_row = ancestor_rows[ancestor_row]
+            ancestor_rows[i] = ancestor_row
+
+        keep_filter[i] = ref_counts[i] != 1 or ancestor_row == i
+        if keep_filter[i]:
+            new_ids[i] = num_kept
+            new_ancestor_ids[num_kept] = new_ids[ancestor_row]
+            num_kept += 1
+
+    return True, keep_filter, new_ancestor_ids[:num_kept]
+
+
 def _do_collapse_unifurcations(
     df: pl.DataFrame,
 ) -> pl.DataFrame:
     logging.info("begin _do_collapse_unifurcations")
-    logging.info(f" - len(df): {df.lazy().select(pl.len()).collect().item()}")
-    with log_context_duration("alifestd_assign_contiguous_ids", logging.info):
-        df = pfl.alifestd_assign_contiguous_ids_polars(df)
+    df = df.lazy().collect()
+    logging.info(f" - len(df): {len(df)}")
+    with log_context_duration(
+        "_collapse_unifurcations_contiguous", logging.info
+    ):
+        (
+            is_topologically_sorted,
+            keep_filter,
+            ancestor_ids,
+        ) = _collapse_unifurcations_contiguous(
+            df["id"].to_numpy(), df["ancestor_id"].to_numpy()
+        )
 
-    gc.collect()
+    if not is_topologically_sorted:
+        raise NotImplementedError(
+            "polars topological sort not yet implemented",
+        )
 
-    logging.info(f" - len(df): {df.lazy().select(pl.len()).collect().item()}")
-    with log_context_duration("alifestd_collapse_unifurcations", logging.info):
-        df = pfl.alifestd_collapse_unifurcations_polars(df)
+    with log_context_duration("apply collapse and reindex", logging.info):
+        df = (
+            df.filter(keep_filter)
+            .drop("id")
+            .with_row_index("id")
+            .with_columns(ancestor_id=pl.Series(ancestor_ids))
+        )
+    del keep_filter, ancestor_ids
 
     render_polars_snapshot(df, "collapsed tree", logging.info)
 
@@ -71,82 +228,199 @@ def _do_delete_trunk(
     df: pl.DataFrame,
 ) -> pl.DataFrame:
     logging.info("begin _do_delete_trunk")
-    logging.info(f" - len(df): {df.lazy().select(pl.len()).collect().item()}")
-    with log_context_duration("alifestd_assign_contiguous_ids", logging.info):
-        df = pfl.alifestd_assign_contiguous_ids_polars(df)
-
-    gc.collect()
+    df = df.lazy().collect()
+    logging.info(f" - len(df): {len(df)}")
+    if "ancestor_list" in df.columns:
+        raise NotImplementedError
 
     with log_context_duration("get_sole_scalar_value_polars", logging.info):
         dstream_S = get_sole_scalar_value_polars(df, "dstream_S")
 
-    df = df.with_columns(
-        is_trunk=pl.col("dstream_rank") < dstream_S - 1,
-        origin_time=pl.col("dstream_rank"),
-    )
+    with log_context_duration(
+        "_delete_trunk_prefix_roots_contiguous", logging.info
+    ):
+        (
+            is_trunk_contiguous,
+            keep_filter,
+            num_prefixed,
+            ancestor_ids,
+        ) = _delete_trunk_prefix_roots_contiguous(
+            df["id"].to_numpy(),
+            df["ancestor_id"].to_numpy(),
+            df["dstream_rank"].cast(pl.Int64).to_numpy(),
+            int(dstream_S),
+        )
 
-    logging.info(f" - len(df): {df.lazy().select(pl.len()).collect().item()}")
-    with log_context_duration("alifestd_delete_trunk_asexual", logging.info):
-        df = pfl.alifestd_delete_trunk_asexual_polars(df)
+    if not is_trunk_contiguous:
+        raise ValueError("specified trunk is non-contiguous")
 
-    if df.lazy().limit(1).collect().is_empty():
+    # columns used as scratch space by unfused implementation
+    df = df.drop(
+        "id", "is_trunk", "ancestor_is_trunk", "origin_time", strict=False
+    )
+    if not keep_filter.any():
         logging.warning("empty dataframe after trunk deletion")
-        return df.drop(
-            ["is_trunk", "ancestor_is_trunk", "origin_time"], strict=False
-        )
+        return df.clear().with_row_index("id")
 
-    logging.info(f" - len(df): {df.lazy().select(pl.len()).collect().item()}")
-    with log_context_duration("alifestd_assign_contiguous_ids", logging.info):
-        df = pfl.alifestd_assign_contiguous_ids_polars(df)
+    with log_context_duration("apply trunk deletion", logging.info):
+        df = df.filter(keep_filter).with_columns(
+            ancestor_id=pl.Series(ancestor_ids),
+        )
+    del keep_filter, ancestor_ids
 
-    logging.info(f" - len(df): {df.lazy().select(pl.len()).collect().item()}")
-    with log_context_duration("alifestd_prefix_roots", logging.info):
-        # extend newly-clipped roots all the way back to dstream_S boundary
-        df = pfl.alifestd_prefix_roots_polars(
-            df, allow_id_reassign=True, origin_time=dstream_S
+    # extend newly-clipped roots all the way back to dstream_S boundary
+    logging.info(f" - num prefixed roots: {num_prefixed}")
+    with log_context_duration("prefix roots and reindex", logging.info):
+        prefix_roots = df.clear(num_prefixed).with_columns(
+            ancestor_id=pl.int_range(num_prefixed, dtype=pl.Int64),
         )
+        df = pl.concat([prefix_roots, df]).with_row_index("id")
 
-    gc.collect()
+    logging.info(f" - len(df): {len(df)}")
+    return df
 
-    logging.info(f" - len(df): {df.lazy().select(pl.len()).collect().item()}")
-    return df.drop(
-        ["is_trunk", "ancestor_is_trunk", "origin_time"], strict=False
-    )
 
+def _get_validation_mode() -> str:
+    """Read validation mode from `HSTRAT_SURFACE_POSTPROCESS_VALIDATE`.
 
-def _do_assign_contiguous_ids(
-    df: pl.DataFrame,
-) -> pl.DataFrame:
-    logging.info("begin _do_assign_contiguous_ids")
-    logging.info(f" - len(df): {df.lazy().select(pl.len()).collect().item()}")
-    with log_context_duration("alifestd_assign_contiguous_ids", logging.info):
-        df = pfl.alifestd_assign_contiguous_ids_polars(df)
+    One of "full" (cross-check entire result against Pandas implementation),
+    "sample" (check structural invariants and a bounded random sample of
+    lineages against Pandas implementation), or "none". Defaults to "sample"
+    in CI and unit test environments, and "none" otherwise.
+    """
+    mode = os.environ.get("HSTRAT_SURFACE_POSTPROCESS_VALIDATE")
+    if mode is None:
+        return "sample" if "CI" in os.environ or is_in_unit_test() else "none"
+    elif mode not in ("full", "sample", "none"):
+        raise ValueError(
+            f"invalid HSTRAT_SURFACE_POSTPROCESS_VALIDATE value {mode!r}, "
+            "expected 'full', 'sample', or 'none'",
+        )
+    return mode
 
-    gc.collect()
 
-    render_polars_snapshot(df, "reassigned tree", logging.info)
+@jit(nopython=True)
+def _calc_lineage_closure(
+    ancestor_rows: np.ndarray,
+    sampled_rows: np.ndarray,
+) -> np.ndarray:
+    """Mask rows that are sampled rows or their ancestors."""
+    mask = np.zeros(len(ancestor_rows), dtype=np.bool_)
+    for row in sampled_rows:
+        while not mask[row]:
+            mask[row] = True
+            row = ancestor_rows[row]
+    return mask
 
-    return df
+
+def _calc_leaf_mask(ancestor_rows: np.ndarray) -> np.ndarray:
+    """Mask rows that are not the ancestor of any other row."""
+    is_root = ancestor_rows == np.arange(len(ancestor_rows))
+    is_leaf = np.ones(len(ancestor_rows), dtype=bool)
+    is_leaf[ancestor_rows[~is_root]] = False
+    return is_leaf
+
+
+def _sample_lineages(
+    df: pl.DataFrame, budget: int, rng: np.random.Generator
+) -> pl.DataFrame:
+    """Subset raw trie to ancestral closure of at most `budget` randomly
+    sampled leaves, retaining row order."""
+    ancestor_rows = _calc_ancestor_rows(
+        df["id"].to_numpy(), df["ancestor_id"].to_numpy()
+    )
+    (leaf_rows,) = np.nonzero(_calc_leaf_mask(ancestor_rows))
+    if len(leaf_rows) > budget:
+        leaf_rows = rng.choice(leaf_rows, size=budget, replace=False)
+    return df.filter(_calc_lineage_closure(ancestor_rows, leaf_rows))
+
+
+def _validate_structure(
+    raw: pl.DataFrame, result: pl.DataFrame, delete_trunk: bool
+) -> None:
+    """Check postprocessed trie for structural invariants, in linear time."""
+    ids = result["id"].to_numpy()
+    ancestor_ids = result["ancestor_id"].to_numpy()
+    assert len(np.unique(ids)) == len(ids), "ids are not unique"
+    assert np.isin(ancestor_ids, ids).all(), "ancestor ids not in trie"
+
+    ancestor_rows = _calc_ancestor_rows(ids, ancestor_ids)
+    ranks = result["hstrat_rank"].cast(pl.Float64).to_numpy()
+    ancestor_ranks = ranks[ancestor_rows]
+    has_ranks = ~np.isnan(ranks) & ~np.isnan(ancestor_ranks)
+    assert (ancestor_ranks <= ranks)[has_ranks].all(), "rank decreases"
+
+    # unifurcation collapse, root prefixing, and peeling preserve leaves
+    raw_is_leaf = _calc_leaf_mask(
+        _calc_ancestor_rows(
+            raw["id"].to_numpy(), raw["ancestor_id"].to_numpy()
+        ),
+    )
+    if delete_trunk:
+        dstream_S = get_sole_scalar_value_polars(raw, "dstream_S")
+        raw_ranks = raw["dstream_rank"].cast(pl.Int64).to_numpy()
+        raw_is_leaf &= raw_ranks >= dstream_S - 1
+    num_leaves = _calc_leaf_mask(ancestor_rows).sum()
+    assert num_leaves == raw_is_leaf.sum(), "leaf count not preserved"
 
 
 def _validate_against_via_pandas(func: typing.Callable) -> typing.Callable:
-    """Decorator to validate Polars impl against equivalent Pandas impl."""
+    """Decorator to validate Polars impl against equivalent Pandas impl.
+
+    Validation mode is set by `HSTRAT_SURFACE_POSTPROCESS_VALIDATE`; see
+    `_get_validation_mode`. In "sample" mode, at most
+    `HSTRAT_SURFACE_POSTPROCESS_VALIDATE_BUDGET` (default 32) lineages are
+    cross-checked.
+    """
+    signature = inspect.signature(func)
+
+    def assert_equal(result: pl.DataFrame, expected: pl.DataFrame) -> None:
+        # convert to pandas to avoid Polars StringCache issues
+        pdt.assert_frame_equal(
+            result.to_pandas(),
+            expected.to_pandas(),
+            check_dtype=False,
+            check_like=True,
+        )
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> pl.DataFrame:
         result = func(*args, **kwargs)
-        if "CI" in os.environ or is_in_unit_test():
-            warnings.warn(
-                "CI environment detected, performing extra validation tests",
-            )
+        mode = _get_validation_mode()
+        if mode == "full":
+            warnings.warn("performing full validation against Pandas impl")
             expected = _surface_postprocess_trie_via_pandas(*args, **kwargs)
-            # convert to pandas to avoid Polars StringCache issues
-            pdt.assert_frame_equal(
-                result.to_pandas(),
-                expected.to_pandas(),
-                check_dtype=False,
-                check_like=True,
+            assert_equal(result, expected)
+        elif mode == "sample":
+            warnings.warn("performing sampled validation against Pandas impl")
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            options = {**bound.arguments}
+            raw = options.pop("df").lazy().collect()
+            if raw.is_empty():
+                return result
+
+            with log_context_duration("_validate_structure", logging.info):
+                _validate_structure(raw, result, options["delete_trunk"])
+
+            budget = int(
+                os.environ.get(
+                    "HSTRAT_SURFACE_POSTPROCESS_VALIDATE_BUDGET", 32
+                )
             )
+            seed = np.random.SeedSequence().entropy
+            logging.info(f"sampling {budget} lineages with {seed=}")
+            sample = _sample_lineages(raw, budget, np.random.default_rng(seed))
+            with log_context_duration("validate sample", logging.info):
+                if len(sample) == len(raw):  # sample covers entire trie
+                    sample_result = result
+                else:
+                    sample_result = func(sample, **options)
+                expected = _surface_postprocess_trie_via_pandas(
+                    sample, **options
+                )
+                assert_equal(sample_result, expected)
+
         return result
 
     return wrapper
@@ -250,7 +524,13 @@ def surface_postprocess_trie(
     Collapsing trunk nodes with rank less than `dstream_S` assumes that `S`
     "dummy" strata were added to fill hstrat surface for founding ancestor(s).
 
-    Currently, data is converted to Pandas for processing, then back to Polars.
+    In CI and unit test environments, output is checked for structural
+    invariants and a random sample of lineages is cross-checked against a
+    reference Pandas implementation. Set environment variable
+    `HSTRAT_SURFACE_POSTPROCESS_VALIDATE` to "full" to cross-check entire
+    output, or to "none" to disable validation. Set
+    `HSTRAT_SURFACE_POSTPROCESS_VALIDATE_BUDGET` to control the number of
+    lineages sampled (default 32).
 
     See Also
     --------
@@ -282,9 +562,7 @@ def surface_postprocess_trie(
         logging.warning("empty dataframe after trunk deletion, returning")
         return _apply_empty_output_schema(df, drop_dstream_metadata)
 
-    df = _do_collapse_unifurcations(df)
-
-    df = _do_assign_contiguous_ids(df)
+    df = _do_collapse_unifurcations(df)  # also assigns contiguous ids
 
     logging.info("applying trie postprocessor...")
     logging.info(f" - len(df): {df.lazy().select(pl.len()).collect().item()}")
@@ -1,13 +1,25 @@
+import collections
 from concurrent import futures
 import contextlib
+import functools
 import gc
+import itertools
+import json
 import logging
 import multiprocessing
+from multiprocessing import pool as mp_pool
+from multiprocessing import shared_memory
+import os
 import pathlib
+import tempfile
+import threading
+import time
 import typing
 import uuid
 
 from downstream import dataframe as dstream_dataframe
+from downstream import dstream
+import numpy as np
 import polars as pl
 import pyarrow as pa
 import tqdm
@@ -18,6 +30,7 @@ from .._auxiliary_lib import (
     give_len,
     iter_slices,
     log_context_duration,
+    log_disk_usage,
     log_memory_usage,
     render_polars_snapshot,
 )
@@ -35,7 +48,8 @@ from ..phylogenetic_inference.tree._impl._build_tree_searchtable_cpp_impl_stub i
     check_trie_invariant_search_lineage_compatible,
     check_trie_invariant_single_root,
     check_trie_invariant_topologically_sorted,
-    collapse_unifurcations,
+    check_trie_invariants_dirty,
+    collapse_unifurcations_inplace,
     copy_records_to_dict,
     diagnose_trie_invariant_ancestor_bounds,
     diagnose_trie_invariant_chronologically_sorted,
@@ -50,8 +64,12 @@ from ..phylogenetic_inference.tree._impl._build_tree_searchtable_cpp_impl_stub i
     diagnose_trie_invariant_single_root,
     diagnose_trie_invariant_topologically_sorted,
     extend_tree_searchtable_cpp_from_exploded,
-    extract_records_to_dict,
+    extend_tree_searchtable_cpp_from_packed,
+    extract_records_to_arrow,
+    load_records_from_dict,
+    make_records,
     placeholder_value,
+    widen_records,
 )
 
 
@@ -156,6 +174,21 @@ def _make_exploded_slice(
     return long_df
 
 
+_packed_slice_columns = ("dstream_data_id", "dstream_T", "dstream_storage_hex")
+
+
+def _make_slice(
+    df_slice: pl.DataFrame,
+    row_slice_log: slice,
+    native_explode: bool,
+) -> pl.DataFrame:
+    """Explode slice, or if `native_explode`, select only the unpacked
+    columns needed to explode it during trie insertion."""
+    if native_explode:
+        return df_slice.select(*_packed_slice_columns)
+    return _make_exploded_slice(df_slice=df_slice, row_slice_log=row_slice_log)
+
+
 def _prepare_df_for_explosion(
     df: pl.DataFrame,
     mp_context: str,
@@ -192,19 +225,168 @@ def _prepare_df_for_explosion(
             f"shuffle over same dstream_T ({shuffle_over_same_T_seed=})",
             logging.info,
         ):
-            df = df.with_columns(
-                pl.all()
-                .exclude("dstream_T")
-                .shuffle(seed=shuffle_over_same_T_seed)
-                .over("dstream_T"),
-            )
+            df = _shuffle_over_same_T(df, shuffle_over_same_T_seed)
         render_polars_snapshot(df, "shuffled", logging.info)
 
     return df
 
 
-def _explode_and_write_slice(args: typing.Tuple[pl.LazyFrame, slice]) -> str:
-    """Explode a single slice and write result to a temporary Arrow file.
+def _shuffle_over_same_T(df: pl.DataFrame, seed: int) -> pl.DataFrame:
+    """Shuffle rows within same-dstream_T groups.
+
+    Each group is shuffled independently of other groups, so shuffling
+    disjoint sets of whole groups gives the same result as shuffling all at
+    once.
+    """
+    return df.with_columns(
+        pl.all().exclude("dstream_T").shuffle(seed=seed).over("dstream_T"),
+    )
+
+
+def _coalesce_dstream_data_id(
+    df: typing.Union[pl.DataFrame, pl.LazyFrame], row_offset: int = 0
+) -> typing.Union[pl.DataFrame, pl.LazyFrame]:
+    """Ensure uint64 dstream_data_id, filling missing values with row index.
+
+    Use `row_offset` to number rows of a slice by their position in the
+    full input.
+    """
+    return df.with_columns(
+        dstream_data_id=pl.coalesce(
+            pl.col("^dstream_data_id$"),
+            pl.int_range(pl.len(), dtype=pl.UInt64) + row_offset,
+        ).cast(pl.UInt64),
+    )
+
+
+def _make_spill_path(scratch_dir: typing.Optional[str], suffix: str) -> str:
+    """Make a unique path for a spill file in `scratch_dir`, or in the
+    system temporary directory if None."""
+    return os.path.join(
+        scratch_dir or tempfile.gettempdir(), f"{uuid.uuid4()}{suffix}"
+    )
+
+
+def _get_ipc_compression(spill_compression: str) -> str:
+    """Translate spill compression option to polars IPC compression."""
+    if spill_compression not in ("none", "lz4", "zstd"):
+        raise ValueError(
+            "spill_compression must be one of 'none', 'lz4', or 'zstd', "
+            f"got {spill_compression!r}",
+        )
+    return {"none": "uncompressed"}.get(spill_compression, spill_compression)
+
+
+def _write_sorted_runs(
+    lf: pl.LazyFrame,
+    sort_run_size: int,
+    mp_context: multiprocessing.context.BaseContext,
+    mp_pool_size: int,
+    run_paths: typing.List[str],
+    scratch_dir: typing.Optional[str] = None,
+) -> None:
+    """Unpack input `sort_run_size` rows at a time, writing each run, stably
+    sorted by dstream_T, to an uncompressed (i.e., memory mappable) Arrow
+    file.
+
+    Run file paths are appended to `run_paths` as they are written, so that
+    the caller can clean up if an error occurs partway.
+    """
+    nrows = lf.select(pl.len()).collect().item()
+    run_slices = [*iter_slices(nrows, sort_run_size)]
+    for i, row_slice in enumerate(run_slices):
+        with log_context_duration(
+            f"_write_sorted_runs ({i + 1} / {len(run_slices)})", logging.info
+        ):
+            run = _coalesce_dstream_data_id(
+                lf[row_slice].collect(), row_offset=row_slice.start
+            )
+            run = dstream_dataframe.unpack_data_packed(
+                run, mp_context=mp_context, mp_pool_size=mp_pool_size
+            )
+            run = run.sort("dstream_T", descending=False, maintain_order=True)
+
+            run_path = _make_spill_path(scratch_dir, "_run.arrow")
+            run_paths.append(run_path)
+            run.write_ipc(run_path, compression="uncompressed")
+            del run  # clear memory
+
+
+def _merge_sorted_runs(
+    run_paths: typing.List[str],
+    batch_size: int,
+    shuffle_over_same_T_seed: typing.Optional[int],
+    batch_paths: typing.List[str],
+    scratch_dir: typing.Optional[str] = None,
+    spill_compression: str = "lz4",
+) -> int:
+    """K-way merge memory-mapped sorted runs into batches, writing each batch
+    to a temporary Arrow file, and return total number of rows.
+
+    Runs are consecutive chunks of input, so taking same-dstream_T rows in
+    run order reproduces a stable sort of the full input. Each batch holds
+    whole dstream_T groups, about `batch_size` rows in total, so that
+    shuffling within same-T groups can be applied batch by batch. Batch file
+    paths are appended to `batch_paths` as they are written.
+    """
+    runs = [pl.read_ipc(path, memory_map=True) for path in run_paths]
+    Ts = [run["dstream_T"].to_numpy() for run in runs]
+    begins = np.zeros(len(runs), dtype=np.int64)
+    ends = np.array([len(run) for run in runs], dtype=np.int64)
+    rows_per_run = max(batch_size // max(len(runs), 1), 1)
+
+    nrows = 0
+    while (begins < ends).any() or not batch_paths:
+        # take all rows up to the smallest dstream_T reached by advancing
+        # rows_per_run in any run, so no run contributes more than
+        # rows_per_run rows plus ties, and at least one run advances
+        threshold = min(
+            (
+                Ts[r][min(begins[r] + rows_per_run, ends[r]) - 1]
+                for r in np.flatnonzero(begins < ends)
+            ),
+            default=0,
+        )
+        stops = np.array(
+            [
+                max(begin, np.searchsorted(T, threshold, side="right"))
+                for begin, T in zip(begins, Ts)
+            ],
+            dtype=np.int64,
+        )
+        batch = pl.concat(
+            [
+                run[begin:stop]
+                for run, begin, stop in zip(runs, begins, stops)
+                if stop > begin
+            ]
+            or [runs[0][:0]],
+        ).sort("dstream_T", descending=False, maintain_order=True)
+        if shuffle_over_same_T_seed is not None:
+            batch = _shuffle_over_same_T(batch, shuffle_over_same_T_seed)
+
+        batch_path = _make_spill_path(scratch_dir, "_merged.arrow")
+        batch_paths.append(batch_path)
+        batch.write_ipc(
+            batch_path, compression=_get_ipc_compression(spill_compression)
+        )
+        nrows += len(batch)
+        begins = stops
+        del batch  # clear memory
+
+    del runs, Ts  # release memory maps
+    return nrows
+
+
+def _explode_and_write_slice(
+    args: typing.Tuple[pl.LazyFrame, slice],
+    scratch_dir: typing.Optional[str] = None,
+    spill_compression: str = "lz4",
+    slice_transport: str = "ipc",
+    native_explode: bool = False,
+) -> str:
+    """Explode a single slice and write result to a temporary Arrow file, or
+    shared memory block, returning its locator.
 
     Receives a ``(LazyFrame, slice)`` tuple as a lightweight task descriptor.
     Only the rows needed for this slice are collected from the LazyFrame.
@@ -213,16 +395,106 @@ def _explode_and_write_slice(args: typing.Tuple[pl.LazyFrame, slice]) -> str:
     logging.info(f"- worker collecting {row_slice}")
     df_slice = lf[row_slice].collect()
     logging.info(f"- worker exploding {row_slice}")
-    long_df = _make_exploded_slice(df_slice=df_slice, row_slice_log=row_slice)
+    long_df = _make_slice(df_slice, row_slice, native_explode)
 
     logging.info(f"- worker writing exploded data for {row_slice}")
-    outpath = f"/tmp/{uuid.uuid4()}.arrow"  # nosec B108
-    long_df.select(pl.all().shrink_dtype()).write_ipc(
-        outpath, compression="lz4"
+    return _write_exploded_slice(
+        long_df, scratch_dir, spill_compression, slice_transport
     )
+
+
+def _write_ipc_file(table: pa.Table, sink: pa.NativeFile) -> None:
+    """Write Arrow table to sink in uncompressed Arrow IPC file format."""
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _write_slice_shm(long_df: pl.DataFrame) -> str:
+    """Write exploded slice to a new shared memory block, in uncompressed
+    Arrow IPC file format, and return the block's name.
+
+    The block outlives the calling process; it is unlinked by the consumer
+    once read (see `_read_slice` and `_release_slice`).
+    """
+    table = long_df.to_arrow()
+    mock_sink = pa.MockOutputStream()  # measure size before allocating
+    _write_ipc_file(table, mock_sink)
+    shm = shared_memory.SharedMemory(create=True, size=mock_sink.size())
+    try:
+        _write_ipc_file(table, pa.FixedSizeBufferWriter(pa.py_buffer(shm.buf)))
+    except BaseException:
+        shm.unlink()
+        raise
+    finally:
+        shm.close()
+    return shm.name
+
+
+def _write_exploded_slice(
+    long_df: pl.DataFrame,
+    scratch_dir: typing.Optional[str],
+    spill_compression: str,
+    slice_transport: str = "ipc",
+) -> str:
+    """Write exploded slice to a temporary Arrow file, or shared memory block
+    if `slice_transport` is "shm", and return its locator.
+
+    Shared memory blocks are always uncompressed.
+    """
+    long_df = long_df.select(pl.all().shrink_dtype())
+    if slice_transport == "shm":
+        locator = _write_slice_shm(long_df)
+    else:
+        locator = _make_spill_path(scratch_dir, ".arrow")
+        long_df.write_ipc(
+            locator, compression=_get_ipc_compression(spill_compression)
+        )
     del long_df  # clear memory
     gc.collect()
-    return outpath
+    return locator
+
+
+def _unpack_explode_and_write_slice(
+    args: typing.Tuple[pl.LazyFrame, slice],
+    scratch_dir: typing.Optional[str] = None,
+    spill_compression: str = "lz4",
+    slice_transport: str = "ipc",
+    native_explode: bool = False,
+) -> typing.Tuple[str, typing.Optional[int], typing.Optional[int]]:
+    """Unpack and explode a single slice of packed data, already sorted by
+    dstream_T, and write result to a temporary Arrow file or shared memory
+    block.
+
+    Receives a ``(LazyFrame, slice)`` tuple over packed data, and collects
+    only the rows needed for this slice. Returns output locator along with
+    first and last dstream_T in slice (None if slice is empty), so that
+    sorting can be checked across slices.
+    """
+    lf, row_slice = args
+    logging.info(f"- worker collecting packed {row_slice}")
+    df_slice = _coalesce_dstream_data_id(
+        lf[row_slice].collect(), row_offset=row_slice.start
+    )
+
+    logging.info(f"- worker unpacking {row_slice}")
+    df_slice = dstream_dataframe.unpack_data_packed(df_slice)
+    if not df_slice["dstream_T"].is_sorted():
+        raise ValueError(
+            f"input rows {row_slice} are not sorted by dstream_T, "
+            "as required for streaming",
+        )
+    first_T = df_slice["dstream_T"].first()
+    last_T = df_slice["dstream_T"].last()
+
+    logging.info(f"- worker exploding {row_slice}")
+    long_df = _make_slice(df_slice, row_slice, native_explode)
+    del df_slice  # clear memory
+
+    logging.info(f"- worker writing exploded data for {row_slice}")
+    locator = _write_exploded_slice(
+        long_df, scratch_dir, spill_compression, slice_transport
+    )
+    return locator, first_T, last_T
 
 
 def _dump_records(records: Records) -> str:
@@ -241,8 +513,15 @@ def _dump_records(records: Records) -> str:
             logging.error(f"failed to dump records to {dump_path}: {e}")
 
 
-def _run_trie_invariant_checks(records: Records, context: str) -> None:
-    """Run all trie invariant checks, raising AssertionError on failure.
+def _run_trie_invariant_checks(
+    records: Records, context: str, full: bool = True
+) -> None:
+    """Run trie invariant checks, raising AssertionError on failure.
+
+    If `full` is False, checks are confined to records created or relinked
+    since the last passing dirty-region check (see
+    ``check_trie_invariants_dirty``), and only a failing invariant is
+    rescanned in full for diagnosis.
 
     On failure, logs diagnostic information from the corresponding
     ``diagnose_trie_invariant_*`` function, dumps the records to a file,
@@ -313,9 +592,18 @@ def _run_trie_invariant_checks(records: Records, context: str) -> None:
             diagnose_trie_invariant_ranks_nonnegative,
         ),
     ]
-    for i, (name, check_fn, diagnose_fn) in enumerate(_checks, 1):
+    checks = _checks
+    if not full:
+        logging.info(f"checking dirty-region trie invariants ({context})...")
+        failed_name = check_trie_invariants_dirty(records)
+        if not failed_name:
+            logging.info(f"dirty-region trie invariants passed ({context})")
+            return
+        checks = [check for check in checks if check[0] == failed_name]
+
+    for i, (name, check_fn, diagnose_fn) in enumerate(checks, 1):
         logging.info(
-            f"checking trie invariant {i} of {len(_checks)}: "
+            f"checking trie invariant {i} of {len(checks)}: "
             f"{name} ({context})...",
         )
         if not check_fn(records):
@@ -330,44 +618,344 @@ def _run_trie_invariant_checks(records: Records, context: str) -> None:
                 f"{diagnostic}\n"
                 f"Records dumped to: {dump_path}"
             )
+
+    if not full:
+        dump_path = _dump_records(records)
+        raise AssertionError(
+            f"Dirty-region trie invariant check failed: {failed_name} "
+            f"({context}), but full check passed\n"
+            f"Records dumped to: {dump_path}"
+        )
     logging.info(f"all trie invariant checks passed ({context})")
 
 
-def _read_slice(inpath: str, pa_source_type: str) -> dict:
-    """Read an Arrow IPC slice from disk and convert columns to numpy."""
-    logging.info(f"_read_slice {inpath} using {pa_source_type=}")
-    _cols = ("dstream_data_id", "dstream_T", "dstream_Tbar", "dstream_value")
-    with log_context_duration(f"pa.ipc.open_file {inpath}", logging.info):
-        with getattr(pa, pa_source_type)(inpath, "rb") as source:
+_slice_columns = (
+    "dstream_data_id",
+    "dstream_T",
+    "dstream_Tbar",
+    "dstream_value",
+)
+
+
+def _slice_table_to_numpy(pa_table: pa.Table) -> typing.Dict[str, np.ndarray]:
+    """Convert slice columns to numpy, without copying where possible.
+
+    For unexploded slices (see `native_explode`), hexadecimal storage data is
+    converted to concatenated characters and their offsets.
+    """
+    if "dstream_storage_hex" not in pa_table.column_names:
+        np_arrays = {}
+        for col in _slice_columns:
+            with log_context_duration(
+                f"pa_table['{col}'].to_numpy()", logging.info
+            ):
+                np_arrays[col] = pa_table[col].to_numpy()
+        return np_arrays
+
+    hex_column = (
+        pa_table["dstream_storage_hex"]
+        .cast(pa.large_string())
+        .combine_chunks()
+    )
+    __, offsets, chars = hex_column.buffers()
+    begin, end = hex_column.offset, hex_column.offset + len(hex_column) + 1
+    return {
+        "dstream_data_id": pa_table["dstream_data_id"].to_numpy(),
+        "dstream_T": pa_table["dstream_T"].to_numpy(),
+        "dstream_storage_hex_chars": np.frombuffer(
+            chars or b"", dtype=np.uint8
+        ),
+        "dstream_storage_hex_offsets": (
+            np.frombuffer(offsets, dtype=np.int64)[begin:end]
+            if offsets is not None
+            else np.zeros(1, dtype=np.int64)
+        ),
+    }
+
+
+def _read_slice(
+    locator: str, pa_source_type: str, slice_transport: str = "ipc"
+) -> dict:
+    """Read a slice and convert columns to numpy.
+
+    Slices in shared memory are copied out, and their block is unlinked.
+    """
+    logging.info(f"_read_slice {locator} using {pa_source_type=}")
+    if slice_transport == "shm":
+        shm = shared_memory.SharedMemory(name=locator)
+        try:
+            pa_table = pa.ipc.open_file(pa.py_buffer(shm.buf)).read_all()
+            np_arrays = {
+                col: array.copy()
+                for col, array in _slice_table_to_numpy(pa_table).items()
+            }
+            del pa_table  # release shared memory buffer
+        finally:
+            shm.close()
+            shm.unlink()
+        return np_arrays
+
+    with log_context_duration(f"pa.ipc.open_file {locator}", logging.info):
+        with getattr(pa, pa_source_type)(locator, "rb") as source:
             pa_table = pa.ipc.open_file(source).read_all()
-    np_arrays = {}
-    for col in _cols:
-        with log_context_duration(
-            f"pa_table['{col}'].to_numpy()", logging.info
-        ):
-            np_arrays[col] = pa_table[col].to_numpy()
-    return np_arrays
+    return _slice_table_to_numpy(pa_table)
+
+
+def _get_lookup_ingest_times(
+    dstream_algo: str, dstream_S: int
+) -> typing.Callable[[np.ndarray], np.ndarray]:
+    """Get batched lookup of dstream buffer sites' ingest times (i.e.,
+    dstream_Tbar) from dstream_T, for named algorithm (e.g.,
+    'dstream.steady_algo')."""
+    try:
+        algo = getattr(dstream, dstream_algo.removeprefix("dstream."))
+    except AttributeError:
+        raise ValueError(f"unknown dstream_algo {dstream_algo!r}")
+
+    def lookup_ingest_times(dstream_T: np.ndarray) -> np.ndarray:
+        if (dstream_T < dstream_S).any():
+            raise NotImplementedError("T < S not yet supported")
+        if not len(dstream_T):
+            return np.empty((0, dstream_S), dtype=np.int64)
+        # serial, as called off the main thread alongside forked workers;
+        # numba's parallel threading layer is not fork or thread safe
+        return algo.lookup_ingest_times_batched(
+            dstream_S, dstream_T.astype(np.uint64), parallel=False
+        )
+
+    return lookup_ingest_times
+
+
+def _release_slice(locator: str, slice_transport: str = "ipc") -> None:
+    """Free the Arrow file or shared memory block holding an exploded slice,
+    if not already freed."""
+    if slice_transport == "shm":
+        try:
+            shm = shared_memory.SharedMemory(name=locator)
+        except FileNotFoundError:  # already unlinked by _read_slice
+            return
+        shm.close()
+        shm.unlink()
+    else:
+        pathlib.Path(locator).unlink(missing_ok=True)
+
+
+class _SlicePipelineMetrics:
+    """Accumulates elapsed time and row counts for each stage of the exploded
+    slice pipeline, for throughput logging.
+
+    Stages are "wait" (consumer blocked on producers and reader), "read" and
+    "lookup" (reader thread), and "insert" (trie building). Safe to update
+    from the reader thread.
+    """
+
+    def __init__(self: "_SlicePipelineMetrics") -> None:
+        self._lock = threading.Lock()
+        self.nrows = collections.Counter()
+        self.seconds = collections.Counter()
+
+    @contextlib.contextmanager
+    def measure(
+        self: "_SlicePipelineMetrics", stage: str
+    ) -> typing.Iterator[typing.List[int]]:
+        """Time enclosed block as `stage`; append row count(s) to the
+        yielded list to record them."""
+        nrows = []
+        start = time.perf_counter()
+        try:
+            yield nrows
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.nrows[stage] += sum(nrows)
+                self.seconds[stage] += elapsed
+
+    def log_summary(
+        self: "_SlicePipelineMetrics",
+        logger: typing.Callable = logging.info,
+    ) -> None:
+        with self._lock:
+            for stage, seconds in self.seconds.items():
+                nrows = self.nrows[stage]
+                rate = nrows / seconds if seconds else float("inf")
+                logger(
+                    f"slice pipeline {stage}: {nrows} rows in {seconds:.3f}s "
+                    f"({rate:.0f} rows/s)",
+                )
 
 
 def _readahead_slices(
     slices: typing.Iterator[str],
     pa_source_type: str,
+    slice_transport: str = "ipc",
+    metrics: typing.Optional[_SlicePipelineMetrics] = None,
+    lookup_ingest_times: typing.Optional[typing.Callable] = None,
 ) -> typing.Iterator[typing.Tuple[str, dict]]:
-    """Yield (inpath, np_arrays) pairs, prefetching the next slice in a
-    background thread while the caller processes the current one."""
+    """Yield (locator, np_arrays) pairs, taking the next slice from producers
+    and reading it in a background thread while the caller processes the
+    current one.
+
+    If `lookup_ingest_times` is provided, slices are unexploded and their
+    dstream_Tbar is looked up after reading. Time spent reading and looking
+    up is recorded to `metrics`.
+    """
+    if metrics is None:
+        metrics = _SlicePipelineMetrics()
+
     slices_iter = iter(slices)
-    first = next(slices_iter, None)
-    if first is None:
-        return
+
+    def read_next() -> typing.Optional[typing.Tuple[str, dict]]:
+        locator = next(slices_iter, None)
+        if locator is None:
+            return None
+        with metrics.measure("read") as nrows:
+            np_arrays = _read_slice(locator, pa_source_type, slice_transport)
+            nrows.append(len(np_arrays["dstream_T"]))
+        if lookup_ingest_times is not None:
+            with metrics.measure("lookup") as nrows:
+                np_arrays["dstream_Tbar"] = lookup_ingest_times(
+                    np_arrays["dstream_T"]
+                )
+                nrows.append(len(np_arrays["dstream_T"]))
+        return locator, np_arrays
+
     with futures.ThreadPoolExecutor(max_workers=1) as reader:
-        future = reader.submit(_read_slice, first, pa_source_type)
-        inpath = first
-        for next_inpath in slices_iter:
-            np_arrays = future.result()
-            future = reader.submit(_read_slice, next_inpath, pa_source_type)
-            yield inpath, np_arrays
-            inpath = next_inpath
-        yield inpath, future.result()
+        future = reader.submit(read_next)
+        item = future.result()
+        while item is not None:
+            future = reader.submit(read_next)
+            yield item
+            item = future.result()
+
+
+def _extend_records(
+    records: Records,
+    np_arrays: typing.Dict[str, np.ndarray],
+    num_threads: int,
+) -> Records:
+    """Add exploded slice to tree searchtable, switching to full-width
+    records layout if compact layout would overflow.
+
+    Unexploded slices (see `native_explode`) are exploded during insertion.
+    """
+    if "dstream_storage_hex_chars" in np_arrays:
+        extend = functools.partial(
+            extend_tree_searchtable_cpp_from_packed,
+            data_ids=np_arrays["dstream_data_id"],
+            num_strata_depositeds=np_arrays["dstream_T"],
+            ranks=np_arrays["dstream_Tbar"],
+            storage_hex_chars=np_arrays["dstream_storage_hex_chars"],
+            storage_hex_offsets=np_arrays["dstream_storage_hex_offsets"],
+            progress_bar=tqdm.tqdm,
+            num_threads=num_threads,
+        )
+    else:
+        extend = functools.partial(
+            extend_tree_searchtable_cpp_from_exploded,
+            data_ids=np_arrays["dstream_data_id"],
+            num_strata_depositeds=np_arrays["dstream_T"],
+            ranks=np_arrays["dstream_Tbar"],
+            differentiae=np_arrays["dstream_value"],
+            progress_bar=tqdm.tqdm,
+            num_threads=num_threads,
+        )
+    try:
+        extend(records=records)
+    except OverflowError:  # raised before any records are added
+        logging.info(
+            f"slice overflows {type(records).__name__}, widening records...",
+        )
+        records = widen_records(records)
+        extend(records=records)
+
+    return records
+
+
+_checkpoint_metadata_key = b"hstrat_surface_unpack_reconstruct_checkpoint"
+_searchtable_metadata_key = b"hstrat_surface_unpack_reconstruct_searchtable"
+
+
+def _write_checkpoint(
+    records: Records,
+    checkpoint_path: str,
+    metadata_key: bytes = _checkpoint_metadata_key,
+    **metadata: int,
+) -> None:
+    """Serialize in-progress records, with resume metadata, to an
+    uncompressed Arrow IPC file that can be memory mapped on resume.
+
+    The file is written alongside and then renamed over `checkpoint_path`,
+    so an interrupted write does not clobber the previous checkpoint.
+
+    Search trie columns (i.e., `search_*`) are included, so records may
+    continue to be extended after loading. Use `metadata_key` to distinguish
+    persisted searchtables, for extension by later runs, from checkpoints.
+    """
+    table = pa.table(copy_records_to_dict(records))
+    table = table.replace_schema_metadata(
+        {metadata_key: json.dumps(metadata)},
+    )
+    temp_path = f"{checkpoint_path}.{uuid.uuid4()}.tmp"
+    try:
+        with pa.OSFile(temp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, checkpoint_path)
+    finally:
+        pathlib.Path(temp_path).unlink(missing_ok=True)
+
+
+def _read_checkpoint_metadata(
+    checkpoint_path: str, metadata_key: bytes = _checkpoint_metadata_key
+) -> typing.Dict[str, int]:
+    """Read resume metadata from checkpoint file, without loading records."""
+    with pa.memory_map(checkpoint_path, "rb") as source:
+        schema_metadata = pa.ipc.open_file(source).schema.metadata or {}
+    if metadata_key not in schema_metadata:
+        kind = metadata_key.decode().rpartition("_")[-1]
+        raise ValueError(
+            f"{checkpoint_path} is not a surface_unpack_reconstruct {kind}",
+        )
+    return json.loads(schema_metadata[metadata_key])
+
+
+def _load_checkpoint(
+    records: Records,
+    checkpoint_path: str,
+    metadata_key: bytes = _checkpoint_metadata_key,
+    **expected_metadata: int,
+) -> Records:
+    """Load checkpointed records, switching to full-width records layout if
+    checkpoint does not fit compact layout.
+
+    Raises ValueError if checkpoint metadata does not match
+    `expected_metadata` (e.g., if it was created from different input data or
+    with a different slice size).
+    """
+    metadata = _read_checkpoint_metadata(checkpoint_path, metadata_key)
+    for key, expected in expected_metadata.items():
+        if metadata.get(key) != expected:
+            raise ValueError(
+                f"checkpoint {checkpoint_path} has {key}={metadata.get(key)}, "
+                f"but expected {key}={expected}; was checkpoint created with "
+                "the same input data and options?",
+            )
+
+    with pa.memory_map(checkpoint_path, "rb") as source:
+        table = pa.ipc.open_file(source).read_all()
+        columns = {name: table[name].to_numpy() for name in table.column_names}
+        try:
+            load_records_from_dict(records, columns)
+        except OverflowError:  # raised before any records are loaded
+            logging.info(
+                f"checkpoint overflows {type(records).__name__}, "
+                "widening records...",
+            )
+            records = widen_records(records)
+            load_records_from_dict(records, columns)
+        del table, columns  # release memory map
+
+    return records
 
 
 def _build_records_chunked(
@@ -375,102 +963,245 @@ def _build_records_chunked(
     collapse_unif_freq: int,
     check_trie_invariant_freq: int,
     check_trie_invariant_after_collapse_unif: bool,
+    check_trie_invariant_full: bool,
+    differentia_bitwidth: int,
     dstream_S: int,
     exploded_slice_size: int,
+    max_dstream_data_id: int,
+    max_dstream_T: int,
+    num_threads: int,
     pa_source_type: str,
+    checkpoint_freq: int = 0,
+    checkpoint_path: typing.Optional[str] = None,
+    first_slice: int = 0,
+    resume_from: typing.Optional[str] = None,
+    scratch_dir: typing.Optional[str] = None,
+    slice_transport: str = "ipc",
+    lookup_ingest_times: typing.Optional[typing.Callable] = None,
+    extend_from: typing.Optional[str] = None,
+    searchtable_path: typing.Optional[str] = None,
 ) -> Records:
     """Build tree searchtable from DataFrame, exploding in chunks to reduce
-    memory usage."""
+    memory usage.
+
+    If `resume_from` is provided, records are loaded from that checkpoint
+    and `slices` should begin at the checkpoint's next slice, `first_slice`.
+
+    If `extend_from` is provided, records are loaded from that persisted
+    searchtable, and `slices` must not precede its `dstream_T` frontier. If
+    `searchtable_path` is provided, records are persisted there once all
+    slices are incorporated, before final unifurcation collapse dismantles
+    the search trie.
+
+    If `lookup_ingest_times` is provided, slices are unexploded, and are
+    exploded natively during insertion.
+
+    Per-stage pipeline throughput is logged after each slice.
+    """
     init_size = exploded_slice_size * dstream_S * 2
     logging.info(f"{init_size=}")
-    records = Records(init_size)  # handle for C++ tree-building data
-
-    logging.info("consuming from exploded df worker")
-    nslices = len(slices)
-    for i, (inpath, np_arrays) in enumerate(
-        _readahead_slices(slices, pa_source_type),
-    ):
-        logging.info(
-            f"taking exploded df off queue ({i + 1} / {nslices})...",
-        )
+    records = make_records(  # handle for C++ tree-building data
+        init_size,
+        max_differentia=(1 << differentia_bitwidth) - 1,
+        max_rank=max_dstream_T,
+        max_id=max(max_dstream_data_id, init_size),
+    )
+    logging.info(
+        f"using {type(records).__name__} layout, "
+        f"{records.record_nbytes} bytes per record",
+    )
 
-        try:
-            logging.info(
-                f"incorporating slice ({i + 1} / {nslices})...",
-            )
+    nslices = first_slice + len(slices)
+    checkpoint_metadata = dict(
+        differentia_bitwidth=differentia_bitwidth,
+        dstream_S=dstream_S,
+        exploded_slice_size=exploded_slice_size,
+        nslices=nslices,
+    )
+    # greatest dstream_T incorporated, which later genomes must not precede
+    dstream_T_frontier = 0
+    if extend_from is not None:
+        if resume_from is None:  # otherwise, checkpoint holds loaded records
             with log_context_duration(
-                "extend_tree_searchtable_cpp_from_exploded "
-                f"({i + 1} / {nslices})",
-                logging.info,
+                f"_load_checkpoint {extend_from}", logging.info
             ):
-                # dispatch to C++ tree-building implementation
-                extend_tree_searchtable_cpp_from_exploded(
+                records = _load_checkpoint(
                     records,
-                    np_arrays["dstream_data_id"],
-                    np_arrays["dstream_T"],
-                    np_arrays["dstream_Tbar"],
-                    np_arrays["dstream_value"],
-                    tqdm.tqdm,
+                    extend_from,
+                    _searchtable_metadata_key,
+                    differentia_bitwidth=differentia_bitwidth,
+                    dstream_S=dstream_S,
                 )
-        finally:
-            logging.info(f"unlinking slice {i + 1} / {nslices}...")
-            pathlib.Path(inpath).unlink(missing_ok=True)
+        searchtable_metadata = _read_checkpoint_metadata(
+            extend_from, _searchtable_metadata_key
+        )
+        dstream_T_frontier = searchtable_metadata["dstream_T_frontier"]
+        max_dstream_data_id = max(
+            max_dstream_data_id, searchtable_metadata["max_dstream_data_id"]
+        )
+        logging.info(
+            f"extending {len(records)} records from {extend_from}, "
+            f"with {dstream_T_frontier=}",
+        )
 
-        if (
-            check_trie_invariant_freq > 0
-            and (i + 1) % check_trie_invariant_freq == 0
+    if resume_from is not None:
+        with log_context_duration(
+            f"_load_checkpoint {resume_from}", logging.info
         ):
-            with log_context_duration(
-                "_run_trie_invariant_checks "
-                f"(before collapse, slice {i + 1} / {nslices})",
-                logging.info,
-            ):
-                _run_trie_invariant_checks(
-                    records,
-                    f"before collapse, after slice {i + 1} / {nslices}",
-                )
+            records = _load_checkpoint(
+                records,
+                resume_from,
+                next_slice=first_slice,
+                **checkpoint_metadata,
+            )
+        dstream_T_frontier = _read_checkpoint_metadata(resume_from).get(
+            "dstream_T_frontier", dstream_T_frontier
+        )
+        logging.info(
+            f"resumed {len(records)} records from {resume_from}, "
+            f"at slice {first_slice + 1} / {nslices}",
+        )
 
-        if collapse_unif_freq > 0 and (i + 1) % collapse_unif_freq == 0:
-            with log_context_duration(
-                "collapse_unifurcations(dropped_only=True) "
-                f"({i + 1} / {nslices})",
-                logging.info,
+    logging.info("consuming from exploded df worker")
+    metrics = _SlicePipelineMetrics()
+    # close explicitly on error, so background reader is not left waiting
+    # on producers after they are torn down
+    with contextlib.closing(
+        _readahead_slices(
+            slices,
+            pa_source_type,
+            slice_transport,
+            metrics,
+            lookup_ingest_times=lookup_ingest_times,
+        )
+    ) as pipeline:
+        for i in itertools.count(start=first_slice):
+            with metrics.measure("wait") as nrows:
+                item = next(pipeline, None)
+                nrows.append(0 if item is None else len(item[1]["dstream_T"]))
+            if item is None:
+                break
+            locator, np_arrays = item
+            logging.info(
+                f"taking exploded df off queue ({i + 1} / {nslices})...",
+            )
+
+            try:
+                if len(np_arrays["dstream_T"]):
+                    if np_arrays["dstream_T"].min() < dstream_T_frontier:
+                        raise ValueError(
+                            f"slice {i + 1} / {nslices} has dstream_T "
+                            f"{np_arrays['dstream_T'].min()}, preceding "
+                            f"{dstream_T_frontier=} of extended searchtable",
+                        )
+                    dstream_T_frontier = int(np_arrays["dstream_T"].max())
+
+                logging.info(
+                    f"incorporating slice ({i + 1} / {nslices})...",
+                )
+                with log_context_duration(
+                    "extend_tree_searchtable_cpp_from_exploded "
+                    f"({i + 1} / {nslices})",
+                    logging.info,
+                ), metrics.measure("insert") as nrows:
+                    # dispatch to C++ tree-building implementation
+                    records = _extend_records(records, np_arrays, num_threads)
+                    nrows.append(len(np_arrays["dstream_T"]))
+            finally:
+                logging.info(f"releasing slice {i + 1} / {nslices}...")
+                del item, np_arrays  # clear memory
+                _release_slice(locator, slice_transport)
+
+            metrics.log_summary(logging.info)
+
+            if (
+                check_trie_invariant_freq > 0
+                and (i + 1) % check_trie_invariant_freq == 0
             ):
-                records = collapse_unifurcations(records, dropped_only=True)
+                with log_context_duration(
+                    "_run_trie_invariant_checks "
+                    f"(before collapse, slice {i + 1} / {nslices})",
+                    logging.info,
+                ):
+                    _run_trie_invariant_checks(
+                        records,
+                        f"before collapse, after slice {i + 1} / {nslices}",
+                        full=check_trie_invariant_full,
+                    )
 
-        if (
-            check_trie_invariant_after_collapse_unif
-            and check_trie_invariant_freq > 0
-            and (i + 1) % check_trie_invariant_freq == 0
-        ):
-            with log_context_duration(
-                "_run_trie_invariant_checks "
-                f"(after collapse, slice {i + 1} / {nslices})",
-                logging.info,
+            if collapse_unif_freq > 0 and (i + 1) % collapse_unif_freq == 0:
+                with log_context_duration(
+                    "collapse_unifurcations_inplace(dropped_only=True) "
+                    f"({i + 1} / {nslices})",
+                    logging.info,
+                ):
+                    collapse_unifurcations_inplace(records, dropped_only=True)
+
+            if (
+                check_trie_invariant_after_collapse_unif
+                and check_trie_invariant_freq > 0
+                and (i + 1) % check_trie_invariant_freq == 0
             ):
-                _run_trie_invariant_checks(
-                    records,
-                    f"after collapse, after slice {i + 1} / {nslices}",
-                )
+                with log_context_duration(
+                    "_run_trie_invariant_checks "
+                    f"(after collapse, slice {i + 1} / {nslices})",
+                    logging.info,
+                ):
+                    _run_trie_invariant_checks(
+                        records,
+                        f"after collapse, after slice {i + 1} / {nslices}",
+                        full=check_trie_invariant_full,
+                    )
+
+            if checkpoint_freq > 0 and (i + 1) % checkpoint_freq == 0:
+                with log_context_duration(
+                    f"_write_checkpoint {checkpoint_path} ({i + 1} / {nslices})",
+                    logging.info,
+                ):
+                    _write_checkpoint(
+                        records,
+                        checkpoint_path,
+                        next_slice=i + 1,
+                        dstream_T_frontier=dstream_T_frontier,
+                        **checkpoint_metadata,
+                    )
 
-        log_memory_usage(logging.info)
+            log_memory_usage(logging.info)
+            if scratch_dir is not None:
+                log_disk_usage(scratch_dir, logging.info)
 
     logging.info("slices complete")
+    metrics.log_summary(logging.info)
 
     # redundant w/ below (just here for testing)
     if collapse_unif_freq == -1:
         with log_context_duration(
-            "collapse_unifurcations(dropped_only=True) (finalize)",
+            "collapse_unifurcations_inplace(dropped_only=True) (finalize)",
+            logging.info,
+        ):
+            collapse_unifurcations_inplace(records, dropped_only=True)
+
+    if searchtable_path is not None:
+        with log_context_duration(
+            f"_write_checkpoint {searchtable_path} (searchtable)",
             logging.info,
         ):
-            records = collapse_unifurcations(records, dropped_only=True)
+            _write_checkpoint(
+                records,
+                searchtable_path,
+                _searchtable_metadata_key,
+                differentia_bitwidth=differentia_bitwidth,
+                dstream_S=dstream_S,
+                dstream_T_frontier=dstream_T_frontier,
+                max_dstream_data_id=max_dstream_data_id,
+            )
 
     # collapse all unifs, to reduce subsequent memory pressure
     with log_context_duration(
-        "collapse_unifurcations(dropped_only=False)",
+        "collapse_unifurcations_inplace(dropped_only=False)",
         logging.info,
     ):
-        records = collapse_unifurcations(records, dropped_only=False)
+        collapse_unifurcations_inplace(records, dropped_only=False)
 
     log_memory_usage(logging.info)
 
@@ -521,25 +1252,18 @@ def _construct_result_dataframe(
     differentia_bitwidth: int,
     dstream_S: int,
 ) -> pl.DataFrame:
-    """Convert tree searchtable records to DataFrame."""
-    logging.info("converting records to dict...")
-    records_dict = extract_records_to_dict(records)
-
-    logging.info("converting dict to dataframe...")
-    schema = {
-        "dstream_data_id": pl.UInt64,
-        "id": pl.UInt64,
-        "ancestor_id": pl.UInt64,
-        "rank": pl.UInt64,
-    }
-    records_dict = {k: records_dict[k] for k in schema}
+    """Convert tree searchtable records to DataFrame.
+
+    Columns are handed to polars through the Arrow C Data Interface, without
+    copying.
+    """
+    logging.info("converting records to dataframe...")
+    records_arrow = extract_records_to_arrow(
+        records, columns=["dstream_data_id", "id", "ancestor_id", "rank"]
+    )
     return (
-        pl.from_dict(
-            records_dict,  # type: ignore
-            schema=schema,
-        )
+        pl.from_arrow(pa.record_batch(records_arrow))
         .with_columns(
-            pl.col("dstream_data_id").replace(placeholder_value, None),
             pl.lit(differentia_bitwidth)
             .alias("hstrat_differentia_bitwidth")
             .cast(pl.UInt32),
@@ -555,10 +1279,23 @@ def _surface_unpacked_reconstruct(
     collapse_unif_freq: int,
     check_trie_invariant_freq: int,
     check_trie_invariant_after_collapse_unif: bool,
+    check_trie_invariant_full: bool,
     differentia_bitwidth: int,
     dstream_S: int,
     exploded_slice_size: int,
+    max_dstream_data_id: int,
+    max_dstream_T: int,
+    num_threads: int,
     pa_source_type: str,
+    checkpoint_freq: int = 0,
+    checkpoint_path: typing.Optional[str] = None,
+    first_slice: int = 0,
+    resume_from: typing.Optional[str] = None,
+    scratch_dir: typing.Optional[str] = None,
+    slice_transport: str = "ipc",
+    lookup_ingest_times: typing.Optional[typing.Callable] = None,
+    extend_from: typing.Optional[str] = None,
+    searchtable_path: typing.Optional[str] = None,
 ) -> pl.DataFrame:
     """Reconstruct phylogenetic tree from unpacked dstream data."""
     logging.info("building tree searchtable chunkwise...")
@@ -567,9 +1304,23 @@ def _surface_unpacked_reconstruct(
         collapse_unif_freq=collapse_unif_freq,
         check_trie_invariant_freq=check_trie_invariant_freq,
         check_trie_invariant_after_collapse_unif=check_trie_invariant_after_collapse_unif,
+        check_trie_invariant_full=check_trie_invariant_full,
+        differentia_bitwidth=differentia_bitwidth,
         dstream_S=dstream_S,
         exploded_slice_size=exploded_slice_size,
+        max_dstream_data_id=max_dstream_data_id,
+        max_dstream_T=max_dstream_T,
+        num_threads=num_threads,
         pa_source_type=pa_source_type,
+        checkpoint_freq=checkpoint_freq,
+        checkpoint_path=checkpoint_path,
+        first_slice=first_slice,
+        resume_from=resume_from,
+        scratch_dir=scratch_dir,
+        slice_transport=slice_transport,
+        lookup_ingest_times=lookup_ingest_times,
+        extend_from=extend_from,
+        searchtable_path=searchtable_path,
     )
 
     with log_context_duration("_construct_result_dataframe", logging.info):
@@ -588,6 +1339,212 @@ def _surface_unpacked_reconstruct(
     return phylo_df
 
 
+def _get_mp_context(mp_context: str) -> multiprocessing.context.BaseContext:
+    """Get multiprocessing context, falling back to spawn if unavailable."""
+    try:  # RE https://docs.pola.rs/user-guide/misc/multiprocessing/
+        logging.info(f"attempting to use multiprocessing {mp_context} context")
+        return multiprocessing.get_context(mp_context)
+    except ValueError:  # forkserver available on unix only
+        logging.info("attempting to use multiprocessing spawn context")
+        return multiprocessing.get_context("spawn")
+
+
+def _imap_bounded(
+    pool: mp_pool.Pool,
+    func: typing.Callable,
+    tasks: typing.Iterable,
+    queue_depth: int,
+    release: typing.Optional[typing.Callable] = None,
+) -> typing.Iterator:
+    """Like ``pool.imap``, but with at most `queue_depth` tasks dispatched
+    and not yet taken by the caller.
+
+    Throttles producers to consumer speed, so that results (e.g., spilled
+    slices) do not pile up. Results of tasks not taken (e.g., on error) are
+    passed to `release`. Backpressure is logged when complete.
+    """
+    tasks_iter = iter(tasks)
+    pending = collections.deque()
+    num_full = num_starved = 0  # producers blocked / consumer blocked
+    try:
+        for task in itertools.islice(tasks_iter, queue_depth):
+            pending.append(pool.apply_async(func, (task,)))
+        while pending:
+            if not pending[0].ready():
+                num_starved += 1
+            elif len(pending) == queue_depth and all(
+                result.ready() for result in pending
+            ):
+                num_full += 1
+            yield pending.popleft().get()
+            for task in itertools.islice(tasks_iter, 1):
+                pending.append(pool.apply_async(func, (task,)))
+        logging.info(
+            f"slice queue ({queue_depth=}) full at {num_full} takes, "
+            f"empty at {num_starved} takes; full queue means insertion is "
+            "the bottleneck, empty queue means exploding is",
+        )
+    finally:
+        for result in pending:
+            if release is not None and result.ready() and result.successful():
+                release(result.get())
+
+
+def _get_slice_queue_depth(
+    slice_queue_depth: typing.Optional[int], mp_pool_size: int
+) -> int:
+    """Resolve slice queue depth, defaulting to two slices per worker."""
+    if slice_queue_depth is None:
+        return 2 * mp_pool_size
+    return slice_queue_depth
+
+
+def _check_slices_sorted(
+    results: typing.Iterator[
+        typing.Tuple[str, typing.Optional[int], typing.Optional[int]]
+    ],
+    slice_transport: str = "ipc",
+) -> typing.Iterator[str]:
+    """Yield exploded slice locators, ensuring dstream_T does not decrease
+    across slices."""
+    prev_last_T = 0
+    for i, (locator, first_T, last_T) in enumerate(results):
+        if first_T is None:  # empty slice, e.g., all rows excluded
+            yield locator
+            continue
+        if first_T < prev_last_T:
+            _release_slice(locator, slice_transport)
+            raise ValueError(
+                f"slice {i + 1} begins at dstream_T {first_T}, but previous "
+                f"slice ended at dstream_T {prev_last_T}; input rows must be "
+                "sorted by dstream_T for streaming",
+            )
+        prev_last_T = last_T
+        yield locator
+
+
+def _select_slices(
+    nrows: int, exploded_slice_size: int, first_slice: int
+) -> typing.List[slice]:
+    """Split rows into exploded slices, skipping slices before
+    `first_slice` (e.g., when resuming from a checkpoint)."""
+    slices = [*iter_slices(nrows, exploded_slice_size)]
+    nslices_log = len(slices)
+    logging.info(f"{nrows=} {exploded_slice_size=} {nslices_log=}")
+    if first_slice > nslices_log:
+        raise ValueError(
+            f"cannot skip to slice {first_slice + 1}, "
+            f"only {nslices_log} slices",
+        )
+    logging.info(f"skipping {first_slice} slices")
+    return slices[first_slice:]
+
+
+@contextlib.contextmanager
+def _explode_prepared_slices_mp(
+    lf: pl.LazyFrame,
+    nrows: int,
+    exploded_slice_size: int,
+    mp_context: multiprocessing.context.BaseContext,
+    mp_pool_size: int,
+    first_slice: int = 0,
+    scratch_dir: typing.Optional[str] = None,
+    spill_compression: str = "lz4",
+    slice_queue_depth: typing.Optional[int] = None,
+    slice_transport: str = "ipc",
+    native_explode: bool = False,
+) -> typing.Iterator[typing.Iterator[str]]:
+    """Explode slices of prepared (unpacked and sorted) data via parallel
+    multiprocess producer(s).
+
+    Workers receive a LazyFrame (e.g., just file path(s) for scan_ipc)
+    instead of pickled data.
+    """
+    slices = _select_slices(nrows, exploded_slice_size, first_slice)
+
+    logging.info(f"creating multiprocessing pool with {mp_pool_size} workers")
+    with mp_context.Pool(
+        processes=mp_pool_size,
+        initializer=configure_prod_logging,
+    ) as pool:
+        yield give_len(
+            _imap_bounded(
+                pool,
+                functools.partial(
+                    _explode_and_write_slice,
+                    scratch_dir=scratch_dir,
+                    spill_compression=spill_compression,
+                    slice_transport=slice_transport,
+                    native_explode=native_explode,
+                ),
+                [(lf, s) for s in slices],
+                _get_slice_queue_depth(slice_queue_depth, mp_pool_size),
+                release=functools.partial(
+                    _release_slice, slice_transport=slice_transport
+                ),
+            ),
+            len(slices),
+        )
+
+
+@contextlib.contextmanager
+def _generate_exploded_slices_streaming(
+    lf: pl.LazyFrame,
+    exploded_slice_size: int,
+    mp_context: str,
+    mp_pool_size: int,
+    first_slice: int = 0,
+    scratch_dir: typing.Optional[str] = None,
+    spill_compression: str = "lz4",
+    slice_queue_depth: typing.Optional[int] = None,
+    slice_transport: str = "ipc",
+    native_explode: bool = False,
+) -> typing.Iterator[typing.Iterator[str]]:
+    """Generator wrapping generation of exploded data frame slices from
+    packed data already sorted by dstream_T, via parallel multiprocess
+    producer(s).
+
+    Unlike `_generate_exploded_slices_mp`, input data is never materialized
+    in full; each worker scans, unpacks, and explodes only its own slice.
+    """
+    if mp_pool_size < 1:
+        raise NotImplementedError(
+            f"mp_pool_size must be >= 1, got {mp_pool_size}"
+        )
+
+    mp_context = _get_mp_context(mp_context)
+
+    nrows_log = lf.select(pl.len()).collect().item()
+    slices = _select_slices(nrows_log, exploded_slice_size, first_slice)
+
+    logging.info(f"creating multiprocessing pool with {mp_pool_size} workers")
+    with mp_context.Pool(
+        processes=mp_pool_size,
+        initializer=configure_prod_logging,
+    ) as pool:
+        yield give_len(
+            _check_slices_sorted(
+                _imap_bounded(
+                    pool,
+                    functools.partial(
+                        _unpack_explode_and_write_slice,
+                        scratch_dir=scratch_dir,
+                        spill_compression=spill_compression,
+                        slice_transport=slice_transport,
+                        native_explode=native_explode,
+                    ),
+                    [(lf, s) for s in slices],
+                    _get_slice_queue_depth(slice_queue_depth, mp_pool_size),
+                    release=lambda result: _release_slice(
+                        result[0], slice_transport
+                    ),
+                ),
+                slice_transport=slice_transport,
+            ),
+            len(slices),
+        )
+
+
 @contextlib.contextmanager
 def _generate_exploded_slices_mp(
     df: typing.Union[pl.LazyFrame, pl.DataFrame],
@@ -595,20 +1552,25 @@ def _generate_exploded_slices_mp(
     mp_context: str,
     mp_pool_size: int,
     shuffle_over_same_T_seed: typing.Optional[int] = None,
+    first_slice: int = 0,
+    scratch_dir: typing.Optional[str] = None,
+    spill_compression: str = "lz4",
+    slice_queue_depth: typing.Optional[int] = None,
+    slice_transport: str = "ipc",
+    native_explode: bool = False,
 ) -> typing.Iterator[typing.Iterator[str]]:
     """Generator wrapping generation of exploded data frame slices via
-    parallel multiprocess producer(s)."""
+    parallel multiprocess producer(s).
+
+    Slices before `first_slice` are skipped (e.g., when resuming from a
+    checkpoint).
+    """
     if mp_pool_size < 1:
         raise NotImplementedError(
             f"mp_pool_size must be >= 1, got {mp_pool_size}"
         )
 
-    try:  # RE https://docs.pola.rs/user-guide/misc/multiprocessing/
-        logging.info(f"attempting to use multiprocessing {mp_context} context")
-        mp_context = multiprocessing.get_context(mp_context)
-    except ValueError:  # forkserver available on unix only
-        logging.info("attempting to use multiprocessing spawn context")
-        mp_context = multiprocessing.get_context("spawn")
+    mp_context = _get_mp_context(mp_context)
 
     # prepare (unpack, sort, add row index) in the main process
     df = _prepare_df_for_explosion(
@@ -617,10 +1579,10 @@ def _generate_exploded_slices_mp(
 
     # write prepared df to a temp Arrow file so workers receive a
     # scan_ipc LazyFrame (just a file path) instead of pickled data
-    df_path = f"/tmp/{uuid.uuid4()}_prepared.arrow"  # nosec B108
+    df_path = _make_spill_path(scratch_dir, "_prepared.arrow")
     nrows_log = len(df)
     logging.info(f"writing prepared df ({nrows_log} rows) to {df_path}")
-    df.write_ipc(df_path, compression="lz4")
+    df.write_ipc(df_path, compression=_get_ipc_compression(spill_compression))
     del df
     gc.collect()
 
@@ -628,42 +1590,126 @@ def _generate_exploded_slices_mp(
         logging.info(f"scanning {df_path}")
         lf = pl.scan_ipc(df_path)
 
-        slices = [*iter_slices(nrows_log, exploded_slice_size)]
-        nslices_log = len(slices)
-        logging.info(
-            f"{nrows_log=} {exploded_slice_size=} {nslices_log=}",
+        with _explode_prepared_slices_mp(
+            lf,
+            nrows_log,
+            exploded_slice_size,
+            mp_context,
+            mp_pool_size,
+            first_slice=first_slice,
+            scratch_dir=scratch_dir,
+            spill_compression=spill_compression,
+            slice_queue_depth=slice_queue_depth,
+            slice_transport=slice_transport,
+            native_explode=native_explode,
+        ) as slices:
+            yield slices
+    finally:
+        pathlib.Path(df_path).unlink(missing_ok=True)
+
+
+@contextlib.contextmanager
+def _generate_exploded_slices_external_sort(
+    lf: pl.LazyFrame,
+    exploded_slice_size: int,
+    mp_context: str,
+    mp_pool_size: int,
+    sort_run_size: int,
+    shuffle_over_same_T_seed: typing.Optional[int] = None,
+    first_slice: int = 0,
+    scratch_dir: typing.Optional[str] = None,
+    spill_compression: str = "lz4",
+    slice_queue_depth: typing.Optional[int] = None,
+    slice_transport: str = "ipc",
+    native_explode: bool = False,
+) -> typing.Iterator[typing.Iterator[str]]:
+    """Generator wrapping generation of exploded data frame slices via
+    parallel multiprocess producer(s), sorting unpacked data on disk.
+
+    Unlike `_generate_exploded_slices_mp`, the full unpacked input is never
+    held in memory. Input is unpacked and sorted in runs of `sort_run_size`
+    rows, which are then merged into the prepared data that slices are
+    exploded from. Row order, and so output, is identical to
+    `_generate_exploded_slices_mp`.
+    """
+    if mp_pool_size < 1:
+        raise NotImplementedError(
+            f"mp_pool_size must be >= 1, got {mp_pool_size}"
         )
 
-        logging.info(
-            f"creating multiprocessing pool with {mp_pool_size} workers",
-        )
-        with mp_context.Pool(
-            processes=mp_pool_size,
-            initializer=configure_prod_logging,
-        ) as pool:
-            yield give_len(
-                pool.imap(
-                    _explode_and_write_slice,
-                    [(lf, s) for s in slices],
-                ),
-                nslices_log,
+    mp_context = _get_mp_context(mp_context)
+
+    run_paths, batch_paths = [], []
+    try:
+        with log_context_duration("_write_sorted_runs", logging.info):
+            _write_sorted_runs(
+                lf,
+                sort_run_size,
+                mp_context,
+                mp_pool_size,
+                run_paths,
+                scratch_dir=scratch_dir,
+            )
+        logging.info(f"wrote {len(run_paths)} sorted runs")
+
+        with log_context_duration("_merge_sorted_runs", logging.info):
+            nrows_log = _merge_sorted_runs(
+                run_paths,
+                sort_run_size,
+                shuffle_over_same_T_seed,
+                batch_paths,
+                scratch_dir=scratch_dir,
+                spill_compression=spill_compression,
             )
+        logging.info(f"merged {nrows_log} rows into {len(batch_paths)} files")
+        for run_path in run_paths:
+            pathlib.Path(run_path).unlink(missing_ok=True)
+
+        with _explode_prepared_slices_mp(
+            pl.scan_ipc(batch_paths),
+            nrows_log,
+            exploded_slice_size,
+            mp_context,
+            mp_pool_size,
+            first_slice=first_slice,
+            scratch_dir=scratch_dir,
+            spill_compression=spill_compression,
+            slice_queue_depth=slice_queue_depth,
+            slice_transport=slice_transport,
+            native_explode=native_explode,
+        ) as slices:
+            yield slices
     finally:
-        pathlib.Path(df_path).unlink(missing_ok=True)
+        for path in (*run_paths, *batch_paths):
+            pathlib.Path(path).unlink(missing_ok=True)
 
 
 def surface_unpack_reconstruct(
     df: typing.Union[pl.DataFrame, pl.LazyFrame],
     *,
+    checkpoint_freq: int = 0,
+    checkpoint_path: typing.Optional[str] = None,
     collapse_unif_freq: int = 1,
     check_trie_invariant_freq: int = 0,
     check_trie_invariant_after_collapse_unif: bool = False,
+    check_trie_invariant_full: bool = False,
     drop_dstream_metadata: typing.Optional[bool] = None,
     exploded_slice_size: int = 1_000_000,
+    extend_from: typing.Optional[str] = None,
     mp_context: str = "spawn",
     mp_pool_size: int = 1,
+    native_explode: bool = False,
+    num_threads: int = 1,
     pa_source_type: str = "memory_map",
+    resume_from: typing.Optional[str] = None,
+    scratch_dir: typing.Optional[str] = None,
+    searchtable_path: typing.Optional[str] = None,
     shuffle_over_same_T_seed: typing.Optional[int] = None,
+    slice_queue_depth: typing.Optional[int] = None,
+    slice_transport: str = "ipc",
+    sort_run_size: typing.Optional[int] = None,
+    spill_compression: str = "lz4",
+    stream_presorted: bool = False,
 ) -> pl.DataFrame:
     """Unpack dstream buffer and counter from genome data and construct an
     estimated phylogenetic tree for the genomes.
@@ -707,6 +1753,18 @@ def surface_unpack_reconstruct(
             - 'downstream_validate_unpacked' : pl.String, polars expression
                 - Polars expression to validate unpacked data.
 
+    checkpoint_freq : int, default 0
+        Frequency of checkpoints, in number of slices.
+
+        At each checkpoint, in-progress tree searchtable records are written
+        to `checkpoint_path`, so that reconstruction can later be resumed via
+        `resume_from`. Set to 0 to disable (default).
+
+    checkpoint_path : str, optional
+        File path for checkpoints, overwritten at each checkpoint.
+
+        Required if `checkpoint_freq` is nonzero.
+
     collapse_unif_freq : int, default 1
         Frequency of unifurcation collapse, in number of slices.
 
@@ -718,6 +1776,13 @@ def surface_unpack_reconstruct(
         Set to 0 to disable (default).
         Set to n > 0 to check every n slices.
 
+    check_trie_invariant_full : bool, default False
+        Should trie invariant checks scan all records?
+
+        By default, checks are confined to records created or relinked since
+        the previous check, and their search trie neighborhoods, so that
+        frequent checks remain cheap. Set True for exhaustive scans.
+
     drop_dstream_metadata : bool or None, default None
         Should dstream/downstream columns be dropped from the output?
 
@@ -729,6 +1794,18 @@ def surface_unpack_reconstruct(
     exploded_slice_size : int, default 1_000_000
         Number of rows to process at once. Lower values reduce memory usage.
 
+    extend_from : str, optional
+        Path of searchtable persisted by an earlier run via
+        `searchtable_path`, to extend with genomes from `df`.
+
+        Genomes in `df` must have `dstream_T` at or after the greatest
+        `dstream_T` already incorporated, and must use the same `dstream_S`
+        and differentia bitwidth. Their 'dstream_data_id' values, if
+        provided, must exceed those already incorporated; if not provided,
+        rows are numbered after them. Output covers all incorporated
+        genomes, but user-defined columns are only joined for genomes in
+        `df`.
+
     mp_context : str, default 'spawn'
         Multiprocessing context to use for parallel processing.
 
@@ -736,18 +1813,107 @@ def surface_unpack_reconstruct(
         Number of worker processes for exploding slices in parallel.
 
         When 1, a single producer process is used (original behavior).
-        When greater than 1, a multiprocessing pool is used with ordered
-        results via ``Pool.imap``.
+        When greater than 1, a multiprocessing pool is used, with results
+        taken in order.
+
+    native_explode : bool, default False
+        Explode dstream buffers natively, during trie insertion?
+
+        Rather than building a one-row-per-differentia DataFrame for each
+        slice, hexadecimal buffer data is unpacked, chronologically sorted,
+        and inserted into the trie by one fused C++ routine, with dstream
+        lookup done in numpy. Reduces memory use and spill file size by a
+        factor of roughly `dstream_S`. Output is identical. Raises
+        NotImplementedError if input has 'downstream_exclude_exploded',
+        'downstream_filter_exploded', or 'downstream_validate_exploded'
+        columns.
+
+    num_threads : int, default 1
+        Number of threads for inserting exploded slices into the trie.
+
+        Slices are partitioned into independent subtries below the strata
+        prefix shared by all genomes in the slice, which are built in
+        parallel. Output is identical to single-threaded construction.
+        Slices that cannot be partitioned are inserted single-threaded.
 
     pa_source_type : str, default 'memory_map'
         PyArrow type to use for exploded chunks (i.e., "memory_map" or
         "OSFile").
 
+    resume_from : str, optional
+        Path of checkpoint file to resume reconstruction from, skipping slices
+        already incorporated into checkpointed records.
+
+        Input data and options that affect slicing (e.g.,
+        `exploded_slice_size`, `shuffle_over_same_T_seed`) must match those
+        of the run that wrote the checkpoint.
+
+    searchtable_path : str, optional
+        File path to persist the tree searchtable to, for later extension
+        with newer genomes via `extend_from`.
+
+        Records, including search trie columns, are written once all genomes
+        are incorporated, before final unifurcation collapse. May be the same
+        path as `extend_from`.
+
+    scratch_dir : str, optional
+        Directory for temporary spill files (e.g., exploded slices).
+
+        Spill files are kept in a subdirectory created for each call, which
+        is removed on completion or error. Defaults to the system temporary
+        directory (e.g., "/tmp"). Set `HSTRAT_LOG_DISK_USAGE` in the
+        environment to log scratch disk use.
+
     shuffle_over_same_T_seed : int or None, default None
         If not None, shuffle rows within same-dstream_T groups after
         sorting but before exploding. The value is used as the random
         seed for reproducibility. Set to None to disable (default).
 
+    slice_queue_depth : int or None, default None
+        Maximum number of exploded slices dispatched to workers but not yet
+        taken for insertion into the trie.
+
+        Producers pause when the queue is full, bounding spill files (or
+        shared memory blocks) awaiting insertion. Higher values smooth out
+        uneven worker speed at the cost of disk or memory. Defaults to two
+        slices per worker in `mp_pool_size`. Queue backpressure and per-stage
+        throughput (rows/s) are logged.
+
+    slice_transport : {'ipc', 'shm'}, default 'ipc'
+        How workers hand exploded slices to the trie builder.
+
+        - If 'ipc', slices are spilled to Arrow IPC files under
+          `scratch_dir`, compressed per `spill_compression` (default).
+        - If 'shm', slices are written, uncompressed, to shared memory
+          blocks (e.g., under "/dev/shm"), avoiding disk round trips.
+          Blocks are unlinked as soon as they are read.
+
+    sort_run_size : int or None, default None
+        If not None, sort unpacked data by dstream_T on disk, in runs of
+        `sort_run_size` rows, rather than in memory.
+
+        Bounds memory use of sorting for inputs larger than memory. Runs are
+        unpacked, sorted, and written to memory-mapped files, then merged.
+        Output is identical to in-memory sorting, including under
+        `shuffle_over_same_T_seed`. Set to None to sort in memory (default).
+
+    spill_compression : {'none', 'lz4', 'zstd'}, default 'lz4'
+        Compression of Arrow IPC spill files.
+
+        Sorted runs under `sort_run_size` are always uncompressed, so that
+        they can be memory mapped.
+
+    stream_presorted : bool, default False
+        Stream input slice-wise, without materializing the full input?
+
+        Requires input rows to already be sorted by ascending dstream_T ---
+        e.g., a LazyFrame scanning a partitioned parquet dataset written in
+        dstream_T order. Rather than unpacking and sorting the full input
+        up front, each slice is scanned, unpacked, and exploded separately,
+        so only one slice per worker is held in memory. Raises ValueError if
+        input is found not to be sorted. Not compatible with
+        `shuffle_over_same_T_seed`.
+
     Returns
     -------
     pl.DataFrame
@@ -788,18 +1954,68 @@ def surface_unpack_reconstruct(
     logging.info("beginning surface_unpack_reconstruct")
     log_memory_usage(logging.info)
 
+    if stream_presorted and shuffle_over_same_T_seed is not None:
+        raise NotImplementedError(
+            "shuffle_over_same_T_seed is not supported with stream_presorted",
+        )
+    if stream_presorted and sort_run_size is not None:
+        raise ValueError(
+            "sort_run_size and stream_presorted are mutually exclusive",
+        )
+    if sort_run_size is not None and sort_run_size < 1:
+        raise ValueError(f"sort_run_size must be >= 1, got {sort_run_size}")
+
+    _get_ipc_compression(spill_compression)  # validate early
+    if slice_transport not in ("ipc", "shm"):
+        raise ValueError(
+            f"slice_transport must be 'ipc' or 'shm', got {slice_transport!r}",
+        )
+    if slice_queue_depth is not None and slice_queue_depth < 1:
+        raise ValueError(
+            f"slice_queue_depth must be >= 1, got {slice_queue_depth}",
+        )
+
+    if (checkpoint_freq > 0) != (checkpoint_path is not None):
+        raise ValueError(
+            "checkpoint_freq and checkpoint_path must be provided together, "
+            f"got {checkpoint_freq=} and {checkpoint_path=}",
+        )
+
     render_polars_snapshot(df, "packed", logging.info)
     logging.info(f"packed {type(df)=}")
 
+    max_extended_dstream_data_id = None
+    if extend_from is not None:
+        max_extended_dstream_data_id = _read_checkpoint_metadata(
+            extend_from, _searchtable_metadata_key
+        )["max_dstream_data_id"]
+        if "dstream_data_id" not in df.lazy().collect_schema().names():
+            logging.info("numbering genomes after extended searchtable...")
+            df = df.with_columns(
+                dstream_data_id=pl.int_range(pl.len(), dtype=pl.UInt64)
+                + (max_extended_dstream_data_id + 1),
+            )
+
+    packed_df = df  # streaming/external sort assign ids slice-wise
     logging.info("ensuring uint64 dstream_data_id...")
-    df = df.with_columns(
-        dstream_data_id=pl.coalesce(
-            pl.col("^dstream_data_id$"),
-            pl.int_range(pl.len(), dtype=pl.UInt64),
-        ).cast(pl.UInt64),
-    )
+    df = _coalesce_dstream_data_id(df)
     render_polars_snapshot(df, "coalesced", logging.info)
 
+    if (
+        extend_from is not None
+        and df.lazy()
+        .select(
+            (pl.col("dstream_data_id") <= max_extended_dstream_data_id).any()
+        )
+        .collect()
+        .item()
+    ):
+        raise ValueError(
+            "Input genome dataframe 'dstream_data_id' column contains "
+            f"values at or below {max_extended_dstream_data_id}, "
+            f"already incorporated into extended searchtable {extend_from}.",
+        )
+
     if (
         df.lazy()
         .select((pl.col("dstream_data_id") == placeholder_value).any())
@@ -815,6 +2031,10 @@ def surface_unpack_reconstruct(
 
     # for simplicity, return early for this special case
     if df.lazy().limit(1).collect().is_empty():
+        if extend_from is not None:
+            raise NotImplementedError(
+                "extend_from with empty input dataframe not yet supported",
+            )
         logging.warning("empty input dataframe, returning empty result")
         core_schema = {
             "dstream_data_id": pl.UInt64,
@@ -847,24 +2067,122 @@ def surface_unpack_reconstruct(
     differentia_bitwidth = dstream_storage_bitwidth // dstream_S
     logging.info(f" - differentia bitwidth: {differentia_bitwidth}")
 
-    logging.info("dispatching to surface_unpacked_reconstruct")
-    with _generate_exploded_slices_mp(
-        df,
-        exploded_slice_size,
-        mp_context,
-        mp_pool_size,
-        shuffle_over_same_T_seed,
-    ) as slices:
-        phylo_df = _surface_unpacked_reconstruct(
-            slices,
-            collapse_unif_freq=collapse_unif_freq,
-            check_trie_invariant_freq=check_trie_invariant_freq,
-            check_trie_invariant_after_collapse_unif=check_trie_invariant_after_collapse_unif,
-            differentia_bitwidth=differentia_bitwidth,
-            dstream_S=dstream_S,
-            exploded_slice_size=exploded_slice_size,
-            pa_source_type=pa_source_type,
+    # bounds used to choose records column widths
+    max_dstream_T = (
+        1
+        << df.lazy()
+        .select(pl.col("dstream_T_bitwidth").max())
+        .collect()
+        .item()
+    ) - 1
+    logging.info(f" - max dstream T: {max_dstream_T}")
+
+    max_dstream_data_id = (
+        df.lazy().select(pl.col("dstream_data_id").max()).collect().item()
+    )
+    logging.info(f" - max dstream data id: {max_dstream_data_id}")
+
+    lookup_ingest_times = None
+    if native_explode:
+        unsupported_columns = {
+            "downstream_exclude_exploded",
+            "downstream_filter_exploded",
+            "downstream_validate_exploded",
+        } & {*df.lazy().collect_schema().names()}
+        if unsupported_columns:
+            raise NotImplementedError(
+                f"native_explode does not support {sorted(unsupported_columns)}"
+                " columns",
+            )
+        dstream_algos = (
+            df.lazy()
+            .select(pl.col("dstream_algo").cast(pl.String).unique())
+            .collect()
+            .to_series()
+            .to_list()
+        )
+        if len(dstream_algos) > 1:
+            raise NotImplementedError(
+                "Multiple dstream_algo not yet supported"
+            )
+        logging.info(f" - dstream algo: {dstream_algos[0]}")
+        lookup_ingest_times = _get_lookup_ingest_times(
+            dstream_algos[0], dstream_S
+        )
+
+    first_slice = 0
+    if resume_from is not None:
+        first_slice = _read_checkpoint_metadata(resume_from)["next_slice"]
+        logging.info(f"resuming from {resume_from} at slice {first_slice + 1}")
+
+    # spill files go in a dedicated directory, removed even on error
+    with tempfile.TemporaryDirectory(
+        prefix="hstrat_surface_unpack_reconstruct_", dir=scratch_dir
+    ) as scratch_path:
+        logging.info(f"spilling to {scratch_path} with {spill_compression=}")
+        spill_kwargs = dict(
+            first_slice=first_slice,
+            native_explode=native_explode,
+            scratch_dir=scratch_path,
+            slice_queue_depth=slice_queue_depth,
+            slice_transport=slice_transport,
+            spill_compression=spill_compression,
         )
+        if stream_presorted:
+            logging.info("streaming presorted input...")
+            generate_exploded_slices = _generate_exploded_slices_streaming(
+                packed_df.lazy(),
+                exploded_slice_size,
+                mp_context,
+                mp_pool_size,
+                **spill_kwargs,
+            )
+        elif sort_run_size is not None:
+            logging.info(f"sorting externally, with {sort_run_size=}...")
+            generate_exploded_slices = _generate_exploded_slices_external_sort(
+                packed_df.lazy(),
+                exploded_slice_size,
+                mp_context,
+                mp_pool_size,
+                sort_run_size,
+                shuffle_over_same_T_seed,
+                **spill_kwargs,
+            )
+        else:
+            generate_exploded_slices = _generate_exploded_slices_mp(
+                df,
+                exploded_slice_size,
+                mp_context,
+                mp_pool_size,
+                shuffle_over_same_T_seed,
+                **spill_kwargs,
+            )
+
+        logging.info("dispatching to surface_unpacked_reconstruct")
+        with generate_exploded_slices as slices:
+            phylo_df = _surface_unpacked_reconstruct(
+                slices,
+                collapse_unif_freq=collapse_unif_freq,
+                check_trie_invariant_freq=check_trie_invariant_freq,
+                check_trie_invariant_after_collapse_unif=check_trie_invariant_after_collapse_unif,
+                check_trie_invariant_full=check_trie_invariant_full,
+                differentia_bitwidth=differentia_bitwidth,
+                dstream_S=dstream_S,
+                exploded_slice_size=exploded_slice_size,
+                max_dstream_data_id=max_dstream_data_id,
+                max_dstream_T=max_dstream_T,
+                num_threads=num_threads,
+                pa_source_type=pa_source_type,
+                checkpoint_freq=checkpoint_freq,
+                checkpoint_path=checkpoint_path,
+                first_slice=first_slice,
+                resume_from=resume_from,
+                scratch_dir=scratch_path,
+                slice_transport=slice_transport,
+                lookup_ingest_times=lookup_ingest_times,
+                extend_from=extend_from,
+                searchtable_path=searchtable_path,
+            )
 
     logging.info("joining user-defined columns...")
     with log_context_duration("_join_user_defined_columns", logging.info):
@@ -1,25 +1,24 @@
 import contextlib
 import logging
 import math
+import multiprocessing
 import random
 import typing
 
 from downstream import dstream
-import more_itertools as mit
 import numpy as np
 import opytional as opyt
 from phyloframe import legacy as pfl
 import polars as pl
 
-from .._auxiliary_lib import RngStateContext, get_sole_scalar_value_polars
+from .._auxiliary_lib import RngStateContext, get_sole_scalar_value_polars, jit
 from .._auxiliary_lib._alifestd_find_leaf_ids import (
     _alifestd_find_leaf_ids_asexual_fast_path,
 )
-from .._auxiliary_lib._alifestd_find_pair_mrca_id_asexual import (
-    _alifestd_find_pair_mrca_id_asexual_fast_path,
-)
 from ..genome_instrumentation import HereditaryStratigraphicSurface
-from ..juxtaposition import calc_rank_of_first_retained_disparity_between
+from ..juxtaposition import (
+    calc_min_implausible_spurious_consecutive_differentia_collisions_between,
+)
 from ..serialization import surf_from_hex
 
 # columns required to deserialize surfaces from data_hex
@@ -33,6 +32,12 @@ _deserialization_columns = (
     "dstream_S",
 )
 
+# number of leaf pairs evaluated per batch
+_chunk_size = 1 << 16
+
+# threshold for single-bit mismatch
+_confidence_level = 0.49
+
 
 def _load_surface(
     phylo_df: pl.DataFrame,
@@ -55,12 +60,424 @@ def _load_surface(
     )
 
 
+@jit(nopython=True)
+def _decode_hex_items(
+    hex_codes: np.ndarray, num_items: int, item_bitwidth: int
+) -> np.ndarray:
+    """Unpack big-endian, fixed-width unsigned integer items from rows of
+    ASCII-encoded hexadecimal characters.
+
+    Parameters
+    ----------
+    hex_codes : np.ndarray
+        2D uint8 array of ASCII character codes, one row per hex string.
+    num_items : int
+        Number of items to unpack from each row.
+    item_bitwidth : int
+        Bit width of each item, at most 64.
+
+    Returns
+    -------
+    np.ndarray
+        2D uint64 array with shape ``(len(hex_codes), num_items)``.
+    """
+    res = np.zeros((hex_codes.shape[0], num_items), dtype=np.uint64)
+    for row in range(hex_codes.shape[0]):
+        bit = 0
+        for item in range(num_items):
+            value = np.uint64(0)
+            for __ in range(item_bitwidth):
+                code = np.int64(hex_codes[row, bit >> 2])
+                nibble = code - 48 if code <= 57 else (code | 32) - 87
+                value = (value << np.uint64(1)) | np.uint64(
+                    (nibble >> (3 - (bit & 3))) & 1
+                )
+                bit += 1
+            res[row, item] = value
+    return res
+
+
+def _get_sole_value(df: pl.DataFrame, col_name: str) -> typing.Any:
+    values = df.get_column(col_name).unique()
+    if len(values) != 1:
+        raise NotImplementedError(
+            f"surface_validate_trie: heterogeneous {col_name} values "
+            "not yet supported",
+        )
+    return values.item()
+
+
+def _get_hex_codes(
+    hex_strings: pl.Series, bitoffset: int, bitwidth: int
+) -> np.ndarray:
+    """Extract a hex-aligned field from each string, as a 2D array of ASCII
+    character codes."""
+    if bitoffset % 4 or bitwidth % 4:
+        raise NotImplementedError(
+            "surface_validate_trie: hex-unaligned fields not yet supported",
+        )
+    fields = hex_strings.str.slice(bitoffset // 4, bitwidth // 4)
+    if (fields.str.len_bytes() != bitwidth // 4).any():
+        raise ValueError(
+            "surface_validate_trie: data_hex too short for specified fields",
+        )
+    return np.frombuffer(
+        "".join(fields.to_list()).encode("ascii"), dtype=np.uint8
+    ).reshape(len(fields), bitwidth // 4)
+
+
+def _decode_surfaces(
+    leaf_df: pl.DataFrame,
+) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Decode all rows' surfaces from data_hex at once.
+
+    Returns
+    -------
+    ranks : np.ndarray
+        2D int64 array of retained hstrat ranks, sorted ascending within each
+        row. Empty buffer sites are placed last.
+    differentia : np.ndarray
+        2D uint64 array of differentia corresponding to ``ranks``.
+    num_retained : np.ndarray
+        Number of strata retained by each row's surface.
+    next_ranks : np.ndarray
+        Each row's surface ``GetNextRank()``.
+    """
+    if leaf_df.is_empty():
+        return (
+            np.empty((0, 0), dtype=np.int64),
+            np.empty((0, 0), dtype=np.uint64),
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int64),
+        )
+
+    dstream_S = _get_sole_value(leaf_df, "dstream_S")
+    dstream_algo = eval(
+        str(_get_sole_value(leaf_df, "dstream_algo")), {"dstream": dstream}
+    )
+    storage_bitwidth = _get_sole_value(leaf_df, "dstream_storage_bitwidth")
+    assert storage_bitwidth % dstream_S == 0
+    T_bitwidth = _get_sole_value(leaf_df, "dstream_T_bitwidth")
+    hex_strings = leaf_df.get_column("data_hex")
+
+    dstream_T = _decode_hex_items(
+        _get_hex_codes(
+            hex_strings,
+            _get_sole_value(leaf_df, "dstream_T_bitoffset"),
+            T_bitwidth,
+        ),
+        1,
+        T_bitwidth,
+    )[:, 0].astype(np.int64)
+    differentia = _decode_hex_items(
+        _get_hex_codes(
+            hex_strings,
+            _get_sole_value(leaf_df, "dstream_storage_bitoffset"),
+            storage_bitwidth,
+        ),
+        dstream_S,
+        storage_bitwidth // dstream_S,
+    )
+
+    empty = np.iinfo(np.int64).max  # sorts empty buffer sites last
+    ingest_times = np.full(differentia.shape, empty, dtype=np.int64)
+    is_full = dstream_T >= dstream_S
+    if is_full.any():
+        ingest_times[is_full] = dstream_algo.lookup_ingest_times_batched(
+            dstream_S, dstream_T[is_full].astype(np.uint64), parallel=False
+        )
+    for row in np.flatnonzero(~is_full):  # T < S unsupported by batched
+        ingest_times[row] = [
+            opyt.or_value(Tbar, empty)
+            for Tbar in dstream_algo.lookup_ingest_times(
+                dstream_S, int(dstream_T[row])
+            )
+        ]
+
+    ranks = np.where(
+        ingest_times == empty, empty, ingest_times - dstream_S
+    )  # dstream rank --> hstrat rank
+    sort_order = np.argsort(ranks, axis=1, kind="stable")
+    return (
+        np.take_along_axis(ranks, sort_order, axis=1),
+        np.take_along_axis(differentia, sort_order, axis=1),
+        np.minimum(dstream_T, dstream_S),
+        dstream_T - dstream_S,
+    )
+
+
+@jit(nopython=True)
+def _calc_first_disparity_ranks(
+    ranks: np.ndarray,
+    differentia: np.ndarray,
+    num_retained: np.ndarray,
+    next_ranks: np.ndarray,
+    collision_threshold: int,
+    first_rows: np.ndarray,
+    second_rows: np.ndarray,
+) -> np.ndarray:
+    """Calculate rank of first retained disparity between surface pairs.
+
+    Batched equivalent of ``calc_rank_of_first_retained_disparity_between``,
+    operating on surfaces decoded by ``_decode_surfaces``.
+
+    Returns
+    -------
+    np.ndarray
+        Rank of first retained disparity for each pair, or -1 where no
+        disparity is detected (i.e., where scalar implementation returns
+        None).
+    """
+    no_disparity = np.iinfo(np.int64).min
+    res = np.empty(len(first_rows), dtype=np.int64)
+    # ring buffer holding up to collision_threshold last-seen common ranks
+    window = np.empty(collision_threshold, dtype=np.int64)
+    for pair in range(len(first_rows)):
+        a, b = first_rows[pair], second_rows[pair]
+        num_a, num_b = num_retained[a], num_retained[b]
+        i, j = 0, 0
+        num_common = 0
+        found_disparity = False
+        while i < num_a and j < num_b:
+            rank_a, rank_b = ranks[a, i], ranks[b, j]
+            if rank_a == rank_b:
+                window[num_common % collision_threshold] = rank_a
+                num_common += 1
+                if differentia[a, i] != differentia[b, j]:
+                    found_disparity = True
+                    break
+                i += 1
+                j += 1
+            elif rank_a < rank_b:
+                i += 1
+            else:
+                j += 1
+
+        if not found_disparity:
+            # conservatively assume mismatch follows newest common rank
+            if i < num_a:
+                fallback = next_ranks[b]
+            elif j < num_b:
+                fallback = next_ranks[a]
+            elif next_ranks[a] != next_ranks[b]:
+                fallback = min(next_ranks[a], next_ranks[b])
+            else:
+                fallback = no_disparity
+            window[num_common % collision_threshold] = fallback
+            num_common += 1
+
+        # discount collision_threshold - 1 newest common ranks as potentially
+        # spurious differentia collisions
+        if num_common >= collision_threshold:
+            oldest = window[num_common % collision_threshold]
+        else:
+            oldest = window[0]
+        res[pair] = -1 if oldest == no_disparity else max(oldest, 0)
+
+    return res
+
+
+@jit(nopython=True)
+def _unrank_pairs(
+    combo_indices: np.ndarray, num_items: int
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Convert lexicographic indices of 2-combinations over
+    ``range(num_items)`` to index pairs, as ``more_itertools.nth_combination``
+    would."""
+    firsts = np.empty(len(combo_indices), dtype=np.int64)
+    seconds = np.empty(len(combo_indices), dtype=np.int64)
+    n = num_items
+    for pair, combo_index in enumerate(combo_indices):
+        # largest first such that first * (2n - first - 1) / 2 <= combo_index
+        estimate = (
+            (2 * n - 1) - np.sqrt((2 * n - 1) ** 2 - 8 * combo_index)
+        ) / 2
+        first = max(0, min(np.int64(estimate), n - 2))
+        while first > 0 and first * (2 * n - first - 1) // 2 > combo_index:
+            first -= 1
+        while (first + 1) * (2 * n - first - 2) // 2 <= combo_index:
+            first += 1
+        firsts[pair] = first
+        seconds[pair] = (
+            combo_index - first * (2 * n - first - 1) // 2 + first + 1
+        )
+    return firsts, seconds
+
+
+@jit(nopython=True)
+def _calc_preorder_positions(ancestor_ids: np.ndarray) -> np.ndarray:
+    """Calculate each node's position in a preorder traversal, for a
+    contiguous, topologically sorted phylogeny."""
+    num_nodes = len(ancestor_ids)
+    subtree_sizes = np.ones(num_nodes, dtype=np.int64)
+    for node in range(num_nodes - 1, -1, -1):
+        ancestor = ancestor_ids[node]
+        if ancestor != node:
+            subtree_sizes[ancestor] += subtree_sizes[node]
+
+    positions = np.empty(num_nodes, dtype=np.int64)
+    # next unassigned position within each node's subtree
+    next_positions = np.empty(num_nodes, dtype=np.int64)
+    next_root_position = 0
+    for node in range(num_nodes):
+        ancestor = ancestor_ids[node]
+        if ancestor == node:
+            positions[node] = next_root_position
+            next_root_position += subtree_sizes[node]
+        else:
+            positions[node] = next_positions[ancestor]
+            next_positions[ancestor] += subtree_sizes[node]
+        next_positions[node] = positions[node] + 1
+
+    return positions
+
+
+@jit(nopython=True)
+def _calc_node_depths(ancestor_ids: np.ndarray) -> np.ndarray:
+    depths = np.zeros(len(ancestor_ids), dtype=np.int64)
+    for node, ancestor in enumerate(ancestor_ids):
+        if ancestor != node:
+            depths[node] = depths[ancestor] + 1
+    return depths
+
+
+@jit(nopython=True)
+def _find_pair_mrca_ids(
+    ancestor_ids: np.ndarray,
+    depths: np.ndarray,
+    firsts: np.ndarray,
+    seconds: np.ndarray,
+) -> np.ndarray:
+    """Find MRCA of each pair by walking lineages to equal depth, then in
+    lockstep; -1 if no common ancestor exists."""
+    res = np.empty(len(firsts), dtype=np.int64)
+    for pair in range(len(firsts)):
+        a, b = firsts[pair], seconds[pair]
+        while depths[a] > depths[b]:
+            a = ancestor_ids[a]
+        while depths[b] > depths[a]:
+            b = ancestor_ids[b]
+        while a != b and ancestor_ids[a] != a:
+            a = ancestor_ids[a]
+            b = ancestor_ids[b]
+        res[pair] = a if a == b else -1
+    return res
+
+
+@jit(nopython=True)
+def _build_argmin_sparse_table(values: np.ndarray) -> np.ndarray:
+    """Tabulate argmin over power-of-two-length windows of values, for
+    constant-time range minimum queries."""
+    num_levels = 1
+    while (1 << num_levels) <= len(values):
+        num_levels += 1
+    table = np.empty((num_levels, len(values)), dtype=np.int64)
+    table[0] = np.arange(len(values))
+    for level in range(1, num_levels):
+        half = 1 << (level - 1)
+        for i in range(len(values) - (1 << level) + 1):
+            left, right = table[level - 1, i], table[level - 1, i + half]
+            table[level, i] = left if values[left] <= values[right] else right
+    return table
+
+
+@jit(nopython=True)
+def _query_argmin_sparse_table(
+    table: np.ndarray,
+    values: np.ndarray,
+    begins: np.ndarray,
+    ends: np.ndarray,
+) -> np.ndarray:
+    """Find argmin of values within each half-open range [begin, end)."""
+    res = np.empty(len(begins), dtype=np.int64)
+    for query in range(len(begins)):
+        begin, end = begins[query], ends[query]
+        level = 0
+        while (2 << level) <= end - begin:
+            level += 1
+        left, right = table[level, begin], table[level, end - (1 << level)]
+        res[query] = left if values[left] <= values[right] else right
+    return res
+
+
+class _LeafMrcaIndex(typing.NamedTuple):
+    """Index answering leaf-pair MRCA queries in constant time.
+
+    The MRCA of two leaves is the shallowest among MRCAs of leaves adjacent
+    in preorder between them, so a range minimum query over adjacent leaves'
+    MRCA depths suffices.
+    """
+
+    leaf_preorder_ranks: np.ndarray  # leaf index -> preorder-sorted rank
+    adjacent_mrca_ids: np.ndarray  # MRCA of preorder-adjacent leaves
+    adjacent_mrca_depths: np.ndarray  # -1 if no common ancestor
+    sparse_table: np.ndarray
+
+    @staticmethod
+    def build(
+        ancestor_ids: np.ndarray, leaf_ids: np.ndarray
+    ) -> "_LeafMrcaIndex":
+        depths = _calc_node_depths(ancestor_ids)
+        preorder = np.argsort(
+            _calc_preorder_positions(ancestor_ids)[leaf_ids], kind="stable"
+        )
+        leaf_preorder_ranks = np.empty_like(preorder)
+        leaf_preorder_ranks[preorder] = np.arange(len(preorder))
+
+        sorted_leaf_ids = leaf_ids[preorder]
+        adjacent_mrca_ids = _find_pair_mrca_ids(
+            ancestor_ids, depths, sorted_leaf_ids[:-1], sorted_leaf_ids[1:]
+        )
+        adjacent_mrca_depths = np.where(
+            adjacent_mrca_ids == -1, -1, depths[adjacent_mrca_ids]
+        )
+        return _LeafMrcaIndex(
+            leaf_preorder_ranks=leaf_preorder_ranks,
+            adjacent_mrca_ids=adjacent_mrca_ids,
+            adjacent_mrca_depths=adjacent_mrca_depths,
+            sparse_table=_build_argmin_sparse_table(adjacent_mrca_depths),
+        )
+
+    def query(self: "_LeafMrcaIndex", firsts: np.ndarray, seconds: np.ndarray):
+        """Find MRCA ids of distinct leaf pairs, given as leaf indices; -1 if
+        no common ancestor exists."""
+        first_ranks = self.leaf_preorder_ranks[firsts]
+        second_ranks = self.leaf_preorder_ranks[seconds]
+        argmins = _query_argmin_sparse_table(
+            self.sparse_table,
+            self.adjacent_mrca_depths,
+            np.minimum(first_ranks, second_ranks),
+            np.maximum(first_ranks, second_ranks),
+        )
+        return np.where(
+            self.adjacent_mrca_depths[argmins] == -1,
+            -1,
+            self.adjacent_mrca_ids[argmins],
+        )
+
+
+# decoded surfaces and collision threshold, for process pool workers
+_worker_surfaces: typing.Optional[tuple] = None
+
+
+def _init_worker(surfaces: tuple) -> None:
+    global _worker_surfaces
+    _worker_surfaces = surfaces
+
+
+def _calc_first_disparity_ranks_worker(
+    pair_rows: typing.Tuple[np.ndarray, np.ndarray],
+) -> np.ndarray:
+    return _calc_first_disparity_ranks(*_worker_surfaces, *pair_rows)
+
+
 def surface_validate_trie(
     df: pl.DataFrame,
     max_num_checks: int = 1_000,
     max_violations: int = 0,
     progress_wrap: typing.Callable = lambda x: x,
     seed: typing.Optional[int] = None,
+    mp_pool_size: int = 1,
 ) -> int:
     """Validate trie reconstruction output data.
 
@@ -83,6 +500,11 @@ def surface_validate_trie(
        ``first_disparity_rank < mrca_rank``: the surfaces prove divergence
        earlier than the trie records.
 
+    Sampled leaves' surfaces are decoded from ``data_hex`` once, up front.
+    Leaf pairs are then checked in batches, with MRCA lookups answered by a
+    precomputed leaf MRCA index and first retained disparity ranks computed
+    by a compiled kernel. Batches may be distributed over a process pool.
+
     Parameters
     ----------
     df : pl.DataFrame
@@ -122,11 +544,14 @@ def surface_validate_trie(
         early. Callers should treat a return value exceeding this
         threshold as a validation failure.
     progress_wrap : callable, optional
-        Wrapper applied to the pair-check iterator, e.g., ``tqdm.tqdm`` for a
-        progress bar. Must accept and return an iterable. Default is the
-        identity function (no wrapping).
+        Wrapper applied to the iterator over batches of pair checks, e.g.,
+        ``tqdm.tqdm`` for a progress bar. Must accept and return an iterable.
+        Default is the identity function (no wrapping).
     seed : int, default None
         Random seed used when sampling leaf pairs.
+    mp_pool_size : int, default 1
+        Number of worker processes used to compute first retained disparity
+        ranks. If 1, computation is performed in the calling process.
 
     Returns
     -------
@@ -164,7 +589,7 @@ def surface_validate_trie(
 
     logging.info("surface_validate_trie: checking contiguous ids...")
     # required by _alifestd_find_leaf_ids_asexual_fast_path
-    # and _alifestd_find_pair_mrca_id_asexual_fast_path
+    # and _LeafMrcaIndex
     if not pfl.alifestd_has_contiguous_ids_polars(df):
         raise ValueError(
             "surface_validate_trie: ids are not contiguous",
@@ -172,7 +597,7 @@ def surface_validate_trie(
 
     logging.info("surface_validate_trie: checking topological sort...")
     # required by _alifestd_find_leaf_ids_asexual_fast_path
-    # and _alifestd_find_pair_mrca_id_asexual_fast_path
+    # and _LeafMrcaIndex
     if not pfl.alifestd_is_topologically_sorted_polars(df):
         raise ValueError(
             "surface_validate_trie: data is not topologically sorted",
@@ -208,97 +633,150 @@ def surface_validate_trie(
     logging.info("surface_validate_trie: collecting dstream_S value...")
     dstream_S = get_sole_scalar_value_polars(df, "dstream_S")
 
-    logging.info("surface_validate_trie: checking for violations...")
-    num_violations = 0
-    for leaf_a, leaf_b in progress_wrap(
-        mit.nth_combination(leaf_ids, 2, i) for i in combo_indices
-    ):
-        surface_a = _load_surface(df, leaf_a)
-        surface_b = _load_surface(df, leaf_b)
-        first_disparity_rank = calc_rank_of_first_retained_disparity_between(
-            surface_a,
-            surface_b,
-            confidence_level=0.49,  # threshold for single-bit mismatch
-        )
+    logging.info("surface_validate_trie: collecting dstream_rank values...")
+    dstream_ranks = (
+        df.lazy()
+        .select(pl.col("dstream_rank"))
+        .collect()
+        .to_series()
+        .to_numpy()
+        .astype(np.int64)
+    )
 
-        # if None, no disparity was found --- surfaces are compatible up
-        # to min(leaf_a, leaf_b) dstream_rank; use that as the bound
-        mrca_rank_bound = opyt.or_else(
-            first_disparity_rank,
-            lambda: min(
-                df.lazy()
-                .filter(pl.col("id") == leaf_a)
-                .select(pl.col("dstream_rank"))
-                .collect()
-                .item(),
-                df.lazy()
-                .filter(pl.col("id") == leaf_b)
-                .select(pl.col("dstream_rank"))
-                .collect()
-                .item(),
-            )
-            - dstream_S,  # dstream rank --> hstrat rank
+    logging.info("surface_validate_trie: unranking leaf pairs...")
+    combo_indices = np.array(combo_indices, dtype=np.int64)
+    pair_leaf_indices = [
+        _unrank_pairs(
+            combo_indices[begin : begin + _chunk_size], len(leaf_ids)
         )
-        assert mrca_rank_bound >= 0
+        for begin in range(0, num_checks, _chunk_size)
+    ]
 
-        mrca_id = _alifestd_find_pair_mrca_id_asexual_fast_path(
-            ancestor_ids, leaf_a, leaf_b
+    logging.info("surface_validate_trie: decoding sampled leaf surfaces...")
+    sampled_leaf_indices = np.unique(
+        np.concatenate(
+            [np.empty(0, dtype=np.int64)]
+            + [np.concatenate(pair) for pair in pair_leaf_indices],
+        ),
+    )
+    surfaces = _decode_surfaces(
+        df.lazy()
+        .select(
+            pl.col(_deserialization_columns).gather(
+                leaf_ids[sampled_leaf_indices],
+            ),
+        )
+        .collect(),
+    )
+    logging.info(
+        f"surface_validate_trie: decoded {len(sampled_leaf_indices)=}",
+    )
+    collision_threshold = 1
+    if len(sampled_leaf_indices):
+        surface = _load_surface(df, leaf_ids[sampled_leaf_indices[0]])
+        collision_threshold = calc_min_implausible_spurious_consecutive_differentia_collisions_between(
+            surface,
+            surface,
+            significance_level=1.0 - _confidence_level,
         )
+    pair_surface_rows = [
+        tuple(np.searchsorted(sampled_leaf_indices, leaf) for leaf in pair)
+        for pair in pair_leaf_indices
+    ]
+
+    logging.info("surface_validate_trie: building leaf MRCA index...")
+    mrca_index = _LeafMrcaIndex.build(ancestor_ids, leaf_ids)
 
-        trie_mrca_rank = (
-            max(
-                df.lazy()
-                .filter(pl.col("id") == mrca_id)
-                .select(pl.col("dstream_rank"))
-                .collect()
-                .item(),
-                dstream_S,
+    logging.info("surface_validate_trie: checking for violations...")
+    num_violations = 0
+    with contextlib.ExitStack() as stack:
+        if mp_pool_size > 1:
+            # RE https://docs.pola.rs/user-guide/misc/multiprocessing/
+            pool = stack.enter_context(
+                multiprocessing.get_context("spawn").Pool(
+                    processes=mp_pool_size,
+                    initializer=_init_worker,
+                    initargs=((*surfaces, collision_threshold),),
+                ),
             )
-            - dstream_S
-        )  # dstream rank --> hstrat rank
-        assert trie_mrca_rank >= 0
-
-        # violation: surfaces prove divergence no later than
-        # first_disparity_rank, which precedes mrca_rank — trie places
-        # MRCA more recently than the surface data allows
-        is_violation = trie_mrca_rank >= mrca_rank_bound + (
-            mrca_rank_bound == 0  # @mmore500: uncertain about this edge case
-        )
-        if is_violation:
-            leaf_a_rank = (
-                df.lazy()
-                .filter(pl.col("id") == leaf_a)
-                .select(pl.col("dstream_rank"))
-                .collect()
-                .item()
-            ) - dstream_S
-            leaf_b_rank = (
-                df.lazy()
-                .filter(pl.col("id") == leaf_b)
-                .select(pl.col("dstream_rank"))
-                .collect()
-                .item()
-            ) - dstream_S
-            logging.info(
-                "\n"
-                "===========================================================\n"
-                f"surface_validate_trie: violation found for leaf pair "
-                f"({leaf_a}, {leaf_b}):\n"
-                "-----------------------------------------------------------\n"
-                f"    delta={mrca_rank_bound - trie_mrca_rank}\n"
-                f"    {trie_mrca_rank=}\n"
-                f"    {mrca_rank_bound=}\n"
-                f"    {first_disparity_rank=}\n"
-                f"    {leaf_a_rank=} {leaf_b_rank=}\n"
-                "===========================================================",
+            first_disparity_rank_chunks = pool.imap(
+                _calc_first_disparity_ranks_worker, pair_surface_rows
+            )
+        else:
+            first_disparity_rank_chunks = (
+                _calc_first_disparity_ranks(
+                    *surfaces, collision_threshold, *pair_rows
+                )
+                for pair_rows in pair_surface_rows
+            )
+
+        for (firsts, seconds), first_disparity_ranks in progress_wrap(
+            zip(pair_leaf_indices, first_disparity_rank_chunks),
+        ):
+            leaf_as, leaf_bs = leaf_ids[firsts], leaf_ids[seconds]
+
+            # if -1, no disparity was found --- surfaces are compatible up
+            # to min(leaf_a, leaf_b) dstream_rank; use that as the bound
+            mrca_rank_bounds = np.where(
+                first_disparity_ranks == -1,
+                np.minimum(dstream_ranks[leaf_as], dstream_ranks[leaf_bs])
+                - dstream_S,  # dstream rank --> hstrat rank
+                first_disparity_ranks,
             )
-        num_violations += is_violation
-        if num_violations > max_violations:
-            logging.info(
-                "surface_validate_trie: "
-                f"stopping with more than {max_violations=} found",
+            assert (mrca_rank_bounds >= 0).all()
+
+            mrca_ids = mrca_index.query(firsts, seconds)
+            assert (mrca_ids >= 0).all()
+
+            trie_mrca_ranks = (
+                np.maximum(dstream_ranks[mrca_ids], dstream_S) - dstream_S
+            )  # dstream rank --> hstrat rank
+
+            # violation: surfaces prove divergence no later than
+            # first_disparity_rank, which precedes mrca_rank — trie places
+            # MRCA more recently than the surface data allows
+            is_violations = trie_mrca_ranks >= mrca_rank_bounds + (
+                mrca_rank_bounds
+                == 0  # @mmore500: uncertain about this edge case
+            )
+            cumulative_violations = num_violations + np.cumsum(is_violations)
+            num_checked = min(
+                np.searchsorted(cumulative_violations, max_violations + 1) + 1,
+                len(is_violations),
             )
-            return num_violations
+            for pair in np.flatnonzero(is_violations[:num_checked]):
+                leaf_a, leaf_b = int(leaf_as[pair]), int(leaf_bs[pair])
+                mrca_rank_bound = int(mrca_rank_bounds[pair])
+                trie_mrca_rank = int(trie_mrca_ranks[pair])
+                first_disparity_rank = (
+                    int(first_disparity_ranks[pair])
+                    if first_disparity_ranks[pair] != -1
+                    else None
+                )
+                leaf_a_rank = int(dstream_ranks[leaf_a]) - dstream_S
+                leaf_b_rank = int(dstream_ranks[leaf_b]) - dstream_S
+                logging.info(
+                    "\n"
+                    "===========================================================\n"
+                    f"surface_validate_trie: violation found for leaf pair "
+                    f"({leaf_a}, {leaf_b}):\n"
+                    "-----------------------------------------------------------\n"
+                    f"    delta={mrca_rank_bound - trie_mrca_rank}\n"
+                    f"    {trie_mrca_rank=}\n"
+                    f"    {mrca_rank_bound=}\n"
+                    f"    {first_disparity_rank=}\n"
+                    f"    {leaf_a_rank=} {leaf_b_rank=}\n"
+                    "===========================================================",
+                )
+
+            if num_checked:
+                num_violations = int(cumulative_violations[num_checked - 1])
+            if num_violations > max_violations:
+                logging.info(
+                    "surface_validate_trie: "
+                    f"stopping with more than {max_violations=} found",
+                )
+                return num_violations
 
     logging.info(
         "surface_validate_trie: "
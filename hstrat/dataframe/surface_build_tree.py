@@ -140,6 +140,15 @@ def _create_parser() -> argparse.ArgumentParser:
             "unifurcations? Default is False (checks run before collapse only)."
         ),
     )
+    add_bool_arg(
+        parser,
+        "check-trie-invariant-full",
+        default=False,
+        help=(
+            "Should trie invariant checks scan all records? Default is False "
+            "(checks cover only records changed since the previous check)."
+        ),
+    )
     parser.add_argument(
         "--exploded-slice-size",
         type=int,
@@ -155,6 +164,15 @@ def _create_parser() -> argparse.ArgumentParser:
             "Default 1 (single producer process)."
         ),
     )
+    parser.add_argument(
+        "--num-threads",
+        type=int,
+        default=1,
+        help=(
+            "Number of threads for inserting exploded slices into the trie. "
+            "Output is identical to single-threaded construction. Default 1."
+        ),
+    )
     parser.add_argument(
         "--delete-trunk",
         action=argparse.BooleanOptionalAction,
@@ -166,6 +184,25 @@ def _create_parser() -> argparse.ArgumentParser:
             "distinct founding strata into independent trees."
         ),
     )
+    add_bool_arg(
+        parser,
+        "partition-by-founder",
+        default=False,
+        help=(
+            "Should genomes be split by founding strata and each partition "
+            "reconstructed independently? Requires --delete-trunk. "
+            "Default False."
+        ),
+    )
+    parser.add_argument(
+        "--partition-pool-size",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes for reconstructing founder "
+            "partitions in parallel. Default 1 (serial)."
+        ),
+    )
     parser.add_argument(
         "--trie-postprocessor",
         type=str,
@@ -231,12 +268,16 @@ def _main(mp_context: str) -> None:
                 collapse_unif_freq=args.collapse_unif_freq,
                 check_trie_invariant_freq=args.check_trie_invariant_freq,
                 check_trie_invariant_after_collapse_unif=args.check_trie_invariant_after_collapse_unif,
+                check_trie_invariant_full=args.check_trie_invariant_full,
                 delete_trunk=args.delete_trunk,
                 drop_dstream_metadata=args.drop_dstream_metadata,
                 exploded_slice_size=args.exploded_slice_size,
                 mp_context=mp_context,
                 mp_pool_size=args.mp_pool_size,
+                num_threads=args.num_threads,
                 pa_source_type=args.pa_source_type,
+                partition_by_founder=args.partition_by_founder,
+                partition_pool_size=args.partition_pool_size,
                 shuffle_over_same_T_seed=args.shuffle_over_same_T_seed,
                 trie_postprocessor=trie_postprocessor,
             ),
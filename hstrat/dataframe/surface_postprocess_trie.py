@@ -103,6 +103,10 @@ Behind the scenes, the following postprocessing steps occur:
 3. Taxon `id` values are reassigned.
 
 4. Supplied `trie_postprocessor` functor is applied.
+
+If environment variable CI is set, output is spot-checked against a reference implementation on a random sample of lineages.
+Set environment variable HSTRAT_SURFACE_POSTPROCESS_VALIDATE to "full" to cross-check entire output, or to "none" to disable validation.
+Set HSTRAT_SURFACE_POSTPROCESS_VALIDATE_BUDGET to control the number of lineages sampled (default 32).
 """
 
 
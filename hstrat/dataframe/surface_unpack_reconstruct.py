@@ -133,7 +133,14 @@ For details, see `python3 -m downstream.dataframe.explode_lookup_unpacked --help
 
 
 To streamline memory and disk usage, consider using CLI flags to cast string columns with repeated data values to categorical, shrink data types, or drop superfluous columns.
-The `--exploded-slice-size` flag may also be used to control memory usage during trie reconstruction.
+The `--exploded-slice-size` flag may also be used to control memory usage during trie reconstruction, and `--native-explode` avoids materializing exploded slices altogether.
+Intermediate data is spilled to disk; use `--scratch-dir` to place spill files on fast local storage (instead of, e.g., a small tmpfs at /tmp) and `--spill-compression` to trade disk usage against throughput.
+Set environment variable HSTRAT_LOG_DISK_USAGE to log scratch disk usage.
+Use `--slice-queue-depth` to bound exploded slices awaiting trie insertion, and `--slice-transport shm` to hand slices off through shared memory rather than spill files; per-stage throughput is logged.
+For inputs too large to sort in memory, use `--sort-run-size` to sort unpacked data on disk in bounded-size runs.
+Alternatively, for inputs too large to hold in memory, provide parquet shards (e.g., `ls shards/*.pqt`) whose rows are sorted by ascending `dstream_T` and use `--stream-presorted` to unpack and explode data slice-by-slice, without materializing the full input.
+For long-running reconstructions, use `--checkpoint-freq` and `--checkpoint-path` to periodically save progress, and `--resume-from` to resume from a saved checkpoint.
+To incrementally grow a reconstruction as newer genomes arrive, use `--searchtable-path` to persist the tree searchtable and, in a later run, `--extend-from` to add genomes with equal or greater `dstream_T`.
 Dataframe operations are conducted using polars and downstream operations may employ numba, both of which are capable of thread-based parallelism.
 Environment variables POLARS_MAX_THREADS and NUMBA_NUM_THREADS may be used to tune thread usage.
 """
@@ -151,6 +158,25 @@ def _create_parser() -> argparse.ArgumentParser:
         dfcli_module="hstrat.dataframe.surface_unpack_reconstruct",
         dfcli_version=get_hstrat_version(),
     )
+    parser.add_argument(
+        "--checkpoint-freq",
+        type=int,
+        default=0,
+        help=(
+            "How often, in slices, should in-progress reconstruction be "
+            "checkpointed to --checkpoint-path? "
+            "Set to 0 to disable (default)."
+        ),
+    )
+    parser.add_argument(
+        "--checkpoint-path",
+        type=str,
+        default=None,
+        help=(
+            "File to write checkpoints to, for use with --resume-from. "
+            "Required if --checkpoint-freq is set."
+        ),
+    )
     parser.add_argument(
         "--collapse-unif-freq",
         type=int,
@@ -176,12 +202,31 @@ def _create_parser() -> argparse.ArgumentParser:
             "unifurcations? Default is False (checks run before collapse only)."
         ),
     )
+    add_bool_arg(
+        parser,
+        "check-trie-invariant-full",
+        default=False,
+        help=(
+            "Should trie invariant checks scan all records? Default is False "
+            "(checks cover only records changed since the previous check)."
+        ),
+    )
     parser.add_argument(
         "--exploded-slice-size",
         type=int,
         default=1_000_000,
         help="Number of rows to process at once. Low values reduce memory use.",
     )
+    parser.add_argument(
+        "--extend-from",
+        type=str,
+        default=None,
+        help=(
+            "Searchtable file, written by an earlier run with "
+            "--searchtable-path, to extend with input genomes. "
+            "Input dstream_T values must not precede those incorporated."
+        ),
+    )
     parser.add_argument(
         "--mp-pool-size",
         type=int,
@@ -191,6 +236,24 @@ def _create_parser() -> argparse.ArgumentParser:
             "Default 1 (single producer process)."
         ),
     )
+    add_bool_arg(
+        parser,
+        "native-explode",
+        default=False,
+        help=(
+            "Explode dstream buffers natively, during trie insertion, rather "
+            "than as a dataframe? Output is identical. Default False."
+        ),
+    )
+    parser.add_argument(
+        "--num-threads",
+        type=int,
+        default=1,
+        help=(
+            "Number of threads for inserting exploded slices into the trie. "
+            "Output is identical to single-threaded construction. Default 1."
+        ),
+    )
     add_bool_arg(
         parser,
         "drop-dstream-metadata",
@@ -210,6 +273,33 @@ def _create_parser() -> argparse.ArgumentParser:
             """(i.e., "memory_map" or "OSFile")."""
         ),
     )
+    parser.add_argument(
+        "--resume-from",
+        type=str,
+        default=None,
+        help=(
+            "Checkpoint file to resume reconstruction from. "
+            "Input data and slicing options must match the checkpointed run."
+        ),
+    )
+    parser.add_argument(
+        "--scratch-dir",
+        type=str,
+        default=None,
+        help=(
+            "Directory for temporary spill files, e.g., on fast local disk. "
+            "Defaults to the system temporary directory."
+        ),
+    )
+    parser.add_argument(
+        "--searchtable-path",
+        type=str,
+        default=None,
+        help=(
+            "File to persist the tree searchtable to, for use with "
+            "--extend-from in later runs."
+        ),
+    )
     parser.add_argument(
         "--shuffle-over-same-T-seed",
         type=int,
@@ -219,6 +309,52 @@ def _create_parser() -> argparse.ArgumentParser:
             "sorting but before exploding. Value is the random seed."
         ),
     )
+    parser.add_argument(
+        "--slice-queue-depth",
+        type=int,
+        default=None,
+        help=(
+            "Maximum number of exploded slices awaiting insertion into the "
+            "trie; workers pause when full. Defaults to two per worker."
+        ),
+    )
+    parser.add_argument(
+        "--slice-transport",
+        type=str,
+        choices=["ipc", "shm"],
+        default="ipc",
+        help=(
+            "How workers hand off exploded slices: Arrow IPC spill files "
+            "(ipc) or shared memory (shm). Default ipc."
+        ),
+    )
+    parser.add_argument(
+        "--sort-run-size",
+        type=int,
+        default=None,
+        help=(
+            "If set, sort unpacked data on disk in runs of this many rows, "
+            "rather than in memory, to bound memory use. "
+            "Output is unaffected."
+        ),
+    )
+    parser.add_argument(
+        "--spill-compression",
+        type=str,
+        choices=["none", "lz4", "zstd"],
+        default="lz4",
+        help="Compression for temporary spill files. Default lz4.",
+    )
+    add_bool_arg(
+        parser,
+        "stream-presorted",
+        default=False,
+        help=(
+            "Stream input slice-wise, without materializing the full input? "
+            "Requires input rows to be sorted by ascending dstream_T, e.g., "
+            "parquet shards written in dstream_T order. Default False."
+        ),
+    )
     return parser
 
 
@@ -233,15 +369,29 @@ def _main(mp_context: str) -> None:
             base_parser=parser,
             output_dataframe_op=functools.partial(
                 surface_unpack_reconstruct,
+                checkpoint_freq=args.checkpoint_freq,
+                checkpoint_path=args.checkpoint_path,
                 collapse_unif_freq=args.collapse_unif_freq,
                 check_trie_invariant_freq=args.check_trie_invariant_freq,
                 check_trie_invariant_after_collapse_unif=args.check_trie_invariant_after_collapse_unif,
+                check_trie_invariant_full=args.check_trie_invariant_full,
                 drop_dstream_metadata=args.drop_dstream_metadata,
                 exploded_slice_size=args.exploded_slice_size,
+                extend_from=args.extend_from,
                 mp_context=mp_context,
                 mp_pool_size=args.mp_pool_size,
+                native_explode=args.native_explode,
+                num_threads=args.num_threads,
                 pa_source_type=args.pa_source_type,
+                resume_from=args.resume_from,
+                scratch_dir=args.scratch_dir,
+                searchtable_path=args.searchtable_path,
                 shuffle_over_same_T_seed=args.shuffle_over_same_T_seed,
+                slice_queue_depth=args.slice_queue_depth,
+                slice_transport=args.slice_transport,
+                sort_run_size=args.sort_run_size,
+                spill_compression=args.spill_compression,
+                stream_presorted=args.stream_presorted,
             ),
         )
 
@@ -26,6 +26,9 @@ Checks performed:
   3. Data is topologically sorted (each ancestor appears before its descendants).
   4. Samples random leaf-node pairs and compares each pair's first retained disparity rank (computed from deserialized surfaces) to the MRCA node's dstream_rank - dstream_S in the trie (converting from raw dstream T space to hstrat rank space). A violation occurs when first_disparity_rank < mrca_rank: the surfaces prove divergence earlier than the trie records.
 
+Sampled leaves' surfaces are decoded once, up front, and leaf pairs are checked in compiled batches --- large --max-num-checks values (e.g., millions of pairs) are practical.
+Use --mp-pool-size to distribute batches over worker processes.
+
 Intended for use after `surface_unpack_reconstruct --no-drop-dstream-metadata`.
 
 Prints the number of detected violations to stdout.
@@ -110,6 +113,16 @@ def _create_parser() -> argparse.ArgumentParser:
             "Default: 0."
         ),
     )
+    parser.add_argument(
+        "--mp-pool-size",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes for computing leaf-pair first "
+            "retained disparities in parallel. "
+            "Default: 1 (single process)."
+        ),
+    )
     parser.add_argument(
         "--seed",
         default=None,
@@ -147,6 +160,7 @@ if __name__ == "__main__":
             max_violations=args.max_violations,
             progress_wrap=tqdm,
             seed=args.seed,
+            mp_pool_size=args.mp_pool_size,
         )
 
     print(num_violations)
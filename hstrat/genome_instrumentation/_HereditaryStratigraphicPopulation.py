@@ -0,0 +1,414 @@
+from copy import copy
+import random
+import typing
+
+import numpy as np
+
+from ..stratum_retention_strategy.stratum_retention_algorithms import (
+    perfect_resolution_algo,
+)
+from ._HereditaryStratigraphicColumn import HereditaryStratigraphicColumn
+from ._HereditaryStratum import HereditaryStratum
+from .stratum_ordered_stores import HereditaryStratumOrderedStoreArray
+
+
+class HereditaryStratigraphicPopulation:
+    """Struct-of-arrays container holding hereditary stratigraphic columns for
+    an entire population.
+
+    Retained ranks and differentiae of all members are stored as 2D numpy
+    arrays, one row per member. Stratum deposition is performed for all
+    members in a single vectorized call, with the retention policy's
+    `GenDropRanks` evaluated only once per distinct number of strata deposited
+    among members, rather than once per member. Reproduction is gather-style:
+    descendants are produced by copying rows at an array of parent indices.
+
+    Potentially useful for simulations where per-organism
+    `HereditaryStratigraphicColumn` instances are a bottleneck. Individual
+    members may be extracted as `HereditaryStratigraphicColumn` objects for
+    downstream phylogenetic inference.
+
+    Notes
+    -----
+    Stratum retention policies are assumed to be deterministic, so that all
+    members with the same number of strata deposited retain the same ranks.
+    This holds for all policies provided by hstrat.
+
+    Differentia bit width is restricted to at most 64 bits. Stratum
+    annotations are not supported.
+    """
+
+    __slots__ = (
+        "_stratum_differentia_bit_width",
+        "_stratum_retention_policy",
+        "_num_strata_deposited",
+        "_num_strata_retained",
+        "_ranks",
+        "_differentiae",
+    )
+
+    # how many bits wide of differentia should the deposited strata be
+    # constructed with?
+    _stratum_differentia_bit_width: int
+    # functor specifying stratum retention policy
+    _stratum_retention_policy: typing.Any
+    # per-member count of strata deposited
+    _num_strata_deposited: np.ndarray
+    # per-member count of strata retained, i.e., number of populated entries
+    # in each row of `_ranks` and `_differentiae`
+    _num_strata_retained: np.ndarray
+    # 2D arrays, one row per member, storing retained strata from most ancient
+    # (column 0) to most recent, with spare capacity past retained count
+    _ranks: np.ndarray
+    _differentiae: np.ndarray
+
+    def __init__(
+        self: "HereditaryStratigraphicPopulation",
+        stratum_retention_policy: typing.Any = perfect_resolution_algo.Policy(),
+        *,
+        population_size: int,
+        stratum_differentia_bit_width: int = 64,
+    ):
+        """Initialize population of columns tracking new lines of descent.
+
+        Deposits a first stratum on each member, so GetNumStrataDeposited()
+        will return 1 after initialization, matching
+        HereditaryStratigraphicColumn.
+
+        Parameters
+        ----------
+        stratum_retention_policy : any
+            Policy struct that implements stratum retention policy by specifying
+            the set of strata ranks that should be pruned from a hereditary
+            stratigraphic column when the nth stratum is deposited.
+        population_size : int
+            Number of member columns.
+        stratum_differentia_bit_width : int, optional
+            The bit width of the generated differentia. Default 64, allowing
+            for 2^64 distinct values. Must be at most 64.
+        """
+        if not 1 <= stratum_differentia_bit_width <= 64:
+            raise ValueError(
+                "stratum_differentia_bit_width must be between 1 and 64, "
+                f"but got {stratum_differentia_bit_width}",
+            )
+        if population_size < 0:
+            raise ValueError(
+                f"population_size must be nonnegative, got {population_size}",
+            )
+
+        self._stratum_differentia_bit_width = stratum_differentia_bit_width
+        self._stratum_retention_policy = stratum_retention_policy
+        self._num_strata_deposited = np.zeros(population_size, dtype=np.int64)
+        self._num_strata_retained = np.zeros(population_size, dtype=np.int64)
+        self._ranks = np.empty((population_size, 0), dtype=np.int64)
+        self._differentiae = np.empty((population_size, 0), dtype=np.uint64)
+        self.DepositStratum()
+
+    def __eq__(
+        self: "HereditaryStratigraphicPopulation",
+        other: typing.Any,
+    ) -> bool:
+        """Compare for value-wise equality."""
+        if not isinstance(other, self.__class__) or (
+            self._stratum_differentia_bit_width,
+            self._stratum_retention_policy,
+        ) != (
+            other._stratum_differentia_bit_width,
+            other._stratum_retention_policy,
+        ):
+            return False
+
+        if not (
+            np.array_equal(
+                self._num_strata_deposited, other._num_strata_deposited
+            )
+            and np.array_equal(
+                self._num_strata_retained, other._num_strata_retained
+            )
+        ):
+            return False
+
+        # compare only populated entries, not spare capacity
+        width = min(self._ranks.shape[1], other._ranks.shape[1])
+        populated = np.arange(width) < self._num_strata_retained[:, None]
+        return bool(
+            (self._num_strata_retained <= width).all()
+            and (self._ranks[:, :width] == other._ranks[:, :width])[
+                populated
+            ].all()
+            and (
+                self._differentiae[:, :width] == other._differentiae[:, :width]
+            )[populated].all()
+        )
+
+    def _Reserve(
+        self: "HereditaryStratigraphicPopulation", capacity: int
+    ) -> None:
+        """Grow backing arrays to hold at least `capacity` strata per member.
+
+        Implementation detail. Capacity is at least doubled on growth, so that
+        deposition is amortized constant time.
+        """
+        old_capacity = self._ranks.shape[1]
+        if capacity <= old_capacity:
+            return
+
+        capacity = max(capacity, 2 * old_capacity)
+        for attr in "_ranks", "_differentiae":
+            old = getattr(self, attr)
+            new = np.empty((len(old), capacity), dtype=old.dtype)
+            new[:, :old_capacity] = old
+            setattr(self, attr, new)
+
+    def _GenerateDifferentiae(
+        self: "HereditaryStratigraphicPopulation", num_differentiae: int
+    ) -> np.ndarray:
+        """Draw random differentia values for newly-deposited strata.
+
+        Uses the same source of randomness as HereditaryStratum, so seeding
+        the `random` module makes population runs reproducible and matchable
+        against column-based runs.
+        """
+        randrange = random.randrange
+        upper = 2**self._stratum_differentia_bit_width
+        return np.fromiter(
+            (randrange(upper) for __ in range(num_differentiae)),
+            dtype=np.uint64,
+            count=num_differentiae,
+        )
+
+    def DepositStratum(
+        self: "HereditaryStratigraphicPopulation",
+        member_indices: typing.Optional[np.ndarray] = None,
+    ) -> None:
+        """Elapse a generation for population members.
+
+        Parameters
+        ----------
+        member_indices : array_like of int, optional
+            Indices of members to deposit a stratum on. If None, the default,
+            a stratum is deposited on every member.
+        """
+        if member_indices is None:
+            member_indices = np.arange(self.GetPopulationSize())
+        else:
+            member_indices = np.unique(np.asarray(member_indices, dtype=int))
+
+        # draw in member order, matching deposition on individual columns
+        differentiae = self._GenerateDifferentiae(len(member_indices))
+
+        # group members by deposition count before any counts are advanced
+        num_deposited = self._num_strata_deposited[member_indices]
+        unique_num_deposited, group_ids = np.unique(
+            num_deposited, return_inverse=True
+        )
+        for group_id, num_deposited in enumerate(
+            unique_num_deposited.tolist()
+        ):
+            if len(unique_num_deposited) == 1:
+                rows = member_indices
+                group_differentiae = differentiae
+            else:
+                mask = group_ids == group_id
+                rows = member_indices[mask]
+                group_differentiae = differentiae[mask]
+            self._DepositStratumOnGroup(
+                rows, num_deposited, group_differentiae
+            )
+
+    def _DepositStratumOnGroup(
+        self: "HereditaryStratigraphicPopulation",
+        rows: np.ndarray,
+        num_deposited: int,
+        differentiae: np.ndarray,
+    ) -> None:
+        """Deposit a stratum on members that share a deposition count.
+
+        Implementation detail. Drop ranks are calculated once for the entire
+        group then applied to all rows as a single column-wise gather.
+        """
+        if not len(rows):
+            return
+
+        num_retained = int(self._num_strata_retained[rows[0]])
+        self._Reserve(num_retained + 1)
+        self._ranks[rows, num_retained] = num_deposited
+        self._differentiae[rows, num_retained] = differentiae
+        num_retained += 1
+
+        retained_ranks = self._ranks[rows[0], :num_retained]
+        condemned_ranks = np.fromiter(
+            self._stratum_retention_policy.GenDropRanks(
+                num_stratum_depositions_completed=num_deposited,
+                retained_ranks=retained_ranks.tolist(),
+            ),
+            dtype=np.int64,
+        )
+        if len(condemned_ranks):
+            (keep,) = np.nonzero(~np.isin(retained_ranks, condemned_ranks))
+            for values in self._ranks, self._differentiae:
+                values[rows, : len(keep)] = values[rows[:, None], keep]
+            num_retained = len(keep)
+
+        self._num_strata_retained[rows] = num_retained
+        self._num_strata_deposited[rows] = num_deposited + 1
+
+    def DepositStrata(
+        self: "HereditaryStratigraphicPopulation",
+        num_stratum_depositions: int,
+        member_indices: typing.Optional[np.ndarray] = None,
+    ) -> None:
+        """Elapse n generations for population members.
+
+        Parameters
+        ----------
+        num_stratum_depositions: int
+            How many generations to elapse?
+        member_indices : array_like of int, optional
+            Indices of members to deposit strata on. If None, the default,
+            strata are deposited on every member.
+        """
+        for _ in range(num_stratum_depositions):
+            self.DepositStratum(member_indices=member_indices)
+
+    def GetPopulationSize(self: "HereditaryStratigraphicPopulation") -> int:
+        """How many member columns are contained in the population?"""
+        return len(self._num_strata_deposited)
+
+    def GetNumStrataDeposited(
+        self: "HereditaryStratigraphicPopulation",
+    ) -> np.ndarray:
+        """Get per-member count of strata deposited, as an integer array.
+
+        Each value includes the initial stratum deposited during population
+        initialization.
+        """
+        return self._num_strata_deposited.copy()
+
+    def GetNumStrataRetained(
+        self: "HereditaryStratigraphicPopulation",
+    ) -> np.ndarray:
+        """Get per-member count of strata retained, as an integer array."""
+        return self._num_strata_retained.copy()
+
+    def GetStratumDifferentiaBitWidth(
+        self: "HereditaryStratigraphicPopulation",
+    ) -> int:
+        """Get the bit width of differentia in member columns."""
+        return self._stratum_differentia_bit_width
+
+    def IterRetainedRanks(
+        self: "HereditaryStratigraphicPopulation",
+        index: int,
+    ) -> typing.Iterator[int]:
+        """Iterate over deposition ranks of strata retained by a member, from
+        most ancient to most recent."""
+        num_retained = self._num_strata_retained[index]
+        yield from self._ranks[index, :num_retained].tolist()
+
+    def IterRetainedDifferentia(
+        self: "HereditaryStratigraphicPopulation",
+        index: int,
+    ) -> typing.Iterator[int]:
+        """Iterate over differentia of strata retained by a member, from most
+        ancient to most recent."""
+        num_retained = self._num_strata_retained[index]
+        yield from self._differentiae[index, :num_retained].tolist()
+
+    def GetMember(
+        self: "HereditaryStratigraphicPopulation",
+        index: int,
+    ) -> HereditaryStratigraphicColumn:
+        """Extract a member as an independent HereditaryStratigraphicColumn.
+
+        The returned column is backed by a HereditaryStratumOrderedStoreArray
+        and may be freely altered without affecting the population.
+        """
+        store = HereditaryStratumOrderedStoreArray()
+        for rank, differentia in zip(
+            self.IterRetainedRanks(index),
+            self.IterRetainedDifferentia(index),
+        ):
+            store.DepositStratum(
+                rank=rank,
+                stratum=HereditaryStratum(
+                    deposition_rank=rank,
+                    differentia=differentia,
+                    differentia_bit_width=self._stratum_differentia_bit_width,
+                ),
+            )
+
+        return HereditaryStratigraphicColumn(
+            self._stratum_retention_policy,
+            stratum_differentia_bit_width=self._stratum_differentia_bit_width,
+            stratum_ordered_store=(
+                store,
+                int(self._num_strata_deposited[index]),
+            ),
+        )
+
+    def IterMembers(
+        self: "HereditaryStratigraphicPopulation",
+    ) -> typing.Iterator[HereditaryStratigraphicColumn]:
+        """Iterate over members as independent HereditaryStratigraphicColumn
+        objects."""
+        for index in range(self.GetPopulationSize()):
+            yield self.GetMember(index)
+
+    def Clone(
+        self: "HereditaryStratigraphicPopulation",
+    ) -> "HereditaryStratigraphicPopulation":
+        """Create an independent copy of the population.
+
+        Contains identical data but may be freely altered without affecting
+        data within this population.
+        """
+        return self.CloneMembers(np.arange(self.GetPopulationSize()))
+
+    def CloneMembers(
+        self: "HereditaryStratigraphicPopulation",
+        member_indices: np.ndarray,
+    ) -> "HereditaryStratigraphicPopulation":
+        """Create a new population by copying members at specified indices.
+
+        Indices may repeat, and the resulting population size is the number of
+        indices provided. Does not alter self.
+
+        Parameters
+        ----------
+        member_indices : array_like of int
+            Indices of members to copy, in the order they should appear in the
+            resulting population.
+        """
+        member_indices = np.asarray(member_indices, dtype=int)
+        # shallow copy
+        result = copy(self)
+        # gather rows, trimming spare capacity
+        width = int(self._num_strata_retained.max(initial=0))
+        result._num_strata_deposited = self._num_strata_deposited[
+            member_indices
+        ]
+        result._num_strata_retained = self._num_strata_retained[member_indices]
+        result._ranks = self._ranks[member_indices, :width]
+        result._differentiae = self._differentiae[member_indices, :width]
+        return result
+
+    def CloneDescendants(
+        self: "HereditaryStratigraphicPopulation",
+        parent_indices: np.ndarray,
+    ) -> "HereditaryStratigraphicPopulation":
+        """Create a population of offspring from specified parents.
+
+        Each offspring is a copy of the member at the corresponding parent
+        index with an additional stratum deposited. Does not alter self.
+
+        Parameters
+        ----------
+        parent_indices : array_like of int
+            Index of the parent of each offspring. Indices may repeat, and the
+            resulting population size is the number of indices provided.
+        """
+        res = self.CloneMembers(parent_indices)
+        res.DepositStratum()
+        return res
@@ -12,12 +12,16 @@ __getattr__, __dir__, __all__ = lazy_attach(
         "_HereditaryStratigraphicColumnBundle": [
             "HereditaryStratigraphicColumnBundle",
         ],
+        "_HereditaryStratigraphicPopulation": [
+            "HereditaryStratigraphicPopulation",
+        ],
         "_HereditaryStratigraphicSurface": ["HereditaryStratigraphicSurface"],
         "_HereditaryStratum": ["HereditaryStratum"],
     },
     should_launder=[
         "HereditaryStratigraphicColumn",
         "HereditaryStratigraphicColumnBundle",
+        "HereditaryStratigraphicPopulation",
         "HereditaryStratigraphicSurface",
         "HereditaryStratum",
     ].__contains__,
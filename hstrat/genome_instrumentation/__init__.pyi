@@ -4,13 +4,21 @@ from _HereditaryStratigraphicColumn import HereditaryStratigraphicColumn
 from _HereditaryStratigraphicColumnBundle import (
     HereditaryStratigraphicColumnBundle,
 )
+from _HereditaryStratigraphicPopulation import (
+    HereditaryStratigraphicPopulation,
+)
 from _HereditaryStratigraphicSurface import HereditaryStratigraphicSurface
 from _HereditaryStratum import HereditaryStratum
 from stratum_ordered_stores import (
+    CopyOnWriteStoreStats,
+    HereditaryStratumOrderedStoreArray,
+    HereditaryStratumOrderedStoreCopyOnWrite,
     HereditaryStratumOrderedStoreDict,
     HereditaryStratumOrderedStoreList,
     HereditaryStratumOrderedStoreTree,
+    get_copy_on_write_store_stats,
     provided_stratum_ordered_stores,
+    reset_copy_on_write_store_stats,
 )
 
 from . import stratum_ordered_stores
@@ -20,9 +28,15 @@ __all__ = [
     "HereditaryStratum",
     "HereditaryStratigraphicColumn",
     "HereditaryStratigraphicColumnBundle",
+    "HereditaryStratigraphicPopulation",
     "HereditaryStratigraphicSurface",
+    "CopyOnWriteStoreStats",
+    "HereditaryStratumOrderedStoreArray",
+    "HereditaryStratumOrderedStoreCopyOnWrite",
     "HereditaryStratumOrderedStoreDict",
     "HereditaryStratumOrderedStoreList",
     "HereditaryStratumOrderedStoreTree",
+    "get_copy_on_write_store_stats",
     "provided_stratum_ordered_stores",
+    "reset_copy_on_write_store_stats",
 ]
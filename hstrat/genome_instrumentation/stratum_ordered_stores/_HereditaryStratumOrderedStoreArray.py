@@ -0,0 +1,292 @@
+from copy import copy
+import typing
+
+import numpy as np
+
+from .._HereditaryStratum import HereditaryStratum
+from ._detail import HereditaryStratumOrderedStoreBase
+
+
+class HereditaryStratumOrderedStoreArray(HereditaryStratumOrderedStoreBase):
+    """Interchangeable backing container for HereditaryStratigraphicColumn.
+
+    Stores deposition ranks and differentiae of retained strata in contiguous
+    numpy arrays, from most ancient (index 0, front) to most recent (back).
+    Annotations, if any, are kept in a side table keyed by deposition rank.
+    Strata are not stored as objects, so `HereditaryStratum` objects returned
+    from this store are reconstructed on access.
+
+    Potentially useful in scenarios where many columns are instrumented, as
+    deposition does not allocate per-stratum objects, deletion is a vectorized
+    compaction, rank lookup is a binary search, and cloning is a single copy
+    of each array.
+    """
+
+    __slots__ = (
+        "_ranks",
+        "_differentiae",
+        "_has_stratum_ranks",
+        "_annotations",
+        "_num_strata_retained",
+    )
+
+    # ranks and differentiae stored from most ancient (index 0, front) to
+    # most recent (back), with spare capacity past `_num_strata_retained`
+    _ranks: np.ndarray
+    # uint64, or object if any differentia exceeds 64 bits
+    _differentiae: np.ndarray
+    # were deposition ranks stored within deposited strata?
+    _has_stratum_ranks: np.ndarray
+    # maps rank to annotation, for strata with annotations
+    _annotations: typing.Dict[int, typing.Any]
+    _num_strata_retained: int
+
+    def __init__(self: "HereditaryStratumOrderedStoreArray"):
+        """Initialize instance variables."""
+        self._ranks = np.empty(0, dtype=np.int64)
+        self._differentiae = np.empty(0, dtype=np.uint64)
+        self._has_stratum_ranks = np.empty(0, dtype=bool)
+        self._annotations = {}
+        self._num_strata_retained = 0
+
+    def __eq__(
+        self: "HereditaryStratumOrderedStoreArray",
+        other: "HereditaryStratumOrderedStoreArray",
+    ) -> bool:
+        """Compare for value-wise equality."""
+        n = self._num_strata_retained
+        return (
+            isinstance(
+                other,
+                self.__class__,
+            )
+            and n == other._num_strata_retained
+            and np.array_equal(self._ranks[:n], other._ranks[:n])
+            and np.array_equal(self._differentiae[:n], other._differentiae[:n])
+            and np.array_equal(
+                self._has_stratum_ranks[:n], other._has_stratum_ranks[:n]
+            )
+            and self._annotations == other._annotations
+        )
+
+    def _Reserve(
+        self: "HereditaryStratumOrderedStoreArray", capacity: int
+    ) -> None:
+        """Grow backing arrays to hold at least `capacity` strata.
+
+        Implementation detail. Capacity is at least doubled on growth, so that
+        deposition is amortized constant time.
+        """
+        if capacity <= len(self._ranks):
+            return
+
+        capacity = max(capacity, 2 * len(self._ranks))
+        n = self._num_strata_retained
+        for attr in "_ranks", "_differentiae", "_has_stratum_ranks":
+            old = getattr(self, attr)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, attr, new)
+
+    def DepositStratum(
+        self: "HereditaryStratumOrderedStoreArray",
+        rank: int,
+        stratum: "HereditaryStratum",
+    ) -> None:
+        """Insert a new stratum into the store.
+
+        Parameters
+        ----------
+        rank : int
+            The position of the stratum being deposited within the sequence of strata deposited into the column. Precisely, the number of strata that have been deposited before stratum.
+        stratum : HereditaryStratum
+            The stratum to deposit.
+        """
+        differentia = stratum.GetDifferentia()
+        if (
+            differentia > np.iinfo(np.uint64).max
+            and self._differentiae.dtype != object
+        ):
+            self._differentiae = self._differentiae.astype(object)
+
+        n = self._num_strata_retained
+        self._Reserve(n + 1)
+        self._ranks[n] = rank
+        self._differentiae[n] = differentia
+        self._has_stratum_ranks[n] = stratum.GetDepositionRank() is not None
+        annotation = stratum.GetAnnotation()
+        if annotation is not None:
+            self._annotations[rank] = annotation
+        self._num_strata_retained = n + 1
+
+    def GetNumStrataRetained(
+        self: "HereditaryStratumOrderedStoreArray",
+    ) -> int:
+        """How many strata are present in the store?
+
+        May be fewer than the number of strata deposited if deletions have
+        occured.
+        """
+        return self._num_strata_retained
+
+    def GetStratumAtColumnIndex(
+        self: "HereditaryStratumOrderedStoreArray",
+        index: int,
+        # needed for other implementations
+        get_rank_at_column_index: typing.Optional[typing.Callable] = None,
+    ) -> HereditaryStratum:
+        """Get the stratum positioned at index i among retained strata.
+
+        Index order is from most ancient (index 0) to most recent.
+
+        Parameters
+        ----------
+        ranks : iterator over int
+            The ranks that are to be deleted.
+        get_column_index_of_rank : callable, optional
+            Callable that returns the index position within retained strata of
+            the stratum deposited at rank r. Not used in this method.
+        """
+        n = self._num_strata_retained
+        if not -n <= index < n:
+            raise IndexError("column index out of range")
+        index %= n
+
+        rank = int(self._ranks[index])
+        return HereditaryStratum(
+            annotation=self._annotations.get(rank),
+            deposition_rank=rank if self._has_stratum_ranks[index] else None,
+            differentia=int(self._differentiae[index]),
+            differentia_bit_width=None,
+        )
+
+    def GetRankAtColumnIndex(
+        self: "HereditaryStratumOrderedStoreArray",
+        index: int,
+    ) -> int:
+        """Map from deposition generation to column position.
+
+        What is the deposition rank of the stratum positioned at index i
+        among retained strata? Index order is from most ancient (index 0) to
+        most recent.
+        """
+        return int(self._ranks[: self._num_strata_retained][index])
+
+    def GetColumnIndexOfRank(
+        self: "HereditaryStratumOrderedStoreArray",
+        rank: int,
+    ) -> typing.Optional[int]:
+        """Map from column position to deposition generation
+
+        What is the index position within retained strata of the stratum
+        deposited at rank r? Returns None if no stratum with rank r is present
+        within the store.
+        """
+        ranks = self._ranks[: self._num_strata_retained]
+        res_idx = int(np.searchsorted(ranks, rank))
+        if res_idx < len(ranks) and ranks[res_idx] == rank:
+            return res_idx
+        else:
+            return None
+
+    def DelRanks(
+        self: "HereditaryStratumOrderedStoreArray",
+        ranks: typing.Iterable[int],
+        # needed for other implementations
+        get_column_index_of_rank: typing.Optional[typing.Callable] = None,
+    ) -> None:
+        """Purge strata with specified deposition ranks from the store.
+
+        Parameters
+        ----------
+        ranks : iterator over int
+            The ranks that are to be deleted.
+        get_column_index_of_rank : callable, optional
+            Callable that returns the deposition rank of the stratum positioned
+            at index i among retained strata. Not used in this method.
+        """
+        ranks = np.fromiter(ranks, dtype=np.int64)
+        if not len(ranks):
+            return
+
+        n = self._num_strata_retained
+        retained_ranks = self._ranks[:n]
+        indices = np.searchsorted(retained_ranks, ranks)
+        assert (indices < n).all()
+        assert (retained_ranks[indices] == ranks).all()
+
+        keep = np.ones(n, dtype=bool)
+        keep[indices] = False
+        num_kept = int(keep.sum())
+        for attr in "_ranks", "_differentiae", "_has_stratum_ranks":
+            values = getattr(self, attr)
+            values[:num_kept] = values[:n][keep]
+
+        if self._annotations:
+            for rank in ranks.tolist():
+                self._annotations.pop(rank, None)
+        self._num_strata_retained = num_kept
+
+    def IterRetainedRanks(
+        self: "HereditaryStratumOrderedStoreArray",
+    ) -> typing.Iterator[int]:
+        """Iterate over deposition ranks of strata present in the store from
+        most ancient to most recent.
+
+        The store may be altered during iteration without iterator
+        invalidation, although subsequent updates will not be reflected in the
+        iterator.
+        """
+        # tolist makes copy, preventing invalidation when strata are deleted
+        yield from self._ranks[: self._num_strata_retained].tolist()
+
+    def IterRetainedStrata(
+        self: "HereditaryStratumOrderedStoreArray",
+    ) -> typing.Iterator[HereditaryStratum]:
+        """Iterate over stored strata from most ancient to most recent."""
+        for index in range(self._num_strata_retained):
+            yield self.GetStratumAtColumnIndex(index)
+
+    def IterRankDifferentiaZip(
+        self: "HereditaryStratumOrderedStoreArray",
+        # needed for other implementations
+        get_rank_at_column_index: typing.Optional[typing.Callable] = None,
+        start_column_index: int = 0,
+    ) -> typing.Iterator[typing.Tuple[int, int]]:
+        """Iterate over differentia and corresponding deposition ranks.
+
+        Values yielded as tuples. Guaranteed ordered from most ancient to most
+        recent.
+
+        Parameters
+        ----------
+        get_rank_at_column_index : callable, optional
+            Callable that returns the deposition rank of the stratum positioned
+            at index i among retained strata. Not used in this method.
+        start_column_index : callable, optional
+            Number of strata to skip over before yielding first result from the
+            iterator. Default 0, meaning no strata are skipped over.
+        """
+        n = self._num_strata_retained
+        yield from zip(
+            self._ranks[start_column_index:n].tolist(),
+            self._differentiae[start_column_index:n].tolist(),
+        )
+
+    def Clone(
+        self: "HereditaryStratumOrderedStoreArray",
+    ) -> "HereditaryStratumOrderedStoreArray":
+        """Create an independent copy of the store.
+
+        Returned copy contains identical data but may be freely altered without
+        affecting data within this store.
+        """
+        # shallow copy
+        result = copy(self)
+        # copy only retained strata, not spare capacity
+        n = self._num_strata_retained
+        result._ranks = self._ranks[:n].copy()
+        result._differentiae = self._differentiae[:n].copy()
+        result._has_stratum_ranks = self._has_stratum_ranks[:n].copy()
+        result._annotations = self._annotations.copy()
+        return result
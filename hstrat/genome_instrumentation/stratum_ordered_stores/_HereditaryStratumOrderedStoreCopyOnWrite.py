@@ -0,0 +1,426 @@
+import bisect
+from copy import copy
+import itertools as it
+import threading
+import typing
+
+from interval_search import binary_search
+
+from .._HereditaryStratum import HereditaryStratum
+from ._detail import HereditaryStratumOrderedStoreBase
+
+
+class CopyOnWriteStoreStats(typing.NamedTuple):
+    """Cumulative statistics on strata sharing between cloned
+    `HereditaryStratumOrderedStoreCopyOnWrite` instances."""
+
+    # number of Clone calls
+    num_clones: int
+    # number of strata references shared, rather than copied, at clone time
+    num_strata_shared: int
+    # number of strata references copied when shared chunks were modified
+    num_strata_copied: int
+
+    @property
+    def num_strata_copies_avoided(self: "CopyOnWriteStoreStats") -> int:
+        """How many fewer strata references were copied than would have been
+        under full copy cloning?"""
+        return self.num_strata_shared - self.num_strata_copied
+
+    @property
+    def savings_fraction(self: "CopyOnWriteStoreStats") -> float:
+        """Fraction of strata reference copies avoided relative to full copy
+        cloning, or NaN if no strata have been shared."""
+        if self.num_strata_shared:
+            return self.num_strata_copies_avoided / self.num_strata_shared
+        else:
+            return float("nan")
+
+
+# module-level counters, reported via get_copy_on_write_store_stats
+# guarded by _stats_lock so counts stay exact under multithreaded cloning
+_stats_lock = threading.Lock()
+_num_clones = 0
+_num_strata_shared = 0
+_num_strata_copied = 0
+
+
+def get_copy_on_write_store_stats() -> CopyOnWriteStoreStats:
+    """Report cumulative strata sharing statistics across all
+    HereditaryStratumOrderedStoreCopyOnWrite instances in this process."""
+    with _stats_lock:
+        return CopyOnWriteStoreStats(
+            num_clones=_num_clones,
+            num_strata_shared=_num_strata_shared,
+            num_strata_copied=_num_strata_copied,
+        )
+
+
+def reset_copy_on_write_store_stats() -> None:
+    """Zero cumulative strata sharing statistics reported by
+    `get_copy_on_write_store_stats`."""
+    global _num_clones, _num_strata_shared, _num_strata_copied
+    with _stats_lock:
+        _num_clones = 0
+        _num_strata_shared = 0
+        _num_strata_copied = 0
+
+
+def _record_strata_copied(num_strata: int) -> None:
+    """Increment cumulative count of strata copied on divergence.
+
+    Implementation detail.
+    """
+    global _num_strata_copied
+    with _stats_lock:
+        _num_strata_copied += num_strata
+
+
+class HereditaryStratumOrderedStoreCopyOnWrite(
+    HereditaryStratumOrderedStoreBase
+):
+    """Interchangeable backing container for HereditaryStratigraphicColumn.
+
+    Stores deposited strata as a sequence of fixed-capacity chunks, from most
+    ancient (index 0, front) to most recent (back). Cloned stores share chunks
+    with the original store; a chunk is copied only when a store holding a
+    shared reference to it deposits into or deletes from it. Underfull
+    chunks left behind by deletions are merged with their neighbors, so the
+    number of chunks stays proportional to the number of strata retained.
+    Because parent and offspring columns retain nearly the same strata,
+    cloning costs are proportional to the number of chunks rather than the
+    number of strata, and most chunks remain shared across a lineage.
+
+    Potentially useful in scenarios where columns are cloned frequently, such
+    as high-fecundity simulations. Cumulative sharing statistics are
+    available via `get_copy_on_write_store_stats`.
+    """
+
+    __slots__ = ("_chunks", "_chunk_owned", "_chunk_offsets")
+
+    # maximum number of strata per chunk
+    _chunk_capacity: typing.ClassVar[int] = 16
+
+    # strata stored from most ancient (chunk 0, index 0) to most recent (back)
+    _chunks: typing.List[typing.List[HereditaryStratum]]
+    # is corresponding chunk exclusively referenced by this store?
+    # i.e., can it be modified in place?
+    _chunk_owned: typing.List[bool]
+    # column index of first stratum in each chunk, plus total strata count
+    # lazily recomputed after modification, None if stale
+    _chunk_offsets: typing.Optional[typing.List[int]]
+
+    def __init__(self: "HereditaryStratumOrderedStoreCopyOnWrite"):
+        """Initialize instance variables."""
+        self._chunks = []
+        self._chunk_owned = []
+        self._chunk_offsets = [0]
+
+    def __eq__(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+        other: "HereditaryStratumOrderedStoreCopyOnWrite",
+    ) -> bool:
+        """Compare for value-wise equality."""
+        # compare strata, not chunking or ownership
+        return isinstance(other, self.__class__) and all(
+            a is b or a == b
+            for a, b in it.zip_longest(
+                self.IterRetainedStrata(),
+                other.IterRetainedStrata(),
+                fillvalue=object(),
+            )
+        )
+
+    def _GetChunkOffsets(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+    ) -> typing.List[int]:
+        """Get column index of first stratum in each chunk, plus total strata
+        count.
+
+        Implementation detail.
+        """
+        if self._chunk_offsets is None:
+            self._chunk_offsets = [
+                0,
+                *it.accumulate(map(len, self._chunks)),
+            ]
+        return self._chunk_offsets
+
+    def _LocateColumnIndex(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+        index: int,
+    ) -> typing.Tuple[int, int]:
+        """Map column index to chunk index and position within chunk.
+
+        Implementation detail.
+        """
+        offsets = self._GetChunkOffsets()
+        num_strata = offsets[-1]
+        if not -num_strata <= index < num_strata:
+            raise IndexError("column index out of range")
+        index %= num_strata
+
+        chunk_index = bisect.bisect_right(offsets, index) - 1
+        return chunk_index, index - offsets[chunk_index]
+
+    def _AcquireChunk(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+        chunk_index: int,
+    ) -> typing.List[HereditaryStratum]:
+        """Get chunk for modification, copying it first if shared.
+
+        Implementation detail.
+        """
+        if not self._chunk_owned[chunk_index]:
+            chunk = self._chunks[chunk_index]
+            self._chunks[chunk_index] = [*chunk]
+            self._chunk_owned[chunk_index] = True
+            _record_strata_copied(len(chunk))
+
+        self._chunk_offsets = None
+        return self._chunks[chunk_index]
+
+    def DepositStratum(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+        rank: typing.Optional[int],
+        stratum: "HereditaryStratum",
+    ) -> None:
+        """Insert a new stratum into the store.
+
+        Parameters
+        ----------
+        rank : typing.Optional[int]
+            The position of the stratum being deposited within the sequence of strata deposited into the column. Precisely, the number of strata that have been deposited before stratum.
+        stratum : HereditaryStratum
+            The stratum to deposit.
+        """
+        if self._chunks and len(self._chunks[-1]) < self._chunk_capacity:
+            self._AcquireChunk(len(self._chunks) - 1).append(stratum)
+        else:
+            self._chunks.append([stratum])
+            self._chunk_owned.append(True)
+            self._chunk_offsets = None
+
+    def GetNumStrataRetained(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+    ) -> int:
+        """How many strata are present in the store?
+
+        May be fewer than the number of strata deposited if deletions have
+        occured.
+        """
+        return self._GetChunkOffsets()[-1]
+
+    def GetStratumAtColumnIndex(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+        index: int,
+        # needed for other implementations
+        get_rank_at_column_index: typing.Optional[typing.Callable] = None,
+    ) -> HereditaryStratum:
+        """Get the stratum positioned at index i among retained strata.
+
+        Index order is from most ancient (index 0) to most recent.
+
+        Parameters
+        ----------
+        index : int
+            The column index of the stratum to get.
+        get_rank_at_column_index : callable, optional
+            Unused, needed for interchangeability with other implementations.
+        """
+        chunk_index, position = self._LocateColumnIndex(index)
+        return self._chunks[chunk_index][position]
+
+    def GetRankAtColumnIndex(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+        index: int,
+    ) -> int:
+        """Map from deposition generation to column position.
+
+        What is the deposition rank of the stratum positioned at index i
+        among retained strata? Index order is from most ancient (index 0) to
+        most recent.
+        """
+        res_rank = self.GetStratumAtColumnIndex(index).GetDepositionRank()
+        assert res_rank is not None
+        return res_rank
+
+    def GetColumnIndexOfRank(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+        rank: int,
+    ) -> typing.Optional[int]:
+        """Map from column position to deposition generation
+
+        What is the index position within retained strata of the stratum
+        deposited at rank r? Returns None if no stratum with rank r is present
+        within the store.
+        """
+        if self.GetNumStrataRetained() == 0:
+            return None
+        else:
+            res_idx = binary_search(
+                lambda idx: self.GetRankAtColumnIndex(idx) >= rank,
+                0,
+                self.GetNumStrataRetained() - 1,
+            )
+            if res_idx is None:
+                return None
+            elif self.GetRankAtColumnIndex(res_idx) == rank:
+                return res_idx
+            else:
+                return None
+
+    def DelRanks(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+        ranks: typing.Iterator[int],
+        # deposition ranks might not be stored in strata
+        get_column_index_of_rank: typing.Optional[typing.Callable] = None,
+    ) -> None:
+        """Purge strata with specified deposition ranks from the store.
+
+        Only chunks containing purged strata are copied, if shared.
+
+        Parameters
+        ----------
+        ranks : iterator over int
+            The ranks that are to be deleted.
+        get_column_index_of_rank : callable, optional
+            Callable that returns the deposition rank of the stratum positioned
+            at index i among retained strata.
+        """
+        if get_column_index_of_rank is None:
+            get_column_index_of_rank = self.GetColumnIndexOfRank
+
+        # locate all indices before any deletion
+        locations = [
+            self._LocateColumnIndex(get_column_index_of_rank(rank))
+            for rank in ranks
+        ]
+        # delete in reverse order to prevent invalidation
+        for chunk_index, position in sorted(locations, reverse=True):
+            del self._AcquireChunk(chunk_index)[position]
+
+        if locations:
+            self._CompactChunks()
+
+    def _CompactChunks(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+    ) -> None:
+        """Discard emptied chunks and merge underfull chunks into neighbors.
+
+        Afterwards, any two adjacent chunks together hold more than half of
+        chunk capacity, bounding the number of chunks to about four times the
+        number of strata retained divided by chunk capacity.
+
+        Implementation detail.
+        """
+        half_capacity = self._chunk_capacity // 2
+        chunks = []
+        chunk_owned = []
+        num_strata_copied = 0
+        for chunk, owned in zip(self._chunks, self._chunk_owned):
+            if not chunk:
+                continue
+            elif (
+                chunks
+                and min(len(chunks[-1]), len(chunk)) < half_capacity
+                and len(chunks[-1]) + len(chunk) <= self._chunk_capacity
+            ):
+                if not chunk_owned[-1]:
+                    num_strata_copied += len(chunks[-1])
+                    chunks[-1] = [*chunks[-1]]
+                    chunk_owned[-1] = True
+                if not owned:
+                    num_strata_copied += len(chunk)
+                chunks[-1].extend(chunk)
+            else:
+                chunks.append(chunk)
+                chunk_owned.append(owned)
+
+        self._chunks = chunks
+        self._chunk_owned = chunk_owned
+        self._chunk_offsets = None
+        if num_strata_copied:
+            _record_strata_copied(num_strata_copied)
+
+    def IterRetainedRanks(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+    ) -> typing.Iterator[int]:
+        """Iterate over deposition ranks of strata present in the store from
+        most ancient to most recent.
+
+        The store may be altered during iteration without iterator
+        invalidation, although subsequent updates will not be reflected in the
+        iterator.
+        """
+        # must make copy to prevent invalidation when strata are deleted
+        ranks = [stratum.GetDepositionRank() for stratum in self._IterData()]
+        for rank in ranks:
+            assert rank is not None
+            yield rank
+
+    def _IterData(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+    ) -> typing.Iterator[HereditaryStratum]:
+        """Iterate over stored strata, without protection from invalidation.
+
+        Implementation detail.
+        """
+        return it.chain.from_iterable(self._chunks)
+
+    def IterRetainedStrata(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+    ) -> typing.Iterator[HereditaryStratum]:
+        """Iterate over stored strata from most ancient to most recent."""
+        yield from self._IterData()
+
+    def IterRankDifferentiaZip(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+        # deposition ranks might not be stored in strata
+        get_rank_at_column_index: typing.Optional[typing.Callable] = None,
+        start_column_index: int = 0,
+    ) -> typing.Iterator[typing.Tuple[int, int]]:
+        """Iterate over differentia and corresponding deposition ranks.
+
+        Values yielded as tuples. Guaranteed ordered from most ancient to most
+        recent.
+
+        Parameters
+        ----------
+        get_rank_at_column_index : callable, optional
+            Callable that returns the deposition rank of the stratum positioned
+            at index i among retained strata.
+        start_column_index : callable, optional
+            Number of strata to skip over before yielding first result from the
+            iterator. Default 0, meaning no strata are skipped over.
+        """
+        if get_rank_at_column_index is None:
+            get_rank_at_column_index = self.GetRankAtColumnIndex
+
+        for index, stratum in enumerate(
+            it.islice(self._IterData(), start_column_index, None),
+            start=start_column_index,
+        ):
+            yield (get_rank_at_column_index(index), stratum.GetDifferentia())
+
+    def Clone(
+        self: "HereditaryStratumOrderedStoreCopyOnWrite",
+    ) -> "HereditaryStratumOrderedStoreCopyOnWrite":
+        """Create an independent copy of the store.
+
+        Returned copy contains identical data but may be freely altered without
+        affecting data within this store. Chunks are shared between this store
+        and the returned copy until either modifies them.
+        """
+        global _num_clones, _num_strata_shared
+        with _stats_lock:
+            _num_clones += 1
+            _num_strata_shared += self.GetNumStrataRetained()
+
+        # shallow copy
+        result = copy(self)
+        # share chunks, relinquishing ownership on both sides
+        self._chunk_owned = [False] * len(self._chunks)
+        result._chunks = [*self._chunks]
+        result._chunk_owned = [*self._chunk_owned]
+        return result
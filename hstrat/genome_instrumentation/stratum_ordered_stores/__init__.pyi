@@ -1,3 +1,12 @@
+from ._HereditaryStratumOrderedStoreArray import (
+    HereditaryStratumOrderedStoreArray,
+)
+from ._HereditaryStratumOrderedStoreCopyOnWrite import (
+    CopyOnWriteStoreStats,
+    HereditaryStratumOrderedStoreCopyOnWrite,
+    get_copy_on_write_store_stats,
+    reset_copy_on_write_store_stats,
+)
 from ._HereditaryStratumOrderedStoreDict import (
     HereditaryStratumOrderedStoreDict,
 )
@@ -11,8 +20,13 @@ from ._provided_stratum_ordered_stores import provided_stratum_ordered_stores
 
 # adapted from https://stackoverflow.com/a/31079085
 __all__ = [
+    "CopyOnWriteStoreStats",
+    "HereditaryStratumOrderedStoreArray",
+    "HereditaryStratumOrderedStoreCopyOnWrite",
     "HereditaryStratumOrderedStoreDict",
     "HereditaryStratumOrderedStoreList",
     "HereditaryStratumOrderedStoreTree",
+    "get_copy_on_write_store_stats",
     "provided_stratum_ordered_stores",
+    "reset_copy_on_write_store_stats",
 ]
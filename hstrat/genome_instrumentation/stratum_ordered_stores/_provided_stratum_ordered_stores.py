@@ -1,3 +1,9 @@
+from ._HereditaryStratumOrderedStoreArray import (
+    HereditaryStratumOrderedStoreArray,
+)
+from ._HereditaryStratumOrderedStoreCopyOnWrite import (
+    HereditaryStratumOrderedStoreCopyOnWrite,
+)
 from ._HereditaryStratumOrderedStoreDict import (
     HereditaryStratumOrderedStoreDict,
 )
@@ -9,6 +15,8 @@ from ._HereditaryStratumOrderedStoreTree import (
 )
 
 provided_stratum_ordered_stores = [
+    HereditaryStratumOrderedStoreArray,
+    HereditaryStratumOrderedStoreCopyOnWrite,
     HereditaryStratumOrderedStoreDict,
     HereditaryStratumOrderedStoreList,
     HereditaryStratumOrderedStoreTree,
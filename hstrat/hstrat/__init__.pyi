@@ -11,14 +11,20 @@ from frozen_instrumentation import (
     HereditaryStratigraphicSpecimen,
 )
 from genome_instrumentation import (
+    CopyOnWriteStoreStats,
     HereditaryStratigraphicColumn,
     HereditaryStratigraphicColumnBundle,
+    HereditaryStratigraphicPopulation,
     HereditaryStratigraphicSurface,
     HereditaryStratum,
+    HereditaryStratumOrderedStoreArray,
+    HereditaryStratumOrderedStoreCopyOnWrite,
     HereditaryStratumOrderedStoreDict,
     HereditaryStratumOrderedStoreList,
     HereditaryStratumOrderedStoreTree,
+    get_copy_on_write_store_stats,
     provided_stratum_ordered_stores,
+    reset_copy_on_write_store_stats,
     stratum_ordered_stores,
 )
 from juxtaposition import (
@@ -131,17 +137,21 @@ from stratum_retention_strategy import (
     PropertyAtMostParameterizer,
     PropertyExactlyParameterizer,
     UnsatisfiableParameterizationRequestError,
+    clear_gen_drop_ranks_cache,
     depth_proportional_resolution_algo,
     depth_proportional_resolution_tapered_algo,
     fixed_resolution_algo,
     geom_seq_nth_root_algo,
     geom_seq_nth_root_tapered_algo,
+    get_gen_drop_ranks_cache_info,
+    is_gen_drop_ranks_cache_enabled,
     nominal_resolution_algo,
     perfect_resolution_algo,
     provided_stratum_retention_algorithms,
     pseudostochastic_algo,
     recency_proportional_resolution_algo,
     recency_proportional_resolution_curbed_algo,
+    set_gen_drop_ranks_cache_maxsize,
     stochastic_algo,
     stratum_retention_algorithms,
     stratum_retention_policy_evaluators,
@@ -199,10 +209,16 @@ __all__ = [
     "HereditaryStratigraphicColumn",
     "HereditaryStratigraphicSurface",
     "HereditaryStratigraphicColumnBundle",
+    "HereditaryStratigraphicPopulation",
+    "CopyOnWriteStoreStats",
+    "HereditaryStratumOrderedStoreArray",
+    "HereditaryStratumOrderedStoreCopyOnWrite",
     "HereditaryStratumOrderedStoreDict",
     "HereditaryStratumOrderedStoreList",
     "HereditaryStratumOrderedStoreTree",
+    "get_copy_on_write_store_stats",
     "provided_stratum_ordered_stores",
+    "reset_copy_on_write_store_stats",
     # juxtaposition
     "calc_definitive_max_rank_of_first_retained_disparity_between",
     "calc_definitive_max_rank_of_last_retained_commonality_between",
@@ -310,6 +326,10 @@ __all__ = [
     "NumStrataRetainedExactEvaluator",
     "NumStrataRetainedUpperBoundEvaluator",
     "UnsatisfiableParameterizationRequestError",
+    "clear_gen_drop_ranks_cache",
+    "get_gen_drop_ranks_cache_info",
+    "is_gen_drop_ranks_cache_enabled",
+    "set_gen_drop_ranks_cache_maxsize",
     "depth_proportional_resolution_algo",
     "depth_proportional_resolution_tapered_algo",
     "fixed_resolution_algo",
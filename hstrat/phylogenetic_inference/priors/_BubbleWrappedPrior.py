@@ -1,5 +1,7 @@
 import numbers
 
+import numpy as np
+
 from ..._auxiliary_lib import cmp_approx
 from ._detail import PriorBase
 
@@ -66,6 +68,77 @@ class BubbleWrappedPrior(PriorBase):
         assert res < end_rank
         return res
 
+    def CalcIntervalProbabilityProxyBatched(
+        self: "BubbleWrappedPrior",
+        begin_ranks: np.ndarray,
+        end_ranks: np.ndarray,
+    ) -> np.ndarray:
+        """Characterize the prior probability of the MRCA generation falling
+        within each of several interval ranges.
+
+        Parameters
+        ----------
+        begin_ranks : np.ndarray
+            The starting ranks of the intervals, inclusive.
+        end_ranks : np.ndarray
+            The ending ranks of the intervals, exclusive.
+
+        Returns
+        -------
+        np.ndarray
+            Float array of proxy statistics, one per interval, as would be
+            given by `CalcIntervalProbabilityProxy`.
+        """
+        begin_ranks = np.asarray(begin_ranks)
+        end_ranks = np.asarray(end_ranks)
+        assert np.issubdtype(begin_ranks.dtype, np.integer)
+        assert np.issubdtype(end_ranks.dtype, np.integer)
+        assert begin_ranks.shape == end_ranks.shape
+        assert np.all((0 <= begin_ranks) & (begin_ranks < end_ranks))
+        res = self._prior.CalcIntervalProbabilityProxyBatched(
+            begin_ranks, end_ranks
+        )
+        assert res.shape == begin_ranks.shape
+        return res
+
+    def CalcIntervalConditionedMeanBatched(
+        self: "BubbleWrappedPrior",
+        begin_ranks: np.ndarray,
+        end_ranks: np.ndarray,
+    ) -> np.ndarray:
+        """Calculate the centriod of prior probability mass within each of
+        several intervals of possible MRCA generations.
+
+        Parameters
+        ----------
+        begin_ranks : np.ndarray
+            The starting ranks of the intervals, inclusive.
+        end_ranks : np.ndarray
+            The ending ranks of the intervals, exclusive.
+
+        Returns
+        -------
+        np.ndarray
+            Float array of interval-conditioned prior means, one per interval,
+            as would be given by `CalcIntervalConditionedMean`.
+        """
+        begin_ranks = np.asarray(begin_ranks)
+        end_ranks = np.asarray(end_ranks)
+        assert np.issubdtype(begin_ranks.dtype, np.integer)
+        assert np.issubdtype(end_ranks.dtype, np.integer)
+        assert begin_ranks.shape == end_ranks.shape
+        assert np.all((0 <= begin_ranks) & (begin_ranks < end_ranks))
+        res = self._prior.CalcIntervalConditionedMeanBatched(
+            begin_ranks, end_ranks
+        )
+        assert res.shape == begin_ranks.shape
+        # equivalent to cmp_approx(begin_rank, res) <= 0
+        assert np.all(
+            (res >= begin_ranks) | np.isclose(res, begin_ranks, rtol=1e-9)
+        )
+        assert np.all(res < end_ranks)
+        return res
+
     def SampleIntervalConditionedValue(
         self: "BubbleWrappedPrior", begin_rank: int, end_rank: int
     ) -> int:
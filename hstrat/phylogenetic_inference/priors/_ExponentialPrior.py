@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 from ._UniformPrior import UniformPrior
 from ._detail import PriorBase
 
@@ -121,6 +123,80 @@ class ExponentialPrior(PriorBase):
 
         return (a * f**a - b * f**b) / (f**a - f**b) - 1 / math.log(f)
 
+    def CalcIntervalProbabilityProxyBatched(
+        self: "ExponentialPrior",
+        begin_ranks: np.ndarray,
+        end_ranks: np.ndarray,
+    ) -> np.ndarray:
+        """Characterize the prior probability of the MRCA generation falling
+        within each of several interval ranges.
+
+        Parameters
+        ----------
+        begin_ranks : np.ndarray
+            The starting ranks of the intervals, inclusive.
+        end_ranks : np.ndarray
+            The ending ranks of the intervals, exclusive.
+
+        Returns
+        -------
+        np.ndarray
+            Float array of proxy statistics, one per interval, as would be
+            given by `CalcIntervalProbabilityProxy`.
+        """
+        f = self._growth_factor
+
+        if f == 1.0:
+            return UniformPrior().CalcIntervalProbabilityProxyBatched(
+                begin_ranks, end_ranks
+            )
+
+        begin_ranks = np.asarray(begin_ranks, dtype=float)
+        end_ranks = np.asarray(end_ranks, dtype=float)
+        return np.power(f, end_ranks) - np.power(f, begin_ranks)
+
+    def CalcIntervalConditionedMeanBatched(
+        self: "ExponentialPrior",
+        begin_ranks: np.ndarray,
+        end_ranks: np.ndarray,
+    ) -> np.ndarray:
+        """Calculate the centriod of prior probability mass within each of
+        several intervals of possible MRCA generations.
+
+        Parameters
+        ----------
+        begin_ranks : np.ndarray
+            The starting ranks of the intervals, inclusive.
+        end_ranks : np.ndarray
+            The ending ranks of the intervals, exclusive.
+
+        Returns
+        -------
+        np.ndarray
+            Float array of interval-conditioned prior means, one per interval,
+            as would be given by `CalcIntervalConditionedMean`.
+        """
+        f = self._growth_factor
+
+        if f == 1.0:
+            return UniformPrior().CalcIntervalConditionedMeanBatched(
+                begin_ranks, end_ranks
+            )
+
+        a = np.asarray(begin_ranks, dtype=float)
+        b = np.asarray(end_ranks, dtype=float) - 1.0
+        d = b - a
+
+        # rearrangement of scalar case, (a f^a - b f^b) / (f^a - f^b),
+        #   = b + (b - a) / (f^(b - a) - 1)
+        # expm1 avoids cancellation for f near 1 and saturates gracefully
+        # rather than overflowing for large intervals
+        log_f = math.log(f)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            res = b + d / np.expm1(d * log_f) - 1 / log_f
+
+        return np.where(d == 0, a, res)
+
     def SampleIntervalConditionedValue(
         self: "ExponentialPrior", begin_rank: int, end_rank: int
     ) -> int:
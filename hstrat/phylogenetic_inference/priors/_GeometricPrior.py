@@ -93,6 +93,81 @@ class GeometricPrior(PriorBase):
             ),
         )
 
+    def CalcIntervalProbabilityProxyBatched(
+        self: "GeometricPrior", begin_ranks: np.ndarray, end_ranks: np.ndarray
+    ) -> np.ndarray:
+        """Characterize the prior probability of the MRCA generation falling
+        within each of several interval ranges.
+
+        Parameters
+        ----------
+        begin_ranks : np.ndarray
+            The starting ranks of the intervals, inclusive.
+        end_ranks : np.ndarray
+            The ending ranks of the intervals, exclusive.
+
+        Returns
+        -------
+        np.ndarray
+            Float array of proxy statistics, one per interval, as would be
+            given by `CalcIntervalProbabilityProxy`.
+        """
+        f = self._growth_factor
+        begin_ranks = np.asarray(begin_ranks, dtype=float)
+        end_ranks = np.asarray(end_ranks, dtype=float)
+
+        if f == 1.0:
+            return end_ranks - begin_ranks
+
+        # closed-form geometric series sum over [begin_rank, end_rank)
+        log_f = np.log(f)
+        return (
+            np.power(f, begin_ranks)
+            * np.expm1((end_ranks - begin_ranks) * log_f)
+            / np.expm1(log_f)
+        )
+
+    def CalcIntervalConditionedMeanBatched(
+        self: "GeometricPrior", begin_ranks: np.ndarray, end_ranks: np.ndarray
+    ) -> np.ndarray:
+        """Calculate the centriod of prior probability mass within each of
+        several intervals of possible MRCA generations.
+
+        Parameters
+        ----------
+        begin_ranks : np.ndarray
+            The starting ranks of the intervals, inclusive.
+        end_ranks : np.ndarray
+            The ending ranks of the intervals, exclusive.
+
+        Returns
+        -------
+        np.ndarray
+            Float array of interval-conditioned prior means, one per interval,
+            as would be given by `CalcIntervalConditionedMean`.
+        """
+        f = self._growth_factor
+        begin_ranks = np.asarray(begin_ranks, dtype=float)
+        end_ranks = np.asarray(end_ranks, dtype=float)
+
+        if f == 1.0:
+            return (begin_ranks + end_ranks - 1.0) / 2.0
+
+        # mean offset of geometric distribution truncated to m values is
+        #   g / (1 - g) - m g^m / (1 - g^m)
+        # take g < 1 for numerical stability, measuring offset from the end
+        # of the interval rather than the beginning if f > 1
+        g = f if f < 1.0 else 1.0 / f
+        log_g = np.log(g)
+        m = end_ranks - begin_ranks
+        offset = g / -np.expm1(log_g) - m * np.power(g, m) / -np.expm1(
+            m * log_g
+        )
+        if f < 1.0:
+            return begin_ranks + offset
+        else:
+            return end_ranks - 1.0 - offset
+
     def SampleIntervalConditionedValue(
         self: "GeometricPrior", begin_rank: int, end_rank: int
     ) -> int:
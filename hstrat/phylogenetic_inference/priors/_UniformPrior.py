@@ -56,6 +56,54 @@ class UniformPrior(PriorBase):
         """
         return np.mean((begin_rank, end_rank - 1))
 
+    def CalcIntervalProbabilityProxyBatched(
+        self: "UniformPrior", begin_ranks: np.ndarray, end_ranks: np.ndarray
+    ) -> np.ndarray:
+        """Characterize the prior probability of the MRCA generation falling
+        within each of several interval ranges.
+
+        Parameters
+        ----------
+        begin_ranks : np.ndarray
+            The starting ranks of the intervals, inclusive.
+        end_ranks : np.ndarray
+            The ending ranks of the intervals, exclusive.
+
+        Returns
+        -------
+        np.ndarray
+            Float array of proxy statistics, one per interval, as would be
+            given by `CalcIntervalProbabilityProxy`.
+        """
+        return np.asarray(end_ranks, dtype=float) - np.asarray(
+            begin_ranks, dtype=float
+        )
+
+    def CalcIntervalConditionedMeanBatched(
+        self: "UniformPrior", begin_ranks: np.ndarray, end_ranks: np.ndarray
+    ) -> np.ndarray:
+        """Calculate the centriod of prior probability mass within each of
+        several intervals of possible MRCA generations.
+
+        Parameters
+        ----------
+        begin_ranks : np.ndarray
+            The starting ranks of the intervals, inclusive.
+        end_ranks : np.ndarray
+            The ending ranks of the intervals, exclusive.
+
+        Returns
+        -------
+        np.ndarray
+            Float array of interval-conditioned prior means, one per interval,
+            as would be given by `CalcIntervalConditionedMean`.
+        """
+        return (
+            np.asarray(begin_ranks, dtype=float)
+            + np.asarray(end_ranks, dtype=float)
+            - 1.0
+        ) / 2.0
+
     def SampleIntervalConditionedValue(
         self: "UniformPrior", begin_rank: int, end_rank: int
     ) -> int:
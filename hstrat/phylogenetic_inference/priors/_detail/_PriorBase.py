@@ -1,2 +1,58 @@
+import numpy as np
+
+
 class PriorBase:
-    """Base class to facilitate detection of prior types."""
+    """Base class to facilitate detection of prior types.
+
+    Provides default batched interval calculations that fall back to
+    element-wise evaluation of scalar methods. Subclasses should override with
+    vectorized implementations where possible.
+    """
+
+    def CalcIntervalProbabilityProxyBatched(
+        self: "PriorBase", begin_ranks: np.ndarray, end_ranks: np.ndarray
+    ) -> np.ndarray:
+        """Calculate `CalcIntervalProbabilityProxy` for each interval of
+        paired begin and end ranks.
+
+        Parameters
+        ----------
+        begin_ranks : np.ndarray
+            The starting ranks of the intervals, inclusive.
+        end_ranks : np.ndarray
+            The ending ranks of the intervals, exclusive.
+
+        Returns
+        -------
+        np.ndarray
+            Float array of proxy statistics, one per interval.
+        """
+        return np.fromiter(
+            map(self.CalcIntervalProbabilityProxy, begin_ranks, end_ranks),
+            dtype=float,
+            count=len(begin_ranks),
+        )
+
+    def CalcIntervalConditionedMeanBatched(
+        self: "PriorBase", begin_ranks: np.ndarray, end_ranks: np.ndarray
+    ) -> np.ndarray:
+        """Calculate `CalcIntervalConditionedMean` for each interval of
+        paired begin and end ranks.
+
+        Parameters
+        ----------
+        begin_ranks : np.ndarray
+            The starting ranks of the intervals, inclusive.
+        end_ranks : np.ndarray
+            The ending ranks of the intervals, exclusive.
+
+        Returns
+        -------
+        np.ndarray
+            Float array of interval-conditioned prior means, one per interval.
+        """
+        return np.fromiter(
+            map(self.CalcIntervalConditionedMean, begin_ranks, end_ranks),
+            dtype=float,
+            count=len(begin_ranks),
+        )
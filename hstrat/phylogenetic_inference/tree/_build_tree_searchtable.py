@@ -1,3 +1,4 @@
+import functools
 import typing
 
 import opytional as opyt
@@ -18,6 +19,7 @@ def build_tree_searchtable(
     progress_wrap: typing.Optional[typing.Callable] = None,
     force_common_ancestry: bool = False,
     use_impl: typing.Literal["cpp", "python", None] = None,
+    num_threads: int = 1,
 ) -> pd.DataFrame:
     """Estimate the phylogenetic history among hereditary stratigraphic
     artifacts by building a trie (a.k.a. prefix tree) of their differentiae
@@ -58,6 +60,12 @@ def build_tree_searchtable(
         If None, the best available implementation will be used.
         If 'cpp', the C++ implementation will be used.
         If 'python', the Python implementation will be used.
+    num_threads : int, default 1
+        Number of threads to use for trie construction.
+
+        Only supported by the C++ implementation, which is used whenever
+        `num_threads` is greater than 1. Parallel construction produces
+        output identical to serial construction.
 
     Returns
     -------
@@ -86,6 +94,13 @@ def build_tree_searchtable(
     --------
     build_tree_trie : Naive trie-based phylogenetic reconstruction algorithm.
     """
+    if num_threads > 1 and use_impl == "python":
+        raise ValueError(
+            "num_threads > 1 is not supported by the Python implementation.",
+        )
+    elif num_threads > 1:
+        use_impl = "cpp"
+
     try:
         build_tree_searchtable_impl = {
             "cpp": build_tree_searchtable_cpp,
@@ -106,6 +121,11 @@ def build_tree_searchtable(
             f"build_tree_searchtable impl '{use_impl}' is unavailable.",
         )
 
+    if num_threads > 1:
+        build_tree_searchtable_impl = functools.partial(
+            build_tree_searchtable_impl, num_threads=num_threads
+        )
+
     return build_tree_searchtable_impl(
         population,
         taxon_labels,
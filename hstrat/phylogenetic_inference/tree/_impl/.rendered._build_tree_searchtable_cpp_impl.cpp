@@ -0,0 +1,3968 @@
+// cppimport
+#ifdef DEBUG
+#undef NDEBUG
+#endif
+
+#include <algorithm>
+#include <array>
+#include <atomic>
+#include <bit>
+#include <cassert>
+#include <chrono>
+#include <condition_variable>
+#include <functional>
+#include <limits>
+#include <mutex>
+#include <numeric>
+#include <optional>
+#include <ranges>
+#include <span>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <type_traits>
+#include <unordered_map>
+#include <unordered_set>
+#include <utility>
+#include <vector>
+
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+using namespace pybind11::literals;
+namespace py = pybind11;
+
+typedef int64_t i64;
+typedef uint64_t u64;
+constexpr u64 placeholder_value = std::numeric_limits<int64_t>::max();
+
+/** @brief Discard the output of functions that requires an output iterator */
+template<typename T> struct null_output_iterator {
+  // adapted from https://stackoverflow.com/a/73189051/17332200
+  using iterator_category = std::forward_iterator_tag;
+  using value_type = T;
+  using difference_type = T;
+  using pointer = T*;
+  using reference = T&;
+
+  /** @brief No-op assignment */
+  void operator=(T const&) {}
+
+  /** @brief Can be pre-incremented */
+  null_output_iterator& operator++() { return *this; }
+
+  /** @brief Can be post-incremented */
+  null_output_iterator operator++(int) { return *this; }
+
+  /** @brief Can be dereferenced */
+  null_output_iterator& operator*() { return *this; }
+};
+
+
+/**
+ *  An iterator that casts the value of another iterator to u64.
+ */
+template<typename T> struct as_u64_iterator {
+  using value_type = u64;
+  using pointer = u64*;
+  using reference = u64&;
+  using iterator_category = std::forward_iterator_tag;
+  using difference_type = int;
+
+  T iter;
+
+  explicit as_u64_iterator(const T& iter) : iter(iter) {}
+
+  u64 operator*() const { return static_cast<u64>(*iter); }
+
+  as_u64_iterator& operator++() {
+    ++iter;
+    return *this;
+  }
+
+  as_u64_iterator operator++(int) {
+    auto res = *this;
+    ++iter;
+    return res;
+  }
+
+  bool operator==(const as_u64_iterator& other) const {
+    return iter == other.iter;
+  }
+
+  bool operator!=(const as_u64_iterator& other) const {
+    return iter != other.iter;
+  }
+};
+
+
+/**
+ *  An iterator that counts up from 0.
+ *  Adapted from https://github.com/mmore500/signalgp-lite/blob/6ec86f7fb189b299fee842b9231ca9711deafd11/include/sgpl/utility/CountingIterator.hpp
+ */
+template<typename T=size_t>
+class CountingIterator {
+
+  size_t idx{};
+
+public:
+  using value_type = T;
+  using pointer = value_type*;
+  using reference = value_type&;
+  using iterator_category = std::forward_iterator_tag;
+  using difference_type = int;
+
+  CountingIterator() = default;
+  explicit CountingIterator(const T& t) : idx( t ) {}
+
+  value_type operator*() const { return idx; }
+
+  CountingIterator operator++(int) {
+    const auto res = *this;
+    ++idx;
+    return res;
+  }
+
+  CountingIterator& operator++() {
+    ++idx;
+    return *this;
+  }
+
+  CountingIterator operator+(const size_t rhs) {
+    CountingIterator res{ *this };
+    res.idx += rhs;
+    return res;
+  }
+
+  bool operator==(const CountingIterator& other) const {
+    return operator*() == other.operator*();
+  }
+
+  bool operator!=(const CountingIterator& other) const {
+    return operator*() != other.operator*();
+  }
+
+};
+
+
+/**
+ * Stores a value of VALUE_T in narrower STORAGE_T, converting implicitly on
+ * read and write so that narrow columns can be used interchangeably with
+ * full-width ones.
+ *
+ * If `has_placeholder` is set, placeholder_value is stored as the maximum
+ * STORAGE_T value and restored on read.
+ *
+ * @see BasicRecords
+ */
+template <typename STORAGE_T, typename VALUE_T, bool has_placeholder>
+class narrow_value {
+  STORAGE_T stored;
+
+public:
+  narrow_value() = default;
+
+  narrow_value(const VALUE_T value) : stored(
+    has_placeholder && static_cast<u64>(value) == placeholder_value
+    ? std::numeric_limits<STORAGE_T>::max()
+    : static_cast<STORAGE_T>(value)
+  ) {
+    assert(
+      (has_placeholder && static_cast<u64>(value) == placeholder_value)
+      || static_cast<VALUE_T>(this->stored) == value
+    );
+  }
+
+  operator VALUE_T() const {
+    return (
+      has_placeholder && this->stored == std::numeric_limits<STORAGE_T>::max()
+      ? static_cast<VALUE_T>(placeholder_value)
+      : static_cast<VALUE_T>(this->stored)
+    );
+  }
+};
+
+
+/**
+ * Element type of a column storing VALUE_T values as STORAGE_T. Full-width
+ * columns store VALUE_T directly.
+ */
+template <typename STORAGE_T, typename VALUE_T, bool has_placeholder>
+using column_value_t = std::conditional_t<
+  sizeof(STORAGE_T) == sizeof(VALUE_T),
+  VALUE_T,
+  narrow_value<STORAGE_T, VALUE_T, has_placeholder>
+>;
+
+
+/**
+ *  An object that holds all the information for building a
+ *  trie using the searchtable approach. Each record is stored
+ *  at one index in the member vectors. Storage details:
+ *    - The `dstream_data_id` represents that in the downstream
+ *      library, and is unique per artifact.
+ *    - Children for a node are stored as storing the index for
+ *      the first child in `search_first_child_id`, and storing
+ *      the rest of the children as a linked list in the first
+ *      child in `search_next_sibling_id`.
+ *    - `ancestor_id` and `search_ancestor_id` differ when the
+ *      records are consolidated. `ancestor_id` remains to save
+ *      the information, while `search_ancestor_id` changes.
+ *    - Parents have a higher `rank` than children.
+ *    - `dirty` marks records created, or whose links were modified, since
+ *      dirty marks were last cleared, so that invariant checks may be
+ *      confined to them. It is bookkeeping, not trie data, and is not
+ *      exported.
+ *  @see build_trie_searchtable_nested
+ *  @see build_trie_searchtable_exploded
+ *  @see extend_trie_searchtable_exploded
+ */
+template <typename ID_T=u64, typename RANK_T=i64, typename DIFFERENTIA_T=u64>
+struct BasicRecords {
+  using id_column_t = std::vector<column_value_t<ID_T, u64, true>>;
+  using rank_column_t = std::vector<column_value_t<RANK_T, i64, false>>;
+  using differentia_column_t = std::vector<
+    column_value_t<DIFFERENTIA_T, u64, false>
+  >;
+
+  /** Largest id (or data id) representable; exceeding values overflow. */
+  static constexpr u64 max_id = (
+    sizeof(ID_T) < sizeof(u64)
+    ? std::numeric_limits<ID_T>::max() - 1  // max reserved for placeholder
+    : placeholder_value - 1
+  );
+  /** Largest rank representable. */
+  static constexpr u64 max_rank = std::numeric_limits<RANK_T>::max();
+  /** Largest differentia representable. */
+  static constexpr u64 max_representable_differentia = (
+    std::numeric_limits<DIFFERENTIA_T>::max()
+  );
+
+  id_column_t dstream_data_id;
+  id_column_t id;
+  id_column_t search_first_child_id;
+  id_column_t search_prev_sibling_id;
+  id_column_t search_next_sibling_id;
+  id_column_t search_ancestor_id;
+  id_column_t ancestor_id;
+  differentia_column_t differentia;
+  rank_column_t rank;
+  std::vector<uint8_t> dirty;
+  u64 max_differentia = 0;
+
+  explicit BasicRecords(const u64 init_size, const bool init_root=true) {
+    this->dstream_data_id.reserve(init_size);
+    this->id.reserve(init_size);
+    this->search_first_child_id.reserve(init_size);
+    this->search_prev_sibling_id.reserve(init_size);
+    this->search_next_sibling_id.reserve(init_size);
+    this->search_ancestor_id.reserve(init_size);
+    this->ancestor_id.reserve(init_size);
+    this->differentia.reserve(init_size);
+    this->rank.reserve(init_size);
+    this->dirty.reserve(init_size);
+
+    if (init_root) {
+      this->addRecord(placeholder_value, 0, 0, 0, 0, 0, 0, 0, 0); // root node
+    }
+  }
+
+  /** Copy constructor. */
+  BasicRecords(const BasicRecords &other) = delete;
+
+  /** Move constructor. */
+  BasicRecords(BasicRecords &&other) = default;
+
+  bool operator==(const BasicRecords &other) const = default;
+
+  void swap(BasicRecords &other) noexcept {
+    this->dstream_data_id.swap(other.dstream_data_id);
+    this->id.swap(other.id);
+    this->search_first_child_id.swap(other.search_first_child_id);
+    this->search_prev_sibling_id.swap(other.search_prev_sibling_id);
+    this->search_next_sibling_id.swap(other.search_next_sibling_id);
+    this->search_ancestor_id.swap(other.search_ancestor_id);
+    this->ancestor_id.swap(other.ancestor_id);
+    this->differentia.swap(other.differentia);
+    this->rank.swap(other.rank);
+    this->dirty.swap(other.dirty);
+    std::swap(this->max_differentia, other.max_differentia);
+  }
+
+  /** Mark record `id` as needing invariant checks. */
+  void markDirty(const u64 id) { this->dirty[id] = true; }
+
+  /** Mark all records as having passed invariant checks. */
+  void clearDirty() { std::ranges::fill(this->dirty, false); }
+
+  void addRecord(
+    const u64 data_id,
+    const u64 id,
+    const u64 ancestor_id,
+    const u64 search_ancestor_id,
+    const u64 search_first_child_id,
+    const u64 search_prev_sibling_id,
+    const u64 search_next_sibling_id,
+    const i64 rank,
+    const u64 differentia
+  ) {
+    assert(search_first_child_id >= id);
+    assert(this->size() == 0 || ancestor_id != id);
+    assert(this->size() == 0 || this->rank[ancestor_id] <= rank);
+    this->dstream_data_id.push_back(data_id);
+    this->id.push_back(id);
+    this->search_first_child_id.push_back(search_first_child_id);
+    this->search_prev_sibling_id.push_back(search_prev_sibling_id);
+    this->search_next_sibling_id.push_back(search_next_sibling_id);
+    this->search_ancestor_id.push_back(search_ancestor_id);
+    this->ancestor_id.push_back(ancestor_id);
+    this->differentia.push_back(differentia);
+    this->rank.push_back(rank);
+    this->dirty.push_back(true);
+    max_differentia = std::max(max_differentia, differentia);
+    assert(
+      search_ancestor_id == placeholder_value
+      || this->rank[search_ancestor_id] <= rank
+    );
+  }
+
+  void mockRecord(  // for testing purposes only; does not check invariants
+    const u64 data_id,
+    const u64 id,
+    const u64 ancestor_id,
+    const u64 search_ancestor_id,
+    const u64 search_first_child_id,
+    const u64 search_prev_sibling_id,
+    const u64 search_next_sibling_id,
+    const i64 rank,
+    const u64 differentia
+  ) {
+    this->dstream_data_id.push_back(data_id);
+    this->id.push_back(id);
+    this->search_first_child_id.push_back(search_first_child_id);
+    this->search_prev_sibling_id.push_back(search_prev_sibling_id);
+    this->search_next_sibling_id.push_back(search_next_sibling_id);
+    this->search_ancestor_id.push_back(search_ancestor_id);
+    this->ancestor_id.push_back(ancestor_id);
+    this->differentia.push_back(differentia);
+    this->rank.push_back(rank);
+    this->dirty.push_back(true);
+    max_differentia = std::max(max_differentia, differentia);
+  }
+
+  /**
+   * Writes a record into an already-allocated slot (see resize).
+   *
+   * Unlike addRecord, does not update max_differentia, so that concurrent
+   * writers to disjoint slots do not race. Callers must ensure
+   * max_differentia already covers the written differentia.
+   */
+  void setRecord(
+    const u64 data_id,
+    const u64 id,
+    const u64 ancestor_id,
+    const u64 search_ancestor_id,
+    const u64 search_first_child_id,
+    const u64 search_prev_sibling_id,
+    const u64 search_next_sibling_id,
+    const i64 rank,
+    const u64 differentia
+  ) {
+    assert(id < this->size());
+    assert(ancestor_id != id);
+    assert(this->rank[ancestor_id] <= rank);
+    assert(differentia <= max_differentia);
+    this->dstream_data_id[id] = data_id;
+    this->id[id] = id;
+    this->search_first_child_id[id] = search_first_child_id;
+    this->search_prev_sibling_id[id] = search_prev_sibling_id;
+    this->search_next_sibling_id[id] = search_next_sibling_id;
+    this->search_ancestor_id[id] = search_ancestor_id;
+    this->ancestor_id[id] = ancestor_id;
+    this->differentia[id] = differentia;
+    this->rank[id] = rank;
+    this->dirty[id] = true;
+  }
+
+  /** Grow or shrink all columns to hold exactly `new_size` records. */
+  void resize(const u64 new_size) {
+    this->dstream_data_id.resize(new_size);
+    this->id.resize(new_size);
+    this->search_first_child_id.resize(new_size);
+    this->search_prev_sibling_id.resize(new_size);
+    this->search_next_sibling_id.resize(new_size);
+    this->search_ancestor_id.resize(new_size);
+    this->ancestor_id.resize(new_size);
+    this->differentia.resize(new_size);
+    this->rank.resize(new_size);
+    this->dirty.resize(new_size, true);
+  }
+
+  u64 size() const { return this->dstream_data_id.size(); }
+
+  /** Bytes of column storage per record. */
+  static constexpr u64 record_nbytes() {
+    return (
+      7 * sizeof(typename id_column_t::value_type)
+      + sizeof(typename rank_column_t::value_type)
+      + sizeof(typename differentia_column_t::value_type)
+      + sizeof(uint8_t)  // dirty
+    );
+  }
+
+};
+
+
+/** Full-width layout, matching the column dtypes of extracted dicts. */
+using Records = BasicRecords<>;
+
+/**
+ * Compact layouts, with 32-bit ids and ranks and differentia stored in the
+ * narrowest unsigned type that fits.
+ *
+ * @see select_records_layout
+ */
+template <typename DIFFERENTIA_T>
+using CompactRecords = BasicRecords<uint32_t, uint32_t, DIFFERENTIA_T>;
+
+
+/**
+ * Column layouts available for Records.
+ *
+ * @see select_records_layout
+ * @see visit_records_layout
+ */
+enum class RecordsLayout { wide, compact8, compact16, compact32, compact64 };
+
+
+/**
+ * Chooses the narrowest records layout able to hold differentia values up to
+ * `max_differentia`, ranks up to `max_rank`, and ids and data ids up to
+ * `max_id` (e.g., the expected node count). Falls back to the full-width
+ * layout if ids or ranks do not fit in 32 bits.
+ */
+RecordsLayout select_records_layout(
+  const u64 max_differentia, const u64 max_rank, const u64 max_id
+) {
+  using compact_t = CompactRecords<uint8_t>;
+  if (max_id > compact_t::max_id || max_rank > compact_t::max_rank) {
+    return RecordsLayout::wide;
+  }
+  else if (max_differentia <= std::numeric_limits<uint8_t>::max()) {
+    return RecordsLayout::compact8;
+  }
+  else if (max_differentia <= std::numeric_limits<uint16_t>::max()) {
+    return RecordsLayout::compact16;
+  }
+  else if (max_differentia <= std::numeric_limits<uint32_t>::max()) {
+    return RecordsLayout::compact32;
+  }
+  else return RecordsLayout::compact64;
+}
+
+
+/**
+ * Calls `fn` with a std::type_identity tag for the records type corresponding
+ * to `layout`, returning its result.
+ */
+template <typename FN>
+auto visit_records_layout(const RecordsLayout layout, FN &&fn) {
+  switch (layout) {
+    case RecordsLayout::compact8:
+      return fn(std::type_identity<CompactRecords<uint8_t>>{});
+    case RecordsLayout::compact16:
+      return fn(std::type_identity<CompactRecords<uint16_t>>{});
+    case RecordsLayout::compact32:
+      return fn(std::type_identity<CompactRecords<uint32_t>>{});
+    case RecordsLayout::compact64:
+      return fn(std::type_identity<CompactRecords<u64>>{});
+    default:
+      return fn(std::type_identity<Records>{});
+  }
+}
+
+
+/**
+ *  Delete records w/ one parent and one child (unifurcations) to save memory.
+ *
+ *  If dropped_only=True, removes record entries that are unifurcations and are
+ *  associated with dropped ranks (i.e., by current num_strata_deposited,
+ *  differentiae at those ranks have been purged. This operation may be called
+ *  at any point(s) during trie construction.
+ *
+ *  Note that detection of dropped ranks is incomplete, as it is based on the
+ *  reconfiguration of the search trie. A more comprehensive approach could
+ *  collate dropped ranks across all records.
+ *
+ *  If dropped_only=False, removes all unifurcations. Note that this should only
+ *  be called if no more records will be added to the trie (i.e., reconstruction
+ *  is complete).
+ *
+ *  Compacts records in place, so that peak memory stays close to the size of
+ *  the live trie. Because kept records are only ever moved to lower ids, a
+ *  single ascending pass suffices. Column capacity is retained for subsequent
+ *  record additions.
+ *
+ *  @see collapse_unifurcations
+ */
+template <typename RECORDS>
+void collapse_unifurcations_inplace(RECORDS &records, const bool dropped_only) {
+  assert(std::equal(
+    std::begin(records.id),
+    std::end(records.id),
+    CountingIterator<u64>{}
+  ));
+  if (records.size() <= 1) return;
+  const u64 orig_size = records.size();
+
+  // how many entries have an entry as ancestor?
+  std::vector<uint8_t> ancestor_ref_counts(records.size());
+  std::for_each(
+    std::begin(records.id),
+    std::end(records.id),
+    [&ancestor_ref_counts, &records](const u64 id){
+      // note: want to count root as ref to self
+      const auto ancestor_id = records.ancestor_id[id];
+      assert(ancestor_id <= id);
+      auto& ref_count = ancestor_ref_counts[ancestor_id];
+      // increment preventing overflow (anything past 2 is equivalent)
+      ref_count = std::min(ref_count + 1, 2);
+    }
+  );
+
+  // a.k.a. should_keeps; ref to save memory
+  auto& is_not_selected_unifurcation = ancestor_ref_counts;
+  std::transform(
+    std::begin(records.id),
+    std::end(records.id),
+    std::begin(ancestor_ref_counts),
+    std::begin(is_not_selected_unifurcation),  // output iterator
+    [&records, dropped_only](
+      const u64 id, const uint8_t ancestor_ref_count
+    ) {
+      const bool is_unifurcation = ancestor_ref_count == 1;
+      const bool is_dropped = (
+        records.ancestor_id[id] != id
+        and records.search_ancestor_id[id] == id
+      );
+      const bool is_selected = dropped_only ? is_dropped : true;
+      const bool is_selected_unifurcation = is_unifurcation and is_selected;
+      return !is_selected_unifurcation;
+    }
+  );
+
+  // maps position [old id] to new, contiguously assigned id
+  std::vector<u64> id_remap;
+  id_remap.reserve(records.size());
+
+  // set up id_remap ansatz; number of preceding kept items
+  assert(!is_not_selected_unifurcation.empty());
+  id_remap.push_back(0);
+  std::partial_sum(
+    as_u64_iterator(std::begin(is_not_selected_unifurcation)),
+    as_u64_iterator(std::prev(std::end(is_not_selected_unifurcation))),
+    std::back_inserter(id_remap),
+    std::plus<u64>{}
+  );
+
+  // fill id_remap with reassigned ids
+  std::transform(
+    std::begin(records.id),
+    std::end(records.id),
+    std::begin(id_remap),
+    std::begin(id_remap),
+    [&id_remap, &records, &is_not_selected_unifurcation](
+      const u64 id, const u64 ansatz
+    ) {
+      const bool should_keep = is_not_selected_unifurcation[id];
+      if (should_keep) return ansatz;
+      else {
+        const auto orig_ancestor_id = records.ancestor_id[id];
+        assert(orig_ancestor_id < id);
+        return id_remap[orig_ancestor_id];
+      }
+    }
+  );
+
+  // move kept records down into their new slots; new_id <= old_id, and all
+  // slots below new_id already hold moved records, so reads of the old slot
+  // must happen before it is overwritten
+  u64 new_size = 0;
+  u64 max_differentia = 0;
+  for (u64 old_id = 0; old_id < orig_size; ++old_id) {
+    const bool should_keep = is_not_selected_unifurcation[old_id];
+    if (!should_keep) continue;
+
+    const u64 new_id = id_remap[old_id];
+    assert(new_id == new_size);
+    assert(new_id <= old_id);
+
+    const u64 data_id = records.dstream_data_id[old_id];
+    const u64 ancestor_id = records.ancestor_id[old_id];
+    const u64 search_ancestor_id = records.search_ancestor_id[old_id];
+    const u64 search_first_child_id = records.search_first_child_id[old_id];
+    const u64 search_prev_sibling_id = records.search_prev_sibling_id[old_id];
+    const u64 search_next_sibling_id = records.search_next_sibling_id[old_id];
+    const i64 rank = records.rank[old_id];
+    const u64 differentia = records.differentia[old_id];
+    // carry dirty marks over, also marking records whose lineage
+    // ancestor was collapsed away
+    const bool dirty = (
+      records.dirty[old_id] || !is_not_selected_unifurcation[ancestor_id]
+    );
+
+    if (dropped_only) {
+      assert(is_not_selected_unifurcation[search_ancestor_id]);
+      assert(is_not_selected_unifurcation[search_first_child_id]);
+      assert(is_not_selected_unifurcation[search_next_sibling_id]);
+    }
+
+    assert(search_ancestor_id <= old_id);
+    assert(id_remap[search_ancestor_id] <= new_id);
+    // remapped slots below new_id already hold moved records; dropped
+    // records are their own search ancestor, and root its own ancestor
+    assert(
+      search_ancestor_id == old_id
+      || rank >= records.rank[id_remap[search_ancestor_id]]
+    );
+    assert(ancestor_id == old_id || rank >= records.rank[id_remap[ancestor_id]]);
+
+    records.dstream_data_id[new_id] = data_id;
+    records.id[new_id] = new_id;
+    records.ancestor_id[new_id] = id_remap[ancestor_id];
+    records.search_ancestor_id[new_id] = (
+      dropped_only ? id_remap[search_ancestor_id] : placeholder_value
+    );
+    records.search_first_child_id[new_id] = (
+      dropped_only ? id_remap[search_first_child_id] : placeholder_value
+    );
+    records.search_prev_sibling_id[new_id] = (
+      dropped_only ? id_remap[search_prev_sibling_id] : placeholder_value
+    );
+    records.search_next_sibling_id[new_id] = (
+      dropped_only ? id_remap[search_next_sibling_id] : placeholder_value
+    );
+    records.rank[new_id] = rank;
+    records.differentia[new_id] = differentia;
+    records.dirty[new_id] = dirty;
+    max_differentia = std::max(max_differentia, differentia);
+    ++new_size;
+  }
+  records.resize(new_size);
+  records.max_differentia = max_differentia;
+
+  assert(std::equal(
+    std::begin(records.id),
+    std::end(records.id),
+    CountingIterator<u64>{}
+  ));
+
+  const auto logging_info = py::module::import("logging").attr("info");
+  logging_info(
+    py::str(
+      "collapsing dropped unifurcations removed {} of {} records, {} remain"
+    ).format(
+      orig_size - new_size,
+      orig_size,
+      new_size
+    )
+  );
+}
+
+
+/**
+ *  Nondestructive counterpart of collapse_unifurcations_inplace, returning
+ *  collapsed records as a new object and leaving `records` unchanged.
+ *
+ *  @see collapse_unifurcations_inplace
+ */
+template <typename RECORDS>
+RECORDS collapse_unifurcations(RECORDS &records, const bool dropped_only) {
+  if (records.size() == 0) return RECORDS(0, /* init_root= */ false);
+  else if (records.size() == 1) return RECORDS(1, /* init_root= */ true);
+
+  const auto reserve_size = records.size() + records.size() / 2;  // 1.5x
+  RECORDS new_records(reserve_size, /* init_root= */ false);
+  const auto copy_into = [](auto &dest, const auto &source) {
+    dest.assign(std::begin(source), std::end(source));
+  };
+  copy_into(new_records.dstream_data_id, records.dstream_data_id);
+  copy_into(new_records.id, records.id);
+  copy_into(new_records.search_first_child_id, records.search_first_child_id);
+  copy_into(new_records.search_prev_sibling_id, records.search_prev_sibling_id);
+  copy_into(new_records.search_next_sibling_id, records.search_next_sibling_id);
+  copy_into(new_records.search_ancestor_id, records.search_ancestor_id);
+  copy_into(new_records.ancestor_id, records.ancestor_id);
+  copy_into(new_records.differentia, records.differentia);
+  copy_into(new_records.rank, records.rank);
+  copy_into(new_records.dirty, records.dirty);
+  new_records.max_differentia = records.max_differentia;
+
+  collapse_unifurcations_inplace(new_records, dropped_only);
+  return new_records;
+}
+
+
+/**
+ * A more permissive declval.
+*/
+template<class T> T& permissive_declval() {
+  std::abort();
+  return *static_cast<T*>(nullptr);
+}
+
+
+/**
+ * A sentinel type for the ChildrenView range.
+ */
+struct ChildrenSentinel {};
+
+
+/**
+ * STL-compatible iterator for children of a node.
+ */
+template <typename RECORDS>
+class ChildrenIterator {
+  std::reference_wrapper<const RECORDS> records;
+  u64 current;
+public:
+  using value_type = u64;
+  using difference_type = std::ptrdiff_t;
+  using iterator_category = std::forward_iterator_tag;
+  using iterator_concept = std::forward_iterator_tag;
+
+  // some compilers require iterators to be default-constructible...
+  // this should never actually be used
+  ChildrenIterator() : records(permissive_declval<RECORDS>()) { }
+
+  ChildrenIterator(const RECORDS& records, u64 parent)
+  : records(records)
+  , current(
+    records.search_first_child_id[parent] == parent
+    ? 0
+    : static_cast<u64>(records.search_first_child_id[parent])
+  )
+  { assert(this->current != placeholder_value); }
+
+  bool operator==(const ChildrenIterator &it) const {
+    return this->current == it.current;
+  }
+  bool operator!=(const ChildrenIterator &it) const {
+    return this->current != it.current;
+  }
+
+  u64 operator*() const { return current; }
+  ChildrenIterator& operator++() {
+    const auto& records = this->records.get();
+    const u64 next = records.search_next_sibling_id[current];
+    assert(next != placeholder_value);
+    current = (next == current) ? 0 : next;
+    return *this;
+  }
+  ChildrenIterator operator++(int) {
+    ChildrenIterator tmp = *this;
+    ++(*this);
+    return tmp;
+  }
+
+  friend bool operator==(const ChildrenIterator &it, ChildrenSentinel) {
+    return it.current == 0;
+  }
+  friend bool operator==(ChildrenSentinel, const ChildrenIterator &it) {
+    return it.current == 0;
+  }
+  friend bool operator!=(const ChildrenIterator &it, ChildrenSentinel) {
+    return it.current != 0;
+  }
+  friend bool operator!=(ChildrenSentinel, const ChildrenIterator &it) {
+    return it.current != 0;
+  }
+};
+
+
+/**
+ * A STL-compatible range view over the children of a node.
+ */
+template <typename RECORDS>
+struct ChildrenView
+: public std::ranges::view_interface<ChildrenView<RECORDS>> {
+  ChildrenView(const RECORDS &records, const u64 parent)
+    : records(records), parent(parent) {}
+  ChildrenIterator<RECORDS> begin() const {
+    return ChildrenIterator<RECORDS>{records, parent};
+  }
+  ChildrenSentinel end() const { return {}; }
+private:
+  std::reference_wrapper<const RECORDS> records;
+  u64 parent;
+};
+
+static_assert(std::forward_iterator<ChildrenIterator<Records>>);
+static_assert(std::sentinel_for<ChildrenSentinel, ChildrenIterator<Records>>);
+static_assert(std::ranges::forward_range<ChildrenView<Records>>);
+
+
+/**
+ * Removes `node` from the children of its parent. See the
+ * information on RECORDS for how children are stored.
+ *
+ * @see attach_search_parent
+ * @see RECORDS
+ */
+template <typename RECORDS>
+void detach_search_parent(RECORDS &records, const u64 node) {
+  const u64 parent = records.search_ancestor_id[node];
+  assert(parent != placeholder_value);
+  const u64 next_sibling = records.search_next_sibling_id[node];
+  const bool is_last_child = next_sibling == node;
+  records.markDirty(node);
+  records.markDirty(parent);
+  records.markDirty(next_sibling);
+  records.markDirty(records.search_prev_sibling_id[node]);
+
+  if (records.search_first_child_id[parent] == node) {
+    const u64 child_id = is_last_child ? parent : next_sibling;
+    records.search_first_child_id[parent] = child_id;
+    // mark next sibling as new first child (otherwise harmlessly mark self)
+    if (is_last_child) assert(next_sibling == node);
+    records.search_prev_sibling_id[next_sibling] = next_sibling;
+  } else if (records.search_next_sibling_id[node] == node) {
+    const u64 prev_sibling = records.search_prev_sibling_id[node];
+    records.search_next_sibling_id[prev_sibling] = prev_sibling;
+  } else {
+    const u64 prev_sibling = records.search_prev_sibling_id[node];
+    const u64 next_sibling = records.search_next_sibling_id[node];
+    records.search_next_sibling_id[prev_sibling] = next_sibling;
+    records.search_prev_sibling_id[next_sibling] = prev_sibling;
+  }
+
+  records.search_ancestor_id[node] = node;
+  records.search_prev_sibling_id[node] = node;
+  records.search_next_sibling_id[node] = node;
+}
+
+
+/**
+ * Attaches `node` to the children of `parent`.
+ *
+ * @see detach_search_parent
+ * @see Records
+ */
+template <typename RECORDS>
+void attach_search_parent(RECORDS &records, const u64 node, const u64 parent) {
+  assert(records.search_ancestor_id[node] != placeholder_value);
+  if (records.search_ancestor_id[node] == parent) {
+    return;
+  }
+
+  records.search_ancestor_id[node] = parent;
+  records.markDirty(node);
+  records.markDirty(parent);
+  assert(parent <= node);
+  assert(records.rank[parent] <= records.rank[node]);
+  assert(records.search_first_child_id[parent] != placeholder_value);
+
+  // insert node into the list of children, choosing its position in order
+  // to keep the list in ascending order by rank
+  const i64 rank = records.rank[node];
+  const auto siblings = ChildrenView(records, parent);
+  u64 precursor_id = parent;
+  const auto next_sibling_it = std::ranges::find_if(
+    siblings,
+    [&records, &precursor_id, rank](const u64 sibling){
+      const bool res = records.rank[sibling] >= rank;
+      if (!res) precursor_id = sibling;
+      return res;
+    }
+  );
+
+  const bool has_next_sibling = next_sibling_it != siblings.end();
+  const bool has_prev_sibling = next_sibling_it != siblings.begin();
+
+  if (has_prev_sibling) {
+    assert(
+      !has_next_sibling
+      || records.search_prev_sibling_id[*next_sibling_it] == precursor_id
+    );
+    assert(precursor_id != parent);
+    records.search_next_sibling_id[precursor_id] = node;
+    records.search_prev_sibling_id[node] = precursor_id;
+  } else {
+    assert(precursor_id == parent);
+    records.search_first_child_id[parent] = node;
+    records.search_prev_sibling_id[node] = node;
+  }
+
+  if (has_prev_sibling) records.markDirty(precursor_id);
+  if (has_next_sibling) {
+    records.markDirty(*next_sibling_it);
+    records.search_prev_sibling_id[*next_sibling_it] = node;
+    records.search_next_sibling_id[node] = *next_sibling_it;
+  } else {
+    records.search_next_sibling_id[node] = node;
+  }
+
+  // full sorted check is too expensive to assert, so just check local sort...
+  assert(
+    records.rank[records.search_prev_sibling_id[node]]
+    <= records.rank[node]
+  );
+  assert(
+    records.rank[node]
+    <= records.rank[records.search_next_sibling_id[node]]
+  );
+
+}
+
+
+/**
+ * Implementation of collapse_indistinguishable_nodes optimized for small
+ * differentia sizes (e.g., a byte or less).
+ *
+ * @see consolidate_trie
+ */
+template <size_t max_differentia, typename RECORDS>
+void collapse_indistinguishable_nodes_small(RECORDS &records, const u64 node) {
+
+  assert(std::ranges::is_sorted(
+    ChildrenView(records, node),
+    [&records](const u64 lhs, const u64 rhs) {
+      return records.rank[lhs] < records.rank[rhs];
+    }
+  ));
+  assert(std::ranges::all_of(
+    ChildrenView(records, node),
+    [&records](const u64 child){ return records.rank[child] >= 0; }
+  ));
+
+  std::array<std::vector<u64>, max_differentia + 1> losers{};
+  std::array<std::vector<u64>, max_differentia + 1> loser_epochs{};
+  std::array<std::vector<u64>, max_differentia + 1> epoch_winners{};
+  std::array<i64, max_differentia + 1> prev_child_rank{};
+  for (const auto child : ChildrenView(records, node)) {
+    assert(child > 0);
+
+    const auto child_d = records.differentia[child];
+    assert(child_d <= max_differentia);
+
+    const auto child_r = records.rank[child];
+    assert(child_r > 0 && child_r >= prev_child_rank[child_d]);
+
+    const auto d = child_d;
+    if (child_r != std::exchange(prev_child_rank[d], child_r)) {
+      epoch_winners[d].push_back(child);
+    } else {
+      const auto cur_winner = epoch_winners[d].back();
+      assert(cur_winner != child);
+      epoch_winners[d].back() = std::min(cur_winner, child);
+      const auto cur_loser = std::max(cur_winner, child);
+      losers[d].push_back(cur_loser);
+      loser_epochs[d].push_back(epoch_winners[d].size() - 1);
+    }
+  }
+
+  // possible optimization: could track which differentia values have been seen
+  for (u64 d = 0; d <= max_differentia; ++d) {
+
+    assert(losers[d].size() == loser_epochs[d].size());
+    for (u64 i{}; i < losers[d].size(); ++i) {
+      const auto loser = losers[d][i];
+      const auto loser_epoch = loser_epochs[d][i];
+      const auto corresponding_winner = epoch_winners[d][loser_epoch];
+
+      std::vector<u64> loser_children;
+      std::ranges::copy(
+        ChildrenView(records, loser), std::back_inserter(loser_children)
+      );
+      for (const u64 loser_child : loser_children) {
+        detach_search_parent(records, loser_child);
+        attach_search_parent(records, loser_child, corresponding_winner);
+      }
+      detach_search_parent(records, loser);
+    }
+
+    assert(std::ranges::is_sorted(loser_epochs[d]));
+    const auto duplicates = std::ranges::unique(loser_epochs[d]);
+    loser_epochs[d].erase(duplicates.begin(), duplicates.end());
+    for (const auto loser_epoch : loser_epochs[d]) {
+      const auto true_winner = epoch_winners[d][loser_epoch];
+      collapse_indistinguishable_nodes_small<max_differentia>(
+        records, true_winner
+      );
+    }
+
+  }
+
+}
+
+// adapted from https://stackoverflow.com/a/20602159/17332200
+struct pairhash {
+  size_t operator()(const std::pair<u64, u64>& arr) const {
+    return std::hash<u64>{}(arr.first) ^ std::hash<u64>{}(arr.second);
+  }
+};
+
+/**
+ * Implementation of collapse_indistinguishable_nodes optimized for large
+ * differentia sizes (e.g., larger than a byte).
+ */
+template <typename RECORDS>
+void collapse_indistinguishable_nodes_large(RECORDS &records, const u64 node) {
+  std::unordered_map<std::pair<i64, u64>, std::vector<u64>, pairhash> groups;
+  for (const u64 child : ChildrenView(records, node)) {
+    std::vector<u64> &items = groups[
+      std::pair{records.rank[child], records.differentia[child]}
+    ];
+    items.insert(std::lower_bound(items.begin(), items.end(), child), child);
+  }
+  for (auto [_, children] : groups) {
+    const u64 winner = children[0];
+    for (u64 i = 1; i < children.size(); ++i) {
+      const u64 loser = children[i];
+
+      std::vector<u64> loser_children;
+      for (const u64 loser_child : ChildrenView(records, loser)) {
+        loser_children.push_back(loser_child);
+      }
+      for (const u64 loser_child : loser_children) {
+        detach_search_parent(records, loser_child);
+        attach_search_parent(records, loser_child, winner);
+      }
+      detach_search_parent(records, loser);
+    }
+
+    if (children.size() > 1) {
+      collapse_indistinguishable_nodes_large(records, winner);
+    }
+
+  }
+}
+
+
+/**
+ * Returns the number of bits in the binary representation
+ * of `x`. This is used to determine which collapse function
+ * to use.
+ *
+ * Adapted from https://stackoverflow.com/a/74374791/17332200
+ */
+int bit_length(const u64 x) { return (8*sizeof x) - std::countl_zero(x); }
+
+
+/**
+ * When consolidating a trie (see below), it may be the
+ * case that a parent has duplicate children. This function
+ * detects duplicates, chooses a winning duplicate, and
+ * attaches all of the losers' children to the winner.
+ *
+ * Dispatches to implementation functions based on the differentia size, as
+ * determined by the max_differentia field of the records.
+ *
+ * @see consolidate_trie
+ *
+ */
+template <typename RECORDS>
+void collapse_indistinguishable_nodes(RECORDS & records, const u64 node) {
+  switch (bit_length(records.max_differentia)) {
+    case 0:
+    case 1:  // single-bit case: values 0-1
+      collapse_indistinguishable_nodes_small<1>(records, node);
+      break;
+    case 2:  // two-bit case: values 0-3
+      collapse_indistinguishable_nodes_small<3>(records, node);
+      break;
+    case 3:
+    case 4:  // four-bit (hex value) case: values 0-15
+      collapse_indistinguishable_nodes_small<15>(records, node);
+      break;
+    case 5:
+    case 6:
+    case 7:
+    case 8:  // eight-bit (byte value) case: values 0-255
+      collapse_indistinguishable_nodes_small<255>(records, node);
+      break;
+    default:  // larger than a byte
+      collapse_indistinguishable_nodes_large(records, node);
+  }
+}
+
+
+/**
+ * Artifacts are sorted by number of strata deposited ascending,
+ * so when the function comes across a rank that has been dropped,
+ * we know it is irrelevant throughout the rest of the run. Therefore,
+ * this function drops all *search* children (note, true parent
+ * data is still stored in `ancestor_id`) and attaches the search
+ * children of those children to the node. Then, attaching children
+ * becomes much faster, avoiding deep searches.
+ *
+ * @see collapse_indistinguishable_nodes
+ */
+template <typename RECORDS>
+void consolidate_trie(RECORDS &records, const i64 rank, const u64 node) {
+  const auto children_range = ChildrenView(records, node);
+  assert(std::ranges::all_of(
+    children_range,
+    [&records, rank](const u64 child){ return records.rank[child] <= rank; }
+  ));
+
+  if (
+    children_range.begin() == children_range.end()
+    // chidlren are stored in ascending order by rank
+    || records.rank[*children_range.begin()] == rank
+  ) [[likely]] {
+    assert(std::ranges::all_of(
+      children_range,
+      [&records, rank](const u64 child){ return records.rank[child] == rank; }
+    ));
+    return;
+  }
+
+  // children are stored in ascending order by rank, so this is equivalent
+  // to copy_if < rank
+  std::vector<u64> node_stack;
+  const auto copy_end = std::ranges::find_if(
+    children_range,
+    [&records, rank](const u64 node){ return records.rank[node] == rank; }
+  );
+  std::ranges::copy(
+    std::ranges::subrange(children_range.begin(), copy_end),
+    std::back_inserter(node_stack)
+  );
+
+  assert(!node_stack.empty());
+
+  // drop children and attach grandchildren
+  while (!node_stack.empty()) {
+    const u64 popped_node = node_stack.back();
+    node_stack.pop_back();
+    detach_search_parent(records, popped_node);
+
+    std::vector<u64> grandchildren;
+    const auto grandchildren_range = ChildrenView(records, popped_node);
+    std::ranges::copy(grandchildren_range, std::back_inserter(grandchildren));
+
+    for (const u64 grandchild : grandchildren) {
+      if (records.rank[grandchild] >= rank) {
+        detach_search_parent(records, grandchild);
+        attach_search_parent(records, grandchild, node);
+      } else {
+        node_stack.push_back(grandchild);
+      }
+    }
+  }
+
+  collapse_indistinguishable_nodes(records, node);
+}
+
+
+/**
+ * Provisional id block owned by one shard during sharded insertion.
+ *
+ * Records created by the shard are written into preallocated slots starting
+ * at `next`, rather than appended. New search children of `frontier` are not
+ * attached (the frontier's child list is shared between shards); they are
+ * collected in `deferred` and attached after shards are merged.
+ *
+ * @see insert_artifacts_sharded
+ */
+struct ShardSlots {
+  u64 next;
+  u64 frontier;
+  std::vector<u64> deferred;
+};
+
+
+/**
+ * Adds a record to the searchtable. Note that this
+ * is the only function that adds records.
+ *
+ * If `slots` is provided, the record is written into the shard's next
+ * provisional slot instead of being appended.
+ */
+template <typename RECORDS>
+u64 create_offstring(
+  RECORDS &records,
+  const u64 parent,
+  const i64 rank,
+  const u64 differentia,
+  const u64 data_id,
+  ShardSlots *slots = nullptr
+) {
+  const u64 node = slots ? slots->next++ : records.size();
+  (records.*(slots ? &RECORDS::setRecord : &RECORDS::addRecord))(
+    data_id,  // data_id
+    node,  // id
+    parent,  // ancestor_id
+    node,  // search_ancestor_id (note! search parent attached next below)
+    node,  // search_first_child_id
+    node,  // search_prev_sibling_id
+    node,  // search_next_sibling_id
+    rank,  // rank
+    differentia  // differentia
+  );
+  const u64 dummy_data_id{placeholder_value};
+  if (data_id != dummy_data_id) return node;  // i.e., leaf node
+  else if (slots && parent == slots->frontier) slots->deferred.push_back(node);
+  else attach_search_parent(records, node, parent);
+  return node;
+}
+
+
+/**
+ * Inserts one rank-differentia pair into the trie.
+ *
+ * @see insert_artifact
+ */
+template <typename RECORDS>
+u64 place_allele(
+  RECORDS &records,
+  const u64 cur_node,
+  const i64 rank,
+  const u64 differentia,
+  ShardSlots *slots = nullptr
+) {
+  assert(records.rank[cur_node] <= rank);
+  const auto range = ChildrenView(records, cur_node);
+  const auto match = std::ranges::find_if(
+    range,
+    [rank, differentia, &records](const u64 child){
+      return (
+        rank == records.rank[child]
+        && differentia == records.differentia[child]
+      );
+    }
+  );
+  if (match != range.end()) {
+    return *match;
+  } else {
+    const u64 dummy_data_id{placeholder_value};
+    return create_offstring(
+      records, cur_node, rank, differentia, dummy_data_id, slots
+    );
+  }
+}
+
+
+/**
+ * A simple iterator over a py::array_t. For more details,
+ * view py_array_span.
+ *
+ * @see py_array_span
+ */
+template <typename T> struct py_array_span_iter {
+  const py::detail::unchecked_reference<T, 1> &data_accessor;
+  u64 index;
+
+  using difference_type = std::ptrdiff_t;
+  using value_type = T;
+  using pointer = T*;
+  using reference = T&;
+  using iterator_category = std::input_iterator_tag;
+
+  py_array_span_iter(
+    const py::detail::unchecked_reference<T, 1> &data_accessor,
+    const u64 index
+  ) : data_accessor(data_accessor), index(index) {}
+
+  u64 operator*() const { return this->data_accessor[this->index]; }
+
+  py_array_span_iter & operator++() { ++this->index; return *this; }
+
+  bool operator!=(const py_array_span_iter &other) const {
+    return this->index != other.index;
+  }
+
+  bool operator==(const py_array_span_iter &other) const {
+    return this->index == other.index;
+  }
+
+};
+
+
+/**
+ * A makeshift span over a pybind11::array_t using an
+ * unchecked_reference. Only supports the indexing and
+ * a .size() call. The unchecked_reference is used for
+ * performance reasons, avoiding index validation.
+ */
+template <typename T> struct py_array_span {
+
+  const py::detail::unchecked_reference<T, 1> &data_accessor;
+  const u64 begin_;
+  const u64 end_;
+
+  u64 size() const { return this->end_ - this->begin_; }
+
+  u64 operator[](const u64 index) const {
+    return this->data_accessor[this->begin_ + index];
+  }
+
+  auto begin() { return py_array_span_iter{data_accessor, this->begin_}; }
+
+  auto end() { return py_array_span_iter{data_accessor, this->end_}; }
+
+  py_array_span(
+    const py::detail::unchecked_reference<T, 1> &data,
+    const u64 begin,
+    const u64 end
+  ) : data_accessor(data), begin_(begin), end_(end) {};
+
+};
+
+
+/**
+ * Adds a single artifact (a.k.a specimen, column) to the
+ * searchtable. Accesses the artifact using a span.
+ *
+ * By default, insertion begins at the root with the artifact's first
+ * stratum. Sharded insertion resumes from `cur_node` at stratum index
+ * `first`, allocating into `slots`.
+ *
+ * @see py_array_span
+ * @see place_allele
+ * @see insert_artifacts_sharded
+ */
+template <typename ISPAN_T, typename USPAN_T, typename RECORDS>
+void insert_artifact(
+  RECORDS &records,
+  ISPAN_T &&ranks,
+  USPAN_T &&differentiae,
+  const u64 data_id,
+  const u64 num_strata_deposited,
+  ShardSlots *slots = nullptr,
+  u64 cur_node = 0,
+  const u64 first = 0
+) {
+  assert(ranks.size() == differentiae.size());
+  for (u64 i = first; i < ranks.size(); ++i) {
+    const i64 r = ranks[i];
+    const u64 d = differentiae[i];
+    consolidate_trie(records, r, cur_node);
+    cur_node = place_allele(records, cur_node, r, d, slots);
+  }
+  create_offstring(
+    records, cur_node, num_strata_deposited - 1, 0, data_id, slots
+  );
+}
+
+
+/**
+ * View of one artifact's strata and metadata, as consumed by
+ * insert_artifacts_serial and insert_artifacts_sharded.
+ */
+template <typename ISPAN_T, typename USPAN_T>
+struct ArtifactView {
+  ISPAN_T ranks;
+  USPAN_T differentiae;
+  u64 data_id;
+  u64 num_strata_deposited;
+};
+
+
+/**
+ * Inserts artifacts one at a time, in order, on the calling thread.
+ *
+ * `get_artifact(i)` must return an object with `ranks`, `differentiae`,
+ * `data_id`, and `num_strata_deposited` members. `on_insert` is called after
+ * each artifact is inserted.
+ *
+ * @see insert_artifacts_sharded
+ */
+template <typename GET_ARTIFACT, typename ON_INSERT, typename RECORDS>
+void insert_artifacts_serial(
+  RECORDS &records,
+  const u64 num_artifacts,
+  GET_ARTIFACT &&get_artifact,
+  ON_INSERT &&on_insert
+) {
+  for (u64 i = 0; i < num_artifacts; ++i) {
+    const auto artifact = get_artifact(i);
+    insert_artifact(
+      records,
+      artifact.ranks,
+      artifact.differentiae,
+      artifact.data_id,
+      artifact.num_strata_deposited
+    );
+    on_insert();
+  }
+}
+
+
+/**
+ * Inserts artifacts using up to `num_threads` threads, producing records
+ * identical to insert_artifacts_serial.
+ *
+ * Artifacts are partitioned below a shallow trie frontier: the node reached
+ * by the strata prefix shared by all artifacts. If all artifacts extending
+ * past the prefix share the same next rank, subtrees keyed by that next
+ * differentia are disjoint, so artifacts are sharded by that differentia and
+ * shards are inserted concurrently. Shards allocate records into disjoint,
+ * preallocated blocks of provisional ids; blocks are then renumbered into
+ * serial creation order (i.e., by artifact order) and new search children of
+ * the frontier are attached in that order.
+ *
+ * Falls back to serial insertion if the frontier cannot be sharded (e.g.,
+ * artifacts disagree on the rank following the shared prefix) or if fewer
+ * than two shards result.
+ *
+ * @see insert_artifacts_serial
+ * @see ShardSlots
+ */
+template <typename GET_ARTIFACT, typename ON_INSERT, typename RECORDS>
+void insert_artifacts_sharded(
+  RECORDS &records,
+  const u64 num_artifacts,
+  GET_ARTIFACT &&get_artifact,
+  const u64 num_threads,
+  ON_INSERT &&on_insert
+) {
+  if (num_threads <= 1 || num_artifacts < 2) {
+    insert_artifacts_serial(records, num_artifacts, get_artifact, on_insert);
+    return;
+  }
+
+  // find length of strata prefix shared by all artifacts
+  const auto first = get_artifact(0);
+  u64 prefix_len = first.ranks.size();
+  for (u64 i = 1; i < num_artifacts && prefix_len; ++i) {
+    const auto artifact = get_artifact(i);
+    const u64 limit = std::min<u64>(prefix_len, artifact.ranks.size());
+    u64 j = 0;
+    while (
+      j < limit
+      && artifact.ranks[j] == first.ranks[j]
+      && artifact.differentiae[j] == first.differentiae[j]
+    ) ++j;
+    prefix_len = j;
+  }
+
+  // group artifacts by differentia following the shared prefix, in order of
+  // first appearance; artifacts ending at the prefix share a leaf-only shard
+  std::optional<i64> frontier_rank;
+  std::vector<std::vector<u64>> shards(1);  // shards[0] is leaf-only shard
+  std::unordered_map<u64, u64> shard_lookup;
+  for (u64 i = 1; i < num_artifacts; ++i) {
+    const auto artifact = get_artifact(i);
+    if (artifact.ranks.size() == prefix_len) {
+      shards[0].push_back(i);
+      continue;
+    }
+    const i64 rank = artifact.ranks[prefix_len];
+    if (frontier_rank.value_or(rank) != rank) {
+      insert_artifacts_serial(
+        records, num_artifacts, get_artifact, on_insert
+      );
+      return;
+    }
+    frontier_rank = rank;
+    const auto [it, inserted] = shard_lookup.try_emplace(
+      artifact.differentiae[prefix_len], shards.size()
+    );
+    if (inserted) shards.emplace_back();
+    shards[it->second].push_back(i);
+  }
+  if (
+    first.ranks.size() > prefix_len
+    && frontier_rank.value_or(first.ranks[prefix_len])
+      != static_cast<i64>(first.ranks[prefix_len])
+  ) {
+    insert_artifacts_serial(records, num_artifacts, get_artifact, on_insert);
+    return;
+  }
+  if (std::ranges::count_if(
+    shards, [](const auto &shard) { return !shard.empty(); }
+  ) < 2) {
+    insert_artifacts_serial(records, num_artifacts, get_artifact, on_insert);
+    return;
+  }
+
+  // first artifact creates or visits all prefix nodes; subsequent artifacts
+  // will find prefix nodes already in place with consolidation a no-op
+  insert_artifact(
+    records,
+    first.ranks,
+    first.differentiae,
+    first.data_id,
+    first.num_strata_deposited
+  );
+  on_insert();
+
+  u64 frontier = 0;
+  for (u64 j = 0; j < prefix_len; ++j) {
+    const auto children = ChildrenView(records, frontier);
+    const auto match = std::ranges::find_if(
+      children,
+      [&records, &first, j](const u64 child) {
+        return records.rank[child] == static_cast<i64>(first.ranks[j])
+          && records.differentia[child] == first.differentiae[j];
+      }
+    );
+    assert(match != children.end());
+    frontier = *match;
+  }
+  // perform frontier consolidation once, up front, as the first artifact
+  // extending past the prefix would; thereafter it is a no-op
+  if (frontier_rank) consolidate_trie(records, *frontier_rank, frontier);
+
+  // allocate disjoint blocks of provisional ids, bounded by one record per
+  // stratum past the prefix, plus one leaf record, per artifact
+  const u64 num_existing = records.size();
+  std::vector<u64> shard_bases;
+  u64 total_bound = 0;
+  for (const auto &shard : shards) {
+    shard_bases.push_back(num_existing + total_bound);
+    for (const u64 i : shard) {
+      total_bound += get_artifact(i).ranks.size() - prefix_len + 1;
+    }
+  }
+  records.resize(num_existing + total_bound);
+
+  std::vector<u64> prov_starts(num_artifacts);
+  std::vector<u64> counts(num_artifacts);
+  std::vector<ShardSlots> slots;
+  for (u64 s = 0; s < shards.size(); ++s) {
+    slots.push_back({shard_bases[s], frontier, {}});
+  }
+
+  // work through shards largest first, for load balance
+  std::vector<u64> shard_order(shards.size());
+  std::iota(shard_order.begin(), shard_order.end(), u64{});
+  std::ranges::stable_sort(
+    shard_order,
+    std::greater<u64>{},
+    [&shards](const u64 s) { return shards[s].size(); }
+  );
+
+  std::atomic<u64> next_shard{0};
+  const auto work = [&]() {
+    for (u64 k; (k = next_shard.fetch_add(1)) < shard_order.size();) {
+      const u64 s = shard_order[k];
+      auto &shard_slots = slots[s];
+      u64 subtree_root = placeholder_value;
+      for (const u64 i : shards[s]) {
+        const auto artifact = get_artifact(i);
+        prov_starts[i] = shard_slots.next;
+        if (artifact.ranks.size() == prefix_len) {
+          create_offstring(
+            records,
+            frontier,
+            artifact.num_strata_deposited - 1,
+            0,
+            artifact.data_id,
+            &shard_slots
+          );
+        } else {
+          // frontier's own child list is shared, so track shard subtree
+          // root here rather than searching for it each time
+          if (subtree_root == placeholder_value) {
+            subtree_root = place_allele(
+              records,
+              frontier,
+              artifact.ranks[prefix_len],
+              artifact.differentiae[prefix_len],
+              &shard_slots
+            );
+          }
+          insert_artifact(
+            records,
+            artifact.ranks,
+            artifact.differentiae,
+            artifact.data_id,
+            artifact.num_strata_deposited,
+            &shard_slots,
+            subtree_root,
+            prefix_len + 1
+          );
+        }
+        counts[i] = shard_slots.next - prov_starts[i];
+        on_insert();
+      }
+    }
+  };
+  {
+    std::vector<std::jthread> workers;
+    const u64 num_workers = std::min<u64>(num_threads, shards.size());
+    for (u64 t = 1; t < num_workers; ++t) workers.emplace_back(work);
+    work();
+  }  // join workers
+
+  // renumber provisional ids into serial creation order
+  std::vector<u64> final_starts(num_artifacts);
+  u64 num_created = 0;
+  for (u64 i = 1; i < num_artifacts; ++i) {
+    final_starts[i] = num_existing + num_created;
+    num_created += counts[i];
+  }
+  std::vector<u64> prov_to_final(total_bound, placeholder_value);
+  for (u64 i = 1; i < num_artifacts; ++i) {
+    for (u64 k = 0; k < counts[i]; ++k) {
+      prov_to_final[prov_starts[i] - num_existing + k] = final_starts[i] + k;
+    }
+  }
+  const auto remap = [&prov_to_final, num_existing](const u64 id) {
+    if (id < num_existing || id == placeholder_value) return id;
+    assert(prov_to_final[id - num_existing] != placeholder_value);
+    return prov_to_final[id - num_existing];
+  };
+
+  const auto relocate = [&](auto &column, const bool is_id_column) {
+    using column_t = std::remove_cvref_t<decltype(column)>;
+    if (is_id_column) {  // existing records may point to new records
+      std::ranges::transform(
+        column.begin(),
+        std::next(column.begin(), num_existing),
+        column.begin(),
+        remap
+      );
+    }
+    column_t created(num_created);
+    for (u64 i = 1; i < num_artifacts; ++i) {
+      for (u64 k = 0; k < counts[i]; ++k) {
+        const auto value = column[prov_starts[i] + k];
+        auto &dest = created[final_starts[i] - num_existing + k];
+        if (is_id_column) dest = remap(value);
+        else dest = value;
+      }
+    }
+    std::ranges::copy(created, std::next(column.begin(), num_existing));
+    column.resize(num_existing + num_created);
+  };
+  relocate(records.dstream_data_id, false);
+  relocate(records.id, true);
+  relocate(records.search_first_child_id, true);
+  relocate(records.search_prev_sibling_id, true);
+  relocate(records.search_next_sibling_id, true);
+  relocate(records.search_ancestor_id, true);
+  relocate(records.ancestor_id, true);
+  relocate(records.differentia, false);
+  relocate(records.rank, false);
+  records.dirty.resize(num_existing + num_created);  // new records all dirty
+  assert(std::equal(
+    std::begin(records.id),
+    std::end(records.id),
+    CountingIterator<u64>{}
+  ));
+
+  // attach new frontier children in creation order, as serially
+  std::vector<u64> deferred;
+  for (const auto &shard_slots : slots) {
+    std::ranges::transform(
+      shard_slots.deferred, std::back_inserter(deferred), remap
+    );
+  }
+  std::ranges::sort(deferred);
+  for (const u64 node : deferred) {
+    attach_search_parent(records, node, frontier);
+  }
+}
+
+
+/**
+ * Consumes the given sequence and uses its data to create
+ * a py::array_t without needing to do any copy operations.
+ *
+ * https://github.com/pybind/pybind11/issues/1042#issuecomment-2262727578
+ */
+template <typename Sequence>
+inline pybind11::array_t<typename Sequence::value_type> as_pyarray(
+  Sequence &&seq
+) {
+    const auto seq_size = seq.size();
+    const auto seq_data = seq.data();
+    std::unique_ptr<Sequence> seq_ptr = std::make_unique<Sequence>(
+      std::move(seq)
+    );
+    auto capsule = pybind11::capsule(
+      seq_ptr.get(),
+      [](void *p) {
+        std::unique_ptr<Sequence>(reinterpret_cast<Sequence *>(p));
+      }
+    );
+    seq_ptr.release();
+
+    return pybind11::array(
+      {seq_size},
+      {sizeof(typename Sequence::value_type)},
+      seq_data,
+      capsule
+    );
+}
+
+
+/**
+ * Copies a column into a full-width vector of VALUE_T, expanding narrow
+ * storage.
+ */
+template <typename VALUE_T, typename COLUMN_T>
+std::vector<VALUE_T> widen_column(const COLUMN_T &column) {
+  return std::vector<VALUE_T>(std::begin(column), std::end(column));
+}
+
+
+/**
+ * Takes a column as a full-width vector of VALUE_T. Full-width columns are
+ * moved without copying; narrow columns are expanded, then released.
+ */
+template <typename VALUE_T, typename COLUMN_T>
+std::vector<VALUE_T> take_column(COLUMN_T &column) {
+  if constexpr (std::is_same_v<typename COLUMN_T::value_type, VALUE_T>) {
+    return std::move(column);
+  } else {
+    auto widened = widen_column<VALUE_T>(column);
+    COLUMN_T{}.swap(column);  // release narrow storage before next column
+    return widened;
+  }
+}
+
+
+/**
+ * Consumes a column as a py::array_t of VALUE_T.
+ *
+ * @see take_column
+ */
+template <typename VALUE_T, typename COLUMN_T>
+py::array_t<VALUE_T> extract_column(COLUMN_T &column) {
+  return as_pyarray(take_column<VALUE_T>(column));
+}
+
+
+/**
+ * Fills a records column from a one-dimensional numpy array, throwing
+ * std::overflow_error if any value is out of the column's range.
+ */
+template <typename COLUMN_T, typename VALUE_T, typename IS_REPRESENTABLE>
+void load_column(
+  COLUMN_T &column,
+  const py::array_t<VALUE_T, py::array::c_style | py::array::forcecast> &array,
+  const char *name,
+  const IS_REPRESENTABLE &is_representable
+) {
+  const auto values = array.template unchecked<1>();
+  for (py::ssize_t i = 0; i < values.shape(0); ++i) {
+    if (!is_representable(values(i))) {
+      throw std::overflow_error(
+        std::string("records column ") + name + " value "
+        + std::to_string(values(i)) + " exceeds records layout"
+      );
+    }
+  }
+  column.assign(values.data(0), values.data(0) + values.shape(0));
+}
+
+
+/**
+ * Replaces contents of a Records object with columns from a dict of numpy
+ * arrays, as produced by copy_records_to_dict.
+ *
+ * Throws std::overflow_error (OverflowError in Python) if any value exceeds
+ * the records layout. Records are left unmodified if an exception is thrown.
+ *
+ * @see copy_records_to_dict
+ */
+template <typename RECORDS>
+void load_records_from_dict(RECORDS &records, const py::dict &columns) {
+  using u64_array_t = py::array_t<
+    u64, py::array::c_style | py::array::forcecast
+  >;
+  using i64_array_t = py::array_t<
+    i64, py::array::c_style | py::array::forcecast
+  >;
+  const auto get = [&columns](const char *name) -> py::object {
+    if (!columns.contains(name)) {
+      throw py::key_error(std::string("missing records column ") + name);
+    }
+    return columns[name];
+  };
+  const auto is_id = [](const u64 value) {
+    return value <= RECORDS::max_id || value == placeholder_value;
+  };
+  const auto is_rank = [](const i64 value) {
+    return value >= 0 && static_cast<u64>(value) <= RECORDS::max_rank;
+  };
+  const auto is_differentia = [](const u64 value) {
+    return value <= RECORDS::max_representable_differentia;
+  };
+
+  RECORDS loaded(0, /* init_root= */ false);
+  const auto load_id = [&](auto &column, const char *name) {
+    load_column(column, get(name).template cast<u64_array_t>(), name, is_id);
+  };
+  load_id(loaded.dstream_data_id, "dstream_data_id");
+  load_id(loaded.id, "id");
+  load_id(loaded.search_first_child_id, "search_first_child_id");
+  load_id(loaded.search_prev_sibling_id, "search_prev_sibling_id");
+  load_id(loaded.search_next_sibling_id, "search_next_sibling_id");
+  load_id(loaded.search_ancestor_id, "search_ancestor_id");
+  load_id(loaded.ancestor_id, "ancestor_id");
+  load_column(
+    loaded.differentia,
+    get("differentia").template cast<u64_array_t>(),
+    "differentia",
+    is_differentia
+  );
+  load_column(
+    loaded.rank, get("rank").template cast<i64_array_t>(), "rank", is_rank
+  );
+
+  const u64 size = loaded.id.size();
+  for (const u64 column_size : {
+    loaded.dstream_data_id.size(),
+    loaded.search_first_child_id.size(),
+    loaded.search_prev_sibling_id.size(),
+    loaded.search_next_sibling_id.size(),
+    loaded.search_ancestor_id.size(),
+    loaded.ancestor_id.size(),
+    loaded.differentia.size(),
+    loaded.rank.size(),
+  }) {
+    if (column_size != size) {
+      throw py::value_error("records columns must have equal lengths");
+    }
+  }
+  for (const u64 differentia : loaded.differentia) {
+    loaded.max_differentia = std::max(loaded.max_differentia, differentia);
+  }
+  loaded.dirty.assign(size, true);  // loaded records are unchecked
+
+  loaded.swap(records);
+}
+
+
+/**
+ * Converts records of any layout to the full-width layout, e.g., when a
+ * compact layout's id range would be exceeded. Columns are converted one at a
+ * time and released, so peak memory exceeds that of the input by at most one
+ * full-width column. The input records are left empty.
+ */
+template <typename RECORDS>
+Records widen_records(RECORDS &records) {
+  if constexpr (std::is_same_v<RECORDS, Records>) {
+    return std::move(records);
+  } else {
+    Records res(0, /* init_root= */ false);
+    const auto widen_into = [](auto &dest, auto &source) {
+      using dest_t = typename std::remove_cvref_t<decltype(dest)>::value_type;
+      dest = widen_column<dest_t>(source);
+      std::remove_cvref_t<decltype(source)>{}.swap(source);
+    };
+    widen_into(res.dstream_data_id, records.dstream_data_id);
+    widen_into(res.id, records.id);
+    widen_into(res.search_first_child_id, records.search_first_child_id);
+    widen_into(res.search_prev_sibling_id, records.search_prev_sibling_id);
+    widen_into(res.search_next_sibling_id, records.search_next_sibling_id);
+    widen_into(res.search_ancestor_id, records.search_ancestor_id);
+    widen_into(res.ancestor_id, records.ancestor_id);
+    widen_into(res.differentia, records.differentia);
+    widen_into(res.rank, records.rank);
+    res.dirty = std::move(records.dirty);
+    res.max_differentia = records.max_differentia;
+    return res;
+  }
+}
+
+
+/**
+ * Nondestructively converts a Records object to a py::dict of lists.
+ */
+template <typename RECORDS>
+py::dict copy_records_to_dict(RECORDS &records) {
+  std::unordered_map<std::string, std::vector<u64>> return_mapping;
+  return_mapping.insert(
+    {"dstream_data_id", widen_column<u64>(records.dstream_data_id)}
+  );
+  return_mapping.insert({"id", widen_column<u64>(records.id)});
+  return_mapping.insert(
+    {"search_first_child_id", widen_column<u64>(records.search_first_child_id)}
+  );
+  return_mapping.insert(
+    {
+      "search_prev_sibling_id",
+      widen_column<u64>(records.search_prev_sibling_id)
+    }
+  );
+  return_mapping.insert(
+    {
+      "search_next_sibling_id",
+      widen_column<u64>(records.search_next_sibling_id)
+    }
+  );
+  return_mapping.insert(
+    {"search_ancestor_id", widen_column<u64>(records.search_ancestor_id)}
+  );
+  return_mapping.insert(
+    {"ancestor_id", widen_column<u64>(records.ancestor_id)}
+  );
+  return_mapping.insert(
+    {"differentia", widen_column<u64>(records.differentia)}
+  );
+  py::dict res = py::cast(return_mapping);
+  res["rank"] = widen_column<i64>(records.rank);
+  return res;
+}
+
+
+/**
+ * Converts a Records object to a py::dict of numpy arrays.
+ *
+ * Data is moved out of the Records object, so no copies are made. The Records
+ * object is left in a valid but unspecified state.
+ *
+ * Compact records are expanded to full-width (uint64/int64) arrays here,
+ * column by column, so output dtypes do not depend on records layout.
+ */
+template <typename RECORDS>
+py::dict extract_records_to_dict(RECORDS &records) {
+  std::unordered_map<std::string, py::array_t<u64>> return_mapping;
+  return_mapping.insert(
+    {"dstream_data_id", extract_column<u64>(records.dstream_data_id)}
+  );
+  return_mapping.insert(
+    {"id", extract_column<u64>(records.id)}
+  );
+  return_mapping.insert(
+    {"search_first_child_id", extract_column<u64>(
+      records.search_first_child_id
+    )}
+  );
+  return_mapping.insert(
+    {"search_prev_sibling_id", extract_column<u64>(
+      records.search_prev_sibling_id
+    )}
+  );
+  return_mapping.insert(
+    {"search_next_sibling_id", extract_column<u64>(
+      records.search_next_sibling_id
+    )}
+  );
+  return_mapping.insert(
+    {"search_ancestor_id", extract_column<u64>(
+      records.search_ancestor_id
+    )}
+  );
+  return_mapping.insert(
+    {"ancestor_id", extract_column<u64>(records.ancestor_id)}
+  );
+  return_mapping.insert(
+    {"differentia", extract_column<u64>(records.differentia)}
+  );
+  py::dict res = py::cast(return_mapping);
+  res["rank"] = extract_column<i64>(records.rank);
+  std::vector<uint8_t>{}.swap(records.dirty);
+  return res;
+}
+
+
+// Arrow C Data Interface ABI, as specified at
+// https://arrow.apache.org/docs/format/CDataInterface.html
+#ifndef ARROW_C_DATA_INTERFACE
+#define ARROW_C_DATA_INTERFACE
+
+#define ARROW_FLAG_DICTIONARY_ORDERED 1
+#define ARROW_FLAG_NULLABLE 2
+#define ARROW_FLAG_MAP_KEYS_SORTED 4
+
+struct ArrowSchema {
+  // Array type description
+  const char* format;
+  const char* name;
+  const char* metadata;
+  int64_t flags;
+  int64_t n_children;
+  struct ArrowSchema** children;
+  struct ArrowSchema* dictionary;
+
+  // Release callback
+  void (*release)(struct ArrowSchema*);
+  // Opaque producer-specific data
+  void* private_data;
+};
+
+struct ArrowArray {
+  // Array data description
+  int64_t length;
+  int64_t null_count;
+  int64_t offset;
+  int64_t n_buffers;
+  int64_t n_children;
+  const void** buffers;
+  struct ArrowArray** children;
+  struct ArrowArray* dictionary;
+
+  // Release callback
+  void (*release)(struct ArrowArray*);
+  // Opaque producer-specific data
+  void* private_data;
+};
+
+#endif  // ARROW_C_DATA_INTERFACE
+
+
+/**
+ * Owns the buffers of one exported Arrow column.
+ */
+template <typename T>
+struct ArrowColumnBuffers {
+  std::vector<T> values;
+  std::vector<uint8_t> validity;
+  std::array<const void*, 2> buffers;
+};
+
+
+/**
+ * Release callback for Arrow columns, freeing column buffers.
+ */
+template <typename T>
+void release_arrow_column(ArrowArray *array) {
+  delete static_cast<ArrowColumnBuffers<T>*>(array->private_data);
+  array->release = nullptr;
+}
+
+
+/**
+ * Release callback for Arrow struct arrays, releasing child columns.
+ */
+void release_arrow_struct(ArrowArray *array) {
+  for (int64_t i = 0; i < array->n_children; ++i) {
+    ArrowArray *child = array->children[i];
+    if (child->release) child->release(child);
+    delete child;
+  }
+  delete[] array->children;
+  delete[] array->buffers;
+  array->release = nullptr;
+}
+
+
+/**
+ * Release callback for Arrow schemas. Format and name strings are static.
+ */
+void release_arrow_schema(ArrowSchema *schema) {
+  for (int64_t i = 0; i < schema->n_children; ++i) {
+    ArrowSchema *child = schema->children[i];
+    if (child->release) child->release(child);
+    delete child;
+  }
+  delete[] schema->children;
+  schema->release = nullptr;
+}
+
+
+/**
+ * Wraps `values` as a non-nullable Arrow column, taking ownership without
+ * copying. If `placeholder_as_null` is set, placeholder_value entries are
+ * marked null in a validity bitmap.
+ */
+template <typename T>
+ArrowArray *make_arrow_column(
+  std::vector<T> &&values, const bool placeholder_as_null
+) {
+  auto *owned = new ArrowColumnBuffers<T>{std::move(values), {}, {}};
+  const u64 length = owned->values.size();
+
+  int64_t null_count = 0;
+  if (placeholder_as_null) {
+    null_count = std::ranges::count(
+      owned->values, static_cast<T>(placeholder_value)
+    );
+  }
+  if (null_count) {
+    owned->validity.assign((length + 7) / 8, 0);
+    for (u64 i = 0; i < length; ++i) {
+      const bool is_valid = (
+        owned->values[i] != static_cast<T>(placeholder_value)
+      );
+      owned->validity[i / 8] |= is_valid << (i % 8);
+    }
+  }
+  owned->buffers = {
+    null_count ? owned->validity.data() : nullptr, owned->values.data()
+  };
+
+  return new ArrowArray{
+    static_cast<int64_t>(length),  // length
+    null_count,  // null_count
+    0,  // offset
+    2,  // n_buffers
+    0,  // n_children
+    owned->buffers.data(),  // buffers
+    nullptr,  // children
+    nullptr,  // dictionary
+    &release_arrow_column<T>,  // release
+    owned  // private_data
+  };
+}
+
+
+/**
+ * Records columns exported through the Arrow C Data Interface, as a struct
+ * array (i.e., a record batch). Implements the Arrow PyCapsule interface
+ * (`__arrow_c_array__`), so pyarrow and polars can take ownership of column
+ * buffers without copying. Can be consumed only once.
+ *
+ * @see extract_records_to_arrow
+ */
+class RecordsArrowExport {
+  ArrowSchema schema;
+  ArrowArray array;
+
+  static void release_schema_capsule(PyObject *capsule) {
+    auto *schema = static_cast<ArrowSchema*>(
+      PyCapsule_GetPointer(capsule, "arrow_schema")
+    );
+    if (schema->release) schema->release(schema);
+    delete schema;
+  }
+
+  static void release_array_capsule(PyObject *capsule) {
+    auto *array = static_cast<ArrowArray*>(
+      PyCapsule_GetPointer(capsule, "arrow_array")
+    );
+    if (array->release) array->release(array);
+    delete array;
+  }
+
+public:
+  RecordsArrowExport(
+    const std::vector<const char*> &names,
+    const std::vector<const char*> &formats,
+    const std::vector<ArrowArray*> &columns,
+    const u64 length
+  ) {
+    const auto num_columns = static_cast<int64_t>(columns.size());
+    auto **child_schemas = new ArrowSchema*[num_columns];
+    auto **child_arrays = new ArrowArray*[num_columns];
+    for (int64_t i = 0; i < num_columns; ++i) {
+      child_schemas[i] = new ArrowSchema{
+        formats[i],  // format
+        names[i],  // name
+        nullptr,  // metadata
+        columns[i]->null_count ? ARROW_FLAG_NULLABLE : 0,  // flags
+        0,  // n_children
+        nullptr,  // children
+        nullptr,  // dictionary
+        &release_arrow_schema,  // release
+        nullptr  // private_data
+      };
+      child_arrays[i] = columns[i];
+    }
+    this->schema = ArrowSchema{
+      "+s", "", nullptr, 0, num_columns, child_schemas, nullptr,
+      &release_arrow_schema, nullptr
+    };
+    this->array = ArrowArray{
+      static_cast<int64_t>(length), 0, 0, 1, num_columns,
+      new const void*[1]{nullptr}, child_arrays, nullptr,
+      &release_arrow_struct, nullptr
+    };
+  }
+
+  RecordsArrowExport(const RecordsArrowExport &) = delete;
+
+  RecordsArrowExport(RecordsArrowExport &&other) noexcept
+  : schema(other.schema), array(other.array) {
+    other.schema.release = nullptr;
+    other.array.release = nullptr;
+  }
+
+  ~RecordsArrowExport() {
+    if (this->schema.release) this->schema.release(&this->schema);
+    if (this->array.release) this->array.release(&this->array);
+  }
+
+  u64 size() const {
+    return this->array.release ? this->array.length : 0;
+  }
+
+  /**
+   * Moves exported data into a (schema, array) pair of PyCapsules. The
+   * requested schema, if any, is ignored, as permitted by the protocol.
+   */
+  py::tuple arrow_c_array(const py::object &/* requested_schema */) {
+    if (!this->array.release) {
+      throw std::runtime_error("RecordsArrowExport has already been consumed");
+    }
+    auto *schema = new ArrowSchema(this->schema);
+    auto *array = new ArrowArray(this->array);
+    this->schema.release = nullptr;
+    this->array.release = nullptr;
+    return py::make_tuple(
+      py::reinterpret_steal<py::object>(
+        PyCapsule_New(schema, "arrow_schema", &release_schema_capsule)
+      ),
+      py::reinterpret_steal<py::object>(
+        PyCapsule_New(array, "arrow_array", &release_array_capsule)
+      )
+    );
+  }
+};
+
+
+/** Names of records columns, in export order. */
+const std::vector<std::string> records_column_names{
+  "dstream_data_id",
+  "id",
+  "search_first_child_id",
+  "search_prev_sibling_id",
+  "search_next_sibling_id",
+  "search_ancestor_id",
+  "ancestor_id",
+  "differentia",
+  "rank",
+};
+
+
+/**
+ * Moves selected records columns into an Arrow record batch export, without
+ * copying full-width columns. Columns not selected are released. The Records
+ * object is left in a valid but unspecified state.
+ *
+ * Id columns are exported as uint64, with placeholder_value entries as null.
+ * Rank is exported as uint64, as ranks are nonnegative.
+ *
+ * @see copy_records_to_arrow
+ * @see RecordsArrowExport
+ */
+template <typename RECORDS>
+RecordsArrowExport extract_records_to_arrow(
+  RECORDS &records, const std::vector<std::string> &columns
+) {
+  const u64 length = records.size();
+  std::vector<const char*> names;
+  std::vector<const char*> formats;
+  std::vector<ArrowArray*> arrays;
+  for (const auto &column : columns) {
+    const auto it = std::ranges::find(records_column_names, column);
+    if (it == records_column_names.end()) {
+      for (ArrowArray *array : arrays) {
+        array->release(array);
+        delete array;
+      }
+      throw py::value_error("unknown records column " + column);
+    }
+    names.push_back(it->c_str());
+    formats.push_back("L");  // uint64
+    if (column == "rank") {
+      arrays.push_back(make_arrow_column(take_column<i64>(records.rank), false));
+    } else if (column == "differentia") {
+      arrays.push_back(
+        make_arrow_column(take_column<u64>(records.differentia), false)
+      );
+    } else {
+      auto &id_column = (
+        column == "dstream_data_id" ? records.dstream_data_id
+        : column == "id" ? records.id
+        : column == "search_first_child_id" ? records.search_first_child_id
+        : column == "search_prev_sibling_id" ? records.search_prev_sibling_id
+        : column == "search_next_sibling_id" ? records.search_next_sibling_id
+        : column == "search_ancestor_id" ? records.search_ancestor_id
+        : records.ancestor_id
+      );
+      arrays.push_back(make_arrow_column(take_column<u64>(id_column), true));
+    }
+  }
+
+  RECORDS{0, /* init_root= */ false}.swap(records);  // release the rest
+  return RecordsArrowExport{names, formats, arrays, length};
+}
+
+
+/**
+ * Nondestructively exports selected records columns as an Arrow record
+ * batch. Columns are copied.
+ *
+ * @see extract_records_to_arrow
+ */
+template <typename RECORDS>
+RecordsArrowExport copy_records_to_arrow(
+  const RECORDS &records, const std::vector<std::string> &columns
+) {
+  RECORDS copy{0, /* init_root= */ false};
+  copy.dstream_data_id = records.dstream_data_id;
+  copy.id = records.id;
+  copy.search_first_child_id = records.search_first_child_id;
+  copy.search_prev_sibling_id = records.search_prev_sibling_id;
+  copy.search_next_sibling_id = records.search_next_sibling_id;
+  copy.search_ancestor_id = records.search_ancestor_id;
+  copy.ancestor_id = records.ancestor_id;
+  copy.differentia = records.differentia;
+  copy.rank = records.rank;
+  return extract_records_to_arrow(copy, columns);
+}
+
+
+/**
+ * Background thread that polls a counter and acquires the GIL periodically
+ * to update a tqdm progress bar. Completes once the counter reaches total.
+ *
+ * Must be constructed while the GIL is held. Call join() with the GIL
+ * released to avoid deadlock with the thread's gil_scoped_acquire.
+ */
+struct ProgressPoller {
+
+  py::object _pbar;
+  u64 _total;
+  std::atomic<u64> _counter{0};
+  std::mutex _mutex;
+  std::condition_variable _cv;
+  std::thread _thread;
+
+  ProgressPoller(py::object pbar, const u64 total)
+    : _pbar(std::move(pbar)), _total(total),
+      _thread(&ProgressPoller::_run, this) {}
+
+  ~ProgressPoller() {
+    if (_thread.joinable()) _thread.join();
+  }
+
+  void increment(const u64 n = 1) {
+    u64 prev = _counter.fetch_add(n, std::memory_order_release);
+    if (prev + n >= _total) _cv.notify_one();
+  }
+
+  void join() { _thread.join(); }
+
+private:
+  void _run() {
+    u64 prev = 0;
+    while (prev < _total) {
+      {
+        std::unique_lock<std::mutex> lock(_mutex);
+        _cv.wait_for(lock, std::chrono::seconds(10), [this]() {
+          return _counter.load(std::memory_order_acquire) >= _total;
+        });
+      }
+      u64 cur = _counter.load(std::memory_order_acquire);
+      py::gil_scoped_acquire acquire;
+      _pbar.attr("update")(cur - prev);
+      prev = cur;
+    }
+  }
+};
+
+
+/**
+ * Constructs the trie in the case where each element in each
+ * of the below vectors represents a unique artifact. Includes
+ * logging and an optional tqdm progress bar.
+ *
+ * Note that ranks must be in ascending order within each stratum.
+ *
+ * If num_threads is greater than 1, artifacts are inserted in parallel where
+ * possible, with results identical to serial insertion.
+ *
+ * @see build_trie_searchtable_exploded
+ * @see insert_artifacts_sharded
+ */
+py::dict build_trie_searchtable_nested(
+  const std::vector<u64> &data_ids,
+  const std::vector<u64> &num_strata_depositeds,
+  const std::vector<std::vector<i64>> &ranks,
+  const std::vector<std::vector<u64>> &differentiae,
+  const py::handle &progress_ctor,
+  const u64 num_threads
+) {
+  assert(
+    data_ids.size() == num_strata_depositeds.size()
+    && data_ids.size() == ranks.size()
+    && data_ids.size() == differentiae.size()
+  );
+
+  if (!data_ids.size()) { return py::dict{}; }
+
+  // size columns to fit; every stratum and artifact adds at most one record
+  u64 max_differentia = 0;
+  u64 max_rank = 0;
+  u64 max_id = data_ids.size() + 1;  // root plus one leaf per artifact
+  for (u64 i = 0; i < data_ids.size(); ++i) {
+    for (const u64 differentia : differentiae[i]) {
+      max_differentia = std::max(max_differentia, differentia);
+    }
+    for (const i64 rank : ranks[i]) {
+      max_rank = std::max(max_rank, static_cast<u64>(rank));
+    }
+    max_rank = std::max(max_rank, num_strata_depositeds[i]);
+    max_id += ranks[i].size();
+  }
+  max_id = std::max(max_id, *std::ranges::max_element(data_ids));
+  const auto layout = select_records_layout(max_differentia, max_rank, max_id);
+
+  return visit_records_layout(layout, [&](const auto tag) {
+    using records_t = typename decltype(tag)::type;
+    records_t records{static_cast<u64>(data_ids.size())};
+    records.max_differentia = max_differentia;
+
+    const auto logging_info = py::module::import("logging").attr("info");
+    logging_info(
+      py::str(
+        "nested searchtable cpp begin ({} threads, {} bytes per record)"
+      ).format(num_threads, records_t::record_nbytes())
+    );
+
+    {
+      ProgressPoller poller{
+        progress_ctor("total"_a=ranks.size()), ranks.size()
+      };
+
+      { // scope: release GIL for computational hot path, reacquire at end
+      py::gil_scoped_release release;
+
+      insert_artifacts_sharded(
+        records,
+        ranks.size(),
+        [&](const u64 i) {
+          return ArtifactView{
+            std::span<const i64>(ranks[i]),
+            std::span<const u64>(differentiae[i]),
+            data_ids[i],
+            num_strata_depositeds[i]
+          };
+        },
+        num_threads,
+        [&poller]() { poller.increment(); }
+      );
+
+      poller.join();
+      } // end GIL release scope
+
+    }  // end progress poller scope
+
+    logging_info("nested searchtable cpp complete");
+    return extract_records_to_dict(records);
+  });
+}
+
+
+/**
+ * A helper function to count the number of unique items in an
+ * array. This is similar to std::unique but does not mutate.
+ */
+template <typename ITER>
+u64 count_unique_elements(ITER begin, ITER end) {
+
+  if (begin == end) { return 0; }
+
+  return std::count_if(
+    begin,
+    end,
+    [last = *begin](const auto &item) mutable {
+      const bool is_unique = last != item;
+      last = item;
+      return is_unique;
+    }
+  ) + 1;
+
+}
+
+
+/**
+ * Maximum values within exploded artifact data, used to size and check
+ * records columns.
+ *
+ * @see select_records_layout
+ */
+struct ExplodedMaxima {
+  u64 differentia;
+  u64 rank;
+  u64 data_id;
+};
+
+
+/**
+ * Scans exploded artifact data for the maxima in ExplodedMaxima. Ranks are
+ * checked against num_strata_depositeds, too, as leaf records take rank
+ * num_strata_deposited - 1.
+ */
+ExplodedMaxima find_exploded_maxima(
+  const py::array_t<u64> &data_ids,
+  const py::array_t<u64> &num_strata_depositeds,
+  const py::array_t<i64> &ranks,
+  const py::array_t<u64> &differentiae
+) {
+  const auto data_ids_ = data_ids.unchecked<1>();
+  const auto num_strata_depositeds_ = num_strata_depositeds.unchecked<1>();
+  const auto ranks_ = ranks.unchecked<1>();
+  const auto differentiae_ = differentiae.unchecked<1>();
+
+  ExplodedMaxima res{0, 0, 0};
+  for (u64 i = 0; i < static_cast<u64>(data_ids.size()); ++i) {
+    res.differentia = std::max(
+      res.differentia, static_cast<u64>(differentiae_[i])
+    );
+    res.rank = std::max({
+      res.rank,
+      static_cast<u64>(ranks_[i]),
+      static_cast<u64>(num_strata_depositeds_[i])
+    });
+    res.data_id = std::max(res.data_id, static_cast<u64>(data_ids_[i]));
+  }
+  return res;
+}
+
+
+/**
+ * Extends a records object with new artifacts. This function allows for
+ * source data to be exploded in chunks, reducing memory pressure. The supplied
+ * records object is modified in place.
+ *
+ * Note that sequential calls to this function must be made with artifacts in
+ * ascending order by num_strata_deposited and that the data_ids array must be
+ * partitioned cleanly across calls (i.e., no data_id should be split across
+ * calls). Within each artifact, ranks must be in ascending order.
+ *
+ * Includes logging and an optional tqdm progress bar.
+ *
+ * If num_threads is greater than 1, artifacts are inserted in parallel where
+ * possible, with results identical to serial insertion.
+ *
+ * @see build_trie_searchtable_exploded : performs a one-pass (non-chunked)
+ * build
+ * @see insert_artifacts_sharded
+ */
+template <typename RECORDS>
+void extend_trie_searchtable_exploded(
+  RECORDS &records,
+  const py::array_t<u64> &data_ids,
+  const py::array_t<u64> &num_strata_depositeds,
+  const py::array_t<i64> &ranks,
+  const py::array_t<u64> &differentiae,
+  const py::handle &progress_ctor,
+  const u64 num_threads
+) {
+  assert(
+    data_ids.size() == num_strata_depositeds.size()
+    && data_ids.size() == ranks.size()
+    && data_ids.size() == differentiae.size()
+  );
+
+  if (!data_ids.size()) { return; }
+
+  const auto data_ids_ = data_ids.unchecked<1>();
+  const auto num_strata_depositeds_ = num_strata_depositeds.unchecked<1>();
+  const auto ranks_ = ranks.unchecked<1>();
+  const auto differentiae_ = differentiae.unchecked<1>();
+
+  // check values fit records columns before any records are added; every
+  // row adds at most one inner record and every artifact one leaf record
+  const auto maxima = find_exploded_maxima(
+    data_ids, num_strata_depositeds, ranks, differentiae
+  );
+  const u64 max_num_records = records.size() + 2 * data_ids.size();
+  if (
+    maxima.differentia > RECORDS::max_representable_differentia
+    || maxima.rank > RECORDS::max_rank
+    || maxima.data_id > RECORDS::max_id
+    || max_num_records > RECORDS::max_id
+  ) {
+    throw std::overflow_error(
+      "exploded data exceeds column widths of compact records layout; "
+      "use a wider layout"
+    );
+  }
+
+  const auto logging_info = py::module::import("logging").attr("info");
+  logging_info(
+    py::str(
+      "exploded searchtable cpp begin ({} threads, {} bytes per record)"
+    ).format(num_threads, RECORDS::record_nbytes())
+  );
+
+  { // scope: ProgressPoller must be destroyed before logging_info below
+    const u64 total = [&data_ids_](){
+      py_array_span<u64> span{
+        data_ids_, 0, static_cast<u64>(data_ids_.size())
+      };
+      return count_unique_elements(span.begin(), span.end());
+    }();
+
+    // ProgressPoller spawns a background thread that acquires the GIL
+    // every 10s to update tqdm; completes once counter reaches total
+    ProgressPoller poller{progress_ctor("total"_a=total), total};
+
+    { // scope: release GIL for computational hot path, reacquire at end
+    py::gil_scoped_release release;
+
+    // find segments w/ contiguous identical data_id values
+    std::vector<u64> segment_begins;
+    segment_begins.reserve(total + 1);
+    for (u64 i = 0; i < static_cast<u64>(ranks.size()); ++i) {
+      if (i == 0 || data_ids_[i - 1] != data_ids_[i]) {
+        segment_begins.push_back(i);
+      }
+      // ranks must be in ascending order
+      else assert(ranks_[i - 1] < ranks_[i]);
+    }
+    segment_begins.push_back(ranks.size());
+    assert(segment_begins.size() == total + 1);
+
+    // set up front so that dispatch on max_differentia does not depend on
+    // insertion order, and so that shards need not update it concurrently
+    records.max_differentia = std::max(
+      records.max_differentia, maxima.differentia
+    );
+
+    insert_artifacts_sharded(
+      records,
+      total,
+      [&](const u64 i) {
+        const u64 begin = segment_begins[i];
+        const u64 end = segment_begins[i + 1];
+        return ArtifactView{
+          py_array_span<i64>(ranks_, begin, end),
+          py_array_span<u64>(differentiae_, begin, end),
+          static_cast<u64>(data_ids_[begin]),
+          static_cast<u64>(num_strata_depositeds_[begin])
+        };
+      },
+      num_threads,
+      [&poller]() { poller.increment(); }
+    );
+
+    // join poller while GIL is released so it can do its final
+    // gil_scoped_acquire without deadlocking
+    poller.join();
+    } // end GIL release scope
+
+    assert(std::cmp_greater_equal(records.size(), total));
+  }  // end progress poller scope
+
+  logging_info(
+    py::str(
+      "exploded searchtable cpp extension complete, num records is {}"
+    ).format(records.size())
+  );
+}
+
+
+/**
+ * Decodes a single hexadecimal digit (either case).
+ */
+inline u64 decode_hex_digit(const uint8_t c) {
+  if (c >= '0' && c <= '9') return c - '0';
+  if (c >= 'a' && c <= 'f') return c - 'a' + 10;
+  if (c >= 'A' && c <= 'F') return c - 'A' + 10;
+  throw std::invalid_argument("invalid hexadecimal digit in storage data");
+}
+
+
+/**
+ * Decodes `num_items` consecutive fixed-width unsigned values from a
+ * hexadecimal string, writing them to `out`. Matches downstream's hex
+ * packing: bits are big-endian, with value `i` spanning bits
+ * [i * bitwidth, (i + 1) * bitwidth).
+ *
+ * Bitwidth must be in [1, 64] and evenly divide the hexadecimal data.
+ */
+template <typename OUT>
+void unpack_hex_items(
+  const uint8_t *hex, const u64 num_hex_chars, const u64 num_items, OUT out
+) {
+  if (num_items == 0 || (4 * num_hex_chars) % num_items) {
+    throw std::invalid_argument(
+      "storage data must divide evenly into dstream_S items"
+    );
+  }
+  const u64 bitwidth = 4 * num_hex_chars / num_items;
+  if (bitwidth == 0 || bitwidth > 64) {
+    throw std::invalid_argument("item bitwidth must be between 1 and 64");
+  }
+
+  if (bitwidth % 4 == 0) {  // fast path, whole hex digits per item
+    const u64 num_digits = bitwidth / 4;
+    for (u64 i = 0; i < num_items; ++i) {
+      u64 value = 0;
+      for (u64 j = 0; j < num_digits; ++j) {
+        value = (value << 4) | decode_hex_digit(hex[i * num_digits + j]);
+      }
+      *out++ = value;
+    }
+    return;
+  }
+
+  for (u64 i = 0; i < num_items; ++i) {
+    u64 value = 0;
+    for (u64 b = i * bitwidth; b < (i + 1) * bitwidth; ++b) {
+      const u64 digit = decode_hex_digit(hex[b / 4]);
+      value = (value << 1) | ((digit >> (3 - b % 4)) & 1);
+    }
+    *out++ = value;
+  }
+}
+
+
+/**
+ * Extends a records object with new artifacts, given as dstream buffers
+ * (hexadecimal storage data) rather than as exploded rows. Fuses hex
+ * unpacking, chronological sorting of each buffer's strata, and trie
+ * insertion, so that no exploded representation of artifacts is built
+ * outside of this function.
+ *
+ * Artifact i's hexadecimal storage data spans
+ * storage_hex_chars[storage_hex_offsets[i]:storage_hex_offsets[i + 1]]
+ * (i.e., as laid out in an Arrow string column), and `ranks` is a
+ * row-per-artifact matrix of buffer sites' ingest times (i.e., dstream
+ * lookup results), in site order.
+ *
+ * Ordering requirements are as for extend_trie_searchtable_exploded. Records
+ * are unchanged if an error is raised.
+ *
+ * @see extend_trie_searchtable_exploded
+ * @see unpack_hex_items
+ */
+template <typename RECORDS>
+void extend_trie_searchtable_packed(
+  RECORDS &records,
+  const py::array_t<u64> &data_ids,
+  const py::array_t<u64> &num_strata_depositeds,
+  const py::array_t<i64, py::array::c_style | py::array::forcecast> &ranks,
+  const py::array_t<uint8_t> &storage_hex_chars,
+  const py::array_t<i64> &storage_hex_offsets,
+  const py::handle &progress_ctor,
+  const u64 num_threads
+) {
+  const u64 num_artifacts = data_ids.size();
+  if (
+    std::cmp_not_equal(num_strata_depositeds.size(), num_artifacts)
+    || ranks.ndim() != 2
+    || std::cmp_not_equal(ranks.shape(0), num_artifacts)
+    || std::cmp_not_equal(storage_hex_offsets.size(), num_artifacts + 1)
+  ) {
+    throw std::invalid_argument(
+      "data_ids, num_strata_depositeds, ranks rows, and storage_hex_offsets "
+      "(less one) must have equal lengths"
+    );
+  }
+  if (!num_artifacts) { return; }
+
+  const u64 dstream_S = ranks.shape(1);
+  const auto data_ids_ = data_ids.unchecked<1>();
+  const auto num_strata_depositeds_ = num_strata_depositeds.unchecked<1>();
+  const auto ranks_ = ranks.unchecked<2>();
+  const auto chars_ = storage_hex_chars.unchecked<1>();
+  const auto offsets_ = storage_hex_offsets.unchecked<1>();
+
+  const auto logging_info = py::module::import("logging").attr("info");
+  logging_info(
+    py::str(
+      "packed searchtable cpp begin ({} threads, {} bytes per record)"
+    ).format(num_threads, RECORDS::record_nbytes())
+  );
+
+  // unpack and chronologically sort each artifact's strata up front, so that
+  // errors are raised before any records are added
+  std::vector<i64> sorted_ranks(num_artifacts * dstream_S);
+  std::vector<u64> sorted_differentiae(num_artifacts * dstream_S);
+  ExplodedMaxima maxima{0, 0, 0};
+  {  // scope: release GIL for unpacking
+    py::gil_scoped_release release;
+
+    std::vector<u64> differentiae(dstream_S);
+    std::vector<u64> argv(dstream_S);
+    for (u64 i = 0; i < num_artifacts; ++i) {
+      const i64 begin = offsets_[i];
+      const i64 end = offsets_[i + 1];
+      if (begin < 0 || end < begin || end > chars_.shape(0)) {
+        throw std::invalid_argument("storage_hex_offsets out of bounds");
+      }
+      unpack_hex_items(
+        chars_.data(begin), end - begin, dstream_S, differentiae.begin()
+      );
+
+      const u64 num_strata_deposited = num_strata_depositeds_[i];
+      std::iota(argv.begin(), argv.end(), u64{});
+      std::ranges::sort(
+        argv, std::less<i64>{}, [&](const u64 j) { return ranks_(i, j); }
+      );
+      for (u64 j = 0; j < dstream_S; ++j) {
+        const i64 rank = ranks_(i, argv[j]);
+        if (rank < 0 || std::cmp_greater_equal(rank, num_strata_deposited)) {
+          throw std::invalid_argument(
+            "out of bounds lookup result: rank must be in "
+            "[0, num_strata_deposited)"
+          );
+        }
+        if (j && rank == sorted_ranks[i * dstream_S + j - 1]) {
+          throw std::invalid_argument("duplicate ranks within artifact");
+        }
+        sorted_ranks[i * dstream_S + j] = rank;
+        sorted_differentiae[i * dstream_S + j] = differentiae[argv[j]];
+        maxima.differentia = std::max(maxima.differentia, differentiae[j]);
+      }
+      maxima.rank = std::max(maxima.rank, num_strata_deposited);
+      maxima.data_id = std::max<u64>(maxima.data_id, data_ids_[i]);
+    }
+  }  // end GIL release scope
+
+  // check values fit records columns before any records are added; every
+  // stratum adds at most one inner record and every artifact one leaf record
+  const u64 max_num_records = (
+    records.size() + num_artifacts * (dstream_S + 1)
+  );
+  if (
+    maxima.differentia > RECORDS::max_representable_differentia
+    || maxima.rank > RECORDS::max_rank
+    || maxima.data_id > RECORDS::max_id
+    || max_num_records > RECORDS::max_id
+  ) {
+    throw std::overflow_error(
+      "packed data exceeds column widths of compact records layout; "
+      "use a wider layout"
+    );
+  }
+
+  { // scope: ProgressPoller must be destroyed before logging_info below
+    // ProgressPoller spawns a background thread that acquires the GIL
+    // every 10s to update tqdm; completes once counter reaches total
+    ProgressPoller poller{
+      progress_ctor("total"_a=num_artifacts), num_artifacts
+    };
+
+    { // scope: release GIL for computational hot path, reacquire at end
+    py::gil_scoped_release release;
+
+    // set up front so that dispatch on max_differentia does not depend on
+    // insertion order, and so that shards need not update it concurrently
+    records.max_differentia = std::max(
+      records.max_differentia, maxima.differentia
+    );
+
+    insert_artifacts_sharded(
+      records,
+      num_artifacts,
+      [&](const u64 i) {
+        return ArtifactView{
+          std::span<const i64>(
+            sorted_ranks.data() + i * dstream_S, dstream_S
+          ),
+          std::span<const u64>(
+            sorted_differentiae.data() + i * dstream_S, dstream_S
+          ),
+          static_cast<u64>(data_ids_[i]),
+          static_cast<u64>(num_strata_depositeds_[i])
+        };
+      },
+      num_threads,
+      [&poller]() { poller.increment(); }
+    );
+
+    // join poller while GIL is released so it can do its final
+    // gil_scoped_acquire without deadlocking
+    poller.join();
+    } // end GIL release scope
+  }  // end progress poller scope
+
+  logging_info(
+    py::str(
+      "packed searchtable cpp extension complete, num records is {}"
+    ).format(records.size())
+  );
+}
+
+
+/**
+ * Constructs a trie from 1-dimensional representing a complete exploded
+ * DataFrame. Unlike extend_trie_searchtable_exploded, this function creates and
+ * a new Records object internally and returns a py::dict with construction
+ * results.
+ *
+ * Note that ranks must be in ascending order within each stratum.
+ *
+ * Includes logging and an optional tqdm progress bar.
+ *
+ * @see build_trie_searchtable_nested
+ */
+py::dict build_trie_searchtable_exploded(
+  const py::array_t<u64> &data_ids,
+  const py::array_t<u64> &num_strata_depositeds,
+  const py::array_t<i64> &ranks,
+  const py::array_t<u64> &differentiae,
+  const py::handle &progress_ctor,
+  const u64 num_threads
+) {
+  const auto maxima = find_exploded_maxima(
+    data_ids, num_strata_depositeds, ranks, differentiae
+  );
+  const auto layout = select_records_layout(
+    maxima.differentia,
+    maxima.rank,
+    std::max<u64>(maxima.data_id, 2 * data_ids.size() + 1)
+  );
+
+  return visit_records_layout(layout, [&](const auto tag) {
+    using records_t = typename decltype(tag)::type;
+    records_t records{static_cast<u64>(data_ids.size())};
+    extend_trie_searchtable_exploded(
+      records,
+      data_ids,
+      num_strata_depositeds,
+      ranks,
+      differentiae,
+      progress_ctor,
+      num_threads
+    );
+
+    const auto logging_info = py::module::import("logging").attr("info");
+    logging_info("exploded searchtable cpp complete");
+    return extract_records_to_dict(records);
+  });
+}
+
+
+/**
+ * Checks whether the search trie structure is present (not dismantled).
+ * After collapse_unifurcations(dropped_only=false), search fields are set
+ * to placeholder_value.
+ */
+template <typename RECORDS>
+bool _has_search_trie(const RECORDS& records) {
+  if (records.size() == 0) return false;
+  return records.search_ancestor_id[0] != placeholder_value;
+}
+
+
+/**
+ * Returns a summary string describing the records state.
+ * Includes size, tip count, search trie status, and per-column stats.
+ * Used as a header for diagnostic messages.
+ */
+template <typename RECORDS>
+std::string _describe_records(const RECORDS& records) {
+  const size_t n = records.size();
+
+  // count tips (data nodes with non-placeholder dstream_data_id)
+  size_t num_tips = 0;
+  for (size_t i = 0; i < n; ++i) {
+    if (records.dstream_data_id[i] != placeholder_value) ++num_tips;
+  }
+
+  std::ostringstream oss;
+  oss << "Records(size=" << n
+      << ", num_tips=" << num_tips
+      << ", has_search_trie="
+      << (_has_search_trie(records) ? "true" : "false") << ")";
+
+  if (n > 0) {
+    // helper lambda for column min/max
+    const auto col_stats = [&](const char* name, const auto& vec) {
+      const auto [mn, mx] = std::minmax_element(vec.begin(), vec.end());
+      const auto nunique = count_unique_elements(vec.begin(), vec.end());
+      std::vector v(vec);
+      const auto m = std::next(v.begin(), v.size() / 2);
+      std::nth_element(v.begin(), m, v.end());
+      const auto median = *m;
+      oss << "\n  " << name
+        << ": min=" << *mn << ", max=" << *mx
+        << ", unique=" << nunique
+        << ", median=" << median;
+    };
+    const auto col_sample = [&](
+      const char* name, const auto& vec, const size_t sample_size=10
+  ) {
+      oss << "\n  " << name << " sample: [";
+      for (size_t i = 0; i < std::min(sample_size, vec.size()); ++i) {
+        oss << vec[i] << (i < sample_size - 1 ? ", " : "");
+      }
+      if (vec.size() > sample_size) oss << ", ...";
+      oss << "]";
+    };
+
+    col_stats("data_id", records.dstream_data_id);
+    col_sample("data_id", records.dstream_data_id);
+
+    col_stats("id", records.id);
+    col_sample("id", records.id);
+
+    col_stats("ancestor_id", records.ancestor_id);
+    col_sample("ancestor_id", records.ancestor_id);
+
+    col_stats("search_ancestor_id", records.search_ancestor_id);
+    col_sample("search_ancestor_id", records.search_ancestor_id);
+
+    col_stats("search_first_child_id", records.search_first_child_id);
+    col_sample("search_first_child_id", records.search_first_child_id);
+
+    col_stats("search_prev_sibling_id", records.search_prev_sibling_id);
+    col_sample("search_prev_sibling_id", records.search_prev_sibling_id);
+
+    col_stats("search_next_sibling_id", records.search_next_sibling_id);
+    col_sample("search_next_sibling_id", records.search_next_sibling_id);
+
+    col_stats("rank", records.rank);
+    col_sample("rank", records.rank);
+
+    col_stats("differentia", records.differentia);
+    col_sample("differentia", records.differentia);
+  }
+  return oss.str();
+}
+
+
+/**
+ * Returns a range over all record ids, for use with invariant check
+ * implementations that accept a subset of nodes to check.
+ */
+template <typename RECORDS>
+auto _all_nodes(const RECORDS& records) {
+  return std::views::iota(u64{}, static_cast<u64>(records.size()));
+}
+
+
+/**
+ * Checks that record ids are contiguously assigned 0, 1, ..., n-1.
+ */
+template <typename RECORDS>
+bool check_trie_invariant_contiguous_ids(const RECORDS& records) {
+  return std::equal(
+    std::begin(records.id), std::end(records.id), CountingIterator<u64>{}
+  );
+}
+
+
+/**
+ * Checks that ancestor ids reference earlier records (ancestor_id[i] <= i).
+ */
+template <typename RECORDS>
+bool check_trie_invariant_topologically_sorted(const RECORDS& records) {
+  return std::ranges::all_of(
+    records.id,
+    [&records](const u64 id) {
+      return records.ancestor_id[id] <= id;
+    }
+  );
+}
+
+
+/**
+ * Checks that parent ranks are <= child ranks for all non-root nodes.
+ */
+template <typename RECORDS>
+bool check_trie_invariant_chronologically_sorted(const RECORDS& records) {
+  return std::ranges::all_of(
+    records.id,
+    [&records](const u64 id) {
+      return records.rank[records.ancestor_id[id]] <= records.rank[id];
+    }
+  );
+}
+
+
+/**
+ * Checks that there is exactly one root (node with ancestor_id == id).
+ */
+template <typename RECORDS>
+bool check_trie_invariant_single_root(const RECORDS& records) {
+  if (records.size() == 0) return true;
+  const u64 root_count = std::ranges::count_if(
+    records.id,
+    [&records](const u64 id) { return records.ancestor_id[id] == id; }
+  );
+  return root_count == 1;
+}
+
+
+/**
+ * Shared implementation for search_children_valid check, over `nodes`.
+ * Returns empty string on pass, diagnostic string on failure.
+ */
+template <typename RECORDS, typename NODES>
+std::string _check_search_children_valid_impl(
+  const RECORDS& records, const NODES& nodes
+) {
+  for (const u64 i : nodes) {
+    const u64 first_child = records.search_first_child_id[i];
+    if (first_child == placeholder_value) {
+      std::ostringstream oss;
+      oss << "search_first_child_id[" << i << "] is placeholder_value";
+      return oss.str();
+    }
+
+    if (first_child == i) continue;  // no children, OK
+
+    if (first_child >= records.size()) {
+      std::ostringstream oss;
+      oss << "search_first_child_id[" << i << "] = " << first_child
+          << " >= size " << records.size();
+      return oss.str();
+    }
+
+    // first child's prev_sibling should be itself (signals head of list)
+    if (records.search_prev_sibling_id[first_child] != first_child) {
+      std::ostringstream oss;
+      oss << "first child " << first_child << " of node " << i
+          << " has prev_sibling "
+          << records.search_prev_sibling_id[first_child] << " != itself";
+      return oss.str();
+    }
+
+    // walk the sibling list
+    u64 cur = first_child;
+    u64 count = 0;
+    while (true) {
+      if (cur >= records.size()) {
+        std::ostringstream oss;
+        oss << "sibling " << cur << " in children of node " << i
+            << " >= size " << records.size();
+        return oss.str();
+      }
+
+      // child's search_ancestor should point back to parent
+      if (records.search_ancestor_id[cur] != i) {
+        std::ostringstream oss;
+        oss << "child " << cur << " has search_ancestor "
+            << records.search_ancestor_id[cur] << " != parent " << i;
+        return oss.str();
+      }
+
+      const u64 next = records.search_next_sibling_id[cur];
+      if (next == cur) break;  // last sibling, OK
+
+      if (next >= records.size()) {
+        std::ostringstream oss;
+        oss << "next_sibling[" << cur << "] = " << next << " >= size "
+            << records.size();
+        return oss.str();
+      }
+
+      // backward pointer consistency
+      if (records.search_prev_sibling_id[next] != cur) {
+        std::ostringstream oss;
+        oss << "backward pointer mismatch: prev_sibling[" << next << "] = "
+            << records.search_prev_sibling_id[next] << " != " << cur;
+        return oss.str();
+      }
+
+      cur = next;
+      ++count;
+      if (count > records.size()) {
+        std::ostringstream oss;
+        oss << "cycle detected in sibling list of node " << i;
+        return oss.str();
+      }
+    }
+  }
+  return "";
+}
+
+
+/**
+ * Checks that search child linked lists are well-formed:
+ *   - first child's prev_sibling points to itself
+ *   - last child's next_sibling points to itself
+ *   - forward and backward pointers are consistent
+ *   - all children's search_ancestor points to parent
+ *   - no cycles in sibling list
+ * Skips check if search trie is not present.
+ */
+template <typename RECORDS>
+bool check_trie_invariant_search_children_valid(const RECORDS& records) {
+  if (!_has_search_trie(records)) return true;
+  return _check_search_children_valid_impl(
+    records, _all_nodes(records)
+  ).empty();
+}
+
+
+/**
+ * Shared implementation for search_children_sorted check, over `nodes`.
+ * Returns empty string on pass, diagnostic string on failure.
+ */
+template <typename RECORDS, typename NODES>
+std::string _check_search_children_sorted_impl(
+  const RECORDS& records, const NODES& nodes
+) {
+  for (const u64 i : nodes) {
+    const u64 first_child = records.search_first_child_id[i];
+    if (first_child == i) continue;  // no children
+
+    i64 prev_rank = records.rank[first_child];
+    u64 cur = first_child;
+    while (true) {
+      const u64 next = records.search_next_sibling_id[cur];
+      if (next == cur) break;
+
+      if (records.rank[next] < prev_rank) {
+        std::ostringstream oss;
+        oss << "children of node " << i << " not sorted: child " << next
+            << " has rank " << records.rank[next]
+            << " < previous sibling " << cur << " rank " << prev_rank;
+        return oss.str();
+      }
+      prev_rank = records.rank[next];
+      cur = next;
+    }
+  }
+  return "";
+}
+
+
+/**
+ * Checks that search children are sorted by rank in ascending order.
+ * Skips check if search trie is not present.
+ */
+template <typename RECORDS>
+bool check_trie_invariant_search_children_sorted(const RECORDS& records) {
+  if (!_has_search_trie(records)) return true;
+  return _check_search_children_sorted_impl(
+    records, _all_nodes(records)
+  ).empty();
+}
+
+
+/**
+ * Shared implementation for no_indistinguishable_nodes check, over `nodes`.
+ * Returns empty string on pass, diagnostic string on failure.
+ */
+template <typename RECORDS, typename NODES>
+std::string _check_no_indistinguishable_nodes_impl(
+  const RECORDS& records, const NODES& nodes
+) {
+  for (const u64 i : nodes) {
+    const u64 first_child = records.search_first_child_id[i];
+    if (first_child == i) continue;
+
+    // collect children (rank, differentia) pairs and check for duplicates
+    std::vector<std::pair<i64, u64>> child_pairs;
+    for (const u64 child : ChildrenView(records, i)) {
+      // leaves should not appear in search trie
+      assert(records.dstream_data_id[child] == placeholder_value);
+
+      child_pairs.emplace_back(records.rank[child], records.differentia[child]);
+    }
+
+    std::ranges::sort(child_pairs);
+    const auto dup = std::ranges::adjacent_find(child_pairs);
+    if (dup != child_pairs.end()) {
+      std::ostringstream oss;
+      oss << "parent " << i << " has indistinguishable children with"
+          << " rank=" << dup->first
+          << ", differentia=" << dup->second << "\n";
+      oss << "children (rank, differentia): [";
+      for (const auto& [r, d] : child_pairs) {
+        oss << "(" << r << ", " << d << "), ";
+      }
+      oss << "]";
+      return oss.str();
+    }
+  }
+  return "";
+}
+
+
+/**
+ * Checks that no two children of the same parent share the same
+ * (rank, differentia) pair.
+ * Skips check if search trie is not present.
+ */
+template <typename RECORDS>
+bool check_trie_invariant_no_indistinguishable_nodes(const RECORDS& records) {
+  if (!_has_search_trie(records)) return true;
+  return _check_no_indistinguishable_nodes_impl(
+    records, _all_nodes(records)
+  ).empty();
+}
+
+
+/**
+ * Checks that data nodes (dstream_data_id != placeholder_value) are leaf
+ * nodes, i.e., have no search children.
+ * Skips check if search trie is not present.
+ */
+template <typename RECORDS>
+bool check_trie_invariant_data_nodes_are_leaves(const RECORDS& records) {
+  if (!_has_search_trie(records)) return true;
+
+  return std::ranges::all_of(
+    records.id,
+    [&records](const u64 id) {
+      if (records.dstream_data_id[id] == placeholder_value) return true;
+      return records.search_first_child_id[id] == id;
+    }
+  );
+}
+
+
+/**
+ * Shared implementation for search_lineage_compatible check, over `nodes`.
+ * Returns empty string on pass, diagnostic string on failure.
+ */
+template <typename RECORDS, typename NODES>
+std::string _check_search_lineage_compatible_impl(
+  const RECORDS& records, const NODES& nodes
+) {
+  for (const u64 i : nodes) {
+    // only consider searchable paths, exclude tips
+    if (records.search_ancestor_id[i] == i) continue;
+
+    u64 a = records.ancestor_id[i];
+    u64 s = records.search_ancestor_id[i];
+    u64 loop = 0;
+    while (a) {
+      const auto rank_a = records.rank[a];
+      const auto rank_s = records.rank[s];
+      if (rank_a == rank_s) {
+        if (records.differentia[a] != records.differentia[s]) {
+          std::ostringstream oss;
+          oss << "node " << i << ": lineage node " << a
+              << " (rank=" << rank_a
+              << ", differentia=" << records.differentia[a]
+              << ") incompatible with search node " << s
+              << " (rank=" << rank_s
+              << ", differentia=" << records.differentia[s] << ")";
+          return oss.str();
+        } else break;  // only search one step back at a time
+      } else if (rank_a > rank_s) {
+        a = records.ancestor_id[a];
+      } else if (records.search_ancestor_id[s] == s) {
+        break;
+      } else {
+        assert(rank_s > rank_a);
+        s = records.search_ancestor_id[s];
+      }
+      if (++loop > records.size() * 3) {  // conservative upper bound on loop
+        std::ostringstream oss;
+        oss << "node " << i << ": cycle detected in ancestor walk"
+            << " (a=" << a << ", a'=" << records.ancestor_id[a] << ", s=" << s << ", s'=" << records.search_ancestor_id[s] << ")";
+        return oss.str();
+      }
+    }
+  }
+
+  return "";
+}
+
+
+/**
+ * Checks that search ancestors are compatible with the lineage trie.
+ * For each node with a valid search_ancestor_id, walking up the lineage
+ * trie via ancestor_id should find a node that is indistinguishable
+ * from (i.e., same rank and differentia as) the search ancestor.
+ *
+ * Skips check if search trie is not present.
+ */
+template <typename RECORDS>
+bool check_trie_invariant_search_lineage_compatible(const RECORDS& records) {
+  if (!_has_search_trie(records)) return true;
+  return _check_search_lineage_compatible_impl(
+    records, _all_nodes(records)
+  ).empty();
+}
+
+
+/**
+ * Checks that all ancestor_id values reference valid indices.
+ */
+template <typename RECORDS>
+bool check_trie_invariant_ancestor_bounds(const RECORDS& records) {
+  return std::ranges::all_of(
+    records.id,
+    [&records](const u64 id) {
+      return records.ancestor_id[id] < records.size();
+    }
+  );
+}
+
+
+/**
+ * Checks that the root node is at index 0 with expected properties:
+ *   - ancestor_id[0] == 0 (self-referencing)
+ *   - rank[0] == 0
+ */
+template <typename RECORDS>
+bool check_trie_invariant_root_at_zero(const RECORDS& records) {
+  if (records.size() == 0) return true;
+  return records.ancestor_id[0] == 0 && records.rank[0] == 0;
+}
+
+
+/**
+ * Checks that all nodes have non-negative rank values.
+ * Negative ranks would indicate data corruption.
+ */
+template <typename RECORDS>
+bool check_trie_invariant_ranks_nonnegative(const RECORDS& records) {
+  return std::ranges::all_of(
+    records.id,
+    [&records](const u64 id) {
+      return records.rank[id] >= 0;
+    }
+  );
+}
+
+
+// ============================================================
+// Diagnose functions: return diagnostic string (empty = pass).
+// On failure, the string starts with a generic records summary.
+// ============================================================
+
+template <typename RECORDS>
+std::string diagnose_trie_invariant_contiguous_ids(const RECORDS& records) {
+  for (u64 i = 0; i < records.size(); ++i) {
+    if (records.id[i] != i) {
+      std::ostringstream oss;
+      oss << _describe_records(records)
+          << "\ncontiguous_ids: id[" << i << "] = " << records.id[i]
+          << ", expected " << i;
+      return oss.str();
+    }
+  }
+  return "";
+}
+
+template <typename RECORDS>
+std::string diagnose_trie_invariant_topologically_sorted(
+    const RECORDS& records) {
+  for (const u64 id : records.id) {
+    if (records.ancestor_id[id] > id) {
+      std::ostringstream oss;
+      oss << _describe_records(records)
+          << "\ntopologically_sorted: ancestor_id[" << id << "] = "
+          << records.ancestor_id[id] << " > " << id;
+      return oss.str();
+    }
+  }
+  return "";
+}
+
+template <typename RECORDS>
+std::string diagnose_trie_invariant_chronologically_sorted(
+    const RECORDS& records) {
+  for (const u64 id : records.id) {
+    const u64 anc = records.ancestor_id[id];
+    if (records.rank[anc] > records.rank[id]) {
+      std::ostringstream oss;
+      oss << _describe_records(records)
+          << "\nchronologically_sorted: node " << id
+          << " (rank=" << records.rank[id]
+          << ") has ancestor " << anc
+          << " (rank=" << records.rank[anc] << ")";
+      return oss.str();
+    }
+  }
+  return "";
+}
+
+template <typename RECORDS>
+std::string diagnose_trie_invariant_single_root(const RECORDS& records) {
+  if (records.size() == 0) return "";
+  std::vector<u64> roots;
+  for (const u64 id : records.id) {
+    if (records.ancestor_id[id] == id) {
+      roots.push_back(id);
+    }
+  }
+  if (roots.size() == 1) return "";
+  std::ostringstream oss;
+  oss << _describe_records(records)
+      << "\nsingle_root: found " << roots.size() << " root(s) at id(s): ";
+  for (size_t j = 0; j < roots.size() && j < 10; ++j) {
+    if (j) oss << ", ";
+    oss << roots[j];
+  }
+  if (roots.size() > 10) oss << ", ...";
+  return oss.str();
+}
+
+template <typename RECORDS>
+std::string diagnose_trie_invariant_search_children_valid(
+    const RECORDS& records) {
+  if (!_has_search_trie(records)) return "";
+  auto diag = _check_search_children_valid_impl(
+    records, _all_nodes(records)
+  );
+  if (diag.empty()) return "";
+  return _describe_records(records) + "\nsearch_children_valid: " + diag;
+}
+
+template <typename RECORDS>
+std::string diagnose_trie_invariant_search_children_sorted(
+    const RECORDS& records) {
+  if (!_has_search_trie(records)) return "";
+  auto diag = _check_search_children_sorted_impl(
+    records, _all_nodes(records)
+  );
+  if (diag.empty()) return "";
+  return _describe_records(records) + "\nsearch_children_sorted: " + diag;
+}
+
+template <typename RECORDS>
+std::string diagnose_trie_invariant_no_indistinguishable_nodes(
+    const RECORDS& records) {
+  if (!_has_search_trie(records)) return "";
+  auto diag = _check_no_indistinguishable_nodes_impl(
+    records, _all_nodes(records)
+  );
+  if (diag.empty()) return "";
+  return _describe_records(records)
+      + "\nno_indistinguishable_nodes: " + diag;
+}
+
+template <typename RECORDS>
+std::string diagnose_trie_invariant_data_nodes_are_leaves(
+    const RECORDS& records) {
+  if (!_has_search_trie(records)) return "";
+  for (const u64 id : records.id) {
+    if (records.dstream_data_id[id] != placeholder_value
+        && records.search_first_child_id[id] != id) {
+      std::ostringstream oss;
+      oss << _describe_records(records)
+          << "\ndata_nodes_are_leaves: data node " << id
+          << " (dstream_data_id=" << records.dstream_data_id[id]
+          << ") has search children (first_child="
+          << records.search_first_child_id[id] << ")";
+      return oss.str();
+    }
+  }
+  return "";
+}
+
+template <typename RECORDS>
+std::string diagnose_trie_invariant_search_lineage_compatible(
+    const RECORDS& records) {
+  if (!_has_search_trie(records)) return "";
+  auto diag = _check_search_lineage_compatible_impl(
+    records, _all_nodes(records)
+  );
+  if (diag.empty()) return "";
+  return _describe_records(records)
+      + "\nsearch_lineage_compatible: " + diag;
+}
+
+template <typename RECORDS>
+std::string diagnose_trie_invariant_ancestor_bounds(const RECORDS& records) {
+  for (const u64 id : records.id) {
+    if (records.ancestor_id[id] >= records.size()) {
+      std::ostringstream oss;
+      oss << _describe_records(records)
+          << "\nancestor_bounds: ancestor_id[" << id << "] = "
+          << records.ancestor_id[id] << " >= size " << records.size();
+      return oss.str();
+    }
+  }
+  return "";
+}
+
+template <typename RECORDS>
+std::string diagnose_trie_invariant_root_at_zero(const RECORDS& records) {
+  if (records.size() == 0) return "";
+  if (records.ancestor_id[0] == 0 && records.rank[0] == 0) return "";
+  std::ostringstream oss;
+  oss << _describe_records(records)
+      << "\nroot_at_zero: node 0 has ancestor_id=" << records.ancestor_id[0]
+      << " (expected 0), rank=" << records.rank[0] << " (expected 0)";
+  return oss.str();
+}
+
+template <typename RECORDS>
+std::string diagnose_trie_invariant_ranks_nonnegative(
+    const RECORDS& records) {
+  for (const u64 id : records.id) {
+    if (records.rank[id] < 0) {
+      std::ostringstream oss;
+      oss << _describe_records(records)
+          << "\nranks_nonnegative: rank[" << id << "] = " << records.rank[id];
+      return oss.str();
+    }
+  }
+  return "";
+}
+
+
+
+/**
+ * Checks trie invariants over the dirty region only: records marked dirty
+ * (i.e., created or relinked since marks were last cleared), the search
+ * child lists they belong to, and those lists' members. Assumes invariants
+ * held over all other records as of the last clear.
+ *
+ * Returns the name of the first violated invariant (as in the corresponding
+ * check_trie_invariant_* function), or an empty string on pass. Dirty marks
+ * are cleared on pass. Use the check_trie_invariant_* and
+ * diagnose_trie_invariant_* functions for full scans and diagnostics.
+ */
+template <typename RECORDS>
+std::string check_trie_invariants_dirty(RECORDS& records) {
+  if (records.dirty.size() != records.size()) return "contiguous_ids";
+
+  std::vector<u64> nodes;
+  for (u64 i = 0; i < records.size(); ++i) {
+    if (records.dirty[i]) nodes.push_back(i);
+  }
+
+  const auto fails = [&nodes](const auto& predicate) {
+    return !std::ranges::all_of(nodes, predicate);
+  };
+  if (fails([&records](const u64 i) { return records.id[i] == i; })) {
+    return "contiguous_ids";
+  }
+  if (fails([&records](const u64 i) {
+    return records.ancestor_id[i] < records.size();
+  })) return "ancestor_bounds";
+  if (fails([&records](const u64 i) { return records.ancestor_id[i] <= i; })) {
+    return "topologically_sorted";
+  }
+  if (fails([&records](const u64 i) {
+    return records.rank[records.ancestor_id[i]] <= records.rank[i];
+  })) return "chronologically_sorted";
+  if (!check_trie_invariant_root_at_zero(records)) return "root_at_zero";
+  if (fails([&records](const u64 i) {
+    return i == 0 || records.ancestor_id[i] != i;
+  })) return "single_root";
+  if (fails([&records](const u64 i) { return records.rank[i] >= 0; })) {
+    return "nonroot_ranks_positive";
+  }
+
+  if (_has_search_trie(records)) {
+    if (fails([&records](const u64 i) {
+      return (
+        records.dstream_data_id[i] == placeholder_value
+        || records.search_first_child_id[i] == i
+      );
+    })) return "data_nodes_are_leaves";
+
+    // search parents whose child lists may have changed
+    std::vector<u64> parents(nodes);
+    for (const u64 i : nodes) {
+      const u64 parent = records.search_ancestor_id[i];
+      if (parent < records.size()) parents.push_back(parent);
+    }
+    std::ranges::sort(parents);
+    const auto duplicates = std::ranges::unique(parents);
+    parents.erase(duplicates.begin(), duplicates.end());
+
+    if (!_check_search_children_valid_impl(records, parents).empty()) {
+      return "search_children_valid";
+    }
+    if (!_check_search_children_sorted_impl(records, parents).empty()) {
+      return "search_children_sorted";
+    }
+    if (!_check_no_indistinguishable_nodes_impl(records, parents).empty()) {
+      return "no_indistinguishable_nodes";
+    }
+
+    // search neighborhood: dirty nodes' search parents and their children
+    std::vector<u64> neighborhood(parents);
+    for (const u64 parent : parents) {
+      std::ranges::copy(
+        ChildrenView(records, parent), std::back_inserter(neighborhood)
+      );
+    }
+    if (!_check_search_lineage_compatible_impl(
+      records, neighborhood
+    ).empty()) return "search_lineage_compatible";
+  }
+
+  records.clearDirty();
+  return "";
+}
+
+/**
+ * Registers the Python class for records type RECORDS, and overloads of all
+ * functions operating on records for that type.
+ */
+template <typename RECORDS>
+void bind_records(py::module_ &m, const char *name) {
+  py::class_<RECORDS>(m, name)
+      .def(
+        py::init<u64, bool>(),
+        py::arg("init_size"),
+        py::arg("init_root")=true
+      )
+      .def("__len__", &RECORDS::size)
+      .def_property_readonly_static(
+        "record_nbytes",
+        [](py::object){ return RECORDS::record_nbytes(); }
+      )
+      .def("addRecord", &RECORDS::addRecord,
+        py::arg("data_id"),
+        py::arg("id"),
+        py::arg("ancestor_id"),
+        py::arg("search_ancestor_id"),
+        py::arg("search_first_child_id"),
+        py::arg("search_prev_sibling_id"),
+        py::arg("search_next_sibling_id"),
+        py::arg("rank"),
+        py::arg("differentia")
+      )
+      .def("mockRecord", &RECORDS::mockRecord,
+        py::arg("data_id"),
+        py::arg("id"),
+        py::arg("ancestor_id"),
+        py::arg("search_ancestor_id"),
+        py::arg("search_first_child_id"),
+        py::arg("search_prev_sibling_id"),
+        py::arg("search_next_sibling_id"),
+        py::arg("rank"),
+        py::arg("differentia")
+  );
+  m.def(
+    "collapse_unifurcations",
+    &collapse_unifurcations<RECORDS>,
+    py::arg("records"),
+    py::arg("dropped_only")
+  );
+  m.def(
+    "collapse_unifurcations_inplace",
+    &collapse_unifurcations_inplace<RECORDS>,
+    py::arg("records"),
+    py::arg("dropped_only")
+  );
+  m.def(
+    "copy_records_to_dict",
+    &copy_records_to_dict<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "load_records_from_dict",
+    &load_records_from_dict<RECORDS>,
+    py::arg("records"),
+    py::arg("columns")
+  );
+  m.def(
+    "extract_records_to_arrow",
+    &extract_records_to_arrow<RECORDS>,
+    py::arg("records"),
+    py::arg("columns")=records_column_names
+  );
+  m.def(
+    "copy_records_to_arrow",
+    &copy_records_to_arrow<RECORDS>,
+    py::arg("records"),
+    py::arg("columns")=records_column_names
+  );
+  m.def(
+    "widen_records",
+    &widen_records<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "extract_records_to_dict",
+    &extract_records_to_dict<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "extend_tree_searchtable_cpp_from_exploded",
+    &extend_trie_searchtable_exploded<RECORDS>,
+    py::arg("records"),
+    py::arg("data_ids"),
+    py::arg("num_strata_depositeds"),
+    py::arg("ranks"),
+    py::arg("differentiae"),
+    py::arg("progress_bar"),
+    py::arg("num_threads")=1
+  );
+  m.def(
+    "extend_tree_searchtable_cpp_from_packed",
+    &extend_trie_searchtable_packed<RECORDS>,
+    py::arg("records"),
+    py::arg("data_ids"),
+    py::arg("num_strata_depositeds"),
+    py::arg("ranks"),
+    py::arg("storage_hex_chars"),
+    py::arg("storage_hex_offsets"),
+    py::arg("progress_bar"),
+    py::arg("num_threads")=1
+  );
+  m.def(
+    "check_trie_invariant_contiguous_ids",
+    &check_trie_invariant_contiguous_ids<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "check_trie_invariant_topologically_sorted",
+    &check_trie_invariant_topologically_sorted<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "check_trie_invariant_chronologically_sorted",
+    &check_trie_invariant_chronologically_sorted<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "check_trie_invariant_single_root",
+    &check_trie_invariant_single_root<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "check_trie_invariant_search_children_valid",
+    &check_trie_invariant_search_children_valid<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "check_trie_invariant_search_children_sorted",
+    &check_trie_invariant_search_children_sorted<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "check_trie_invariant_no_indistinguishable_nodes",
+    &check_trie_invariant_no_indistinguishable_nodes<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "check_trie_invariant_data_nodes_are_leaves",
+    &check_trie_invariant_data_nodes_are_leaves<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "check_trie_invariant_search_lineage_compatible",
+    &check_trie_invariant_search_lineage_compatible<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "check_trie_invariant_ancestor_bounds",
+    &check_trie_invariant_ancestor_bounds<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "check_trie_invariant_root_at_zero",
+    &check_trie_invariant_root_at_zero<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "check_trie_invariant_ranks_nonnegative",
+    &check_trie_invariant_ranks_nonnegative<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "_describe_records",
+    &_describe_records<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "check_trie_invariants_dirty",
+    &check_trie_invariants_dirty<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "diagnose_trie_invariant_contiguous_ids",
+    &diagnose_trie_invariant_contiguous_ids<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "diagnose_trie_invariant_topologically_sorted",
+    &diagnose_trie_invariant_topologically_sorted<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "diagnose_trie_invariant_chronologically_sorted",
+    &diagnose_trie_invariant_chronologically_sorted<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "diagnose_trie_invariant_single_root",
+    &diagnose_trie_invariant_single_root<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "diagnose_trie_invariant_search_children_valid",
+    &diagnose_trie_invariant_search_children_valid<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "diagnose_trie_invariant_search_children_sorted",
+    &diagnose_trie_invariant_search_children_sorted<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "diagnose_trie_invariant_no_indistinguishable_nodes",
+    &diagnose_trie_invariant_no_indistinguishable_nodes<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "diagnose_trie_invariant_data_nodes_are_leaves",
+    &diagnose_trie_invariant_data_nodes_are_leaves<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "diagnose_trie_invariant_search_lineage_compatible",
+    &diagnose_trie_invariant_search_lineage_compatible<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "diagnose_trie_invariant_ancestor_bounds",
+    &diagnose_trie_invariant_ancestor_bounds<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "diagnose_trie_invariant_root_at_zero",
+    &diagnose_trie_invariant_root_at_zero<RECORDS>,
+    py::arg("records")
+  );
+  m.def(
+    "diagnose_trie_invariant_ranks_nonnegative",
+    &diagnose_trie_invariant_ranks_nonnegative<RECORDS>,
+    py::arg("records")
+  );
+}
+
+
+/**
+ * Creates an empty records object (with root) using the narrowest layout
+ * able to hold the given maxima.
+ *
+ * @see select_records_layout
+ */
+py::object make_records(
+  const u64 init_size,
+  const u64 max_differentia,
+  const u64 max_rank,
+  const u64 max_id
+) {
+  const auto layout = select_records_layout(max_differentia, max_rank, max_id);
+  return visit_records_layout(layout, [init_size](const auto tag) {
+    using records_t = typename decltype(tag)::type;
+    return py::cast(records_t{init_size});
+  });
+}
+
+
+PYBIND11_MODULE(_build_tree_searchtable_cpp_impl, m) {
+  m.attr("placeholder_value") = py::int_(placeholder_value);
+  bind_records<Records>(m, "Records");
+  bind_records<CompactRecords<uint8_t>>(m, "CompactRecords8");
+  bind_records<CompactRecords<uint16_t>>(m, "CompactRecords16");
+  bind_records<CompactRecords<uint32_t>>(m, "CompactRecords32");
+  bind_records<CompactRecords<u64>>(m, "CompactRecords64");
+  py::class_<RecordsArrowExport>(m, "RecordsArrowExport")
+      .def("__len__", &RecordsArrowExport::size)
+      .def(
+        "__arrow_c_array__",
+        &RecordsArrowExport::arrow_c_array,
+        py::arg("requested_schema")=py::none()
+      );
+  m.def(
+    "make_records",
+    &make_records,
+    py::arg("init_size"),
+    py::arg("max_differentia"),
+    py::arg("max_rank"),
+    py::arg("max_id")
+  );
+  m.def(
+    "build_tree_searchtable_cpp_from_exploded",
+    &build_trie_searchtable_exploded,
+    py::arg("data_ids"),
+    py::arg("num_strata_depositeds"),
+    py::arg("ranks"),
+    py::arg("differentiae"),
+    py::arg("progress_bar"),
+    py::arg("num_threads")=1
+  );
+  m.def(
+    "build_tree_searchtable_cpp_from_nested",
+    &build_trie_searchtable_nested,
+    py::arg("data_ids"),
+    py::arg("num_strata_depositeds"),
+    py::arg("ranks"),
+    py::arg("differentiae"),
+    py::arg("progress_bar"),
+    py::arg("num_threads")=1
+  );
+}
+
+
+/*
+
+*/
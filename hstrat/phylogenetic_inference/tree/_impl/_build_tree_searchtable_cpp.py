@@ -9,13 +9,14 @@ from phyloframe import legacy as pfl
 import polars as pl
 
 from ...._auxiliary_lib import HereditaryStratigraphicArtifact, argsort
+from ....genome_instrumentation import HereditaryStratigraphicColumn
 from ._build_tree_searchtable_cpp_impl_stub import (
-    Records,
     build_tree_searchtable_cpp_from_exploded,
     build_tree_searchtable_cpp_from_nested,
-    collapse_unifurcations,
+    collapse_unifurcations_inplace,
     extend_tree_searchtable_cpp_from_exploded,
     extract_records_to_dict,
+    make_records,
     placeholder_value,
 )
 
@@ -51,28 +52,86 @@ def _finalize_records(
     return pfl.alifestd_try_add_ancestor_list_col(df, mutate=True)
 
 
+def _calc_retained_ranks_batched(
+    population: typing.Sequence[HereditaryStratigraphicArtifact],
+) -> typing.Optional[typing.Tuple[np.ndarray, np.ndarray]]:
+    """Calculate retained ranks of all population members in a single
+    vectorized policy call, as a CSR-style `(offsets, ranks)` pair.
+
+    Returns None if population members are not all columns sharing a
+    deterministic retention policy.
+    """
+    if not all(
+        isinstance(ann, HereditaryStratigraphicColumn) for ann in population
+    ):
+        return None
+
+    policies = {
+        id(ann._stratum_retention_policy): ann._stratum_retention_policy
+        for ann in population
+    }
+    policy = next(iter(policies.values()), None)
+    if policy is None or policy.CalcRetainedRanksBatched is None:
+        return None
+    if not all(other == policy for other in policies.values()):
+        return None
+
+    return policy.CalcRetainedRanksBatched(
+        [ann.GetNumStrataDeposited() for ann in population],
+    )
+
+
+def _collect_nested_retained_ranks(
+    sorted_population: typing.Sequence[HereditaryStratigraphicArtifact],
+) -> typing.List[typing.List[int]]:
+    """Collect retained ranks of each population member as a list of lists,
+    using a batched policy call if possible."""
+    retained_ranks = _calc_retained_ranks_batched(sorted_population)
+    if retained_ranks is None:
+        return [[*ann.IterRetainedRanks()] for ann in sorted_population]
+
+    offsets, ranks = retained_ranks
+    return [
+        ranks[begin:end].tolist()
+        for begin, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+    ]
+
+
 def _explode_population(
     sorted_population: typing.Sequence[HereditaryStratigraphicArtifact],
 ) -> pl.DataFrame:
     """Create DataFrame with one row for each retained stratum across all
     population members."""
+    retained_ranks = _calc_retained_ranks_batched(sorted_population)
+    if retained_ranks is not None:
+        offsets, ranks = retained_ranks
+        counts = np.diff(offsets)
+        data_ids = np.repeat(np.arange(len(sorted_population)), counts)
+        num_strata_depositeds = np.repeat(
+            [ann.GetNextRank() for ann in sorted_population], counts
+        )
+    else:
+        data_ids = [
+            i
+            for i, ann in enumerate(sorted_population)
+            for __ in range(ann.GetNumStrataRetained())
+        ]
+        num_strata_depositeds = [
+            ann.GetNextRank()
+            for ann in sorted_population
+            for __ in range(ann.GetNumStrataRetained())
+        ]
+        ranks = [
+            rank
+            for ann in sorted_population
+            for rank in ann.IterRetainedRanks()
+        ]
+
     return pl.DataFrame(
         {
-            "data_ids": [
-                i
-                for i, ann in enumerate(sorted_population)
-                for __ in range(ann.GetNumStrataRetained())
-            ],
-            "num_strata_depositeds": [
-                ann.GetNextRank()
-                for ann in sorted_population
-                for __ in range(ann.GetNumStrataRetained())
-            ],
-            "ranks": [
-                rank
-                for ann in sorted_population
-                for rank in ann.IterRetainedRanks()
-            ],
+            "data_ids": data_ids,
+            "num_strata_depositeds": num_strata_depositeds,
+            "ranks": ranks,
             "differentiae": [
                 differentia
                 for ann in sorted_population
@@ -93,6 +152,7 @@ def build_tree_searchtable_cpp(
     taxon_labels: typing.Optional[typing.Iterable] = None,
     progress_wrap: typing.Optional[typing.Callable] = None,
     force_common_ancestry: bool = False,
+    num_threads: int = 1,
     _entry_point: typing.Literal[
         "batched_small",
         "batched_medium",
@@ -131,6 +191,12 @@ def build_tree_searchtable_cpp(
         definitively do not share common ancestry will raise a ValueError.
     progress_wrap : Callable, optional
         Pass tqdm or equivalent to display a progress bar.
+    num_threads : int, default 1
+        Number of threads to use for trie construction.
+
+        Parallel construction produces output identical to serial
+        construction. Falls back to serial construction when artifacts
+        cannot be partitioned into independent subtries.
     _entry_point : Literal, default "nested"
         Which implementation interface should be called?
 
@@ -166,9 +232,10 @@ def build_tree_searchtable_cpp(
         records = build_tree_searchtable_cpp_from_nested(
             [*range(len(sorted_population))],
             [ann.GetNextRank() for ann in sorted_population],
-            [[*ann.IterRetainedRanks()] for ann in sorted_population],
+            _collect_nested_retained_ranks(sorted_population),
             [[*ann.IterRetainedDifferentia()] for ann in sorted_population],
             opyt.or_value(progress_wrap, mock.Mock()),
+            num_threads=num_threads,
         )
     elif _entry_point == "exploded":
         exploded_df = _explode_population(sorted_population)
@@ -178,6 +245,7 @@ def build_tree_searchtable_cpp(
             exploded_df["ranks"].to_numpy(),
             exploded_df["differentiae"].to_numpy(),
             opyt.or_value(progress_wrap, mock.Mock()),
+            num_threads=num_threads,
         )
     elif _entry_point.startswith("batched_"):
         exploded_df = _explode_population(sorted_population)
@@ -189,7 +257,17 @@ def build_tree_searchtable_cpp(
             "batched_medium_nocollapse": 1_000,
             "batched_large_nocollapse": 10_000_000,
         }[_entry_point]
-        records = Records(len(exploded_df) * 4)
+        records = make_records(
+            len(exploded_df) * 4,
+            max_differentia=opyt.or_value(
+                exploded_df["differentiae"].max(), 0
+            ),
+            max_rank=opyt.or_value(
+                exploded_df["num_strata_depositeds"].max(), 0
+            ),
+            # root, plus at most one record per stratum and per artifact
+            max_id=len(exploded_df) + len(sorted_population) + 1,
+        )
         for partition_dfs in mit.sliced(
             exploded_df.partition_by("data_ids"), batch_size
         ):
@@ -201,9 +279,10 @@ def build_tree_searchtable_cpp(
                 slice_df["ranks"].to_numpy(),
                 slice_df["differentiae"].to_numpy(),
                 opyt.or_value(progress_wrap, mock.Mock()),
+                num_threads=num_threads,
             )
             if not _entry_point.endswith("_nocollapse"):
-                records = collapse_unifurcations(records, dropped_only=True)
+                collapse_unifurcations_inplace(records, dropped_only=True)
         records = extract_records_to_dict(records)
     else:
         raise ValueError(f"Invalid entry point: {_entry_point}")
@@ -5,12 +5,26 @@ _impl_mod = load_cppimportable_module(
 )
 placeholder_value = _impl_mod.placeholder_value
 Records = _impl_mod.Records
+CompactRecords8 = _impl_mod.CompactRecords8
+CompactRecords16 = _impl_mod.CompactRecords16
+CompactRecords32 = _impl_mod.CompactRecords32
+CompactRecords64 = _impl_mod.CompactRecords64
+make_records = _impl_mod.make_records
+widen_records = _impl_mod.widen_records
 collapse_unifurcations = _impl_mod.collapse_unifurcations
+collapse_unifurcations_inplace = _impl_mod.collapse_unifurcations_inplace
 copy_records_to_dict = _impl_mod.copy_records_to_dict
 extract_records_to_dict = _impl_mod.extract_records_to_dict
+RecordsArrowExport = _impl_mod.RecordsArrowExport
+copy_records_to_arrow = _impl_mod.copy_records_to_arrow
+extract_records_to_arrow = _impl_mod.extract_records_to_arrow
+load_records_from_dict = _impl_mod.load_records_from_dict
 extend_tree_searchtable_cpp_from_exploded = (
     _impl_mod.extend_tree_searchtable_cpp_from_exploded
 )
+extend_tree_searchtable_cpp_from_packed = (
+    _impl_mod.extend_tree_searchtable_cpp_from_packed
+)
 build_tree_searchtable_cpp_from_exploded = (
     _impl_mod.build_tree_searchtable_cpp_from_exploded
 )
@@ -49,6 +63,7 @@ check_trie_invariant_root_at_zero = _impl_mod.check_trie_invariant_root_at_zero
 check_trie_invariant_ranks_nonnegative = (
     _impl_mod.check_trie_invariant_ranks_nonnegative
 )
+check_trie_invariants_dirty = _impl_mod.check_trie_invariants_dirty
 describe_records = _impl_mod._describe_records
 diagnose_trie_invariant_contiguous_ids = (
     _impl_mod.diagnose_trie_invariant_contiguous_ids
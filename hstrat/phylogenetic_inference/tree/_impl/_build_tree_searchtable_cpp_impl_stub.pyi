@@ -31,14 +31,42 @@ class Records:
         differentia: int,
     ) -> None: ...
     def __len__(self) -> int: ...
+    record_nbytes: int  # bytes of column storage per record
+
+class CompactRecords8(Records): ...
+class CompactRecords16(Records): ...
+class CompactRecords32(Records): ...
+class CompactRecords64(Records): ...
+
+class RecordsArrowExport:
+    def __len__(self) -> int: ...
+    def __arrow_c_array__(
+        self, requested_schema: typing.Optional[object] = None
+    ) -> tuple[object, object]: ...
 
 placeholder_value: int
 
+def make_records(
+    init_size: int, max_differentia: int, max_rank: int, max_id: int
+) -> Records: ...
+def widen_records(records: Records) -> Records: ...
 def collapse_unifurcations(
     records: Records, dropped_only: bool
 ) -> Records: ...
+def collapse_unifurcations_inplace(
+    records: Records, dropped_only: bool
+) -> None: ...
 def copy_records_to_dict(records: Records) -> dict[str, np.ndarray]: ...
 def extract_records_to_dict(records: Records) -> dict[str, np.ndarray]: ...
+def load_records_from_dict(
+    records: Records, columns: dict[str, np.ndarray]
+) -> None: ...
+def copy_records_to_arrow(
+    records: Records, columns: typing.Sequence[str] = ...
+) -> RecordsArrowExport: ...
+def extract_records_to_arrow(
+    records: Records, columns: typing.Sequence[str] = ...
+) -> RecordsArrowExport: ...
 def extend_tree_searchtable_cpp_from_exploded(
     records: Records,
     data_ids: np.ndarray,
@@ -46,6 +74,17 @@ def extend_tree_searchtable_cpp_from_exploded(
     ranks: np.ndarray,
     differentiae: np.ndarray,
     tqdm_progress_bar: typing.Union[typing.Type[tqdm.tqdm], mock.Mock],
+    num_threads: int = 1,
+) -> None: ...
+def extend_tree_searchtable_cpp_from_packed(
+    records: Records,
+    data_ids: np.ndarray,
+    num_strata_depositeds: np.ndarray,
+    ranks: np.ndarray,
+    storage_hex_chars: np.ndarray,
+    storage_hex_offsets: np.ndarray,
+    tqdm_progress_bar: typing.Union[typing.Type[tqdm.tqdm], mock.Mock],
+    num_threads: int = 1,
 ) -> None: ...
 def build_tree_searchtable_cpp_from_exploded(
     data_ids: np.ndarray,
@@ -53,6 +92,7 @@ def build_tree_searchtable_cpp_from_exploded(
     ranks: np.ndarray,
     differentiae: np.ndarray,
     tqdm_progress_bar: typing.Union[typing.Type[tqdm.tqdm], mock.Mock],
+    num_threads: int = 1,
 ) -> dict[str, np.ndarray]: ...
 def build_tree_searchtable_cpp_from_nested(
     data_ids: typing.List[int],
@@ -60,6 +100,7 @@ def build_tree_searchtable_cpp_from_nested(
     ranks: typing.List[typing.List[int]],
     differentiae: typing.List[typing.List[int]],
     tqdm_progress_bar: typing.Union[typing.Type[tqdm.tqdm], mock.Mock],
+    num_threads: int = 1,
 ) -> dict[str, np.ndarray]: ...
 def check_trie_invariant_contiguous_ids(records: Records) -> bool: ...
 def check_trie_invariant_topologically_sorted(records: Records) -> bool: ...
@@ -87,6 +128,7 @@ def check_trie_invariant_root_at_zero(records: Records) -> bool: ...
 def check_trie_invariant_ranks_nonnegative(
     records: Records,
 ) -> bool: ...
+def check_trie_invariants_dirty(records: Records) -> str: ...
 def describe_records(records: Records) -> str: ...
 def diagnose_trie_invariant_contiguous_ids(records: Records) -> str: ...
 def diagnose_trie_invariant_topologically_sorted(
@@ -1,6 +1,7 @@
 import math
 import typing
 
+import numpy as np
 import pandas as pd
 import polars as pl
 
@@ -9,7 +10,7 @@ from ...._auxiliary_lib import (
     anytree_iterative_deepcopy,
 )
 from .._impl import TrieInnerNode, TrieLeafNode
-from ._detail import TriePostprocessorBase
+from ._detail import TriePostprocessorBase, calc_trie_ancestor_rows
 
 
 def _call_anytree(
@@ -37,6 +38,45 @@ def _call_anytree(
     return trie
 
 
+def _calc_destruction_times(
+    ftor: "AssignDestructionTimeYoungestPlusOneTriePostprocessor",
+    trie: typing.Union[pd.DataFrame, pl.DataFrame],
+) -> np.ndarray:
+    """Implementation detail for dataframe tries."""
+    origin_times = np.asarray(
+        trie[ftor._origin_time_property].to_numpy(), dtype=float
+    )
+    ancestor_rows = calc_trie_ancestor_rows(
+        trie["id"].to_numpy(), trie["ancestor_id"].to_numpy()
+    )
+    is_child = ancestor_rows != np.arange(len(ancestor_rows))
+
+    # leaves have no children, so keep infinite destruction time
+    destruction_times = np.full(len(origin_times), math.inf)
+    np.minimum.at(
+        destruction_times, ancestor_rows[is_child], origin_times[is_child]
+    )
+    return destruction_times + 1
+
+
+def _call_pandas(
+    ftor: "AssignDestructionTimeYoungestPlusOneTriePostprocessor",
+    trie: pd.DataFrame,
+) -> pd.DataFrame:
+    trie[ftor._assigned_property] = _calc_destruction_times(ftor, trie)
+    return trie
+
+
+def _call_polars(
+    ftor: "AssignDestructionTimeYoungestPlusOneTriePostprocessor",
+    trie: pl.DataFrame,
+) -> pl.DataFrame:
+    destruction_times = _calc_destruction_times(ftor, trie)
+    return trie.with_columns(
+        pl.Series(ftor._assigned_property, destruction_times),
+    )
+
+
 class AssignDestructionTimeYoungestPlusOneTriePostprocessor(
     TriePostprocessorBase,
 ):
@@ -79,8 +119,11 @@ class AssignDestructionTimeYoungestPlusOneTriePostprocessor(
 
         Parameters
         ----------
-        trie : TrieInnerNode
+        trie : TrieInnerNode or pd.DataFrame or pl.DataFrame
             The input trie to be postprocessed.
+
+            Dataframe tries must have 'id', 'ancestor_id', and origin time
+            columns, with roots as their own ancestor.
         p_differentia_collision : float
             The multiplicative inverse of the number of possible
             differentia.
@@ -93,7 +136,7 @@ class AssignDestructionTimeYoungestPlusOneTriePostprocessor(
 
         Returns
         -------
-        TrieInnerNode
+        TrieInnerNode or pd.DataFrame or pl.DataFrame
             The postprocessed trie with assigned destruction times.
         """
         if isinstance(trie, TrieInnerNode):
@@ -106,7 +149,13 @@ class AssignDestructionTimeYoungestPlusOneTriePostprocessor(
                 trie,
                 progress_wrap=progress_wrap,
             )
-        elif isinstance(trie, (pl.DataFrame, pd.DataFrame)):
-            raise NotImplementedError  # pragma: no cover
+        elif isinstance(trie, pd.DataFrame):
+            if not mutate:
+                trie = trie.copy()
+            return _call_pandas(self, trie)  # no progress wrap
+        elif isinstance(trie, pl.DataFrame):
+            if not mutate:
+                trie = trie.clone()
+            return _call_polars(self, trie)  # no progress wrap
         else:
             raise TypeError  # pragma: no cover
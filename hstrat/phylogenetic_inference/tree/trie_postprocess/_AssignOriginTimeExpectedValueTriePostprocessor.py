@@ -7,13 +7,19 @@ import polars as pl
 from ...._auxiliary_lib import (
     AnyTreeFastPreOrderIter,
     anytree_iterative_deepcopy,
+    jit,
 )
 from ...priors._detail import PriorBase
 from .._impl import TrieInnerNode, TrieLeafNode
 from ._AssignOriginTimeNaiveTriePostprocessor import (
     AssignOriginTimeNaiveTriePostprocessor,
+    _calc_interval_bounds,
+)
+from ._detail import (
+    TriePostprocessorBase,
+    calc_trie_ancestor_rows,
+    calc_trie_child_rank_minima,
 )
-from ._detail import TriePostprocessorBase
 
 
 def _call_anytree(
@@ -32,6 +38,17 @@ def _call_anytree(
         progress_wrap=progress_wrap,
     )
 
+    interior_nodes = [
+        node
+        for node in AnyTreeFastPreOrderIter(trie)
+        if not node.is_leaf and node.parent is not None
+    ]
+    naive_weights = iter(
+        ftor._prior.CalcIntervalProbabilityProxyBatched(
+            *_calc_interval_bounds(interior_nodes)
+        ),
+    )  # consumed in preorder, below
+
     for node in progress_wrap(AnyTreeFastPreOrderIter(trie)):
         if node.is_leaf:
             setattr(node, ftor._assigned_property, node.rank)
@@ -40,21 +57,7 @@ def _call_anytree(
             setattr(node, ftor._assigned_property, 0)
         else:
             assert node.children
-            weights = (
-                p_differentia_collision,
-                1
-                * ftor._prior.CalcIntervalProbabilityProxy(
-                    node.rank,
-                    min(
-                        (
-                            child.rank
-                            for child in node.children
-                            if not child.is_leaf
-                        ),
-                        default=node.rank + 1,
-                    ),
-                ),
-            )
+            weights = (p_differentia_collision, next(naive_weights))
             values = (
                 getattr(node.parent, ftor._assigned_property),
                 node._naive_origin_time,
@@ -72,6 +75,98 @@ def _call_anytree(
     return trie
 
 
+@jit(nopython=True)
+def _blend_origin_times(
+    ancestor_rows: np.ndarray,
+    is_interior: np.ndarray,
+    naive_origin_times: np.ndarray,
+    naive_weights: np.ndarray,
+    p_differentia_collision: float,
+) -> np.ndarray:
+    """Implementation detail for dataframe tries.
+
+    Blends each interior node's naive origin time with its parent's
+    (already-blended) origin time. Requires ancestors to precede descendants.
+    """
+    origin_times = naive_origin_times.copy()
+    for row, ancestor_row in enumerate(ancestor_rows):
+        if is_interior[row]:  # leaves and roots keep naive origin time
+            origin_times[row] = (
+                p_differentia_collision * origin_times[ancestor_row]
+                + naive_weights[row] * naive_origin_times[row]
+            ) / (p_differentia_collision + naive_weights[row])
+    return origin_times
+
+
+def _calc_origin_times(
+    ftor: "AssignOriginTimeExpectedValueTriePostprocessor",
+    trie: typing.Union[pd.DataFrame, pl.DataFrame],
+    p_differentia_collision: float,
+) -> np.ndarray:
+    """Implementation detail for dataframe tries."""
+    ranks = np.asarray(trie["rank"].to_numpy(), dtype=np.int64)
+    ancestor_rows = calc_trie_ancestor_rows(
+        trie["id"].to_numpy(), trie["ancestor_id"].to_numpy()
+    )
+    (
+        is_leaf,
+        min_child_rank,
+        min_inner_child_rank,
+    ) = calc_trie_child_rank_minima(ancestor_rows, ranks)
+    if (ancestor_rows > np.arange(len(ancestor_rows))).any():
+        raise NotImplementedError(
+            "dataframe tries must be topologically sorted",
+        )
+
+    is_root = ancestor_rows == np.arange(len(ancestor_rows))
+    is_interior = ~is_leaf & ~is_root
+    begin_ranks = ranks[is_interior]
+    end_ranks = min_inner_child_rank[is_interior]  # endpoint is exclusive
+
+    # as per AssignOriginTimeNaiveTriePostprocessor
+    naive_origin_times = np.where(is_leaf, ranks, 0).astype(float)
+    naive_origin_times[is_interior] = np.minimum(
+        ftor._prior.CalcIntervalConditionedMeanBatched(begin_ranks, end_ranks),
+        min_child_rank[is_interior],
+    )
+
+    interval_proxies = ftor._prior.CalcIntervalProbabilityProxyBatched(
+        begin_ranks, end_ranks
+    )
+    naive_weights = np.zeros(len(ranks))
+    naive_weights[is_interior] = interval_proxies
+
+    return _blend_origin_times(
+        ancestor_rows,
+        is_interior,
+        naive_origin_times,
+        naive_weights,
+        float(p_differentia_collision),
+    )
+
+
+def _call_pandas(
+    ftor: "AssignOriginTimeExpectedValueTriePostprocessor",
+    trie: pd.DataFrame,
+    p_differentia_collision: float,
+) -> pd.DataFrame:
+    trie[ftor._assigned_property] = _calc_origin_times(
+        ftor, trie, p_differentia_collision
+    )
+    return trie
+
+
+def _call_polars(
+    ftor: "AssignOriginTimeExpectedValueTriePostprocessor",
+    trie: pl.DataFrame,
+    p_differentia_collision: float,
+) -> pl.DataFrame:
+    origin_times = _calc_origin_times(ftor, trie, p_differentia_collision)
+    return trie.with_columns(
+        pl.Series(ftor._assigned_property, origin_times),
+    )
+
+
 class AssignOriginTimeExpectedValueTriePostprocessor(TriePostprocessorBase):
     """Functor to assign origin time property to trie nodes using expected
     values over the distribution of possible differentia collisions.
@@ -112,8 +207,12 @@ class AssignOriginTimeExpectedValueTriePostprocessor(TriePostprocessorBase):
 
         Parameters
         ----------
-        trie : TrieInnerNode
+        trie : TrieInnerNode or pd.DataFrame or pl.DataFrame
             The input trie to be postprocessed.
+
+            Dataframe tries must have 'id', 'ancestor_id', and 'rank' columns,
+            with roots as their own ancestor. Dataframe tries must also be
+            topologically sorted.
         p_differentia_collision : float
             Probability of a randomly-generated differentia matching an
             existing differentia.
@@ -124,7 +223,7 @@ class AssignOriginTimeExpectedValueTriePostprocessor(TriePostprocessorBase):
 
         Returns
         -------
-        TrieInnerNode
+        TrieInnerNode or pd.DataFrame or pl.DataFrame
             The postprocessed trie with assigned origin times.
         """
         if isinstance(trie, TrieInnerNode):
@@ -138,7 +237,17 @@ class AssignOriginTimeExpectedValueTriePostprocessor(TriePostprocessorBase):
                 p_differentia_collision,
                 progress_wrap=progress_wrap,
             )
-        elif isinstance(trie, (pl.DataFrame, pd.DataFrame)):
-            raise NotImplementedError  # pragma: no cover
+        elif isinstance(trie, pd.DataFrame):
+            if not mutate:
+                trie = trie.copy()
+            return _call_pandas(
+                self, trie, p_differentia_collision
+            )  # no progress wrap
+        elif isinstance(trie, pl.DataFrame):
+            if not mutate:
+                trie = trie.clone()
+            return _call_polars(
+                self, trie, p_differentia_collision
+            )  # no progress wrap
         else:
             raise TypeError  # pragma: no cover
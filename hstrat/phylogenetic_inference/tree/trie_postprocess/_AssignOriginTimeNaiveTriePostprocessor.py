@@ -1,5 +1,6 @@
 import typing
 
+import numpy as np
 import pandas as pd
 import polars as pl
 
@@ -10,7 +11,38 @@ from ...._auxiliary_lib import (
 from ...priors import ArbitraryPrior
 from ...priors._detail import PriorBase
 from .._impl import TrieInnerNode, TrieLeafNode
-from ._detail import TriePostprocessorBase
+from ._detail import (
+    TriePostprocessorBase,
+    calc_trie_ancestor_rows,
+    calc_trie_child_rank_minima,
+)
+
+
+def _calc_interval_bounds(
+    interior_nodes: typing.List[TrieInnerNode],
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Implementation detail for anytree tries.
+
+    Returns begin (inclusive) and end (exclusive) ranks of the interval
+    conditioning each interior node's origin time.
+    """
+    begin_ranks = np.fromiter(
+        (node.rank for node in interior_nodes),
+        dtype=np.int64,
+        count=len(interior_nodes),
+    )
+    end_ranks = np.fromiter(
+        (
+            min(
+                (child.rank for child in node.children if not child.is_leaf),
+                default=node.rank + 1,
+            )  # endpoint is exclusive
+            for node in interior_nodes
+        ),
+        dtype=np.int64,
+        count=len(interior_nodes),
+    )
+    return begin_ranks, end_ranks
 
 
 def _call_anytree(
@@ -18,6 +50,17 @@ def _call_anytree(
     trie: TrieInnerNode,
     progress_wrap: typing.Callable,
 ) -> TrieInnerNode:
+    interior_nodes = [
+        node
+        for node in AnyTreeFastPreOrderIter(trie)
+        if not node.is_leaf and node.parent is not None
+    ]
+    interval_means = iter(
+        ftor._prior.CalcIntervalConditionedMeanBatched(
+            *_calc_interval_bounds(interior_nodes)
+        ),
+    )  # consumed in preorder, below
+
     for node in progress_wrap(AnyTreeFastPreOrderIter(trie)):
         if node.is_leaf:
             setattr(node, ftor._assigned_property, node.rank)
@@ -25,17 +68,7 @@ def _call_anytree(
         elif node.parent is None:
             setattr(node, ftor._assigned_property, 0)
         else:
-            interval_mean = ftor._prior.CalcIntervalConditionedMean(
-                node.rank,
-                min(
-                    (
-                        child.rank
-                        for child in node.children
-                        if not child.is_leaf
-                    ),
-                    default=node.rank + 1,
-                ),  # endpoint is exclusive
-            )
+            interval_mean = next(interval_means)
             setattr(
                 node,
                 ftor._assigned_property,
@@ -53,6 +86,52 @@ def _call_anytree(
     return trie
 
 
+def _calc_origin_times(
+    ftor: "AssignOriginTimeNaiveTriePostprocessor",
+    trie: typing.Union[pd.DataFrame, pl.DataFrame],
+) -> np.ndarray:
+    """Implementation detail for dataframe tries."""
+    ranks = np.asarray(trie["rank"].to_numpy(), dtype=np.int64)
+    ancestor_rows = calc_trie_ancestor_rows(
+        trie["id"].to_numpy(), trie["ancestor_id"].to_numpy()
+    )
+    (
+        is_leaf,
+        min_child_rank,
+        min_inner_child_rank,
+    ) = calc_trie_child_rank_minima(ancestor_rows, ranks)
+    is_root = ancestor_rows == np.arange(len(ancestor_rows))
+    is_interior = ~is_leaf & ~is_root
+
+    interval_means = ftor._prior.CalcIntervalConditionedMeanBatched(
+        ranks[is_interior],
+        min_inner_child_rank[is_interior],  # endpoint is exclusive
+    )
+
+    origin_times = np.where(is_leaf, ranks, 0).astype(float)
+    origin_times[is_interior] = np.minimum(
+        interval_means, min_child_rank[is_interior]
+    )
+    return origin_times
+
+
+def _call_pandas(
+    ftor: "AssignOriginTimeNaiveTriePostprocessor",
+    trie: pd.DataFrame,
+) -> pd.DataFrame:
+    trie[ftor._assigned_property] = _calc_origin_times(ftor, trie)
+    return trie
+
+
+def _call_polars(
+    ftor: "AssignOriginTimeNaiveTriePostprocessor",
+    trie: pl.DataFrame,
+) -> pl.DataFrame:
+    return trie.with_columns(
+        pl.Series(ftor._assigned_property, _calc_origin_times(ftor, trie)),
+    )
+
+
 class AssignOriginTimeNaiveTriePostprocessor(TriePostprocessorBase):
     """Functor to assign origin time property to trie nodes calculated as the
     average of the node's rank and the minimum rank among its children.
@@ -94,8 +173,11 @@ class AssignOriginTimeNaiveTriePostprocessor(TriePostprocessorBase):
 
         Parameters
         ----------
-        trie : TrieInnerNode
+        trie : TrieInnerNode or pd.DataFrame or pl.DataFrame
             The input trie to be postprocessed.
+
+            Dataframe tries must have 'id', 'ancestor_id', and 'rank' columns,
+            with roots as their own ancestor.
         p_differentia_collision : float
             Probability of a randomly-generated differentia matching an
             existing differentia.
@@ -108,7 +190,7 @@ class AssignOriginTimeNaiveTriePostprocessor(TriePostprocessorBase):
 
         Returns
         -------
-        TrieInnerNode
+        TrieInnerNode or pd.DataFrame or pl.DataFrame
             The postprocessed trie with assigned origin times.
         """
         if isinstance(trie, TrieInnerNode):
@@ -121,7 +203,13 @@ class AssignOriginTimeNaiveTriePostprocessor(TriePostprocessorBase):
                 trie,
                 progress_wrap=progress_wrap,
             )
-        elif isinstance(trie, (pl.DataFrame, pd.DataFrame)):
-            raise NotImplementedError  # pragma: no cover
+        elif isinstance(trie, pd.DataFrame):
+            if not mutate:
+                trie = trie.copy()
+            return _call_pandas(self, trie)  # no progress wrap
+        elif isinstance(trie, pl.DataFrame):
+            if not mutate:
+                trie = trie.clone()
+            return _call_polars(self, trie)  # no progress wrap
         else:
             raise TypeError  # pragma: no cover
@@ -1,5 +1,6 @@
 import typing
 
+import numpy as np
 import pandas as pd
 import polars as pl
 
@@ -10,7 +11,11 @@ from ...._auxiliary_lib import (
 from ...priors import ArbitraryPrior
 from ...priors._detail import PriorBase
 from .._impl import TrieInnerNode, TrieLeafNode
-from ._detail import TriePostprocessorBase
+from ._detail import (
+    TriePostprocessorBase,
+    calc_trie_ancestor_rows,
+    calc_trie_child_rank_minima,
+)
 
 
 def _call_anytree(
@@ -54,6 +59,60 @@ def _call_anytree(
     return trie
 
 
+def _calc_origin_times(
+    ftor: "AssignOriginTimeSampleNaiveTriePostprocessor",
+    trie: typing.Union[pd.DataFrame, pl.DataFrame],
+) -> np.ndarray:
+    """Implementation detail for dataframe tries.
+
+    Interior nodes are sampled in row order.
+    """
+    ranks = np.asarray(trie["rank"].to_numpy(), dtype=np.int64)
+    ancestor_rows = calc_trie_ancestor_rows(
+        trie["id"].to_numpy(), trie["ancestor_id"].to_numpy()
+    )
+    (
+        is_leaf,
+        min_child_rank,
+        min_inner_child_rank,
+    ) = calc_trie_child_rank_minima(ancestor_rows, ranks)
+    is_root = ancestor_rows == np.arange(len(ancestor_rows))
+    is_interior = ~is_leaf & ~is_root
+
+    interval_samples = np.fromiter(
+        map(
+            ftor._prior.SampleIntervalConditionedValue,
+            ranks[is_interior],
+            min_inner_child_rank[is_interior],  # endpoint is exclusive
+        ),
+        dtype=float,
+        count=is_interior.sum(),
+    )
+
+    origin_times = np.where(is_leaf, ranks, 0).astype(float)
+    origin_times[is_interior] = np.minimum(
+        interval_samples, min_child_rank[is_interior]
+    )
+    return origin_times
+
+
+def _call_pandas(
+    ftor: "AssignOriginTimeSampleNaiveTriePostprocessor",
+    trie: pd.DataFrame,
+) -> pd.DataFrame:
+    trie[ftor._assigned_property] = _calc_origin_times(ftor, trie)
+    return trie
+
+
+def _call_polars(
+    ftor: "AssignOriginTimeSampleNaiveTriePostprocessor",
+    trie: pl.DataFrame,
+) -> pl.DataFrame:
+    return trie.with_columns(
+        pl.Series(ftor._assigned_property, _calc_origin_times(ftor, trie)),
+    )
+
+
 class AssignOriginTimeSampleNaiveTriePostprocessor(TriePostprocessorBase):
     """Functor to assign origin time property to trie nodes sampled between the
     node's rank and the minimum rank among its children.
@@ -94,8 +153,11 @@ class AssignOriginTimeSampleNaiveTriePostprocessor(TriePostprocessorBase):
 
         Parameters
         ----------
-        trie : TrieInnerNode
+        trie : TrieInnerNode or pd.DataFrame or pl.DataFrame
             The input trie to be postprocessed.
+
+            Dataframe tries must have 'id', 'ancestor_id', and 'rank' columns,
+            with roots as their own ancestor.
         p_differentia_collision : float
             Probability of a randomly-generated differentia matching an
             existing differentia.
@@ -108,7 +170,7 @@ class AssignOriginTimeSampleNaiveTriePostprocessor(TriePostprocessorBase):
 
         Returns
         -------
-        TrieInnerNode
+        TrieInnerNode or pd.DataFrame or pl.DataFrame
             The postprocessed trie with assigned origin times.
         """
         if isinstance(trie, TrieInnerNode):
@@ -121,7 +183,13 @@ class AssignOriginTimeSampleNaiveTriePostprocessor(TriePostprocessorBase):
                 trie,
                 progress_wrap=progress_wrap,
             )
-        elif isinstance(trie, (pl.DataFrame, pd.DataFrame)):
-            raise NotImplementedError  # pragma: no cover
+        elif isinstance(trie, pd.DataFrame):
+            if not mutate:
+                trie = trie.copy()
+            return _call_pandas(self, trie)  # no progress wrap
+        elif isinstance(trie, pl.DataFrame):
+            if not mutate:
+                trie = trie.clone()
+            return _call_polars(self, trie)  # no progress wrap
         else:
             raise TypeError  # pragma: no cover
@@ -1,5 +1,6 @@
 import typing
 
+import numpy as np
 import pandas as pd
 import polars as pl
 
@@ -9,7 +10,7 @@ from ...._auxiliary_lib import (
     anytree_peel_sibling_to_cousin,
 )
 from .._impl import TrieInnerNode
-from ._detail import TriePostprocessorBase
+from ._detail import TriePostprocessorBase, calc_trie_ancestor_rows
 
 
 def _call_anytree(
@@ -23,6 +24,69 @@ def _call_anytree(
     return trie
 
 
+def _calc_peel_rows(
+    trie: typing.Union[pd.DataFrame, pl.DataFrame],
+) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Implementation detail for dataframe tries.
+
+    Returns row gather order for result, with each peeled leaf preceded by a
+    copy of its parent, and result ids and ancestor ids. All but the last
+    (by row) of each parent's leaf children are peeled.
+    """
+    if "ancestor_list" in trie.columns:
+        raise NotImplementedError
+
+    ids = trie["id"].to_numpy()
+    ancestor_ids = trie["ancestor_id"].to_numpy()
+    ancestor_rows = calc_trie_ancestor_rows(ids, ancestor_ids)
+    is_child = ancestor_rows != np.arange(len(ids))
+    is_leaf = np.ones(len(ids), dtype=bool)
+    is_leaf[ancestor_rows[is_child]] = False
+
+    (leaf_rows,) = np.nonzero(is_leaf & is_child)
+    leaf_parent_rows = ancestor_rows[leaf_rows]
+    # leaf rows are ascending, so stable sort keeps row order within parents
+    order = np.argsort(leaf_parent_rows, kind="stable")
+    has_later_sibling = np.zeros(len(leaf_rows), dtype=bool)
+    has_later_sibling[order[:-1]] = (
+        leaf_parent_rows[order[:-1]] == leaf_parent_rows[order[1:]]
+    )
+    peel_rows = leaf_rows[has_later_sibling]
+    peel_parent_rows = leaf_parent_rows[has_later_sibling]
+
+    clone_ids = (
+        ids.max(initial=0) + 1 + np.arange(len(peel_rows), dtype=ids.dtype)
+    )
+    result_ancestor_ids = ancestor_ids.copy()
+    result_ancestor_ids[peel_rows] = clone_ids
+
+    return (
+        np.insert(np.arange(len(ids)), peel_rows, peel_parent_rows),
+        np.insert(ids, peel_rows, clone_ids),
+        np.insert(
+            result_ancestor_ids, peel_rows, ancestor_ids[peel_parent_rows]
+        ),
+    )
+
+
+def _call_pandas(trie: pd.DataFrame) -> pd.DataFrame:
+    rows, ids, ancestor_ids = _calc_peel_rows(trie)
+    trie = trie.iloc[rows].reset_index(drop=True)
+    trie["id"] = ids
+    trie["ancestor_id"] = ancestor_ids
+    return trie
+
+
+def _call_polars(trie: pl.DataFrame) -> pl.DataFrame:
+    rows, ids, ancestor_ids = _calc_peel_rows(trie)
+    return trie[rows].with_columns(
+        pl.Series("id", ids, dtype=trie.schema["id"]),
+        pl.Series(
+            "ancestor_id", ancestor_ids, dtype=trie.schema["ancestor_id"]
+        ),
+    )
+
+
 class PeelBackConjoinedLeavesTriePostprocessor(TriePostprocessorBase):
     """Functor to separate any TrieLeafNode instances that are direct siblings.
 
@@ -52,8 +116,11 @@ class PeelBackConjoinedLeavesTriePostprocessor(TriePostprocessorBase):
 
         Parameters:
         ----------
-        trie : TrieInnerNode
+        trie : TrieInnerNode or pd.DataFrame or pl.DataFrame
             The root node of the trie to be unzipped.
+
+            Dataframe tries must have 'id' and 'ancestor_id' columns, with
+            roots as their own ancestor.
         p_differentia_collision : float
             The multiplicative inverse of the number of possible
             differentia.
@@ -66,7 +133,7 @@ class PeelBackConjoinedLeavesTriePostprocessor(TriePostprocessorBase):
 
         Returns
         -------
-        TrieInnerNode
+        TrieInnerNode or pd.DataFrame or pl.DataFrame
             The postprocessed trie.
         """
         if isinstance(trie, TrieInnerNode):
@@ -78,7 +145,9 @@ class PeelBackConjoinedLeavesTriePostprocessor(TriePostprocessorBase):
                 trie,
                 progress_wrap=progress_wrap,
             )
-        elif isinstance(trie, (pl.DataFrame, pd.DataFrame)):
-            raise NotImplementedError
+        elif isinstance(trie, pd.DataFrame):
+            return _call_pandas(trie)  # no progress wrap; always copies
+        elif isinstance(trie, pl.DataFrame):
+            return _call_polars(trie)  # no progress wrap
         else:
             raise TypeError
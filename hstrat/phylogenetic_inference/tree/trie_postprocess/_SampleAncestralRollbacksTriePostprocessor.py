@@ -3,6 +3,7 @@ import itertools as it
 import random
 import typing
 
+import numpy as np
 import opytional as opyt
 import pandas as pd
 import polars as pl
@@ -15,36 +16,20 @@ from ...._auxiliary_lib import (
     anytree_has_sibling,
     anytree_iterative_deepcopy,
     anytree_peel_sibling_to_cousin,
+    jit,
 )
 from .._impl import TrieInnerNode
-from ._detail import TriePostprocessorBase
+from ._detail import TriePostprocessorBase, calc_trie_ancestor_rows
 
 
-def _call_anytree(
-    trie: TrieInnerNode,
-    p_differentia_collision: float,
-    progress_wrap: typing.Callable,
-) -> TrieInnerNode:
+def _calc_expected_collisions(
+    p_differentia_collision: float, unzip_opportunities: int
+) -> int:
     """Implementation detail for `SampleAncestralRollbacks.__call__`.
 
-    See `SampleAncestralRollbacks.__call__` for parameter descriptions.
+    Calculates number of rollbacks to perform, before capping at the maximum
+    number of possible unzips.
     """
-    eligible_nodes = {
-        id(node): node
-        for node in AnyTreeFastPreOrderIter(trie)
-        if anytree_has_sibling(node) and anytree_has_grandparent(node)
-    }
-    # sequence data structure allows efficient random choice
-    possibly_eligible_node_ids = [*eligible_nodes.keys()]
-
-    # number of internal nodes approx equal to the number of branching nodes in
-    # a strictly bifurcating/unifurcating tree
-    # ... correction for multifurcations (i.e., due to strong selection
-    # pressure) should be considered in the future (including whether such
-    # corections are necessary in the first place)
-    num_leaves = sum(node.is_leaf for node in AnyTreeFastPreOrderIter(trie))
-    unzip_opportunities = num_leaves
-
     if p_differentia_collision <= 0.5:
         # 1 + 1/x + 1/x^2 + ... = x / (x - 1)
         # expected number of successive collisions:
@@ -72,11 +57,41 @@ def _call_anytree(
     # but some care would have to be taken to consider the possibility of
     # successive collisions where the MRCA is rolled back more than one
     # position
-    expected_collisions = int(
+    return int(
         collision_succession_corrected_expectation_per_opportunity
         * unzip_opportunities
     )
 
+
+def _call_anytree(
+    trie: TrieInnerNode,
+    p_differentia_collision: float,
+    progress_wrap: typing.Callable,
+) -> TrieInnerNode:
+    """Implementation detail for `SampleAncestralRollbacks.__call__`.
+
+    See `SampleAncestralRollbacks.__call__` for parameter descriptions.
+    """
+    eligible_nodes = {
+        id(node): node
+        for node in AnyTreeFastPreOrderIter(trie)
+        if anytree_has_sibling(node) and anytree_has_grandparent(node)
+    }
+    # sequence data structure allows efficient random choice
+    possibly_eligible_node_ids = [*eligible_nodes.keys()]
+
+    # number of internal nodes approx equal to the number of branching nodes in
+    # a strictly bifurcating/unifurcating tree
+    # ... correction for multifurcations (i.e., due to strong selection
+    # pressure) should be considered in the future (including whether such
+    # corections are necessary in the first place)
+    num_leaves = sum(node.is_leaf for node in AnyTreeFastPreOrderIter(trie))
+    unzip_opportunities = num_leaves
+
+    expected_collisions = _calc_expected_collisions(
+        p_differentia_collision, unzip_opportunities
+    )
+
     def calc_max_unzips() -> bool:
         leaf_counts = anytree_calc_leaf_counts(trie)
         del leaf_counts[id(trie)]  # exclude root
@@ -148,6 +163,228 @@ def _call_anytree(
     return trie
 
 
+@jit(nopython=True)
+def _calc_num_children(ancestor_rows: np.ndarray, size: int) -> np.ndarray:
+    """Implementation detail for dataframe tries."""
+    num_children = np.zeros(size, dtype=np.int64)
+    for row in range(len(ancestor_rows)):
+        ancestor_row = ancestor_rows[row]
+        if ancestor_row != row:
+            num_children[ancestor_row] += 1
+    return num_children
+
+
+@jit(nopython=True)
+def _calc_preorder_rows(
+    ancestor_rows: np.ndarray, num_children: np.ndarray
+) -> np.ndarray:
+    """Implementation detail for dataframe tries.
+
+    Returns rows in depth-first preorder, visiting roots and siblings in row
+    order. Roots are their own ancestor.
+    """
+    num_rows = len(ancestor_rows)
+    child_offsets = np.zeros(num_rows + 1, dtype=np.int64)
+    child_offsets[1:] = np.cumsum(num_children[:num_rows])
+    child_rows = np.empty(child_offsets[-1], dtype=np.int64)
+    child_fill = child_offsets[:-1].copy()
+    for row in range(num_rows):
+        ancestor_row = ancestor_rows[row]
+        if ancestor_row != row:
+            child_rows[child_fill[ancestor_row]] = row
+            child_fill[ancestor_row] += 1
+
+    preorder_rows = np.empty(num_rows, dtype=np.int64)
+    num_visited = 0
+    stack = np.empty(num_rows, dtype=np.int64)
+    for root in range(num_rows):
+        if ancestor_rows[root] != root:
+            continue
+        stack[0] = root
+        stack_size = 1
+        while stack_size:
+            stack_size -= 1
+            row = stack[stack_size]
+            preorder_rows[num_visited] = row
+            num_visited += 1
+            # push in reverse, so that children pop in row order
+            for i in range(
+                child_offsets[row + 1] - 1, child_offsets[row] - 1, -1
+            ):
+                stack[stack_size] = child_rows[i]
+                stack_size += 1
+
+    return preorder_rows[:num_visited]
+
+
+@jit(nopython=True)
+def _calc_max_unzips(
+    ancestor_rows: np.ndarray, num_children: np.ndarray
+) -> int:
+    """Implementation detail for dataframe tries.
+
+    Equivalent to summing leaf count less one over all non-root nodes, as in
+    anytree implementation.
+    """
+    depths = np.zeros(len(ancestor_rows), dtype=np.int64)
+    max_unzips = 0
+    for row in _calc_preorder_rows(ancestor_rows, num_children):
+        ancestor_row = ancestor_rows[row]
+        if ancestor_row != row:
+            depths[row] = depths[ancestor_row] + 1
+            max_unzips -= 1  # -1 per; last sibling always ineligible
+        if num_children[row] == 0:
+            max_unzips += depths[row]  # leaf counted by each non-root node
+    return max_unzips
+
+
+@jit(nopython=True)
+def _sample_rollbacks(
+    ancestor_rows: np.ndarray, num_children: np.ndarray, num_rollbacks: int
+) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Implementation detail for dataframe tries.
+
+    Performs rollbacks on array representation of trie, appending one clone
+    node per rollback. As in the anytree implementation, each rollback
+    targets a node sampled uniformly from nodes with a sibling and a
+    grandparent; the target is moved onto a clone of its parent, which is
+    attached to its grandparent.
+
+    Returns preorder of resulting nodes, the original row each node is a copy
+    of, and each node's ancestor node.
+    """
+    num_rows = len(ancestor_rows)
+    num_nodes = num_rows + num_rollbacks
+    ancestors = np.empty(num_nodes, dtype=np.int64)
+    ancestors[:num_rows] = ancestor_rows
+    sources = np.empty(num_nodes, dtype=np.int64)
+    sources[:num_rows] = np.arange(num_rows)
+    num_children = np.concatenate(
+        (num_children, np.zeros(num_rollbacks, dtype=np.int64)),
+    )
+
+    # possibly eligible candidates, with stale entries removed lazily on draw
+    # each rollback adds at most two candidates
+    candidates = np.empty(num_rows + 2 * num_rollbacks, dtype=np.int64)
+    is_candidate = np.zeros(num_nodes, dtype=np.bool_)
+    num_candidates = 0
+    for row in range(num_rows):
+        ancestor_row = ancestor_rows[row]
+        if (
+            ancestor_row != row
+            and ancestor_rows[ancestor_row] != ancestor_row
+            and num_children[ancestor_row] > 1
+        ):
+            candidates[num_candidates] = row
+            is_candidate[row] = True
+            num_candidates += 1
+
+    node = num_rows
+    while node < num_nodes:
+        assert num_candidates
+        idx = np.random.randint(0, num_candidates)
+        target = candidates[idx]
+        # swap and pop, target is either stale or about to be ineligible
+        num_candidates -= 1
+        candidates[idx] = candidates[num_candidates]
+        is_candidate[target] = False
+
+        parent = ancestors[target]
+        grandparent = ancestors[parent]
+        if (
+            parent == target
+            or grandparent == parent
+            or num_children[parent] < 2
+        ):
+            continue  # no longer eligible
+
+        # peel target onto clone of parent, attached as cousin
+        sources[node] = sources[parent]
+        ancestors[node] = grandparent
+        ancestors[target] = node
+        num_children[node] = 1
+        num_children[parent] -= 1
+        num_children[grandparent] += 1
+
+        if ancestors[grandparent] != grandparent:
+            # peeled off parent is always newly eligible
+            candidates[num_candidates] = node
+            is_candidate[node] = True
+            num_candidates += 1
+            # peeled from parent is newly eligible, if now has sibling
+            if num_children[grandparent] == 2 and not is_candidate[parent]:
+                candidates[num_candidates] = parent
+                is_candidate[parent] = True
+                num_candidates += 1
+
+        node += 1
+
+    return _calc_preorder_rows(ancestors, num_children), sources, ancestors
+
+
+def _calc_rollback_rows(
+    trie: typing.Union[pd.DataFrame, pl.DataFrame],
+    p_differentia_collision: float,
+) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Implementation detail for dataframe tries.
+
+    Returns row gather order for result, in preorder with clone rows included,
+    and result ids and ancestor ids.
+    """
+    if "ancestor_list" in trie.columns:
+        raise NotImplementedError
+
+    ids = trie["id"].to_numpy()
+    ancestor_ids = trie["ancestor_id"].to_numpy()
+    ancestor_rows = calc_trie_ancestor_rows(ids, ancestor_ids)
+    num_children = _calc_num_children(ancestor_rows, len(ancestor_rows))
+
+    num_leaves = np.count_nonzero(num_children == 0)
+    num_rollbacks = min(
+        _calc_expected_collisions(p_differentia_collision, num_leaves),
+        _calc_max_unzips(ancestor_rows, num_children),
+    )
+
+    preorder, sources, ancestors = _sample_rollbacks(
+        ancestor_rows, num_children, num_rollbacks
+    )
+    clone_ids = (
+        ids.max(initial=0) + 1 + np.arange(num_rollbacks, dtype=ids.dtype)
+    )
+    node_ids = np.concatenate((ids, clone_ids))
+    return (
+        sources[preorder],
+        node_ids[preorder],
+        node_ids[ancestors[preorder]],
+    )
+
+
+def _call_pandas(
+    trie: pd.DataFrame, p_differentia_collision: float
+) -> pd.DataFrame:
+    rows, ids, ancestor_ids = _calc_rollback_rows(
+        trie, p_differentia_collision
+    )
+    trie = trie.iloc[rows].reset_index(drop=True)
+    trie["id"] = ids
+    trie["ancestor_id"] = ancestor_ids
+    return trie
+
+
+def _call_polars(
+    trie: pl.DataFrame, p_differentia_collision: float
+) -> pl.DataFrame:
+    rows, ids, ancestor_ids = _calc_rollback_rows(
+        trie, p_differentia_collision
+    )
+    return trie[rows].with_columns(
+        pl.Series("id", ids, dtype=trie.schema["id"]),
+        pl.Series(
+            "ancestor_id", ancestor_ids, dtype=trie.schema["ancestor_id"]
+        ),
+    )
+
+
 class SampleAncestralRollbacksTriePostprocessor(
     TriePostprocessorBase,
 ):
@@ -191,12 +428,17 @@ class SampleAncestralRollbacksTriePostprocessor(
         The number of rollback operations is calculated from the number of
         possible spurious collisions and the probability of spurious collision.
         Unzip targets are sampled randomly using the standard library `random`
-        module.
+        module for anytree tries, and using numba-internal (or numpy, if numba
+        is unavailable) random state for dataframe tries.
 
         Parameters:
         ----------
-        trie : TrieInnerNode
+        trie : TrieInnerNode or pd.DataFrame or pl.DataFrame
             The root node of the trie to be unzipped.
+
+            Dataframe tries must have 'id' and 'ancestor_id' columns, with
+            roots as their own ancestor. Clone rows copy all columns of the
+            node they are cloned from, except 'id' and 'ancestor_id'.
         p_differentia_collision : float
             The multiplicative inverse of the number of possible
             differentia.
@@ -209,13 +451,20 @@ class SampleAncestralRollbacksTriePostprocessor(
 
         Returns
         -------
-        TrieInnerNode
+        TrieInnerNode or pd.DataFrame or pl.DataFrame
             The postprocessed trie.
 
+            Dataframe trie rows are returned in depth-first preorder, with clone
+            nodes assigned ids greater than all existing ids.
+
         Notes:
         ------
         This function assumes underlying shared genesis, so the root node of the
         trie is not eligible for rollback.
+
+        Dataframe tries are processed in time linear in node count. Results
+        are reproducible by `seed`, but differ from results for an equivalent
+        anytree trie.
         """
         with opyt.apply_if_or_value(
             self._seed,
@@ -232,7 +481,9 @@ class SampleAncestralRollbacksTriePostprocessor(
                     p_differentia_collision,
                     progress_wrap=progress_wrap,
                 )
-            elif isinstance(trie, (pl.DataFrame, pd.DataFrame)):
-                raise NotImplementedError
+            elif isinstance(trie, pd.DataFrame):
+                return _call_pandas(trie, p_differentia_collision)
+            elif isinstance(trie, pl.DataFrame):
+                return _call_polars(trie, p_differentia_collision)
             else:
                 raise TypeError
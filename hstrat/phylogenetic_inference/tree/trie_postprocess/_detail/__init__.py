@@ -1,5 +1,9 @@
 from ._TriePostprocessorBase import TriePostprocessorBase
+from ._calc_trie_ancestor_rows import calc_trie_ancestor_rows
+from ._calc_trie_child_rank_minima import calc_trie_child_rank_minima
 
 __all__ = [
     "TriePostprocessorBase",
+    "calc_trie_ancestor_rows",
+    "calc_trie_child_rank_minima",
 ]
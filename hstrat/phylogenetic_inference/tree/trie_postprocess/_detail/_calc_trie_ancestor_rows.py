@@ -0,0 +1,43 @@
+import numpy as np
+
+
+def calc_trie_ancestor_rows(
+    ids: np.ndarray,
+    ancestor_ids: np.ndarray,
+) -> np.ndarray:
+    """Find row position of each trie node's parent, for vectorized dataframe
+    trie postprocessors.
+
+    Parameters
+    ----------
+    ids : np.ndarray
+        Node ids, in any order.
+    ancestor_ids : np.ndarray
+        Parent node ids, equal to own id for root nodes.
+
+    Returns
+    -------
+    np.ndarray
+        Row position of each node's parent, equal to own row for root nodes.
+
+    Raises
+    ------
+    ValueError
+        If any ancestor id does not match an id.
+    """
+    ids = np.asarray(ids)
+    ancestor_ids = np.asarray(ancestor_ids)
+    if len(ids) and np.array_equal(
+        ids, np.arange(ids[0], ids[0] + len(ids), dtype=ids.dtype)
+    ):  # fast path for contiguous ids, as from surface_postprocess_trie
+        ancestor_rows = ancestor_ids.astype(np.int64) - np.int64(ids[0])
+        if ((ancestor_rows < 0) | (ancestor_rows >= len(ids))).any():
+            raise ValueError("ancestor_id values must refer to ids in trie")
+        return ancestor_rows
+
+    sorter = np.argsort(ids, kind="stable")
+    positions = np.searchsorted(ids, ancestor_ids, sorter=sorter)
+    ancestor_rows = sorter[np.minimum(positions, len(ids) - 1)]
+    if not np.array_equal(ids[ancestor_rows], ancestor_ids):
+        raise ValueError("ancestor_id values must refer to ids in trie")
+    return ancestor_rows
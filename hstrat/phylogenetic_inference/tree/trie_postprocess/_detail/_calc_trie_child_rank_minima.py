@@ -0,0 +1,52 @@
+import typing
+
+import numpy as np
+
+
+def calc_trie_child_rank_minima(
+    ancestor_rows: np.ndarray,
+    ranks: np.ndarray,
+) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Summarize ranks of each trie node's children, for vectorized
+    dataframe trie postprocessors.
+
+    Parameters
+    ----------
+    ancestor_rows : np.ndarray
+        Row position of each node's parent, equal to own row for root nodes.
+
+        See `calc_trie_ancestor_rows`.
+    ranks : np.ndarray
+        Node ranks.
+
+    Returns
+    -------
+    is_leaf : np.ndarray
+        Whether each node has no children.
+    min_child_rank : np.ndarray
+        Least rank among each node's children. Placeholder for leaves.
+    min_inner_child_rank : np.ndarray
+        Least rank among each node's non-leaf children, or `rank + 1` if
+        there are none (i.e., exclusive end of the node's origin interval).
+    """
+    ranks = np.asarray(ranks, dtype=np.int64)
+    is_child = ancestor_rows != np.arange(len(ancestor_rows))
+
+    is_leaf = np.ones(len(ancestor_rows), dtype=bool)
+    is_leaf[ancestor_rows[is_child]] = False
+
+    placeholder = np.iinfo(np.int64).max
+    min_child_rank = np.full(len(ancestor_rows), placeholder, dtype=np.int64)
+    np.minimum.at(min_child_rank, ancestor_rows[is_child], ranks[is_child])
+
+    is_inner_child = is_child & ~is_leaf
+    min_inner_child_rank = np.full_like(min_child_rank, placeholder)
+    np.minimum.at(
+        min_inner_child_rank,
+        ancestor_rows[is_inner_child],
+        ranks[is_inner_child],
+    )
+    has_no_inner_child = min_inner_child_rank == placeholder
+    min_inner_child_rank[has_no_inner_child] = ranks[has_no_inner_child] + 1
+
+    return is_leaf, min_child_rank, min_inner_child_rank
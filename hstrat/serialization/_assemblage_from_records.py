@@ -1,9 +1,11 @@
 import typing
 
+import opytional as opyt
+
 from ..frozen_instrumentation._HereditaryStratigraphicAssemblage import (
     HereditaryStratigraphicAssemblage,
 )
-from ._impl import col_records_from_pop_records
+from ._impl import col_records_from_pop_records, policy_from_record
 from ._specimen_from_records import specimen_from_records
 
 
@@ -37,7 +39,25 @@ def assemblage_from_records(
 
     col_records = col_records_from_pop_records(records, mutate=mutate)
 
+    # columns share a policy, so calculate all retained ranks in one call
+    # (policy record is not populated for empty populations)
+    policy = opyt.apply_if(records["policy"], policy_from_record)
+    if policy is None or policy.CalcRetainedRanksBatched is None:
+        return HereditaryStratigraphicAssemblage(
+            specimen_from_records(col_record)
+            for col_record in progress_wrap(col_records)
+        )
+
+    col_records = [*col_records]
+    offsets, ranks = policy.CalcRetainedRanksBatched(
+        [col_record["num_strata_deposited"] for col_record in col_records],
+    )
     return HereditaryStratigraphicAssemblage(
-        specimen_from_records(col_record)
-        for col_record in progress_wrap(col_records)
+        specimen_from_records(
+            col_record,
+            _retained_ranks=ranks[begin:end],
+        )
+        for col_record, begin, end in progress_wrap(
+            zip(col_records, offsets[:-1].tolist(), offsets[1:].tolist()),
+        )
     )
@@ -15,10 +15,22 @@ from ._unpack_differentiae_str import unpack_differentiae_str
 
 def specimen_from_records(
     records: typing.Dict,
+    *,
+    _retained_ranks: typing.Optional[np.ndarray] = None,
 ) -> HereditaryStratigraphicSpecimen:
     """Deserialize a `HereditaryStratigraphicSpecimen` from a dict composed of
     builtin data types.
 
+    Parameters
+    ----------
+    records : dict
+        Data to deserialize.
+    _retained_ranks : np.ndarray, optional
+        Precomputed retained ranks, skipping calculation from the record's
+        policy.
+
+        For internal use in bulk deserialization.
+
     See Also
     --------
     HereditaryStratigraphicSpecimen
@@ -37,7 +49,6 @@ def specimen_from_records(
             }"""
         )
 
-    policy = policy_from_record(records["policy"])
     differentia = numpy_fromiter_polyfill(
         unpack_differentiae_str(
             records["differentiae"],
@@ -45,10 +56,15 @@ def specimen_from_records(
         ),
         dtype=np.min_scalar_type(2 ** records["differentia_bit_width"] - 1),
     )
-    ranks = numpy_fromiter_polyfill(
-        policy.IterRetainedRanks(records["num_strata_deposited"]),
-        dtype=np.min_scalar_type(records["num_strata_deposited"] - 1),
-    )
+    ranks_dtype = np.min_scalar_type(records["num_strata_deposited"] - 1)
+    if _retained_ranks is None:
+        policy = policy_from_record(records["policy"])
+        ranks = numpy_fromiter_polyfill(
+            policy.IterRetainedRanks(records["num_strata_deposited"]),
+            dtype=ranks_dtype,
+        )
+    else:
+        ranks = _retained_ranks.astype(ranks_dtype)
     return HereditaryStratigraphicSpecimen(
         pd.Series(data=differentia, index=ranks),
         records["differentia_bit_width"],
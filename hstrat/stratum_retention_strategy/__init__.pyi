@@ -1,16 +1,20 @@
 from stratum_retention_algorithms import (
     UnsatisfiableParameterizationRequestError,
+    clear_gen_drop_ranks_cache,
     depth_proportional_resolution_algo,
     depth_proportional_resolution_tapered_algo,
     fixed_resolution_algo,
     geom_seq_nth_root_algo,
     geom_seq_nth_root_tapered_algo,
+    get_gen_drop_ranks_cache_info,
+    is_gen_drop_ranks_cache_enabled,
     nominal_resolution_algo,
     perfect_resolution_algo,
     provided_stratum_retention_algorithms,
     pseudostochastic_algo,
     recency_proportional_resolution_algo,
     recency_proportional_resolution_curbed_algo,
+    set_gen_drop_ranks_cache_maxsize,
     stochastic_algo,
 )
 from stratum_retention_policy_evaluators import (
@@ -44,6 +48,10 @@ __all__ = [
     "NumStrataRetainedExactEvaluator",
     "NumStrataRetainedUpperBoundEvaluator",
     "UnsatisfiableParameterizationRequestError",
+    "clear_gen_drop_ranks_cache",
+    "get_gen_drop_ranks_cache_info",
+    "is_gen_drop_ranks_cache_enabled",
+    "set_gen_drop_ranks_cache_maxsize",
     "depth_proportional_resolution_algo",
     "depth_proportional_resolution_tapered_algo",
     "fixed_resolution_algo",
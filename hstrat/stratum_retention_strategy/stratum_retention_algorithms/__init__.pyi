@@ -11,7 +11,13 @@ from . import (
     recency_proportional_resolution_curbed_algo,
     stochastic_algo,
 )
-from ._detail import UnsatisfiableParameterizationRequestError
+from ._detail import (
+    UnsatisfiableParameterizationRequestError,
+    clear_gen_drop_ranks_cache,
+    get_gen_drop_ranks_cache_info,
+    is_gen_drop_ranks_cache_enabled,
+    set_gen_drop_ranks_cache_maxsize,
+)
 from ._provided_stratum_retention_algorithms import (
     provided_stratum_retention_algorithms,
 )
@@ -19,6 +25,10 @@ from ._provided_stratum_retention_algorithms import (
 # adapted from https://stackoverflow.com/a/31079085
 __all__ = [
     "UnsatisfiableParameterizationRequestError",
+    "clear_gen_drop_ranks_cache",
+    "get_gen_drop_ranks_cache_info",
+    "is_gen_drop_ranks_cache_enabled",
+    "set_gen_drop_ranks_cache_maxsize",
     "depth_proportional_resolution_algo",
     "depth_proportional_resolution_tapered_algo",
     "fixed_resolution_algo",
@@ -0,0 +1,229 @@
+import collections
+import os
+import threading
+import typing
+
+from ._PolicyCouplerBase import PolicyCouplerBase
+
+
+class GenDropRanksCacheInfo(typing.NamedTuple):
+    """Hit/miss statistics for the shared drop ranks cache, in the style of
+    `functools.lru_cache`'s `cache_info`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self: "GenDropRanksCacheInfo") -> float:
+        """Fraction of lookups served from cache, or NaN if no lookups."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else float("nan")
+
+
+class _GenDropRanksCache:
+    """Bounded least-recently-used cache mapping (policy, number of strata
+    deposited) to the ranks dropped at that deposition.
+
+    Implementation detail. A single module-level instance is shared by all
+    policies. Disabled (maxsize zero) by default. Accesses are serialized by a lock, so the cache is safe to use
+    from multiple threads. Each process holds its own independent cache;
+    forked children inherit a snapshot of the parent's cache, and the lock is
+    reinitialized after fork.
+    """
+
+    _entries: typing.OrderedDict[typing.Hashable, typing.Tuple[int, ...]]
+    _hits: int
+    _lock: threading.Lock
+    _maxsize: int
+    _misses: int
+
+    def __init__(self: "_GenDropRanksCache", maxsize: int) -> None:
+        self._entries = collections.OrderedDict()
+        self._hits = 0
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._misses = 0
+
+    def IsEnabled(self: "_GenDropRanksCache") -> bool:
+        """Can entries be stored?
+
+        Unsynchronized read, so that disabled caching adds no locking cost.
+        """
+        return self._maxsize > 0
+
+    def _ReinitLock(self: "_GenDropRanksCache") -> None:
+        """Replace lock, which may have been held by another thread at fork."""
+        self._lock = threading.Lock()
+
+    def Get(
+        self: "_GenDropRanksCache", key: typing.Hashable
+    ) -> typing.Optional[typing.Tuple[int, ...]]:
+        """Look up cached drop ranks, returning None on a miss."""
+        with self._lock:
+            res = self._entries.get(key)
+            if res is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return res
+
+    def Put(
+        self: "_GenDropRanksCache",
+        key: typing.Hashable,
+        drop_ranks: typing.Tuple[int, ...],
+    ) -> None:
+        """Store drop ranks, evicting least-recently-used entries if full."""
+        with self._lock:
+            if self._maxsize <= 0:
+                return
+            self._entries[key] = drop_ranks
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def Clear(self: "_GenDropRanksCache") -> None:
+        """Discard all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def GetInfo(self: "_GenDropRanksCache") -> GenDropRanksCacheInfo:
+        """Report hit/miss statistics and occupancy."""
+        with self._lock:
+            return GenDropRanksCacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                maxsize=self._maxsize,
+                currsize=len(self._entries),
+            )
+
+    def SetMaxsize(self: "_GenDropRanksCache", maxsize: int) -> None:
+        """Change capacity, evicting least-recently-used entries if needed."""
+        if maxsize < 0:
+            raise ValueError(f"maxsize must be nonnegative, got {maxsize}")
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+
+_gen_drop_ranks_cache = _GenDropRanksCache(maxsize=0)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_gen_drop_ranks_cache._ReinitLock)
+
+
+class CachedGenDropRanks:
+    """Wraps a GenDropRanks functor to share results through the drop ranks
+    cache.
+
+    Results are keyed by functor type, policy spec representation, and number
+    of strata deposited, so columns under equivalent policies share cache
+    entries even if they hold distinct policy instances. Only suitable for
+    deterministic retention policies whose drop ranks are a function of the
+    number of strata deposited alone, ignoring `retained_ranks`. Functors
+    derived from a retention predicate, which only yield ranks from
+    `retained_ranks`, must not be wrapped.
+
+    If the cache is disabled after wrapping, calls are forwarded directly to
+    the wrapped functor.
+    """
+
+    _ftor: typing.Callable
+    _key: typing.Tuple[type, str]
+
+    def __init__(
+        self: "CachedGenDropRanks",
+        ftor: typing.Callable,
+        policy_spec: typing.Any,
+    ) -> None:
+        self._ftor = ftor
+        self._key = (type(ftor), repr(policy_spec))
+
+    def __eq__(self: "CachedGenDropRanks", other: typing.Any) -> bool:
+        return isinstance(other, self.__class__) and self._ftor == other._ftor
+
+    def __call__(
+        self: "CachedGenDropRanks",
+        policy: PolicyCouplerBase,
+        num_stratum_depositions_completed: int,
+        retained_ranks: typing.Optional[typing.Iterable[int]],
+    ) -> typing.Iterator[int]:
+        """Forwards to wrapped functor on cache miss."""
+        if not _gen_drop_ranks_cache.IsEnabled():
+            return self._ftor(
+                policy,
+                num_stratum_depositions_completed,
+                retained_ranks,
+            )
+
+        key = (*self._key, num_stratum_depositions_completed)
+        res = _gen_drop_ranks_cache.Get(key)
+        if res is None:
+            res = tuple(
+                self._ftor(
+                    policy,
+                    num_stratum_depositions_completed,
+                    retained_ranks,
+                ),
+            )
+            _gen_drop_ranks_cache.Put(key, res)
+
+        return iter(res)
+
+
+def clear_gen_drop_ranks_cache() -> None:
+    """Discard all entries from the drop ranks cache shared among stratum
+    retention policies and reset its hit/miss statistics."""
+    _gen_drop_ranks_cache.Clear()
+
+
+def is_gen_drop_ranks_cache_enabled() -> bool:
+    """Is the drop ranks cache shared among stratum retention policies
+    enabled?
+
+    Only policy instances constructed while the cache is enabled use it.
+    """
+    return _gen_drop_ranks_cache.IsEnabled()
+
+
+def get_gen_drop_ranks_cache_info() -> GenDropRanksCacheInfo:
+    """Get hit/miss statistics for the drop ranks cache shared among stratum
+    retention policies.
+
+    Returns
+    -------
+    GenDropRanksCacheInfo
+        Named tuple with fields `hits`, `misses`, `maxsize`, and `currsize`,
+        as well as a `hit_rate` property.
+
+    Notes
+    -----
+    Statistics are per-process.
+    """
+    return _gen_drop_ranks_cache.GetInfo()
+
+
+def set_gen_drop_ranks_cache_maxsize(maxsize: int) -> None:
+    """Bound the number of entries held in the drop ranks cache shared among
+    stratum retention policies.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of (policy, number of strata deposited) entries to
+        retain. Least-recently-used entries are evicted first. Zero disables
+        caching.
+
+    Notes
+    -----
+    Caching is disabled by default. It pays off when many columns under
+    equivalent policies deposit strata at the same ranks, such as in
+    synchronous-generation simulations, but adds overhead for lone columns.
+    Only policy instances constructed while caching is enabled (nonzero
+    maxsize) use the cache.
+    """
+    _gen_drop_ranks_cache.SetMaxsize(maxsize)
@@ -10,6 +10,14 @@ from .._impl import (
     CalcMrcaUncertaintyRelUpperBoundPessimalRankBruteForce,
     CalcMrcaUncertaintyRelUpperBoundWorstCase,
     CalcNumStrataRetainedUpperBoundWorstCase,
+    CalcRetainedRanksBatchedFromIterRetainedRanks,
+)
+from .._impl._GenDropRanksFromPredKeepRank import (
+    _GenDropRanksFromPredKeepRankBase,
+)
+from ._GenDropRanksCache import (
+    CachedGenDropRanks,
+    is_gen_drop_ranks_cache_enabled,
 )
 from ._PolicyCouplerBase import PolicyCouplerBase
 from ._PolicySpecBase import PolicySpecBase
@@ -66,9 +74,27 @@ def PolicyCouplerFactory(
     calc_num_strata_retained_exact_ftor_t: typing.Optional[_ftor_type] = None,
     calc_rank_at_column_index_ftor_t: typing.Optional[_ftor_type] = None,
     iter_retained_ranks_ftor_t: typing.Optional[_ftor_type] = None,
+    calc_retained_ranks_batched_ftor_t: typing.Optional[_ftor_type] = None,
+    # caching
+    cache_gen_drop_ranks: bool = True,
 ) -> typing.Type[typing.Callable]:
     """Joins policy implementation functors into a single class that can be
-    instantiated with particular policy specification parameters."""
+    instantiated with particular policy specification parameters.
+
+    If `calc_retained_ranks_batched_ftor_t` is not provided but
+    `iter_retained_ranks_ftor_t` is, a generic CalcRetainedRanksBatched
+    implementation that delegates to IterRetainedRanks is used.
+
+    If `cache_gen_drop_ranks` is set, GenDropRanks results of policy instances
+    constructed while the cache is enabled (see
+    `set_gen_drop_ranks_cache_maxsize`) are shared across columns through a
+    bounded LRU cache keyed on policy spec and number of strata deposited.
+    Policy instances constructed while the cache is disabled, the default,
+    call GenDropRanks directly with no caching overhead. Must be disabled for policies that do not drop the same ranks from every
+    column with the same number of strata deposited. GenDropRanks functors
+    derived from a retention predicate are never cached, as their results
+    depend on the retained ranks passed in.
+    """
     policy_spec_t_ = policy_spec_t
 
     class PolicyCoupler(
@@ -94,6 +120,7 @@ def PolicyCouplerFactory(
         CalcNumStrataRetainedExact: typing.Optional[typing.Callable]
         CalcRankAtColumnIndex: typing.Optional[typing.Callable]
         IterRetainedRanks: typing.Optional[typing.Callable]
+        CalcRetainedRanksBatched: typing.Optional[typing.Callable]
 
         # enactment
         GenDropRanks: typing.Callable
@@ -135,10 +162,19 @@ def PolicyCouplerFactory(
                 self._policy_spec = policy_spec_t_(*args, **kwargs)
 
             # enactment
-            self.GenDropRanks = _CurryPolicy(
-                self,
-                gen_drop_ranks_ftor_t(self._policy_spec),
-            )
+            gen_drop_ranks_ftor = gen_drop_ranks_ftor_t(self._policy_spec)
+            if (
+                cache_gen_drop_ranks
+                and is_gen_drop_ranks_cache_enabled()
+                and not isinstance(
+                    gen_drop_ranks_ftor, _GenDropRanksFromPredKeepRankBase
+                )
+            ):
+                gen_drop_ranks_ftor = CachedGenDropRanks(
+                    gen_drop_ranks_ftor,
+                    self._policy_spec,
+                )
+            self.GenDropRanks = _CurryPolicy(self, gen_drop_ranks_ftor)
 
             # invariants
             self.CalcMrcaUncertaintyAbsUpperBound = _CurryPolicy(
@@ -203,6 +239,15 @@ def PolicyCouplerFactory(
                 iter_retained_ranks_ftor_t,
                 lambda x: _CurryPolicy(self, x(self._policy_spec)),
             )
+            # fall back to generic implementation via IterRetainedRanks
+            self.CalcRetainedRanksBatched = opyt.apply_if(
+                calc_retained_ranks_batched_ftor_t
+                or (
+                    iter_retained_ranks_ftor_t
+                    and CalcRetainedRanksBatchedFromIterRetainedRanks
+                ),
+                lambda x: _CurryPolicy(self, x(self._policy_spec)),
+            )
 
         def __eq__(
             self: "PolicyCoupler",
@@ -227,6 +272,7 @@ def PolicyCouplerFactory(
                     self.CalcNumStrataRetainedExact,
                     self.CalcRankAtColumnIndex,
                     self.IterRetainedRanks,
+                    self.CalcRetainedRanksBatched,
                 ) == (
                     other._policy_spec,
                     other.GenDropRanks,
@@ -242,6 +288,7 @@ def PolicyCouplerFactory(
                     other.CalcNumStrataRetainedExact,
                     other.CalcRankAtColumnIndex,
                     other.IterRetainedRanks,
+                    other.CalcRetainedRanksBatched,
                 )
             else:
                 return False
@@ -300,6 +347,9 @@ def PolicyCouplerFactory(
                 calc_num_strata_retained_exact_ftor_t=calc_num_strata_retained_exact_ftor_t,
                 calc_rank_at_column_index_ftor_t=None,
                 iter_retained_ranks_ftor_t=iter_retained_ranks_ftor_t,
+                calc_retained_ranks_batched_ftor_t=calc_retained_ranks_batched_ftor_t,
+                # caching
+                cache_gen_drop_ranks=cache_gen_drop_ranks,
             )
 
             # propagate any glossing over over implementation details
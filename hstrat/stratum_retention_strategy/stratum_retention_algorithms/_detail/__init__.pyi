@@ -1,3 +1,11 @@
+from ._GenDropRanksCache import (
+    CachedGenDropRanks,
+    GenDropRanksCacheInfo,
+    clear_gen_drop_ranks_cache,
+    get_gen_drop_ranks_cache_info,
+    is_gen_drop_ranks_cache_enabled,
+    set_gen_drop_ranks_cache_maxsize,
+)
 from ._PolicyCouplerBase import PolicyCouplerBase
 from ._PolicyCouplerFactory import PolicyCouplerFactory
 from ._PolicySpecBase import PolicySpecBase
@@ -6,8 +14,14 @@ from ._UnsatisfiableParameterizationRequestError import (
 )
 
 __all__ = [
+    "CachedGenDropRanks",
+    "GenDropRanksCacheInfo",
     "PolicyCouplerBase",
     "PolicyCouplerFactory",
     "PolicySpecBase",
     "UnsatisfiableParameterizationRequestError",
+    "clear_gen_drop_ranks_cache",
+    "get_gen_drop_ranks_cache_info",
+    "is_gen_drop_ranks_cache_enabled",
+    "set_gen_drop_ranks_cache_maxsize",
 ]
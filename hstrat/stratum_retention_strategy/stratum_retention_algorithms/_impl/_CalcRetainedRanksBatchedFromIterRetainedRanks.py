@@ -0,0 +1,76 @@
+import typing
+
+import numpy as np
+
+from .._detail._PolicyCouplerBase import PolicyCouplerBase
+
+
+class CalcRetainedRanksBatchedFromIterRetainedRanks:
+    """Generic batched retained ranks calculation, for policies without a
+    closed-form vectorized implementation.
+
+    Calls `IterRetainedRanks` once per distinct number of strata deposited,
+    then gathers results into a CSR layout with vectorized operations.
+    """
+
+    def __init__(
+        self: "CalcRetainedRanksBatchedFromIterRetainedRanks",
+        policy_spec: typing.Optional[typing.Any] = None,
+    ) -> None:
+        pass
+
+    def __eq__(
+        self: "CalcRetainedRanksBatchedFromIterRetainedRanks",
+        other: typing.Any,
+    ) -> bool:
+        return isinstance(other, self.__class__)
+
+    def __call__(
+        self: "CalcRetainedRanksBatchedFromIterRetainedRanks",
+        policy: PolicyCouplerBase,
+        num_strata_deposited: np.ndarray,
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """Calculate retained strata ranks for each of several numbers of
+        strata deposited.
+
+        Parameters
+        ----------
+        num_strata_deposited : array_like of int
+            Number of strata deposited, for each query.
+
+        Returns
+        -------
+        offsets : np.ndarray
+            Integer array of length `len(num_strata_deposited) + 1`. Ranks
+            retained for query i are `ranks[offsets[i]:offsets[i + 1]]`.
+        ranks : np.ndarray
+            Integer array of retained ranks for all queries, concatenated, in
+            ascending order within each query.
+        """
+        num_strata_deposited = np.asarray(num_strata_deposited, dtype=np.int64)
+        unique_num_deposited, inverse = np.unique(
+            num_strata_deposited, return_inverse=True
+        )
+        unique_ranks = [
+            np.fromiter(policy.IterRetainedRanks(n), dtype=np.int64)
+            for n in unique_num_deposited.tolist()
+        ]
+        unique_counts = np.fromiter(
+            map(len, unique_ranks), dtype=np.int64, count=len(unique_ranks)
+        )
+        unique_offsets = np.zeros(len(unique_ranks) + 1, dtype=np.int64)
+        np.cumsum(unique_counts, out=unique_offsets[1:])
+
+        # gather, for each query, its distinct count's ranks
+        counts = unique_counts[inverse]
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        # position of each output element within its own query's ranks
+        within = np.arange(offsets[-1], dtype=np.int64) - np.repeat(
+            offsets[:-1], counts
+        )
+        source_starts = np.repeat(unique_offsets[:-1][inverse], counts)
+        source_ranks = np.concatenate(
+            [np.empty(0, dtype=np.int64), *unique_ranks]
+        )
+        return offsets, source_ranks[source_starts + within]
@@ -22,6 +22,9 @@ from ._CalcMrcaUncertaintyRelUpperBoundWorstCase import (
 from ._CalcNumStrataRetainedUpperBoundWorstCase import (
     CalcNumStrataRetainedUpperBoundWorstCase,
 )
+from ._CalcRetainedRanksBatchedFromIterRetainedRanks import (
+    CalcRetainedRanksBatchedFromIterRetainedRanks,
+)
 from ._GenDropRanksFromPredKeepRank import GenDropRanksFromPredKeepRank
 
 __all__ = [
@@ -33,5 +36,6 @@ __all__ = [
     "CalcMrcaUncertaintyAbsUpperBoundWorstCase",
     "CalcMrcaUncertaintyRelUpperBoundWorstCase",
     "CalcNumStrataRetainedUpperBoundWorstCase",
+    "CalcRetainedRanksBatchedFromIterRetainedRanks",
     "GenDropRanksFromPredKeepRank",
 ]
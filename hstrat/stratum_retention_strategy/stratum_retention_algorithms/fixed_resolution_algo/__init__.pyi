@@ -27,6 +27,7 @@ from ._scry._CalcMrcaUncertaintyAbsExact import CalcMrcaUncertaintyAbsExact
 from ._scry._CalcMrcaUncertaintyRelExact import CalcMrcaUncertaintyRelExact
 from ._scry._CalcNumStrataRetainedExact import CalcNumStrataRetainedExact
 from ._scry._CalcRankAtColumnIndex import CalcRankAtColumnIndex
+from ._scry._CalcRetainedRanksBatched import CalcRetainedRanksBatched
 from ._scry._IterRetainedRanks import IterRetainedRanks
 
 __all__ = [
@@ -41,6 +42,7 @@ __all__ = [
     "CalcNumStrataRetainedExact",
     "CalcNumStrataRetainedUpperBound",
     "CalcRankAtColumnIndex",
+    "CalcRetainedRanksBatched",
     "GenDropRanks",
     "_GenDropRanks_impls",
     "IterRetainedRanks",
@@ -0,0 +1,51 @@
+import typing
+
+import numpy as np
+
+from ..._detail import PolicyCouplerBase
+from .._PolicySpec import PolicySpec
+
+
+class CalcRetainedRanksBatched:
+    """Functor to provide member function implementation in Policy class."""
+
+    def __init__(
+        self: "CalcRetainedRanksBatched",
+        policy_spec: typing.Optional[PolicySpec],
+    ) -> None:
+        pass
+
+    def __eq__(self: "CalcRetainedRanksBatched", other: typing.Any) -> bool:
+        return isinstance(other, self.__class__)
+
+    def __call__(
+        self: "CalcRetainedRanksBatched",
+        policy: PolicyCouplerBase,
+        num_strata_deposited: np.ndarray,
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """Calculate retained strata ranks for each of several numbers of
+        strata deposited, as a CSR-style `(offsets, ranks)` pair.
+
+        Ranks retained at `num_strata_deposited[i]` are
+        `ranks[offsets[i]:offsets[i + 1]]`, in ascending order.
+        """
+        spec = policy.GetSpec()
+        resolution = spec.GetFixedResolution()
+        num_strata_deposited = np.asarray(num_strata_deposited, dtype=np.int64)
+
+        # multiples of resolution, plus last rank if not a multiple
+        last_ranks = num_strata_deposited - 1
+        has_extra_last_rank = (last_ranks > 0) & (last_ranks % resolution != 0)
+        counts = -(-num_strata_deposited // resolution) + has_extra_last_rank
+
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        # position of each output element within its own query
+        within = np.arange(offsets[-1], dtype=np.int64) - np.repeat(
+            offsets[:-1], counts
+        )
+        ranks = within * resolution
+        ranks[offsets[1:][has_extra_last_rank] - 1] = last_ranks[
+            has_extra_last_rank
+        ]
+        return offsets, ranks
@@ -0,0 +1,43 @@
+import typing
+
+import numpy as np
+
+from ..._detail import PolicyCouplerBase
+from .._PolicySpec import PolicySpec
+
+
+class CalcRetainedRanksBatched:
+    """Functor to provide member function implementation in Policy class."""
+
+    def __init__(
+        self: "CalcRetainedRanksBatched",
+        policy_spec: typing.Optional[PolicySpec],
+    ) -> None:
+        pass
+
+    def __eq__(self: "CalcRetainedRanksBatched", other: typing.Any) -> bool:
+        return isinstance(other, self.__class__)
+
+    def __call__(
+        self: "CalcRetainedRanksBatched",
+        policy: typing.Optional[PolicyCouplerBase],
+        num_strata_deposited: np.ndarray,
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """Calculate retained strata ranks for each of several numbers of
+        strata deposited, as a CSR-style `(offsets, ranks)` pair.
+
+        Ranks retained at `num_strata_deposited[i]` are
+        `ranks[offsets[i]:offsets[i + 1]]`, in ascending order.
+        """
+        num_strata_deposited = np.asarray(num_strata_deposited, dtype=np.int64)
+
+        # first and last ranks are retained
+        counts = np.minimum(num_strata_deposited, 2)
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        # position of each output element within its own query, 0 or 1
+        within = np.arange(offsets[-1], dtype=np.int64) - np.repeat(
+            offsets[:-1], counts
+        )
+        ranks = within * np.repeat(num_strata_deposited - 1, counts)
+        return offsets, ranks
@@ -26,6 +26,7 @@ from ._scry._CalcMrcaUncertaintyAbsExact import CalcMrcaUncertaintyAbsExact
 from ._scry._CalcMrcaUncertaintyRelExact import CalcMrcaUncertaintyRelExact
 from ._scry._CalcNumStrataRetainedExact import CalcNumStrataRetainedExact
 from ._scry._CalcRankAtColumnIndex import CalcRankAtColumnIndex
+from ._scry._CalcRetainedRanksBatched import CalcRetainedRanksBatched
 from ._scry._IterRetainedRanks import IterRetainedRanks
 
 Policy = PolicyCouplerFactory(
@@ -46,6 +47,7 @@ Policy = PolicyCouplerFactory(
     calc_num_strata_retained_exact_ftor_t=CalcNumStrataRetainedExact,
     calc_rank_at_column_index_ftor_t=CalcRankAtColumnIndex,
     iter_retained_ranks_ftor_t=IterRetainedRanks,
+    calc_retained_ranks_batched_ftor_t=CalcRetainedRanksBatched,
 )
 
 # gloss away PolicyCoupler implementation details
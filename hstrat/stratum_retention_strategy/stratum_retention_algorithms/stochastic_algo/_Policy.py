@@ -46,6 +46,9 @@ Policy = PolicyCouplerFactory(
     calc_num_strata_retained_exact_ftor_t=CalcNumStrataRetainedExact,
     calc_rank_at_column_index_ftor_t=CalcRankAtColumnIndex,
     iter_retained_ranks_ftor_t=IterRetainedRanks,
+    # caching
+    # drop ranks are drawn at random, so may differ between columns
+    cache_gen_drop_ranks=False,
 )
 
 # gloss away PolicyCoupler implementation details
@@ -0,0 +1,32 @@
+import more_itertools as mit
+import pytest
+
+from hstrat._auxiliary_lib import log_disk_usage
+
+
+@pytest.fixture(autouse=True)
+def _set_log_disk_env(monkeypatch):
+    monkeypatch.setenv("HSTRAT_LOG_DISK_USAGE", "1")
+
+
+def test_log_disk_usage(tmp_path):
+    (tmp_path / "a.arrow").write_bytes(b"x" * 2**20)
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "c.arrow").write_bytes(b"x" * 2**20)
+    message = []
+    log_disk_usage(str(tmp_path), message.append)
+    assert "2.0 MiB in 2 file(s)" in mit.one(message)
+    assert "free" in mit.one(message)
+
+
+def test_log_disk_usage_missing(tmp_path):
+    message = []
+    log_disk_usage(str(tmp_path / "missing"), message.append)
+    assert "failed" in mit.one(message)
+
+
+def test_log_disk_usage_disabled(monkeypatch, tmp_path):
+    monkeypatch.delenv("HSTRAT_LOG_DISK_USAGE", raising=False)
+    message = []
+    log_disk_usage(str(tmp_path), message.append)
+    assert len(message) == 0
@@ -5,7 +5,7 @@ from phyloframe import legacy as pfl
 import polars as pl
 import pytest
 
-from hstrat.dataframe import surface_build_tree
+from hstrat.dataframe import surface_build_tree, surface_test_drive
 from hstrat.dataframe.surface_build_tree import _create_parser
 from hstrat.phylogenetic_inference.tree.trie_postprocess import (
     AssignOriginTimeNodeRankTriePostprocessor,
@@ -192,3 +192,63 @@ def test_single_genome_no_delete_trunk():
         pfl.alifestd_try_add_ancestor_list_col(res.to_pandas()),
     )
     assert pfl.alifestd_is_chronologically_ordered(res.to_pandas())
+
+
+def _make_multi_founder_population(num_founders: int) -> pl.DataFrame:
+    tree = pfl.alifestd_make_balanced_bifurcating(5)
+    tree = pfl.alifestd_try_add_ancestor_id_col(tree)
+    return pl.concat(  # test drive founders independently
+        surface_test_drive(
+            pl.from_pandas(tree).drop("ancestor_list"),
+            dstream_algo="dstream.steady_algo",
+            dstream_S=16,
+            stratum_differentia_bit_width=8,
+        )
+        for __ in range(num_founders)
+    )
+
+
+def _get_clades(df: pl.DataFrame) -> set:
+    """Get set of (rank, leaf data ids) for each node, independent of node
+    ordering and id assignment."""
+    leaves = {id_: set() for id_ in df["id"]}
+    for id_, ancestor_id, data_id in reversed(
+        df.select("id", "ancestor_id", "dstream_data_id").rows(),
+    ):
+        if data_id is not None:
+            leaves[id_].add(data_id)
+        if ancestor_id != id_:
+            leaves[ancestor_id] |= leaves[id_]
+    ranks = dict(zip(df["id"], df["hstrat_rank"]))
+    return {(ranks[id_], frozenset(ids)) for id_, ids in leaves.items()}
+
+
+def test_partition_by_founder():
+    df = _make_multi_founder_population(3)
+    expected = surface_build_tree(df)
+    for partition_pool_size in 1, 2:
+        actual = surface_build_tree(
+            df,
+            partition_by_founder=True,
+            partition_pool_size=partition_pool_size,
+        )
+        assert pfl.alifestd_validate(
+            pfl.alifestd_try_add_ancestor_list_col(actual.to_pandas()),
+        )
+        assert actual.schema == expected.schema
+        assert len(actual) == len(expected)
+        assert actual["id"].to_list() == [*range(len(actual))]
+        assert (actual["id"] == actual["ancestor_id"]).sum() == 3
+        assert _get_clades(actual) == _get_clades(expected)
+
+
+def test_partition_by_founder_empty():
+    df = pl.read_csv(f"{assets_path}/packed.csv").head(0)
+    res = surface_build_tree(df, partition_by_founder=True)
+    assert len(res) == 0
+
+
+def test_partition_by_founder_requires_delete_trunk():
+    df = pl.read_csv(f"{assets_path}/packed.csv")
+    with pytest.raises(ValueError):
+        surface_build_tree(df, partition_by_founder=True, delete_trunk=False)
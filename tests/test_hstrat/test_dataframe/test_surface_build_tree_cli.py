@@ -85,6 +85,26 @@ def test_surface_build_tree_cli_shuffle_over_same_T_seed():
     assert os.path.exists(output_file)
 
 
+def test_surface_build_tree_cli_partition_by_founder():
+    """Smoke test for --partition-by-founder on build tree CLI."""
+    output_file = "/tmp/hstrat_surface_build_tree_partition.csv"  # nosec B108
+    pathlib.Path(output_file).unlink(missing_ok=True)
+    subprocess.run(  # nosec B603
+        [
+            "python3",
+            "-m",
+            "hstrat.dataframe.surface_build_tree",
+            output_file,
+            "--partition-by-founder",
+            "--partition-pool-size",
+            "2",
+        ],
+        check=True,
+        input=f"{assets}/packed.csv".encode(),
+    )
+    assert os.path.exists(output_file)
+
+
 def test_surface_build_tree_cli_no_drop_dstream_metadata():
     output_file = "/tmp/hstrat_surface_build_tree_no_drop.pqt"  # nosec B108
     pathlib.Path(output_file).unlink(missing_ok=True)
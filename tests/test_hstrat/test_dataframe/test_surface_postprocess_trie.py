@@ -1,14 +1,24 @@
 import os
+import typing
 
 from downstream import dstream, dsurf
+import numpy as np
 from phyloframe import legacy as pfl
 import polars as pl
+import pytest
 
 from hstrat import hstrat
 from hstrat.dataframe import (
     surface_postprocess_trie,
     surface_unpack_reconstruct,
 )
+from hstrat.dataframe._surface_postprocess_trie import (
+    _do_collapse_unifurcations,
+    _do_delete_trunk,
+    _get_validation_mode,
+    _sample_lineages,
+    _validate_structure,
+)
 from hstrat.phylogenetic_inference.tree.trie_postprocess import (
     AssignOriginTimeNodeRankTriePostprocessor,
 )
@@ -33,6 +43,40 @@ def test_smoke():
     assert pfl.alifestd_is_chronologically_ordered(res.to_pandas())
 
 
+@pytest.mark.parametrize(
+    "trie_postprocessor",
+    [
+        hstrat.AssignOriginTimeNaiveTriePostprocessor(),
+        hstrat.AssignOriginTimeExpectedValueTriePostprocessor(
+            prior=hstrat.ArbitraryPrior(),
+        ),
+        hstrat.CompoundTriePostprocessor(
+            [
+                hstrat.PeelBackConjoinedLeavesTriePostprocessor(),
+                hstrat.AssignOriginTimeNaiveTriePostprocessor(),
+                hstrat.AssignDestructionTimeYoungestPlusOneTriePostprocessor(),
+            ],
+        ),
+        hstrat.CompoundTriePostprocessor(
+            [
+                hstrat.SampleAncestralRollbacksTriePostprocessor(seed=1),
+                hstrat.AssignOriginTimeExpectedValueTriePostprocessor(
+                    prior=hstrat.ArbitraryPrior(),
+                ),
+            ],
+        ),
+    ],
+)
+def test_smoke_trie_postprocessors(trie_postprocessor: typing.Callable):
+    df = pl.read_csv(f"{assets_path}/packed.csv")
+    raw = surface_unpack_reconstruct(df)
+    res = surface_postprocess_trie(raw, trie_postprocessor=trie_postprocessor)
+    assert "origin_time" in res.columns
+    assert pfl.alifestd_validate(
+        pfl.alifestd_try_add_ancestor_list_col(res.to_pandas()),
+    )
+
+
 def test_dstream_rank_in_unpack_reconstruct():
     """dstream_rank should be present after surface_unpack_reconstruct."""
     df = pl.read_csv(f"{assets_path}/packed.csv")
@@ -125,3 +169,179 @@ def test_zero_generations_elapsed():
     assert pfl.alifestd_validate(
         pfl.alifestd_try_add_ancestor_list_col(res.to_pandas()),
     )
+
+
+@pytest.mark.parametrize("num_rows", [1, 2, 10, 200])
+@pytest.mark.parametrize("id_space", [1, 10, 10**12])
+@pytest.mark.parametrize("seed", range(3))
+def test_collapse_unifurcations_fused(num_rows: int, id_space: int, seed: int):
+    rng = np.random.default_rng(seed)
+    ids = np.sort(
+        rng.choice(num_rows * id_space, size=num_rows, replace=False)
+    ).astype(np.uint64)
+    ancestor_rows = [0, *(rng.integers(0, i) for i in range(1, num_rows))]
+    df = pl.DataFrame(
+        {
+            "id": ids,
+            "ancestor_id": ids[ancestor_rows],
+            "payload": np.arange(num_rows),
+        }
+    )
+
+    expected = pfl.alifestd_assign_contiguous_ids_polars(
+        pfl.alifestd_collapse_unifurcations_polars(
+            pfl.alifestd_assign_contiguous_ids_polars(df),
+        ),
+    )
+    actual = _do_collapse_unifurcations(df)
+    for column in "id", "ancestor_id", "payload":
+        assert actual[column].to_list() == expected[column].to_list()
+
+
+def test_collapse_unifurcations_fused_not_topologically_sorted():
+    df = pl.DataFrame(
+        {"id": [0, 1, 2], "ancestor_id": [1, 1, 0]},
+        schema={"id": pl.UInt64, "ancestor_id": pl.UInt64},
+    )
+    with pytest.raises(NotImplementedError):
+        _do_collapse_unifurcations(df)
+
+
+@pytest.mark.parametrize("num_rows", [1, 2, 10, 200])
+@pytest.mark.parametrize("id_space", [1, 10**12])
+@pytest.mark.parametrize("dstream_S", [0, 1, 4])
+@pytest.mark.parametrize("seed", range(3))
+def test_delete_trunk_fused(
+    num_rows: int, id_space: int, dstream_S: int, seed: int
+):
+    rng = np.random.default_rng(seed)
+    ids = rng.choice(num_rows * id_space, size=num_rows, replace=False)
+    ancestor_rows = [
+        i if rng.random() < 0.1 else rng.integers(0, max(i, 1))
+        for i in range(num_rows)
+    ]
+    ranks = np.zeros(num_rows, dtype=np.uint64)
+    for i, ancestor_row in enumerate(ancestor_rows):
+        if ancestor_row != i:
+            ranks[i] = ranks[ancestor_row] + rng.integers(0, 3)
+    order = rng.permutation(num_rows)  # not topologically sorted
+    df = pl.DataFrame(
+        {
+            "id": pl.Series(ids[order], dtype=pl.UInt64),
+            "ancestor_id": pl.Series(
+                ids[np.array(ancestor_rows)[order]], dtype=pl.UInt64
+            ),
+            "dstream_rank": pl.Series(ranks[order], dtype=pl.UInt64),
+            "dstream_S": pl.Series([dstream_S] * num_rows, dtype=pl.UInt32),
+            "payload": order,
+        }
+    )
+
+    expected = pfl.alifestd_assign_contiguous_ids_polars(df).with_columns(
+        is_trunk=pl.col("dstream_rank") < dstream_S - 1,
+        origin_time=pl.col("dstream_rank"),
+    )
+    expected = pfl.alifestd_delete_trunk_asexual_polars(expected)
+    if not expected.is_empty():
+        expected = pfl.alifestd_prefix_roots_polars(
+            pfl.alifestd_assign_contiguous_ids_polars(expected),
+            allow_id_reassign=True,
+            origin_time=dstream_S,
+        )
+    expected = expected.drop("is_trunk", "ancestor_is_trunk", "origin_time")
+
+    actual = _do_delete_trunk(df)
+    assert actual.columns == expected.columns
+    for column in expected.columns:
+        assert actual[column].to_list() == expected[column].to_list()
+
+
+def test_delete_trunk_fused_noncontiguous():
+    df = pl.DataFrame(
+        {
+            "id": [0, 1, 2],
+            "ancestor_id": [0, 0, 1],
+            "dstream_rank": [0, 5, 1],
+            "dstream_S": [4, 4, 4],
+        },
+        schema={
+            "id": pl.UInt64,
+            "ancestor_id": pl.UInt64,
+            "dstream_rank": pl.UInt64,
+            "dstream_S": pl.UInt32,
+        },
+    )
+    with pytest.raises(ValueError):
+        _do_delete_trunk(df)
+
+
+def test_get_validation_mode(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("HSTRAT_SURFACE_POSTPROCESS_VALIDATE", raising=False)
+    assert _get_validation_mode() == "sample"  # unit test detected
+
+    for mode in "full", "sample", "none":
+        monkeypatch.setenv("HSTRAT_SURFACE_POSTPROCESS_VALIDATE", mode)
+        assert _get_validation_mode() == mode
+
+    monkeypatch.setenv("HSTRAT_SURFACE_POSTPROCESS_VALIDATE", "1")
+    with pytest.raises(ValueError):
+        _get_validation_mode()
+
+
+@pytest.mark.parametrize("budget", [0, 1, 5, 1000])
+@pytest.mark.parametrize("seed", range(3))
+def test_sample_lineages(budget: int, seed: int):
+    rng = np.random.default_rng(seed)
+    num_rows = 200
+    ancestor_rows = [0, *(rng.integers(0, i) for i in range(1, num_rows))]
+    df = pl.DataFrame(
+        {
+            "id": np.arange(num_rows) * 3,
+            "ancestor_id": np.array(ancestor_rows) * 3,
+        },
+    )
+    is_leaf = ~df["id"].is_in(df["ancestor_id"])
+
+    sample = _sample_lineages(df, budget, rng)
+    sample_ids = {*sample["id"]}
+    assert sample["id"].is_in(df["id"]).all()
+    assert sample["ancestor_id"].is_in(sample["id"]).all()  # closed
+    assert sample["id"].is_sorted()  # row order retained
+    num_sampled_leaves = (~sample["id"].is_in(sample["ancestor_id"])).sum()
+    assert num_sampled_leaves == min(budget, is_leaf.sum())
+    assert sample_ids <= {*df.filter(is_leaf)["id"]} | {*df["ancestor_id"]}
+
+
+def test_validate_structure():
+    raw = pl.read_csv(f"{assets_path}/trie_long.csv")
+    result = surface_postprocess_trie(raw)
+    _validate_structure(raw, result, delete_trunk=True)
+
+    with pytest.raises(AssertionError):
+        _validate_structure(raw, result[1:], delete_trunk=True)
+    with pytest.raises(AssertionError):
+        _validate_structure(
+            raw,
+            result.with_columns(hstrat_rank=-pl.col("hstrat_rank")),
+            delete_trunk=True,
+        )
+    with pytest.raises(AssertionError):
+        _validate_structure(raw, pl.concat([result, result]), True)
+
+
+@pytest.mark.parametrize("mode", ["full", "sample", "none"])
+@pytest.mark.parametrize("budget", [1, 32])
+def test_validation_modes(
+    monkeypatch: pytest.MonkeyPatch, mode: str, budget: int
+):
+    monkeypatch.setenv("HSTRAT_SURFACE_POSTPROCESS_VALIDATE", mode)
+    monkeypatch.setenv(
+        "HSTRAT_SURFACE_POSTPROCESS_VALIDATE_BUDGET", str(budget)
+    )
+    df = pl.read_csv(f"{assets_path}/packed.csv")
+    raw = surface_unpack_reconstruct(df)
+    res = surface_postprocess_trie(
+        raw,
+        trie_postprocessor=hstrat.AssignOriginTimeNaiveTriePostprocessor(),
+    )
+    assert "origin_time" in res.columns
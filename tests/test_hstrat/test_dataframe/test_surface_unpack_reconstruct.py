@@ -1,10 +1,15 @@
+from multiprocessing.pool import ThreadPool
 import os
 import re
+import typing
 
+from downstream import dataframe as dstream_dataframe
+import numpy as np
 from phyloframe import legacy as pfl
 import polars as pl
 import pytest
 
+from hstrat.dataframe import _surface_unpack_reconstruct as impl
 from hstrat.dataframe import surface_unpack_reconstruct
 from hstrat.dataframe.surface_unpack_reconstruct import _create_parser
 
@@ -41,6 +46,15 @@ def test_mp_pool_size(mp_pool_size: int):
     )
 
 
+def test_num_threads():
+    df = pl.read_csv(f"{assets_path}/packed.csv")
+    serial = surface_unpack_reconstruct(df, exploded_slice_size=10)
+    threaded = surface_unpack_reconstruct(
+        df, exploded_slice_size=10, num_threads=4
+    )
+    assert serial.equals(threaded)
+
+
 def test_drop_dstream_metadata_default():
     """Default behavior (None) should drop dstream/downstream columns."""
     df = pl.read_csv(f"{assets_path}/packed.csv")
@@ -154,3 +168,361 @@ def test_drop_dstream_metadata_false():
     }
     # all original dstream columns should be present in output
     assert input_dstream_cols <= output_dstream_cols
+
+
+@pytest.mark.parametrize("check_trie_invariant_full", [False, True])
+def test_check_trie_invariant(check_trie_invariant_full: bool):
+    df = pl.read_csv(f"{assets_path}/packed.csv")
+    expected = surface_unpack_reconstruct(df, exploded_slice_size=1)
+    res = surface_unpack_reconstruct(
+        df,
+        check_trie_invariant_after_collapse_unif=True,
+        check_trie_invariant_freq=1,
+        check_trie_invariant_full=check_trie_invariant_full,
+        exploded_slice_size=1,
+    )
+    assert res.equals(expected)
+
+
+def test_checkpoint_resume(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    df = pl.read_csv(f"{assets_path}/packed.csv")
+    expected = surface_unpack_reconstruct(df, exploded_slice_size=1)
+
+    checkpoint_path = str(tmp_path / "checkpoint.arrow")
+    extend_records = impl._extend_records
+    num_calls = 0
+
+    def interrupted_extend_records(*args, **kwargs):
+        nonlocal num_calls
+        num_calls += 1
+        if num_calls > 1:
+            raise KeyboardInterrupt
+        return extend_records(*args, **kwargs)
+
+    with monkeypatch.context() as m:
+        m.setattr(impl, "_extend_records", interrupted_extend_records)
+        with pytest.raises(KeyboardInterrupt):
+            surface_unpack_reconstruct(
+                df,
+                checkpoint_freq=1,
+                checkpoint_path=checkpoint_path,
+                exploded_slice_size=1,
+            )
+    assert impl._read_checkpoint_metadata(checkpoint_path)["next_slice"] == 1
+
+    res = surface_unpack_reconstruct(
+        df, exploded_slice_size=1, resume_from=checkpoint_path
+    )
+    assert res.equals(expected)
+
+
+def test_checkpoint_resume_mismatch(tmp_path):
+    df = pl.read_csv(f"{assets_path}/packed.csv")
+    checkpoint_path = str(tmp_path / "checkpoint.arrow")
+    surface_unpack_reconstruct(
+        df,
+        checkpoint_freq=1,
+        checkpoint_path=checkpoint_path,
+        exploded_slice_size=10,
+    )
+    with pytest.raises(ValueError):
+        surface_unpack_reconstruct(
+            df, exploded_slice_size=1, resume_from=checkpoint_path
+        )
+
+
+def test_checkpoint_freq_requires_path():
+    df = pl.read_csv(f"{assets_path}/packed.csv")
+    with pytest.raises(ValueError):
+        surface_unpack_reconstruct(df, checkpoint_freq=1)
+
+
+def _sort_packed_by_T(df: pl.DataFrame) -> pl.DataFrame:
+    df = df.with_row_index("dstream_data_id").with_columns(
+        pl.col("dstream_data_id").cast(pl.UInt64),
+    )
+    T = dstream_dataframe.unpack_data_packed(df)["dstream_T"]
+    return (
+        df.with_columns(T.alias("T")).sort("T", maintain_order=True).drop("T")
+    )
+
+
+@pytest.mark.parametrize("mp_pool_size", [1, 2])
+def test_stream_presorted(tmp_path, mp_pool_size: int):
+    df = _sort_packed_by_T(pl.read_csv(f"{assets_path}/packed.csv"))
+    expected = surface_unpack_reconstruct(df, exploded_slice_size=1)
+
+    for i in range(len(df)):  # shards on disk
+        df[i : i + 1].write_parquet(tmp_path / f"shard{i}.pqt")
+    lf = pl.scan_parquet(sorted(tmp_path.glob("shard*.pqt")))
+    res = surface_unpack_reconstruct(
+        lf,
+        exploded_slice_size=1,
+        mp_pool_size=mp_pool_size,
+        stream_presorted=True,
+    )
+    assert res.equals(expected)
+
+
+def test_stream_presorted_unsorted():
+    df = _sort_packed_by_T(pl.read_csv(f"{assets_path}/packed.csv"))
+    with pytest.raises(ValueError):
+        surface_unpack_reconstruct(
+            df.reverse(), exploded_slice_size=1, stream_presorted=True
+        )
+    with pytest.raises(ValueError):
+        surface_unpack_reconstruct(
+            df.reverse(), exploded_slice_size=10, stream_presorted=True
+        )
+
+
+@pytest.mark.parametrize("shuffle_over_same_T_seed", [None, 42])
+def test_sort_run_size(shuffle_over_same_T_seed: typing.Optional[int]):
+    df = pl.read_csv(f"{assets_path}/packed.csv").reverse()  # unsorted runs
+    kwargs = dict(
+        exploded_slice_size=1,
+        shuffle_over_same_T_seed=shuffle_over_same_T_seed,
+    )
+    expected = surface_unpack_reconstruct(df, **kwargs)
+    res = surface_unpack_reconstruct(df, sort_run_size=1, **kwargs)
+    assert res.equals(expected)
+
+
+@pytest.mark.parametrize("shuffle_over_same_T_seed", [None, 1])
+@pytest.mark.parametrize("num_runs", [1, 3, 10])
+@pytest.mark.parametrize("batch_size", [1, 7, 1000])
+def test_merge_sorted_runs(
+    tmp_path,
+    shuffle_over_same_T_seed: typing.Optional[int],
+    num_runs: int,
+    batch_size: int,
+):
+    rng = np.random.default_rng(num_runs)
+    df = pl.DataFrame(
+        {"dstream_T": rng.integers(0, 20, 200), "row": np.arange(200)},
+    )
+    expected = df.sort("dstream_T", maintain_order=True)
+    if shuffle_over_same_T_seed is not None:
+        expected = impl._shuffle_over_same_T(
+            expected, shuffle_over_same_T_seed
+        )
+
+    run_paths = []
+    for i, run in enumerate(np.array_split(np.arange(len(df)), num_runs)):
+        run_paths.append(str(tmp_path / f"run{i}.arrow"))
+        df[run].sort("dstream_T", maintain_order=True).write_ipc(
+            run_paths[-1], compression="uncompressed"
+        )
+
+    batch_paths = []
+    nrows = impl._merge_sorted_runs(
+        run_paths,
+        batch_size,
+        shuffle_over_same_T_seed,
+        batch_paths,
+        scratch_dir=str(tmp_path),
+    )
+    assert nrows == len(df)
+    batches = [pl.read_ipc(path) for path in batch_paths]
+    assert pl.concat(batches).equals(expected)
+    for prev, batch in zip(batches, batches[1:]):  # whole T groups
+        assert prev["dstream_T"].max() < batch["dstream_T"].min()
+
+
+@pytest.mark.parametrize("spill_compression", ["none", "lz4", "zstd"])
+def test_scratch_dir(tmp_path, spill_compression: str):
+    df = pl.read_csv(f"{assets_path}/packed.csv")
+    expected = surface_unpack_reconstruct(df, exploded_slice_size=1)
+    res = surface_unpack_reconstruct(
+        df,
+        exploded_slice_size=1,
+        scratch_dir=str(tmp_path),
+        spill_compression=spill_compression,
+    )
+    assert res.equals(expected)
+    assert [*tmp_path.iterdir()] == []  # spill files cleaned up
+
+
+@pytest.mark.parametrize("slice_transport", ["ipc", "shm"])
+def test_scratch_dir_cleanup_on_error(
+    tmp_path, monkeypatch: pytest.MonkeyPatch, slice_transport: str
+):
+    df = pl.read_csv(f"{assets_path}/packed.csv")
+
+    def failing_extend_records(*args, **kwargs):
+        raise RuntimeError
+
+    monkeypatch.setattr(impl, "_extend_records", failing_extend_records)
+    with pytest.raises(RuntimeError):
+        surface_unpack_reconstruct(
+            df,
+            exploded_slice_size=1,
+            scratch_dir=str(tmp_path),
+            slice_transport=slice_transport,
+        )
+    assert [*tmp_path.iterdir()] == []
+
+
+def test_spill_compression_invalid():
+    df = pl.read_csv(f"{assets_path}/packed.csv")
+    with pytest.raises(ValueError):
+        surface_unpack_reconstruct(df, spill_compression="gzip")
+
+
+@pytest.mark.parametrize("stream_presorted", [False, True])
+@pytest.mark.parametrize("slice_queue_depth", [None, 1])
+@pytest.mark.parametrize("slice_transport", ["ipc", "shm"])
+def test_slice_pipeline(
+    tmp_path,
+    stream_presorted: bool,
+    slice_queue_depth: typing.Optional[int],
+    slice_transport: str,
+):
+    df = _sort_packed_by_T(pl.read_csv(f"{assets_path}/packed.csv"))
+    expected = surface_unpack_reconstruct(df, exploded_slice_size=1)
+    res = surface_unpack_reconstruct(
+        df,
+        exploded_slice_size=1,
+        mp_pool_size=2,
+        scratch_dir=str(tmp_path),
+        slice_queue_depth=slice_queue_depth,
+        slice_transport=slice_transport,
+        stream_presorted=stream_presorted,
+    )
+    assert res.equals(expected)
+    assert [*tmp_path.iterdir()] == []
+
+
+@pytest.mark.parametrize("queue_depth", [1, 3])
+def test_imap_bounded(queue_depth: int):
+    num_taken = 0
+    num_dispatched = 0
+
+    def tasks():
+        nonlocal num_dispatched
+        for task in range(10):
+            assert num_dispatched - num_taken <= queue_depth
+            num_dispatched += 1
+            yield task
+
+    with ThreadPool(2) as pool:
+        results = []
+        for result in impl._imap_bounded(
+            pool, lambda x: x * x, tasks(), queue_depth
+        ):
+            num_taken += 1
+            results.append(result)
+
+    assert results == [x * x for x in range(10)]
+
+
+def test_imap_bounded_release():
+    released = []
+    with ThreadPool(2) as pool:
+        results = impl._imap_bounded(
+            pool, lambda x: x, range(10), 3, release=released.append
+        )
+        assert next(results) == 0
+        pool.close()
+        pool.join()  # pending tasks complete
+        results.close()
+
+    assert sorted(released) == [1, 2]  # task 3 not yet dispatched
+
+
+def test_slice_pipeline_invalid():
+    df = pl.read_csv(f"{assets_path}/packed.csv")
+    with pytest.raises(ValueError):
+        surface_unpack_reconstruct(df, slice_transport="pipe")
+    with pytest.raises(ValueError):
+        surface_unpack_reconstruct(df, slice_queue_depth=0)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(),
+        dict(mp_pool_size=2, slice_transport="shm"),
+        dict(shuffle_over_same_T_seed=1),
+        dict(sort_run_size=1),
+        dict(stream_presorted=True),
+    ],
+)
+@pytest.mark.parametrize("exploded_slice_size", [1, 10])
+def test_native_explode(exploded_slice_size: int, kwargs: dict):
+    df = _sort_packed_by_T(pl.read_csv(f"{assets_path}/packed.csv"))
+    kwargs = dict(exploded_slice_size=exploded_slice_size, **kwargs)
+    expected = surface_unpack_reconstruct(df, **kwargs)
+    res = surface_unpack_reconstruct(df, native_explode=True, **kwargs)
+    assert res.equals(expected)
+
+
+def test_native_explode_unsupported():
+    df = pl.read_csv(f"{assets_path}/packed.csv").with_columns(
+        downstream_exclude_exploded=pl.lit(False),
+    )
+    with pytest.raises(NotImplementedError):
+        surface_unpack_reconstruct(df, native_explode=True)
+
+
+@pytest.mark.parametrize("exploded_slice_size", [1, 10])
+def test_extend_from(tmp_path, exploded_slice_size: int):
+    df = _sort_packed_by_T(pl.read_csv(f"{assets_path}/packed.csv"))
+    expected = surface_unpack_reconstruct(
+        df, exploded_slice_size=exploded_slice_size
+    )
+
+    searchtable_path = str(tmp_path / "searchtable.arrow")
+    surface_unpack_reconstruct(
+        df[:1],
+        exploded_slice_size=exploded_slice_size,
+        searchtable_path=searchtable_path,
+    )
+    res = surface_unpack_reconstruct(
+        df[1:],
+        exploded_slice_size=exploded_slice_size,
+        extend_from=searchtable_path,
+        searchtable_path=searchtable_path,
+    )
+    core_columns = ["id", "ancestor_id", "dstream_rank", "dstream_data_id"]
+    assert res.select(core_columns).equals(expected.select(core_columns))
+
+    # user-defined columns are only joined for newly incorporated genomes
+    awoo = res.filter(pl.col("dstream_data_id").is_not_null())["awoo"]
+    assert awoo.null_count() == len(df[:1])
+
+
+def test_extend_from_default_data_ids(tmp_path):
+    df = _sort_packed_by_T(pl.read_csv(f"{assets_path}/packed.csv")).drop(
+        "dstream_data_id"
+    )
+    expected = surface_unpack_reconstruct(df)
+
+    searchtable_path = str(tmp_path / "searchtable.arrow")
+    surface_unpack_reconstruct(df[:1], searchtable_path=searchtable_path)
+    res = surface_unpack_reconstruct(df[1:], extend_from=searchtable_path)
+    core_columns = ["id", "ancestor_id", "dstream_rank", "dstream_data_id"]
+    assert res.select(core_columns).equals(expected.select(core_columns))
+
+
+def test_extend_from_invalid(tmp_path):
+    df = _sort_packed_by_T(pl.read_csv(f"{assets_path}/packed.csv"))
+    searchtable_path = str(tmp_path / "searchtable.arrow")
+    surface_unpack_reconstruct(df[1:], searchtable_path=searchtable_path)
+
+    with pytest.raises(ValueError):  # dstream_T precedes frontier
+        surface_unpack_reconstruct(
+            df[:1].with_columns(
+                pl.lit(2, dtype=pl.UInt64).alias("dstream_data_id")
+            ),
+            extend_from=searchtable_path,
+        )
+    with pytest.raises(ValueError):  # dstream_data_id already incorporated
+        surface_unpack_reconstruct(df[1:], extend_from=searchtable_path)
+
+    checkpoint_path = str(tmp_path / "checkpoint.arrow")
+    surface_unpack_reconstruct(
+        df, checkpoint_freq=1, checkpoint_path=checkpoint_path
+    )
+    with pytest.raises(ValueError):  # not a searchtable
+        surface_unpack_reconstruct(df[1:], extend_from=checkpoint_path)
@@ -145,6 +145,26 @@ def test_surface_unpack_reconstruct_cli_check_trie_invariant_freq():
     assert os.path.exists(output_file)
 
 
+def test_surface_unpack_reconstruct_cli_check_trie_invariant_full():
+    """Smoke test for --check-trie-invariant-full flag."""
+    output_file = "/tmp/hstrat_unpack_surface_reconstruct_invariant_full.csv"  # nosec B108
+    pathlib.Path(output_file).unlink(missing_ok=True)
+    subprocess.run(  # nosec B603
+        [
+            "python3",
+            "-m",
+            "hstrat.dataframe.surface_unpack_reconstruct",
+            output_file,
+            "--check-trie-invariant-freq",
+            "1",
+            "--check-trie-invariant-full",
+        ],
+        check=True,
+        input=f"{assets}/packed.csv".encode(),
+    )
+    assert os.path.exists(output_file)
+
+
 def test_surface_unpack_reconstruct_cli_check_trie_invariant_freq_zero():
     """Smoke test for --check-trie-invariant-freq=0 (disabled, default)."""
     output_file = (
@@ -186,6 +206,132 @@ def test_surface_unpack_reconstruct_cli_mp_pool_size():
     assert os.path.exists(output_file)
 
 
+def test_surface_unpack_reconstruct_cli_num_threads():
+    output_file = (
+        "/tmp/hstrat_unpack_surface_reconstruct_threads.csv"  # nosec B108
+    )
+    pathlib.Path(output_file).unlink(missing_ok=True)
+    subprocess.run(  # nosec B603
+        [
+            "python3",
+            "-m",
+            "hstrat.dataframe.surface_unpack_reconstruct",
+            output_file,
+            "--num-threads",
+            "2",
+        ],
+        check=True,
+        input=f"{assets}/packed.csv".encode(),
+    )
+    assert os.path.exists(output_file)
+
+
+def test_surface_unpack_reconstruct_cli_checkpoint_resume():
+    output_file = (
+        "/tmp/hstrat_unpack_surface_reconstruct_resume.csv"  # nosec B108
+    )
+    checkpoint_file = (
+        "/tmp/hstrat_unpack_surface_reconstruct_checkpoint.arrow"  # nosec B108
+    )
+    pathlib.Path(checkpoint_file).unlink(missing_ok=True)
+    subprocess.run(  # nosec B603
+        [
+            "python3",
+            "-m",
+            "hstrat.dataframe.surface_unpack_reconstruct",
+            "/tmp/hstrat_unpack_surface_reconstruct_checkpoint.csv",  # nosec B108
+            "--checkpoint-freq",
+            "1",
+            "--checkpoint-path",
+            checkpoint_file,
+        ],
+        check=True,
+        input=f"{assets}/packed.csv".encode(),
+    )
+    assert os.path.exists(checkpoint_file)
+
+    pathlib.Path(output_file).unlink(missing_ok=True)
+    subprocess.run(  # nosec B603
+        [
+            "python3",
+            "-m",
+            "hstrat.dataframe.surface_unpack_reconstruct",
+            output_file,
+            "--resume-from",
+            checkpoint_file,
+        ],
+        check=True,
+        input=f"{assets}/packed.csv".encode(),
+    )
+    assert os.path.exists(output_file)
+
+
+def test_surface_unpack_reconstruct_cli_scratch_dir(tmp_path):
+    output_file = (
+        "/tmp/hstrat_unpack_surface_reconstruct_scratch.csv"  # nosec B108
+    )
+    pathlib.Path(output_file).unlink(missing_ok=True)
+    subprocess.run(  # nosec B603
+        [
+            "python3",
+            "-m",
+            "hstrat.dataframe.surface_unpack_reconstruct",
+            output_file,
+            "--scratch-dir",
+            str(tmp_path),
+            "--spill-compression",
+            "zstd",
+        ],
+        check=True,
+        input=f"{assets}/packed.csv".encode(),
+    )
+    assert os.path.exists(output_file)
+    assert [*tmp_path.iterdir()] == []
+
+
+def test_surface_unpack_reconstruct_cli_slice_pipeline():
+    """Smoke test for --slice-queue-depth and --slice-transport flags."""
+    output_file = (
+        "/tmp/hstrat_unpack_surface_reconstruct_pipeline.csv"  # nosec B108
+    )
+    pathlib.Path(output_file).unlink(missing_ok=True)
+    subprocess.run(  # nosec B603
+        [
+            "python3",
+            "-m",
+            "hstrat.dataframe.surface_unpack_reconstruct",
+            output_file,
+            "--slice-queue-depth",
+            "1",
+            "--slice-transport",
+            "shm",
+        ],
+        check=True,
+        input=f"{assets}/packed.csv".encode(),
+    )
+    assert os.path.exists(output_file)
+
+
+def test_surface_unpack_reconstruct_cli_native_explode():
+    """Smoke test for --native-explode flag."""
+    output_file = (
+        "/tmp/hstrat_unpack_surface_reconstruct_native.csv"  # nosec B108
+    )
+    pathlib.Path(output_file).unlink(missing_ok=True)
+    subprocess.run(  # nosec B603
+        [
+            "python3",
+            "-m",
+            "hstrat.dataframe.surface_unpack_reconstruct",
+            output_file,
+            "--native-explode",
+        ],
+        check=True,
+        input=f"{assets}/packed.csv".encode(),
+    )
+    assert os.path.exists(output_file)
+
+
 def test_surface_unpack_reconstruct_cli_shuffle_over_same_T_seed():
     """Smoke test for --shuffle-over-same-T-seed flag."""
     output_file = (
@@ -223,3 +369,43 @@ def test_surface_unpack_reconstruct_cli_drop_dstream_metadata_fails():
         input=f"{assets}/packed.csv".encode(),
     )
     assert result.returncode != 0
+
+
+def test_surface_unpack_reconstruct_cli_extend_from(tmp_path):
+    df = pl.read_csv(f"{assets}/packed.csv")  # rows ascending by dstream_T
+    df[:1].write_parquet(tmp_path / "first.pqt")
+    df[1:].write_parquet(tmp_path / "second.pqt")
+
+    output_file = (
+        "/tmp/hstrat_unpack_surface_reconstruct_extend.csv"  # nosec B108
+    )
+    searchtable_file = str(tmp_path / "searchtable.arrow")
+    subprocess.run(  # nosec B603
+        [
+            "python3",
+            "-m",
+            "hstrat.dataframe.surface_unpack_reconstruct",
+            "/tmp/hstrat_unpack_surface_reconstruct_searchtable.csv",  # nosec B108
+            "--searchtable-path",
+            searchtable_file,
+        ],
+        check=True,
+        input=str(tmp_path / "first.pqt").encode(),
+    )
+    assert os.path.exists(searchtable_file)
+
+    pathlib.Path(output_file).unlink(missing_ok=True)
+    subprocess.run(  # nosec B603
+        [
+            "python3",
+            "-m",
+            "hstrat.dataframe.surface_unpack_reconstruct",
+            output_file,
+            "--extend-from",
+            searchtable_file,
+        ],
+        check=True,
+        input=str(tmp_path / "second.pqt").encode(),
+    )
+    assert os.path.exists(output_file)
+    assert len(pl.read_csv(output_file)) > len(df)
@@ -1,9 +1,28 @@
+import itertools as it
 import os
+import random
 
+from downstream import dstream, dsurf
+import more_itertools as mit
+import numpy as np
 import polars as pl
 import pytest
 
-from hstrat.dataframe import surface_validate_trie
+from hstrat import hstrat
+from hstrat._auxiliary_lib._alifestd_find_leaf_ids import (
+    _alifestd_find_leaf_ids_asexual_fast_path,
+)
+from hstrat._auxiliary_lib._alifestd_find_pair_mrca_id_asexual import (
+    _alifestd_find_pair_mrca_id_asexual_fast_path,
+)
+from hstrat.dataframe import surface_unpack_reconstruct, surface_validate_trie
+from hstrat.dataframe._surface_validate_trie import (
+    _calc_first_disparity_ranks,
+    _decode_surfaces,
+    _LeafMrcaIndex,
+    _load_surface,
+    _unrank_pairs,
+)
 
 assets_path = os.path.join(os.path.dirname(__file__), "assets")
 
@@ -147,3 +166,194 @@ def test_seed_different():
     count_1 = surface_validate_trie(df, seed=1, max_violations=10)
     assert count_0 >= 1
     assert count_1 >= 1
+
+
+# ---------------------------------------------------------------------------
+# Batched engine tests, against scalar reference implementations
+# ---------------------------------------------------------------------------
+
+
+def _make_trie(differentia_bitwidth: int, seed: int) -> pl.DataFrame:
+    """Reconstruct trie from surfaces evolved along a random phylogeny."""
+    rng = random.Random(seed)
+    S = 16
+    population = [
+        hstrat.HereditaryStratigraphicSurface(
+            dsurf.Surface(dstream.steady_algo, S),
+            stratum_differentia_bit_width=differentia_bitwidth,
+        ),
+    ]
+    for __ in range(80):
+        parent = rng.choice(population)
+        population.append(parent.CloneNthDescendant(rng.randrange(1, 40)))
+
+    df = pl.DataFrame(
+        [
+            {
+                "data_hex": hstrat.surf_to_hex(surf, dstream_T_bitwidth=32),
+                "dstream_algo": "dstream.steady_algo",
+                "dstream_storage_bitoffset": 32,
+                "dstream_storage_bitwidth": S * differentia_bitwidth,
+                "dstream_T_bitoffset": 0,
+                "dstream_T_bitwidth": 32,
+                "dstream_S": S,
+            }
+            for surf in population[-40:]
+        ],
+    )
+    return surface_unpack_reconstruct(df, drop_dstream_metadata=False)
+
+
+def _get_leaf_ids(df: pl.DataFrame) -> np.ndarray:
+    return _alifestd_find_leaf_ids_asexual_fast_path(
+        df["ancestor_id"].to_numpy().astype(np.int64),
+    )
+
+
+@pytest.mark.parametrize("differentia_bitwidth", [1, 8, 64])
+def test_decode_surfaces(differentia_bitwidth: int):
+    df = _make_trie(differentia_bitwidth, seed=1)
+    leaf_ids = _get_leaf_ids(df)
+    ranks, differentia, num_retained, next_ranks = _decode_surfaces(
+        df[leaf_ids],
+    )
+    for row, leaf_id in enumerate(leaf_ids):
+        surface = _load_surface(df, leaf_id)
+        assert num_retained[row] == surface.GetNumStrataRetained()
+        assert next_ranks[row] == surface.GetNextRank()
+        assert [*ranks[row, : num_retained[row]]] == [
+            *surface.IterRetainedRanks()
+        ]
+        assert [*differentia[row, : num_retained[row]]] == [
+            *surface.IterRetainedDifferentia()
+        ]
+
+
+def test_decode_surfaces_T_lt_S():
+    S = 16
+    surface = hstrat.HereditaryStratigraphicSurface(
+        dsurf.Surface(dstream.steady_algo, S), predeposit_strata=0
+    )
+    surface._surface.T = 0
+    surface.DepositStrata(5)
+    leaf_df = pl.DataFrame(
+        {
+            "data_hex": hstrat.surf_to_hex(surface, dstream_T_bitwidth=32),
+            "dstream_algo": "dstream.steady_algo",
+            "dstream_storage_bitoffset": 32,
+            "dstream_storage_bitwidth": S * 64,
+            "dstream_T_bitoffset": 0,
+            "dstream_T_bitwidth": 32,
+            "dstream_S": S,
+        },
+    )
+    ranks, differentia, num_retained, next_ranks = _decode_surfaces(leaf_df)
+    assert num_retained[0] == 5
+    assert next_ranks[0] == surface.GetNextRank()
+    assert [*ranks[0, :5]] == [*surface.IterRetainedRanks()]
+    assert [*differentia[0, :5]] == [*surface.IterRetainedDifferentia()]
+
+
+@pytest.mark.parametrize("differentia_bitwidth", [1, 8])
+@pytest.mark.parametrize("confidence_level", [0.49, 0.95])
+def test_calc_first_disparity_ranks(
+    differentia_bitwidth: int, confidence_level: float
+):
+    df = _make_trie(differentia_bitwidth, seed=2)
+    leaf_ids = _get_leaf_ids(df)
+    surfaces = [_load_surface(df, leaf_id) for leaf_id in leaf_ids]
+    collision_threshold = hstrat.calc_min_implausible_spurious_consecutive_differentia_collisions_between(
+        surfaces[0],
+        surfaces[0],
+        significance_level=1.0 - confidence_level,
+    )
+    firsts, seconds = map(
+        np.array, zip(*it.combinations(range(len(leaf_ids)), 2))
+    )
+
+    actual = _calc_first_disparity_ranks(
+        *_decode_surfaces(df[leaf_ids]),
+        collision_threshold,
+        firsts,
+        seconds,
+    )
+    expected = [
+        hstrat.calc_rank_of_first_retained_disparity_between(
+            surfaces[first],
+            surfaces[second],
+            confidence_level=confidence_level,
+        )
+        for first, second in zip(firsts, seconds)
+    ]
+    assert [None if x == -1 else x for x in actual] == expected
+
+
+@pytest.mark.parametrize("num_items", [2, 3, 10, 101])
+def test_unrank_pairs(num_items: int):
+    num_combinations = num_items * (num_items - 1) // 2
+    firsts, seconds = _unrank_pairs(
+        np.arange(num_combinations, dtype=np.int64), num_items
+    )
+    assert [*zip(firsts, seconds)] == [
+        mit.nth_combination(range(num_items), 2, i)
+        for i in range(num_combinations)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_leaf_mrca_index(seed: int):
+    df = _make_trie(8, seed=seed)
+    ancestor_ids = df["ancestor_id"].to_numpy().astype(np.int64)
+    leaf_ids = _get_leaf_ids(df)
+    firsts, seconds = map(
+        np.array, zip(*it.combinations(range(len(leaf_ids)), 2))
+    )
+    actual = _LeafMrcaIndex.build(ancestor_ids, leaf_ids).query(
+        firsts, seconds
+    )
+    expected = [
+        _alifestd_find_pair_mrca_id_asexual_fast_path(
+            ancestor_ids, leaf_ids[first], leaf_ids[second]
+        )
+        for first, second in zip(firsts, seconds)
+    ]
+    assert [*actual] == expected
+
+
+def test_leaf_mrca_index_disjoint():
+    #   0     3
+    #  / \    |
+    # 1   2   4
+    ancestor_ids = np.array([0, 0, 0, 3, 3], dtype=np.int64)
+    leaf_ids = np.array([1, 2, 4], dtype=np.int64)
+    index = _LeafMrcaIndex.build(ancestor_ids, leaf_ids)
+    assert [*index.query(np.array([0, 0, 1]), np.array([1, 2, 2]))] == [
+        0,
+        -1,
+        -1,
+    ]
+
+
+@pytest.mark.parametrize("mp_pool_size", [1, 2])
+def test_mp_pool_size(mp_pool_size: int):
+    df = _make_trie(1, seed=3)
+    corrupted = df.with_columns(
+        dstream_rank=pl.when(pl.col("id") % 3 == 0)
+        .then(pl.col("dstream_rank") * 2)
+        .otherwise(pl.col("dstream_rank")),
+    )
+    expected = surface_validate_trie(
+        corrupted, max_num_checks=200, max_violations=10_000, seed=1
+    )
+    assert expected > 0
+    assert (
+        surface_validate_trie(
+            corrupted,
+            max_num_checks=200,
+            max_violations=10_000,
+            seed=1,
+            mp_pool_size=mp_pool_size,
+        )
+        == expected
+    )
+    assert surface_validate_trie(df, mp_pool_size=mp_pool_size) == 0
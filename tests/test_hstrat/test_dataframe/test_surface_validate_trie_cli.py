@@ -165,3 +165,23 @@ def test_surface_validate_trie_cli_seed():
         )
         results.append(r.stdout.strip())
     assert results[0] == results[1]
+
+
+def test_surface_validate_trie_cli_mp_pool_size():
+    """--mp-pool-size flag distributes pair checks over worker processes."""
+    result = subprocess.run(  # nosec B603
+        [
+            "python3",
+            "-m",
+            "hstrat.dataframe.surface_validate_trie",
+            f"{assets}/trie_long_invalid.csv",
+            "--max-violations",
+            "10",
+            "--mp-pool-size",
+            "2",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert int(result.stdout.strip()) >= 1
@@ -21,6 +21,8 @@ from hstrat import hstrat
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -56,6 +58,8 @@ def test_Clone1(always_store_rank_in_stratum, retention_policy, ordered_store):
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -86,6 +90,8 @@ def test_Clone2(always_store_rank_in_stratum, retention_policy, ordered_store):
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -126,6 +132,8 @@ def test_Clone3(always_store_rank_in_stratum, ordered_store):
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -168,6 +176,8 @@ def test_Clone4(always_store_rank_in_stratum, ordered_store):
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -199,6 +209,8 @@ def test_pickle(always_store_rank_in_stratum, retention_policy, ordered_store):
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -232,6 +244,8 @@ def test_pickle_with_deposits(retention_policy, ordered_store):
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -276,6 +290,8 @@ def test_pickle_with_population(
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -326,6 +342,8 @@ def test_eq(
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         pytest.param(
@@ -382,6 +400,8 @@ def test_annotation(
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -651,6 +671,8 @@ def test_CalcMinImplausibleSpuriousConsecutiveDifferentiaCollisions():
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -684,6 +706,8 @@ def test_IterRetainedStrata(
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -723,6 +747,8 @@ def test_GetColumnIndexOfRank():
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -762,6 +788,8 @@ def test_GetStratumAtRank(
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -797,6 +825,8 @@ def test_DepositStrata_zero(
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -841,6 +871,8 @@ def test_DepositStrata_one(
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
@@ -887,6 +919,8 @@ def test_DepositStrata_several(
 @pytest.mark.parametrize(
     "ordered_store",
     [
+        hstrat.HereditaryStratumOrderedStoreArray,
+        hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
         hstrat.HereditaryStratumOrderedStoreDict,
         hstrat.HereditaryStratumOrderedStoreList,
         hstrat.HereditaryStratumOrderedStoreTree,
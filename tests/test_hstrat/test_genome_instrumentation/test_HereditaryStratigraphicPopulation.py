@@ -0,0 +1,171 @@
+from copy import deepcopy
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from hstrat import hstrat
+
+
+@pytest.mark.parametrize(
+    "retention_policy",
+    [
+        hstrat.fixed_resolution_algo.Policy(5),
+        hstrat.nominal_resolution_algo.Policy(),
+        hstrat.perfect_resolution_algo.Policy(),
+        hstrat.recency_proportional_resolution_algo.Policy(3),
+    ],
+)
+@pytest.mark.parametrize("differentia_bit_width", [1, 8, 64])
+def test_matches_column(retention_policy, differentia_bit_width):
+    population = hstrat.HereditaryStratigraphicPopulation(
+        retention_policy,
+        population_size=10,
+        stratum_differentia_bit_width=differentia_bit_width,
+    )
+    for generation in range(100):
+        population = population.CloneDescendants(
+            np.random.randint(10, size=10),
+        )
+        population.DepositStratum(np.random.randint(10, size=3))
+
+    assert population.GetPopulationSize() == 10
+    for index, column in enumerate(population.IterMembers()):
+        num_deposited = population.GetNumStrataDeposited()[index]
+        assert 101 <= num_deposited <= 201
+        assert column.GetNumStrataDeposited() == num_deposited
+        assert (
+            column.GetNumStrataRetained()
+            == population.GetNumStrataRetained()[index]
+        )
+        assert [*column.IterRetainedRanks()] == [
+            *retention_policy.IterRetainedRanks(num_deposited)
+        ]
+        assert [*column.IterRetainedDifferentia()] == [
+            *population.IterRetainedDifferentia(index)
+        ]
+        assert all(
+            0 <= differentia < 2**differentia_bit_width
+            for differentia in column.IterRetainedDifferentia()
+        )
+        assert column.GetStratumDifferentiaBitWidth() == differentia_bit_width
+
+        # extracted column behaves like any other column
+        descendant = column.CloneDescendant()
+        assert descendant.GetNumStrataDeposited() == num_deposited + 1
+        # result may be indeterminate (None) for narrow differentia
+        assert hstrat.does_have_any_common_ancestor(column, descendant) in (
+            True,
+            None,
+        )
+
+
+@pytest.mark.parametrize(
+    "retention_policy",
+    [
+        hstrat.fixed_resolution_algo.Policy(5),
+        hstrat.recency_proportional_resolution_algo.Policy(3),
+    ],
+)
+@pytest.mark.parametrize("differentia_bit_width", [1, 8, 64])
+def test_seeded_matches_column(retention_policy, differentia_bit_width):
+    random.seed(1)
+    population = hstrat.HereditaryStratigraphicPopulation(
+        retention_policy,
+        population_size=5,
+        stratum_differentia_bit_width=differentia_bit_width,
+    )
+    population.DepositStrata(10)
+    population.DepositStratum([4, 1])
+
+    random.seed(1)
+    columns = [
+        hstrat.HereditaryStratigraphicColumn(
+            retention_policy,
+            stratum_differentia_bit_width=differentia_bit_width,
+        )
+        for __ in range(5)
+    ]
+    for __ in range(10):
+        for column in columns:
+            column.DepositStratum()
+    for index in 1, 4:
+        columns[index].DepositStratum()
+
+    for index, column in enumerate(columns):
+        assert [*population.IterRetainedDifferentia(index)] == [
+            *column.IterRetainedDifferentia()
+        ]
+
+
+def test_gather_lineage():
+    population = hstrat.HereditaryStratigraphicPopulation(
+        hstrat.fixed_resolution_algo.Policy(3),
+        population_size=4,
+    )
+    population.DepositStrata(5)
+    descendants = population.CloneDescendants([2, 2, 0])
+    assert descendants.GetPopulationSize() == 3
+    assert (descendants.GetNumStrataDeposited() == 7).all()
+
+    parent = population.GetMember(2)
+    for index in range(2):
+        child = descendants.GetMember(index)
+        lb, ub = hstrat.calc_rank_of_mrca_bounds_between(
+            parent, child, prior="arbitrary"
+        )
+        assert lb <= 5 < ub
+    lb, ub = hstrat.calc_rank_of_mrca_bounds_between(
+        descendants.GetMember(0), descendants.GetMember(1), prior="arbitrary"
+    )
+    assert lb <= 5 < ub
+    assert not hstrat.does_have_any_common_ancestor(
+        descendants.GetMember(0), descendants.GetMember(2)
+    )
+
+    # parents unaltered
+    assert (population.GetNumStrataDeposited() == 6).all()
+
+
+def test_deposit_subset():
+    population = hstrat.HereditaryStratigraphicPopulation(
+        hstrat.recency_proportional_resolution_algo.Policy(2),
+        population_size=5,
+    )
+    population.DepositStrata(3, member_indices=[1, 3, 3])
+    assert [*population.GetNumStrataDeposited()] == [1, 4, 1, 4, 1]
+
+    population.DepositStratum()
+    assert [*population.GetNumStrataDeposited()] == [2, 5, 2, 5, 2]
+
+
+def test_equality_clone():
+    population1 = hstrat.HereditaryStratigraphicPopulation(population_size=3)
+    population2 = hstrat.HereditaryStratigraphicPopulation(population_size=3)
+    assert population1 != population2
+    assert population1 == population1.Clone()
+    assert population1 == deepcopy(population1)
+    assert population1 == pickle.loads(pickle.dumps(population1))
+
+    clone = population1.Clone()
+    clone.DepositStratum()
+    assert population1 != clone
+    assert (population1.GetNumStrataDeposited() == 1).all()
+
+
+def test_empty():
+    population = hstrat.HereditaryStratigraphicPopulation(population_size=0)
+    population.DepositStrata(3)
+    assert population.GetPopulationSize() == 0
+    assert [*population.IterMembers()] == []
+    assert population.CloneDescendants([]).GetPopulationSize() == 0
+
+
+@pytest.mark.parametrize("differentia_bit_width", [0, 65])
+def test_invalid_bit_width(differentia_bit_width):
+    with pytest.raises(ValueError):
+        hstrat.HereditaryStratigraphicPopulation(
+            population_size=1,
+            stratum_differentia_bit_width=differentia_bit_width,
+        )
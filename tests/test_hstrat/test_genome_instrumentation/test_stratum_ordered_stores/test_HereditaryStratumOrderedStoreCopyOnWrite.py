@@ -0,0 +1,593 @@
+from concurrent import futures
+import unittest
+
+from hstrat import hstrat
+from hstrat._auxiliary_lib import is_strictly_increasing
+
+
+class TestHereditaryStratumOrderedStoreCopyOnWrite(unittest.TestCase):
+
+    # tests can run independently
+    _multiprocess_can_split_ = True
+
+    def test_deposition(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        assert store1.GetNumStrataRetained() == 0
+
+        stratum1 = hstrat.HereditaryStratum(deposition_rank=0)
+        store1.DepositStratum(0, stratum1)
+        assert store1.GetNumStrataRetained() == 1
+        assert store1.GetStratumAtColumnIndex(0) == stratum1
+
+        store2 = store1.Clone()
+
+        stratum2 = hstrat.HereditaryStratum(deposition_rank=1)
+        store1.DepositStratum(1, stratum2)
+        assert store1.GetNumStrataRetained() == 2
+        assert store1.GetStratumAtColumnIndex(1) == stratum2
+        assert store1.GetStratumAtColumnIndex(0) != stratum2
+
+        assert store2.GetNumStrataRetained() == 1
+        assert store2.GetStratumAtColumnIndex(0) == stratum1
+
+    def test_deletion1(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        stratum1 = hstrat.HereditaryStratum(deposition_rank=0)
+        store1.DepositStratum(0, stratum1)
+
+        store2 = store1.Clone()
+        stratum2 = hstrat.HereditaryStratum(deposition_rank=1)
+        store1.DepositStratum(1, stratum2)
+
+        del store1
+        assert store2.GetNumStrataRetained() == 1
+        assert store2.GetStratumAtColumnIndex(0) == stratum1
+
+    def test_deletion2(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        stratum1 = hstrat.HereditaryStratum(deposition_rank=0)
+        store1.DepositStratum(0, stratum1)
+
+        store2 = store1.Clone()
+        stratum2 = hstrat.HereditaryStratum(deposition_rank=1)
+        store1.DepositStratum(1, stratum2)
+
+        del store2
+        assert store1.GetNumStrataRetained() == 2
+        assert store1.GetStratumAtColumnIndex(0) == stratum1
+        assert store1.GetStratumAtColumnIndex(1) == stratum2
+
+    def test_equality(self):
+        assert (
+            hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+            == hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        )
+
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        store1.DepositStratum(0, hstrat.HereditaryStratum(deposition_rank=0))
+        store2 = store1.Clone()
+        assert store1 == store2
+
+        store2.DepositStratum(1, hstrat.HereditaryStratum(deposition_rank=1))
+        assert store1 != store2
+
+    def test_GetRankAtColumnIndex(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        store1.DepositStratum(0, hstrat.HereditaryStratum(deposition_rank=0))
+        store1.DepositStratum(1, hstrat.HereditaryStratum(deposition_rank=1))
+        store1.DepositStratum(2, hstrat.HereditaryStratum(deposition_rank=2))
+        assert store1.GetRankAtColumnIndex(0) == 0
+        assert store1.GetRankAtColumnIndex(1) == 1
+        assert store1.GetRankAtColumnIndex(2) == 2
+
+        store1.DelRanks([1])
+        assert store1.GetRankAtColumnIndex(0) == 0
+        assert store1.GetRankAtColumnIndex(1) == 2
+
+    def test_GetStratumAtColumnIndex(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        strata = [
+            hstrat.HereditaryStratum(deposition_rank=rank) for rank in range(3)
+        ]
+        for rank, stratum in enumerate(strata):
+            store1.DepositStratum(rank, stratum)
+
+        for rank, stratum in enumerate(strata):
+            assert store1.GetStratumAtColumnIndex(rank) == strata[rank]
+
+        store1.DelRanks([1])
+        assert store1.GetStratumAtColumnIndex(0) == strata[0]
+        assert store1.GetStratumAtColumnIndex(1) == strata[2]
+
+    def test_GetNumStrataRetained(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        for rank in range(5):
+            assert store1.GetNumStrataRetained() == rank
+            store1.DepositStratum(rank, hstrat.HereditaryStratum())
+        assert store1.GetNumStrataRetained() == 5
+
+        store1.DelRanks([1, 2], get_column_index_of_rank=lambda x: x)
+        assert store1.GetNumStrataRetained() == 3
+
+        store1.DepositStratum(5, hstrat.HereditaryStratum())
+        assert store1.GetNumStrataRetained() == 4
+
+        store1.DelRanks(
+            [5],
+            get_column_index_of_rank=lambda x: {
+                3: 0,
+                5: 1,
+            }[x],
+        )
+        assert store1.GetNumStrataRetained() == 3
+
+    def test_GetColumnIndexOfRank(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 63]
+        for rank in ranks:
+            store1.DepositStratum(
+                rank=rank,
+                stratum=hstrat.HereditaryStratum(deposition_rank=rank),
+            )
+
+        assert store1.GetColumnIndexOfRank(-1) is None
+        assert store1.GetColumnIndexOfRank(0) == 0
+        assert store1.GetColumnIndexOfRank(1) is None
+        assert store1.GetColumnIndexOfRank(8) == 1
+        assert store1.GetColumnIndexOfRank(42) == 2
+        assert store1.GetColumnIndexOfRank(63) == 3
+        assert store1.GetColumnIndexOfRank(64) is None
+
+    def test_IterRetainedRanks(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 63]
+        for rank in ranks:
+            store1.DepositStratum(
+                rank=rank,
+                stratum=hstrat.HereditaryStratum(deposition_rank=rank),
+            )
+
+        assert set(store1.IterRetainedRanks()) == set(ranks)
+        assert [*store1.IterRetainedRanks()] == ranks
+        assert is_strictly_increasing(ranks)
+
+    def test_IterRankDifferentiaZip1(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 63]
+        strata = [
+            hstrat.HereditaryStratum(deposition_rank=rank) for rank in ranks
+        ]
+        for rank, stratum in zip(ranks, strata):
+            store1.DepositStratum(rank=rank, stratum=stratum)
+
+        assert [
+            *zip(ranks, [stratum.GetDifferentia() for stratum in strata])
+        ] == [*store1.IterRankDifferentiaZip()]
+        assert [*zip(ranks, [stratum.GetDifferentia() for stratum in strata])][
+            0:
+        ] == [*store1.IterRankDifferentiaZip(start_column_index=0)]
+        assert [*zip(ranks, [stratum.GetDifferentia() for stratum in strata])][
+            2:
+        ] == [*store1.IterRankDifferentiaZip(start_column_index=2)]
+
+    def test_IterRankDifferentiaZip2(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 63]
+        strata = [
+            hstrat.HereditaryStratum(deposition_rank=rank) for rank in ranks
+        ]
+        for rank, stratum in zip(ranks, strata):
+            store1.DepositStratum(rank=rank, stratum=stratum)
+
+        def col_index_to_rank(column_idx):
+            return ranks[column_idx]
+
+        assert [
+            *zip(ranks, [stratum.GetDifferentia() for stratum in strata])
+        ] == [
+            *store1.IterRankDifferentiaZip(
+                get_rank_at_column_index=col_index_to_rank,
+            )
+        ]
+        assert [*zip(ranks, [stratum.GetDifferentia() for stratum in strata])][
+            0:
+        ] == [
+            *store1.IterRankDifferentiaZip(
+                get_rank_at_column_index=col_index_to_rank,
+                start_column_index=0,
+            )
+        ]
+        assert [*zip(ranks, [stratum.GetDifferentia() for stratum in strata])][
+            2:
+        ] == [
+            *store1.IterRankDifferentiaZip(
+                get_rank_at_column_index=col_index_to_rank,
+                start_column_index=2,
+            )
+        ]
+
+    def test_DelRanks_getrank_impl1(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 55, 63]
+        strata = [
+            hstrat.HereditaryStratum(deposition_rank=rank) for rank in ranks
+        ]
+        for rank, stratum in zip(ranks, strata):
+            store1.DepositStratum(rank=rank, stratum=stratum)
+
+        for deletion in (
+            [],
+            [8, 42],
+            [],
+            [55],
+            [],
+            [0, 63],
+            [],
+        ):
+            store1.DelRanks(deletion)
+            for rank in deletion:
+                del strata[ranks.index(rank)]
+                ranks.remove(rank)
+            assert [
+                *zip(ranks, [stratum.GetDifferentia() for stratum in strata])
+            ] == [*store1.IterRankDifferentiaZip()]
+
+    def test_DelRanks_getrank_impl2(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 55, 63]
+        strata = [
+            hstrat.HereditaryStratum(deposition_rank=rank) for rank in ranks
+        ]
+        for rank, stratum in zip(ranks, strata):
+            store1.DepositStratum(rank=rank, stratum=stratum)
+
+        for deletion in (
+            [],
+            [0, 63],
+            [],
+            [8],
+            [],
+            [55],
+            [],
+            [42],
+            [],
+        ):
+            store1.DelRanks(deletion)
+            for rank in deletion:
+                del strata[ranks.index(rank)]
+                ranks.remove(rank)
+            assert [
+                *zip(ranks, [stratum.GetDifferentia() for stratum in strata])
+            ] == [*store1.IterRankDifferentiaZip()]
+
+    def test_DelRanks_getrank_impl3(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 55, 63, 80]
+        strata = [
+            hstrat.HereditaryStratum(deposition_rank=rank) for rank in ranks
+        ]
+        for rank, stratum in zip(ranks, strata):
+            store1.DepositStratum(rank=rank, stratum=stratum)
+
+        for deletion in (
+            [],
+            [0, 80],
+            [],
+            [63],
+            [],
+            [8, 55],
+            [],
+            [42],
+            [],
+        ):
+            store1.DelRanks(deletion)
+            for rank in deletion:
+                del strata[ranks.index(rank)]
+                ranks.remove(rank)
+            assert [
+                *zip(ranks, [stratum.GetDifferentia() for stratum in strata])
+            ] == [*store1.IterRankDifferentiaZip()]
+
+    def test_DelRanks_getrank_impl4(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 55, 63]
+        strata = [
+            hstrat.HereditaryStratum(deposition_rank=rank) for rank in ranks
+        ]
+        for rank, stratum in zip(ranks, strata):
+            store1.DepositStratum(rank=rank, stratum=stratum)
+
+        for deletion in (
+            [],
+            [55, 63],
+            [],
+            [0, 8],
+            [],
+            [42],
+            [],
+        ):
+            store1.DelRanks(deletion)
+            for rank in deletion:
+                del strata[ranks.index(rank)]
+                ranks.remove(rank)
+            assert [
+                *zip(ranks, [stratum.GetDifferentia() for stratum in strata])
+            ] == [*store1.IterRankDifferentiaZip()]
+
+    def test_DelRanks_getrank_impl5(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 55, 63]
+        strata = [
+            hstrat.HereditaryStratum(deposition_rank=rank) for rank in ranks
+        ]
+        for rank, stratum in zip(ranks, strata):
+            store1.DepositStratum(rank=rank, stratum=stratum)
+
+        for deletion in (
+            [],
+            [42, 63],
+            [],
+            [0, 8, 55],
+            [],
+        ):
+            store1.DelRanks(deletion)
+            for rank in deletion:
+                del strata[ranks.index(rank)]
+                ranks.remove(rank)
+            assert [
+                *zip(ranks, [stratum.GetDifferentia() for stratum in strata])
+            ] == [*store1.IterRankDifferentiaZip()]
+
+    def test_DelRanks_calcrank_impl1(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 55, 63]
+        strata = [hstrat.HereditaryStratum() for rank in ranks]
+        for rank, stratum in zip(ranks, strata):
+            store1.DepositStratum(rank=rank, stratum=stratum)
+
+        for deletion in (
+            [],
+            [8, 42],
+            [],
+            [55],
+            [],
+            [0, 63],
+            [],
+        ):
+            store1.DelRanks(
+                get_column_index_of_rank=ranks.index,
+                ranks=deletion,
+            )
+            for rank in deletion:
+                del strata[ranks.index(rank)]
+                ranks.remove(rank)
+            assert [
+                *zip(ranks, [stratum.GetDifferentia() for stratum in strata])
+            ] == [
+                *store1.IterRankDifferentiaZip(
+                    get_rank_at_column_index=lambda idx: ranks[idx],
+                )
+            ]
+
+    def test_DelRanks_calcrank_impl2(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 55, 63]
+        strata = [hstrat.HereditaryStratum() for rank in ranks]
+        for rank, stratum in zip(ranks, strata):
+            store1.DepositStratum(rank=rank, stratum=stratum)
+
+        for deletion in (
+            [],
+            [0, 63],
+            [],
+            [8],
+            [],
+            [55],
+            [],
+            [42],
+            [],
+        ):
+            store1.DelRanks(
+                get_column_index_of_rank=ranks.index,
+                ranks=deletion,
+            )
+            for rank in deletion:
+                del strata[ranks.index(rank)]
+                ranks.remove(rank)
+            assert [
+                *zip(ranks, [stratum.GetDifferentia() for stratum in strata])
+            ] == [
+                *store1.IterRankDifferentiaZip(
+                    get_rank_at_column_index=lambda idx: ranks[idx],
+                )
+            ]
+
+    def test_DelRanks_calcrank_impl3(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 55, 63, 80]
+        strata = [hstrat.HereditaryStratum() for rank in ranks]
+        for rank, stratum in zip(ranks, strata):
+            store1.DepositStratum(rank=rank, stratum=stratum)
+
+        for deletion in (
+            [],
+            [0, 80],
+            [],
+            [63],
+            [],
+            [8, 55],
+            [],
+            [42],
+            [],
+        ):
+            store1.DelRanks(
+                get_column_index_of_rank=ranks.index,
+                ranks=deletion,
+            )
+            for rank in deletion:
+                del strata[ranks.index(rank)]
+                ranks.remove(rank)
+            assert [
+                *zip(ranks, [stratum.GetDifferentia() for stratum in strata])
+            ] == [
+                *store1.IterRankDifferentiaZip(
+                    get_rank_at_column_index=lambda idx: ranks[idx],
+                )
+            ]
+
+    def test_DelRanks_calcrank_impl4(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 55, 63]
+        strata = [hstrat.HereditaryStratum() for rank in ranks]
+        for rank, stratum in zip(ranks, strata):
+            store1.DepositStratum(rank=rank, stratum=stratum)
+
+        for deletion in (
+            [],
+            [55, 63],
+            [],
+            [0, 8],
+            [],
+            [42],
+            [],
+        ):
+            store1.DelRanks(
+                get_column_index_of_rank=ranks.index,
+                ranks=deletion,
+            )
+            for rank in deletion:
+                del strata[ranks.index(rank)]
+                ranks.remove(rank)
+            assert [
+                *zip(ranks, [stratum.GetDifferentia() for stratum in strata])
+            ] == [
+                *store1.IterRankDifferentiaZip(
+                    get_rank_at_column_index=lambda idx: ranks[idx],
+                )
+            ]
+
+    def test_DelRanks_calcrank_impl5(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        ranks = [0, 8, 42, 55, 63]
+        strata = [hstrat.HereditaryStratum() for rank in ranks]
+        for rank, stratum in zip(ranks, strata):
+            store1.DepositStratum(rank=rank, stratum=stratum)
+
+        for deletion in (
+            [],
+            [42, 63],
+            [],
+            [0, 8, 55],
+            [],
+        ):
+            store1.DelRanks(
+                get_column_index_of_rank=ranks.index,
+                ranks=deletion,
+            )
+            for rank in deletion:
+                del strata[ranks.index(rank)]
+                ranks.remove(rank)
+            assert [
+                *zip(ranks, [stratum.GetDifferentia() for stratum in strata])
+            ] == [
+                *store1.IterRankDifferentiaZip(
+                    get_rank_at_column_index=lambda idx: ranks[idx],
+                )
+            ]
+
+    def test_clone_divergence(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        strata = [
+            hstrat.HereditaryStratum(deposition_rank=r) for r in range(100)
+        ]
+        for rank, stratum in enumerate(strata):
+            store1.DepositStratum(rank, stratum)
+
+        store2 = store1.Clone()
+        store3 = store2.Clone()
+        store2.DelRanks([3, 50, 99])
+        store2.DepositStratum(
+            100, hstrat.HereditaryStratum(deposition_rank=100)
+        )
+        store3.DelRanks(range(0, 100, 2))
+
+        assert [*store1.IterRetainedStrata()] == strata
+        assert [*store1.IterRetainedRanks()] == [*range(100)]
+        assert [*store2.IterRetainedRanks()] == [
+            *(r for r in range(101) if r not in (3, 50, 99))
+        ]
+        assert [*store3.IterRetainedRanks()] == [*range(1, 100, 2)]
+        for store in store1, store2, store3:
+            for index, rank in enumerate(store.IterRetainedRanks()):
+                assert store.GetColumnIndexOfRank(rank) == index
+                assert store.GetRankAtColumnIndex(index) == rank
+
+    def test_stats(self):
+        hstrat.reset_copy_on_write_store_stats()
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        for rank in range(100):
+            store1.DepositStratum(
+                rank, hstrat.HereditaryStratum(deposition_rank=rank)
+            )
+        assert hstrat.get_copy_on_write_store_stats().num_clones == 0
+
+        store2 = store1.Clone()
+        store2.DelRanks([0])
+        store2.DepositStratum(
+            100, hstrat.HereditaryStratum(deposition_rank=100)
+        )
+
+        stats = hstrat.get_copy_on_write_store_stats()
+        assert stats.num_clones == 1
+        assert stats.num_strata_shared == 100
+        # only first and last chunks copied
+        assert 0 < stats.num_strata_copied < 100
+        assert stats.num_strata_copies_avoided == 100 - stats.num_strata_copied
+        assert 0 < stats.savings_fraction < 1
+
+        hstrat.reset_copy_on_write_store_stats()
+        stats = hstrat.get_copy_on_write_store_stats()
+        assert stats == (0, 0, 0)
+        assert stats.num_strata_copies_avoided == 0
+
+    def test_chunk_count_bounded(self):
+        column = hstrat.HereditaryStratigraphicColumn(
+            hstrat.recency_proportional_resolution_algo.Policy(10),
+            stratum_ordered_store=hstrat.HereditaryStratumOrderedStoreCopyOnWrite,
+        )
+        capacity = (
+            hstrat.HereditaryStratumOrderedStoreCopyOnWrite._chunk_capacity
+        )
+        for generation in range(20_000):
+            column = column.CloneDescendant()
+            if generation % 1_000 == 0:
+                store = column._stratum_ordered_store
+                num_strata = store.GetNumStrataRetained()
+                assert len(store._chunks) <= 4 * num_strata // capacity + 1
+                for chunk1, chunk2 in zip(store._chunks, store._chunks[1:]):
+                    assert len(chunk1) + len(chunk2) > capacity // 2
+
+        assert [*column.IterRetainedRanks()] == [
+            *column._stratum_retention_policy.IterRetainedRanks(
+                column.GetNumStrataDeposited()
+            )
+        ]
+
+    def test_stats_threads(self):
+        store1 = hstrat.HereditaryStratumOrderedStoreCopyOnWrite()
+        for rank in range(10):
+            store1.DepositStratum(
+                rank, hstrat.HereditaryStratum(deposition_rank=rank)
+            )
+
+        hstrat.reset_copy_on_write_store_stats()
+        with futures.ThreadPoolExecutor(max_workers=4) as executor:
+            [*executor.map(lambda __: store1.Clone(), range(4_000))]
+
+        stats = hstrat.get_copy_on_write_store_stats()
+        assert stats.num_clones == 4_000
+        assert stats.num_strata_shared == 40_000
+
+
+if __name__ == "__main__":
+    unittest.main()
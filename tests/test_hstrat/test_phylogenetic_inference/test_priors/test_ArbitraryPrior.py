@@ -1,5 +1,6 @@
 import math
 import statistics
+import typing
 
 import numpy as np
 import pytest
@@ -8,6 +9,13 @@ from hstrat import hstrat
 import hstrat.phylogenetic_inference.priors._detail as detail
 
 
+def _make_intervals(seed: int) -> typing.Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    begin_ranks = rng.integers(0, 300, size=100)
+    end_ranks = begin_ranks + rng.integers(1, 100, size=100)
+    return begin_ranks, end_ranks
+
+
 def test_base_class():
     assert issubclass(hstrat.ArbitraryPrior, detail.PriorBase)
 
@@ -70,3 +78,25 @@ def test_sample_interval_conditioned_value():
     )
     assert len(samples) > 1
     assert all(0 <= sample < 100 for sample in samples)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_calc_interval_probability_proxy_batched(seed):
+    prior = hstrat.ArbitraryPrior()
+    begin_ranks, end_ranks = _make_intervals(seed)
+    res = prior.CalcIntervalProbabilityProxyBatched(begin_ranks, end_ranks)
+    assert res.tolist() == [
+        prior.CalcIntervalProbabilityProxy(begin, end)
+        for begin, end in zip(begin_ranks, end_ranks)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_calc_interval_conditioned_mean_batched(seed):
+    prior = hstrat.ArbitraryPrior()
+    begin_ranks, end_ranks = _make_intervals(seed)
+    res = prior.CalcIntervalConditionedMeanBatched(begin_ranks, end_ranks)
+    assert res.tolist() == [
+        prior.CalcIntervalConditionedMean(begin, end)
+        for begin, end in zip(begin_ranks, end_ranks)
+    ]
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from hstrat import hstrat
@@ -44,3 +45,52 @@ def test_sample_interval_conditioned_value():
     wrapped = BubbleWrappedPrior(wrapee)
     with pytest.raises(NotImplementedError):
         wrapped.SampleIntervalConditionedValue(0, 100)
+
+
+@pytest.mark.parametrize(
+    "wrapee",
+    [
+        hstrat.ArbitraryPrior(),
+        hstrat.ExponentialPrior(1.01),
+        hstrat.GeometricPrior(0.99),
+    ],
+)
+def test_calc_interval_batched(wrapee):
+    wrapped = BubbleWrappedPrior(wrapee)
+    begin_ranks = np.array([0, 7, 99, 78])
+    end_ranks = np.array([50, 8, 100, 100])
+    for method in (
+        "CalcIntervalProbabilityProxyBatched",
+        "CalcIntervalConditionedMeanBatched",
+    ):
+        res = getattr(wrapped, method)(begin_ranks, end_ranks)
+        assert (
+            res.tolist()
+            == getattr(wrapee, method)(begin_ranks, end_ranks).tolist()
+        )
+
+        with pytest.raises(AssertionError):
+            getattr(wrapped, method)(np.array([7]), np.array([7]))
+        with pytest.raises(AssertionError):
+            getattr(wrapped, method)(np.array([-1]), np.array([41]))
+        with pytest.raises(AssertionError):
+            getattr(wrapped, method)(np.array([0.0]), np.array([41.0]))
+
+
+def test_calc_interval_batched_fallback():
+    class ScalarOnlyPrior(detail.PriorBase):
+        def CalcIntervalProbabilityProxy(self, begin_rank, end_rank):
+            return float(end_rank - begin_rank) ** 2
+
+        def CalcIntervalConditionedMean(self, begin_rank, end_rank):
+            return float(begin_rank)
+
+    wrapped = BubbleWrappedPrior(ScalarOnlyPrior())
+    begin_ranks = np.array([0, 7, 99, 78])
+    end_ranks = np.array([50, 8, 100, 100])
+    assert wrapped.CalcIntervalProbabilityProxyBatched(
+        begin_ranks, end_ranks
+    ).tolist() == [2500.0, 1.0, 1.0, 484.0]
+    assert wrapped.CalcIntervalConditionedMeanBatched(
+        begin_ranks, end_ranks
+    ).tolist() == [0.0, 7.0, 99.0, 78.0]
@@ -1,5 +1,6 @@
 import math
 import statistics
+import typing
 
 import numpy as np
 import pytest
@@ -8,6 +9,13 @@ from hstrat import hstrat
 import hstrat.phylogenetic_inference.priors._detail as detail
 
 
+def _make_intervals(seed: int) -> typing.Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    begin_ranks = rng.integers(0, 300, size=100)
+    end_ranks = begin_ranks + rng.integers(1, 100, size=100)
+    return begin_ranks, end_ranks
+
+
 def test_base_class():
     assert issubclass(hstrat.GeometricPrior, detail.PriorBase)
 
@@ -82,3 +90,42 @@ def test_calc_interval_conditioned_mean(growth_factor):
 def test_sample_interval_conditioned_value():
     with pytest.raises(NotImplementedError):
         hstrat.GeometricPrior(1.0).SampleIntervalConditionedValue(0, 100)
+
+
+@pytest.mark.parametrize("growth_factor", [1.0, 1.01, 0.99, 1.5, 0.6])
+@pytest.mark.parametrize("seed", range(3))
+def test_calc_interval_probability_proxy_batched(growth_factor, seed):
+    prior = hstrat.GeometricPrior(growth_factor)
+    begin_ranks, end_ranks = _make_intervals(seed)
+    res = prior.CalcIntervalProbabilityProxyBatched(begin_ranks, end_ranks)
+    assert res.tolist() == pytest.approx(
+        [
+            prior.CalcIntervalProbabilityProxy(begin, end)
+            for begin, end in zip(begin_ranks, end_ranks)
+        ]
+    )
+
+
+@pytest.mark.parametrize("growth_factor", [1.0, 1.01, 0.99, 1.5, 0.6])
+@pytest.mark.parametrize("seed", range(3))
+def test_calc_interval_conditioned_mean_batched(growth_factor, seed):
+    prior = hstrat.GeometricPrior(growth_factor)
+    begin_ranks, end_ranks = _make_intervals(seed)
+    res = prior.CalcIntervalConditionedMeanBatched(begin_ranks, end_ranks)
+    assert res.tolist() == pytest.approx(
+        [
+            prior.CalcIntervalConditionedMean(begin, end)
+            for begin, end in zip(begin_ranks, end_ranks)
+        ]
+    )
+
+
+@pytest.mark.parametrize("growth_factor", [1.0000001, 1.01, 2.0, 0.5])
+def test_calc_interval_conditioned_mean_batched_extreme(growth_factor):
+    prior = hstrat.GeometricPrior(growth_factor)
+    begin_ranks = np.array([0, 0, 10_000, 999_999], dtype=np.int64)
+    end_ranks = np.array([1, 100_000, 1_000_000, 1_000_000], dtype=np.int64)
+    res = prior.CalcIntervalConditionedMeanBatched(begin_ranks, end_ranks)
+    assert np.isfinite(res).all()
+    assert (begin_ranks <= res).all()
+    assert (res < end_ranks).all()
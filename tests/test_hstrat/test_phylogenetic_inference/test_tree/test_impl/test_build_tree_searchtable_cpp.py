@@ -548,6 +548,59 @@ def test_determinism2(orig_tree, retention_policy, differentia_width):
         assert first_reconst.equals(second_reconst)
 
 
+@pytest.mark.parametrize(
+    "orig_tree",
+    [
+        impl.setup_dendropy_tree(f"{assets_path}/nk_lexicaseselection.csv"),
+        impl.setup_dendropy_tree(f"{assets_path}/nk_tournamentselection.csv"),
+    ],
+)
+@pytest.mark.parametrize(
+    "retention_policy",
+    [
+        hstrat.perfect_resolution_algo.Policy(),
+        hstrat.recency_proportional_resolution_algo.Policy(3),
+        hstrat.fixed_resolution_algo.Policy(5),
+    ],
+)
+@pytest.mark.parametrize("differentia_width", [1, 8, 64])
+@pytest.mark.parametrize("num_founders", [1, 3])
+@pytest.mark.parametrize("num_threads", [4])
+@pytest.mark.parametrize("entry_point", entry_points)
+def test_num_threads(
+    orig_tree,
+    retention_policy,
+    differentia_width,
+    num_founders,
+    num_threads,
+    entry_point,
+):
+    extant_population = [
+        col
+        for __ in range(num_founders)
+        for col in hstrat.descend_template_phylogeny_dendropy(
+            orig_tree,
+            seed_instrument=hstrat.HereditaryStratigraphicColumn(
+                stratum_differentia_bit_width=differentia_width,
+                stratum_retention_policy=retention_policy,
+            ).CloneNthDescendant(10),
+        )
+    ]
+
+    serial_reconst = build_tree_searchtable_cpp(
+        extant_population,
+        force_common_ancestry=True,
+        _entry_point=entry_point,
+    )
+    threaded_reconst = build_tree_searchtable_cpp(
+        extant_population,
+        force_common_ancestry=True,
+        num_threads=num_threads,
+        _entry_point=entry_point,
+    )
+    assert serial_reconst.equals(threaded_reconst)
+
+
 @pytest.mark.parametrize(
     "orig_tree",
     [
@@ -1,13 +1,30 @@
+from downstream import dstream
+import numpy as np
 from phyloframe import legacy as pfl
 import polars as pl
+import pyarrow as pa
+import pytest
 from tqdm import tqdm
 
 from hstrat.phylogenetic_inference.tree._impl._build_tree_searchtable_cpp_impl_stub import (
+    CompactRecords8,
+    CompactRecords16,
+    CompactRecords32,
+    CompactRecords64,
     Records,
     build_tree_searchtable_cpp_from_exploded,
     collapse_unifurcations,
+    collapse_unifurcations_inplace,
+    copy_records_to_arrow,
     copy_records_to_dict,
+    extend_tree_searchtable_cpp_from_exploded,
+    extend_tree_searchtable_cpp_from_packed,
+    extract_records_to_arrow,
+    extract_records_to_dict,
+    load_records_from_dict,
+    make_records,
     placeholder_value,
+    widen_records,
 )
 
 
@@ -17,6 +34,13 @@ def test_collapse_unifurcations_singleton():
     assert len(records) == 1
 
 
+@pytest.mark.parametrize("init_root", [False, True])
+def test_collapse_unifurcations_inplace_trivial(init_root: bool):
+    records = Records(1, init_root)
+    collapse_unifurcations_inplace(records, dropped_only=False)
+    assert len(records) == int(init_root)
+
+
 def test_collapse_all_unifurcations_linear_tree():
     # 0 <- 1 <- 2 <- 3 <- 4 <- 5 <- 6 <- 7
     records = Records(8)
@@ -204,3 +228,388 @@ def test_regression_distilled():
             res.with_columns(origin_time=pl.col("rank")).to_pandas(),
         ),
     )
+
+
+@pytest.mark.parametrize("num_threads", [2, 3, 8])
+@pytest.mark.parametrize("num_founders", [1, 2, 5])
+@pytest.mark.parametrize("slice_size", [1, 10, 100])
+def test_extend_num_threads_matches_serial(
+    num_threads: int, num_founders: int, slice_size: int
+):
+    rng = np.random.default_rng(num_threads + num_founders + slice_size)
+    num_artifacts, num_ranks = 200, 6
+    differentiae = rng.integers(0, 2, size=(num_artifacts, num_ranks))
+    differentiae[:, 0] = rng.integers(0, num_founders, size=num_artifacts)
+    data_ids = np.repeat(np.arange(num_artifacts, dtype=np.uint64), num_ranks)
+    ranks = np.tile(np.arange(num_ranks, dtype=np.int64), num_artifacts)
+    num_strata_depositeds = np.full_like(data_ids, num_ranks)
+    differentiae = differentiae.ravel().astype(np.uint64)
+
+    def build(num_threads: int) -> dict:
+        records = Records(1)
+        for begin in range(0, len(data_ids), slice_size * num_ranks):
+            chunk = slice(begin, begin + slice_size * num_ranks)
+            extend_tree_searchtable_cpp_from_exploded(
+                records,
+                data_ids[chunk],
+                num_strata_depositeds[chunk],
+                ranks[chunk],
+                differentiae[chunk],
+                tqdm,
+                num_threads=num_threads,
+            )
+            records = collapse_unifurcations(records, dropped_only=True)
+        return copy_records_to_dict(records)
+
+    serial, threaded = build(1), build(num_threads)
+    assert serial.keys() == threaded.keys()
+    for key in serial:
+        assert np.array_equal(serial[key], threaded[key]), key
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("slice_size", [1, 10, 100])
+def test_collapse_unifurcations_inplace_matches_copy(
+    compact: bool, slice_size: int
+):
+    rng = np.random.default_rng(slice_size + compact)
+    num_artifacts, num_ranks = 200, 6
+    differentiae = rng.integers(0, 2, size=(num_artifacts, num_ranks))
+    data_ids = np.repeat(np.arange(num_artifacts, dtype=np.uint64), num_ranks)
+    ranks = np.tile(np.arange(num_ranks, dtype=np.int64), num_artifacts)
+    num_strata_depositeds = rng.integers(
+        num_ranks, 2 * num_ranks, size=num_artifacts, dtype=np.uint64
+    ).repeat(num_ranks)
+    differentiae = differentiae.ravel().astype(np.uint64)
+
+    def make() -> Records:
+        if compact:
+            return make_records(
+                1,
+                max_differentia=1,
+                max_rank=num_ranks,
+                max_id=num_artifacts * (num_ranks + 1) + 1,
+            )
+        return Records(1)
+
+    def assert_records_equal(expected: Records, actual: Records) -> None:
+        expected = copy_records_to_dict(expected)
+        actual = copy_records_to_dict(actual)
+        assert expected.keys() == actual.keys()
+        for key in expected:
+            assert np.array_equal(expected[key], actual[key]), key
+
+    copied, inplace = make(), make()
+    for begin in range(0, len(data_ids), slice_size * num_ranks):
+        chunk = slice(begin, begin + slice_size * num_ranks)
+        for records in copied, inplace:
+            extend_tree_searchtable_cpp_from_exploded(
+                records,
+                data_ids[chunk],
+                num_strata_depositeds[chunk],
+                ranks[chunk],
+                differentiae[chunk],
+                tqdm,
+            )
+        original = copied
+        copied = collapse_unifurcations(original, dropped_only=True)
+        assert_records_equal(original, inplace)  # copy leaves input intact
+        collapse_unifurcations_inplace(inplace, dropped_only=True)
+        assert_records_equal(copied, inplace)
+
+    copied = collapse_unifurcations(copied, dropped_only=False)
+    collapse_unifurcations_inplace(inplace, dropped_only=False)
+    assert_records_equal(copied, inplace)
+
+
+def _pack_hex(values: np.ndarray, bitwidth: int) -> str:
+    bits = "".join(format(int(value), f"0{bitwidth}b") for value in values)
+    return "".join(
+        format(int(bits[i : i + 4], 2), "x") for i in range(0, len(bits), 4)
+    )
+
+
+@pytest.mark.parametrize("num_threads", [1, 3])
+@pytest.mark.parametrize("bitwidth", [1, 4, 8, 12, 64])
+def test_extend_packed_matches_exploded(num_threads: int, bitwidth: int):
+    rng = np.random.default_rng(num_threads + bitwidth)
+    num_artifacts, dstream_S = 100, 8
+    num_strata_depositeds = np.sort(
+        rng.integers(dstream_S, 100, size=num_artifacts)
+    ).astype(np.uint64)
+    # buffer sites hold ingest times in arbitrary order
+    ranks = dstream.steady_algo.lookup_ingest_times_batched(
+        dstream_S, num_strata_depositeds
+    ).astype(np.int64)
+    differentiae = rng.integers(
+        0,
+        2 ** min(bitwidth, 2),  # ensure some common ancestry
+        size=(num_artifacts, dstream_S),
+        dtype=np.uint64,
+    )
+    differentiae[:, -1] = 2**bitwidth - 1  # exercise full width
+    data_ids = np.arange(num_artifacts, dtype=np.uint64)
+    hex_strings = [_pack_hex(row, bitwidth) for row in differentiae]
+    hex_chars = np.frombuffer("".join(hex_strings).encode(), dtype=np.uint8)
+    hex_offsets = np.cumsum(
+        [0] + [len(hex_string) for hex_string in hex_strings]
+    ).astype(np.int64)
+
+    packed = Records(1)
+    extend_tree_searchtable_cpp_from_packed(
+        packed,
+        data_ids,
+        num_strata_depositeds,
+        ranks,
+        hex_chars,
+        hex_offsets,
+        tqdm,
+        num_threads=num_threads,
+    )
+
+    argv = np.argsort(ranks, axis=1)
+    exploded = Records(1)
+    extend_tree_searchtable_cpp_from_exploded(
+        exploded,
+        np.repeat(data_ids, dstream_S),
+        np.repeat(num_strata_depositeds, dstream_S),
+        np.take_along_axis(ranks, argv, axis=1).ravel(),
+        np.take_along_axis(differentiae, argv, axis=1).ravel(),
+        tqdm,
+    )
+
+    packed = copy_records_to_dict(packed)
+    exploded = copy_records_to_dict(exploded)
+    assert packed.keys() == exploded.keys()
+    for key in packed:
+        assert np.array_equal(packed[key], exploded[key]), key
+
+
+def test_extend_packed_invalid():
+    def extend(records: Records, hex_string: str, ranks: list) -> None:
+        extend_tree_searchtable_cpp_from_packed(
+            records,
+            np.array([0], dtype=np.uint64),
+            np.array([4], dtype=np.uint64),
+            np.array([ranks], dtype=np.int64),
+            np.frombuffer(hex_string.encode(), dtype=np.uint8),
+            np.array([0, len(hex_string)], dtype=np.int64),
+            tqdm,
+        )
+
+    records = Records(1)
+    with pytest.raises(ValueError):
+        extend(records, "0g", [2, 0])  # invalid hex digit
+    with pytest.raises(ValueError):
+        extend(records, "01", [4, 0])  # rank out of bounds
+    with pytest.raises(ValueError):
+        extend(records, "01", [1, 1])  # duplicate ranks
+    with pytest.raises(ValueError):
+        extend(records, "01", [2, 0, 1])  # 8 bits over 3 items
+    assert len(records) == 1
+
+    records = CompactRecords8(1)
+    with pytest.raises(OverflowError):
+        extend(records, "000000000100", [2, 0])  # 24 bits per item
+    assert len(records) == 1
+
+    extend(records, "1f", [2, 0])
+    assert len(records) > 1
+
+
+@pytest.mark.parametrize(
+    "max_differentia, max_rank, max_id, expected",
+    [
+        (1, 1_000, 1_000, CompactRecords8),
+        (255, 2**32 - 1, 2**32 - 2, CompactRecords8),
+        (256, 1_000, 1_000, CompactRecords16),
+        (2**32 - 1, 1_000, 1_000, CompactRecords32),
+        (2**64 - 1, 1_000, 1_000, CompactRecords64),
+        (1, 2**32, 1_000, Records),
+        (1, 1_000, 2**32 - 1, Records),
+    ],
+)
+def test_make_records_layout(
+    max_differentia: int, max_rank: int, max_id: int, expected: type
+):
+    records = make_records(
+        10, max_differentia=max_differentia, max_rank=max_rank, max_id=max_id
+    )
+    assert isinstance(records, expected)
+    assert len(records) == 1
+    assert records.record_nbytes <= Records.record_nbytes
+
+
+@pytest.mark.parametrize("differentia_bitwidth", [1, 8, 16, 64])
+@pytest.mark.parametrize("slice_size", [1, 10, 100])
+def test_compact_records_match_wide(
+    differentia_bitwidth: int, slice_size: int
+):
+    rng = np.random.default_rng(differentia_bitwidth + slice_size)
+    num_artifacts, num_ranks = 200, 6
+    differentiae = rng.integers(
+        0,
+        2**differentia_bitwidth,
+        size=(num_artifacts, num_ranks),
+        dtype=np.uint64,
+    )
+    differentiae[:, 1:] %= 2  # ensure some common ancestry
+    data_ids = np.repeat(np.arange(num_artifacts, dtype=np.uint64), num_ranks)
+    ranks = np.tile(np.arange(num_ranks, dtype=np.int64), num_artifacts)
+    num_strata_depositeds = np.full_like(data_ids, num_ranks)
+    differentiae = differentiae.ravel()
+
+    def build(records: Records) -> tuple:
+        for begin in range(0, len(data_ids), slice_size * num_ranks):
+            chunk = slice(begin, begin + slice_size * num_ranks)
+            extend_tree_searchtable_cpp_from_exploded(
+                records,
+                data_ids[chunk],
+                num_strata_depositeds[chunk],
+                ranks[chunk],
+                differentiae[chunk],
+                tqdm,
+            )
+            records = collapse_unifurcations(records, dropped_only=True)
+        searchable = copy_records_to_dict(records)
+        records = collapse_unifurcations(records, dropped_only=False)
+        return searchable, extract_records_to_dict(records)
+
+    compact_records = make_records(
+        1,
+        max_differentia=2**differentia_bitwidth - 1,
+        max_rank=num_ranks,
+        max_id=num_artifacts * (num_ranks + 1) + 1,
+    )
+    assert not isinstance(compact_records, Records)
+    wide, compact = build(Records(1)), build(compact_records)
+    for wide_dict, compact_dict in zip(wide, compact):
+        assert wide_dict.keys() == compact_dict.keys()
+        for key in wide_dict:
+            assert np.array_equal(wide_dict[key], compact_dict[key]), key
+    for key, value in compact[1].items():
+        assert value.dtype == (np.int64 if key == "rank" else np.uint64), key
+    assert placeholder_value in compact[1]["search_ancestor_id"]
+
+
+def test_compact_records_overflow_widen():
+    data_ids = np.array([0, 0, 1, 1], dtype=np.uint64)
+    num_strata_depositeds = np.array([2, 2, 2, 2], dtype=np.uint64)
+    ranks = np.array([0, 1, 0, 1], dtype=np.int64)
+    differentiae = np.array([0, 1, 0, 256], dtype=np.uint64)
+
+    def extend(records: Records) -> None:
+        extend_tree_searchtable_cpp_from_exploded(
+            records, data_ids, num_strata_depositeds, ranks, differentiae, tqdm
+        )
+
+    records = CompactRecords8(1)
+    with pytest.raises(OverflowError):
+        extend(records)
+    assert len(records) == 1
+
+    records = widen_records(records)
+    assert isinstance(records, Records)
+    extend(records)
+
+    expected = Records(1)
+    extend(expected)
+    assert copy_records_to_dict(records) == copy_records_to_dict(expected)
+
+
+def _build_example_records(records: Records) -> Records:
+    data_ids = np.array([0, 0, 1, 1, 2, 2], dtype=np.uint64)
+    num_strata_depositeds = np.full_like(data_ids, 2)
+    ranks = np.array([0, 1, 0, 1, 0, 1], dtype=np.int64)
+    differentiae = np.array([0, 1, 0, 1, 1, 0], dtype=np.uint64)
+    extend_tree_searchtable_cpp_from_exploded(
+        records, data_ids, num_strata_depositeds, ranks, differentiae, tqdm
+    )
+    return records
+
+
+@pytest.mark.parametrize(
+    "make_empty", [Records, CompactRecords8, CompactRecords64]
+)
+def test_records_arrow_export_matches_dict(make_empty: type):
+    records = _build_example_records(make_empty(1))
+    expected = copy_records_to_dict(records)
+
+    exported = copy_records_to_arrow(records)
+    assert len(exported) == len(records)
+    batch = pa.record_batch(exported)
+    assert sorted(batch.schema.names) == sorted(expected)
+    assert all(field.type == pa.uint64() for field in batch.schema)
+
+    assert len(records) == len(expected["id"])  # copy leaves records intact
+    assert copy_records_to_dict(records) == expected
+
+    df = pl.from_arrow(batch)
+    for key, values in expected.items():
+        if key in ("differentia", "rank"):
+            assert df[key].to_list() == values, key
+        else:  # placeholder ids are exported as null
+            assert df[key].to_list() == [
+                None if value == placeholder_value else value
+                for value in values
+            ], key
+
+
+def test_records_arrow_export_extract_columns():
+    records = _build_example_records(Records(1))
+    expected = copy_records_to_dict(records)
+
+    columns = ["rank", "id"]
+    df = pl.from_arrow(
+        pa.record_batch(extract_records_to_arrow(records, columns=columns))
+    )
+    assert df.columns == columns
+    assert df["rank"].to_list() == expected["rank"]
+    assert df["id"].to_list() == expected["id"]
+    assert len(records) == 0  # extract consumes records
+
+
+def test_records_arrow_export_single_use():
+    exported = copy_records_to_arrow(Records(1))
+    pa.record_batch(exported)
+    with pytest.raises(RuntimeError):
+        pa.record_batch(exported)
+
+
+def test_records_arrow_export_unknown_column():
+    records = Records(1)
+    with pytest.raises(ValueError):
+        extract_records_to_arrow(records, columns=["id", "nonexistent"])
+    assert len(records) == 1
+
+
+@pytest.mark.parametrize(
+    "make_empty", [Records, CompactRecords8, CompactRecords64]
+)
+def test_load_records_from_dict(make_empty: type):
+    expected = copy_records_to_dict(_build_example_records(make_empty(1)))
+
+    records = make_empty(1)
+    load_records_from_dict(
+        records, {k: np.asarray(v) for k, v in expected.items()}
+    )
+    assert copy_records_to_dict(records) == expected
+
+    # loaded records can be extended further
+    _build_example_records(records)
+    assert len(records) > len(expected["id"])
+
+
+def test_load_records_from_dict_invalid():
+    columns = copy_records_to_dict(_build_example_records(Records(1)))
+
+    records = CompactRecords8(1)
+    with pytest.raises(OverflowError):
+        load_records_from_dict(
+            records, {**columns, "differentia": [256] * len(columns["id"])}
+        )
+    with pytest.raises(ValueError):
+        load_records_from_dict(records, {**columns, "rank": [0]})
+    with pytest.raises(KeyError):
+        load_records_from_dict(records, {"id": columns["id"]})
+    assert len(records) == 1  # left unmodified
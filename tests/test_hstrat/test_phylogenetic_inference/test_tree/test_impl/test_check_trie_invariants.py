@@ -1,9 +1,12 @@
 import os
+import random
 
 import numpy as np
 import polars as pl
+import pytest
 from tqdm import tqdm
 
+from hstrat import hstrat
 from hstrat.dataframe._surface_unpack_reconstruct import _dump_records
 from hstrat.phylogenetic_inference.tree._impl._build_tree_searchtable_cpp_impl_stub import (
     Records,
@@ -19,6 +22,7 @@ from hstrat.phylogenetic_inference.tree._impl._build_tree_searchtable_cpp_impl_s
     check_trie_invariant_search_lineage_compatible,
     check_trie_invariant_single_root,
     check_trie_invariant_topologically_sorted,
+    check_trie_invariants_dirty,
     collapse_unifurcations,
     copy_records_to_dict,
     describe_records,
@@ -35,6 +39,7 @@ from hstrat.phylogenetic_inference.tree._impl._build_tree_searchtable_cpp_impl_s
     diagnose_trie_invariant_single_root,
     diagnose_trie_invariant_topologically_sorted,
     extend_tree_searchtable_cpp_from_exploded,
+    load_records_from_dict,
     placeholder_value,
 )
 
@@ -391,6 +396,127 @@ def test_search_children_valid_detects_bad_prev_sibling():
     assert check_trie_invariant_no_indistinguishable_nodes(records)
 
 
+# ---- Dirty-region checks ----
+
+
+@pytest.mark.parametrize("num_threads", [1, 4])
+def test_dirty_checks_incremental(num_threads: int):
+    """Dirty-region checks pass batch by batch as the trie grows."""
+    rng = random.Random(1)
+    population = [
+        hstrat.HereditaryStratigraphicColumn(
+            stratum_retention_policy=hstrat.recency_proportional_resolution_algo.Policy(
+                2
+            ),
+            stratum_differentia_bit_width=2,
+        )
+    ]
+    for __ in range(60):
+        population.append(
+            rng.choice(population).CloneNthDescendant(rng.randrange(1, 8))
+        )
+    population.sort(key=lambda c: c.GetNumStrataDeposited())
+
+    records = Records(100)
+    for begin in range(0, len(population), 10):
+        batch = population[begin : begin + 10]
+        extend_tree_searchtable_cpp_from_exploded(
+            records,
+            np.array(
+                [
+                    begin + i
+                    for i, c in enumerate(batch)
+                    for __ in c.IterRetainedRanks()
+                ],
+                dtype=np.uint64,
+            ),
+            np.array(
+                [
+                    c.GetNumStrataDeposited()
+                    for c in batch
+                    for __ in c.IterRetainedRanks()
+                ],
+                dtype=np.uint64,
+            ),
+            np.array(
+                [r for c in batch for r in c.IterRetainedRanks()],
+                dtype=np.int64,
+            ),
+            np.array(
+                [d for c in batch for d in c.IterRetainedDifferentia()],
+                dtype=np.uint64,
+            ),
+            tqdm,
+            num_threads=num_threads,
+        )
+        assert check_trie_invariants_dirty(records) == ""
+        records = collapse_unifurcations(records, dropped_only=True)
+        assert check_trie_invariants_dirty(records) == ""
+        for name, check_fn in _all_checks():
+            assert check_fn(records), f"{name} failed after batch {begin}"
+
+
+def test_dirty_checks_clear_on_pass():
+    """Passing dirty-region checks clear dirty marks."""
+    records = Records(4, init_root=False)
+    records.mockRecord(PV, 0, 0, 0, 0, 0, 0, 0, 0)
+    records.mockRecord(PV, 1, 0, 1, 1, 1, 1, 1, 1)
+    assert check_trie_invariants_dirty(records) == ""
+    records.mockRecord(PV, 2, 3, 2, 2, 2, 2, 1, 2)  # ancestor out of bounds
+    assert check_trie_invariants_dirty(records) == "ancestor_bounds"
+    # failing checks leave dirty marks in place
+    assert check_trie_invariants_dirty(records) == "ancestor_bounds"
+
+
+@pytest.mark.parametrize(
+    "mocked, expected",
+    [
+        (
+            [(PV, 0, 0, 0, 0, 0, 0, 0, 0), (PV, 2, 0, 0, 2, 2, 2, 1, 1)],
+            "contiguous_ids",
+        ),
+        (
+            [
+                (PV, 0, 0, 0, 0, 0, 0, 0, 0),
+                (PV, 1, 2, 1, 1, 1, 1, 1, 1),
+                (PV, 2, 0, 2, 2, 2, 2, 1, 2),
+            ],
+            "topologically_sorted",
+        ),
+        (
+            [
+                (PV, 0, 0, 0, 0, 0, 0, 0, 0),
+                (PV, 1, 0, 1, 1, 1, 1, 5, 1),
+                (PV, 2, 1, 2, 2, 2, 2, 3, 2),
+            ],
+            "chronologically_sorted",
+        ),
+        (
+            [(PV, 0, 0, 0, 0, 0, 0, 0, 0), (PV, 1, 1, 1, 1, 1, 1, 0, 0)],
+            "single_root",
+        ),
+    ],
+)
+def test_dirty_checks_detect_broken(mocked: list, expected: str):
+    """Dirty-region checks name the violated invariant."""
+    records = Records(4, init_root=False)
+    for record in mocked:
+        records.mockRecord(*record)
+    assert check_trie_invariants_dirty(records) == expected
+
+
+def test_dirty_checks_loaded_records():
+    """Records loaded from dict are checked in full."""
+    records = _make_valid_built_records()
+    assert check_trie_invariants_dirty(records) == ""
+
+    columns = copy_records_to_dict(records)
+    columns["rank"] = np.array(columns["rank"])
+    columns["rank"][-1] = 0  # leaf ranked before its ancestor
+    load_records_from_dict(records, columns)
+    assert check_trie_invariants_dirty(records) == "chronologically_sorted"
+
+
 # ---- Diagnose function tests ----
 
 
@@ -0,0 +1,216 @@
+import random
+import typing
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from hstrat import hstrat
+from hstrat._auxiliary_lib import AnyTreeFastPreOrderIter, coerce_to_pandas
+import hstrat.phylogenetic_inference.tree._impl as impl
+
+
+def _make_trie(seed: int, num_clones: int) -> impl.TrieInnerNode:
+    random.seed(seed)
+    population = [
+        hstrat.HereditaryStratigraphicColumn(
+            stratum_differentia_bit_width=1,
+            stratum_retention_policy=hstrat.fixed_resolution_algo.Policy(3),
+        ),
+    ]
+    for __ in range(num_clones):
+        parent = random.choice(population)
+        population.append(
+            parent.CloneNthDescendant(random.randrange(1, 5)),
+        )
+    return impl.build_trie_from_artifacts(
+        population=population,
+        taxon_labels=None,
+        progress_wrap=lambda x: x,
+    )
+
+
+def _trie_to_df(
+    trie: impl.TrieInnerNode, df_type: typing.Type
+) -> typing.Union[pd.DataFrame, pl.DataFrame]:
+    """Flatten trie to dataframe trie, with nodes in preorder."""
+    nodes = [*AnyTreeFastPreOrderIter(trie)]
+    ids = {id(node): i for i, node in enumerate(nodes)}
+    return df_type(
+        {
+            "id": [*range(len(nodes))],
+            "ancestor_id": [
+                ids[id(node.parent)] if node.parent is not None else i
+                for i, node in enumerate(nodes)
+            ],
+            "rank": [node.rank or 0 for node in nodes],
+            "taxon_label": [
+                node.taxon_label if node.is_leaf else None for node in nodes
+            ],
+        },
+    )
+
+
+def _lineages(df: typing.Union[pd.DataFrame, pl.DataFrame]) -> list:
+    """Describe each leaf by its taxon label and ancestors' ranks."""
+    df = coerce_to_pandas(df).set_index("id")
+    lineages = []
+    for id_, row in df.iterrows():
+        if id_ in df["ancestor_id"].values:
+            continue
+        lineage = [row["taxon_label"]]
+        while row["ancestor_id"] != id_:
+            id_ = row["ancestor_id"]
+            row = df.loc[id_]
+            lineage.append(row["rank"])
+        lineages.append(tuple(lineage))
+    return sorted(lineages)
+
+
+@pytest.mark.parametrize("df_type", [pd.DataFrame, pl.DataFrame])
+@pytest.mark.parametrize(
+    "postprocessor",
+    [
+        hstrat.AssignOriginTimeNaiveTriePostprocessor(),
+        hstrat.AssignOriginTimeNaiveTriePostprocessor(
+            prior=hstrat.GeometricPrior(1.1),
+        ),
+        hstrat.AssignOriginTimeExpectedValueTriePostprocessor(
+            prior=hstrat.ArbitraryPrior(),
+        ),
+        hstrat.AssignOriginTimeExpectedValueTriePostprocessor(
+            prior=hstrat.ExponentialPrior(1.1),
+            assigned_property="blueberry",
+        ),
+        hstrat.AssignOriginTimeSampleNaiveTriePostprocessor(),
+        hstrat.CompoundTriePostprocessor(
+            [
+                hstrat.AssignOriginTimeNaiveTriePostprocessor(),
+                hstrat.AssignDestructionTimeYoungestPlusOneTriePostprocessor(),
+            ],
+        ),
+    ],
+)
+@pytest.mark.parametrize("seed", range(4))
+def test_assign_matches_anytree(
+    df_type: typing.Type, postprocessor: typing.Callable, seed: int
+):
+    trie = _make_trie(seed, num_clones=20)
+    df = _trie_to_df(trie, df_type)
+
+    np.random.seed(seed)  # sampled in preorder, i.e., row order
+    expected = postprocessor(trie, p_differentia_collision=0.5, mutate=True)
+    np.random.seed(seed)
+    actual = postprocessor(df, p_differentia_collision=0.5, mutate=False)
+
+    assert isinstance(actual, df_type)
+    assert [*actual.columns[:4]] == [*df.columns]
+    for column in [*actual.columns[4:]]:
+        assert coerce_to_pandas(actual)[column].tolist() == pytest.approx(
+            [
+                getattr(node, column)
+                for node in AnyTreeFastPreOrderIter(expected)
+            ]
+        )
+    assert len(actual.columns) > len(df.columns)  # not mutated
+
+
+@pytest.mark.parametrize("df_type", [pd.DataFrame, pl.DataFrame])
+@pytest.mark.parametrize("seed", range(4))
+def test_peel_back_matches_anytree(df_type: typing.Type, seed: int):
+    trie = _make_trie(seed, num_clones=20)
+    df = _trie_to_df(trie, df_type)
+
+    expected = hstrat.PeelBackConjoinedLeavesTriePostprocessor()(
+        trie, p_differentia_collision=0.5, mutate=True
+    )
+    actual = hstrat.PeelBackConjoinedLeavesTriePostprocessor()(
+        df, p_differentia_collision=0.5
+    )
+
+    assert isinstance(actual, df_type)
+    expected_df = _trie_to_df(expected, df_type)
+    assert len(actual) == len(expected_df)
+    assert _lineages(actual) == _lineages(expected_df)
+
+    # ancestors precede descendants
+    actual = coerce_to_pandas(actual)
+    rows = dict(zip(actual["id"], actual.index))
+    assert all(rows[a] <= i for i, a in enumerate(actual["ancestor_id"]))
+
+
+def test_noncontiguous_ids():
+    df = pl.DataFrame(
+        {
+            "id": [10, 3, 20, 2, 4],
+            "ancestor_id": [10, 10, 3, 3, 3],
+            "rank": [0, 1, 4, 4, 4],
+        },
+    )
+    res = hstrat.AssignOriginTimeExpectedValueTriePostprocessor(
+        prior=hstrat.ArbitraryPrior(),
+    )(df, p_differentia_collision=0.5)
+    assert res["origin_time"].to_list() == pytest.approx([0, 2 / 3, 4, 4, 4])
+
+    res = hstrat.PeelBackConjoinedLeavesTriePostprocessor()(
+        df, p_differentia_collision=0.5
+    )
+    assert res["id"].to_list() == [10, 3, 21, 20, 22, 2, 4]
+    assert res["ancestor_id"].to_list() == [10, 10, 10, 21, 10, 22, 3]
+
+
+def test_not_topologically_sorted():
+    df = pl.DataFrame(
+        {"id": [0, 1, 2], "ancestor_id": [0, 2, 0], "rank": [0, 2, 1]},
+    )
+    with pytest.raises(NotImplementedError):
+        hstrat.AssignOriginTimeExpectedValueTriePostprocessor(
+            prior=hstrat.ArbitraryPrior(),
+        )(df, p_differentia_collision=0.5)
+
+
+@pytest.mark.parametrize("df_type", [pd.DataFrame, pl.DataFrame])
+@pytest.mark.parametrize("p_differentia_collision", [0, 0.5, 1.0, 2**32])
+@pytest.mark.parametrize("seed", range(4))
+def test_sample_ancestral_rollbacks(
+    df_type: typing.Type, p_differentia_collision: float, seed: int
+):
+    trie = _make_trie(seed, num_clones=30)
+    df = _trie_to_df(trie, df_type)
+
+    postprocessor = hstrat.SampleAncestralRollbacksTriePostprocessor(seed=1)
+    expected = postprocessor(
+        trie, p_differentia_collision=p_differentia_collision
+    )
+    actual = postprocessor(df, p_differentia_collision=p_differentia_collision)
+
+    assert isinstance(actual, df_type)
+    assert [*actual.columns] == [*df.columns]
+    assert len(actual) == len([*AnyTreeFastPreOrderIter(expected)])
+    assert _lineages(actual) == _lineages(df)
+
+    actual = coerce_to_pandas(actual)
+    assert actual["id"].is_unique
+    rows = dict(zip(actual["id"], actual.index))
+    assert all(rows[a] <= i for i, a in enumerate(actual["ancestor_id"]))
+    if p_differentia_collision > 1:
+        assert (actual["ancestor_id"] == actual["id"].iloc[0]).sum() == len(
+            trie.leaves
+        ) + 1
+
+
+@pytest.mark.parametrize("df_type", [pd.DataFrame, pl.DataFrame])
+def test_sample_ancestral_rollbacks_seed(df_type: typing.Type):
+    df = _trie_to_df(_make_trie(1, num_clones=100), df_type)
+
+    def sample(seed: int) -> pd.DataFrame:
+        return coerce_to_pandas(
+            hstrat.SampleAncestralRollbacksTriePostprocessor(seed=seed)(
+                df, p_differentia_collision=0.5
+            ),
+        )
+
+    pd.testing.assert_frame_equal(sample(1), sample(1))
+    assert not sample(1).equals(sample(3))
+    assert len(sample(1)) == len(sample(3)) > len(df)
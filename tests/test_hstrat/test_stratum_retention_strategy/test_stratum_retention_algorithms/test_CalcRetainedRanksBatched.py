@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from hstrat import hstrat
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [
+        hstrat.depth_proportional_resolution_algo.Policy(3),
+        hstrat.depth_proportional_resolution_tapered_algo.Policy(3),
+        hstrat.fixed_resolution_algo.Policy(3),
+        hstrat.geom_seq_nth_root_algo.Policy(2, 2),
+        hstrat.geom_seq_nth_root_tapered_algo.Policy(2, 2),
+        hstrat.nominal_resolution_algo.Policy(),
+        hstrat.perfect_resolution_algo.Policy(),
+        hstrat.recency_proportional_resolution_algo.Policy(2),
+        hstrat.recency_proportional_resolution_curbed_algo.Policy(8),
+    ],
+)
+@pytest.mark.parametrize(
+    "num_strata_deposited",
+    [
+        np.array([], dtype=int),
+        np.array([5, 0, 5, 1]),
+        np.random.default_rng(1).integers(
+            low=0,
+            high=10**3,
+            size=10**2,
+        ),
+    ],
+)
+def test_matches_IterRetainedRanks(policy, num_strata_deposited):
+    offsets, ranks = policy.CalcRetainedRanksBatched(num_strata_deposited)
+    assert len(offsets) == len(num_strata_deposited) + 1
+    assert offsets[0] == 0
+    assert offsets[-1] == len(ranks)
+    for i, n in enumerate(num_strata_deposited):
+        assert [*ranks[offsets[i] : offsets[i + 1]]] == [
+            *policy.IterRetainedRanks(int(n))
+        ]
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [
+        hstrat.fixed_resolution_algo.Policy(3),
+        hstrat.recency_proportional_resolution_algo.Policy(2),
+    ],
+)
+def test_without_calc_rank_at_column_index(policy):
+    num_strata_deposited = np.arange(20)
+    expected = policy.CalcRetainedRanksBatched(num_strata_deposited)
+    actual = policy.WithoutCalcRankAtColumnIndex().CalcRetainedRanksBatched(
+        num_strata_deposited
+    )
+    assert all(map(np.array_equal, actual, expected))
+
+
+def test_stochastic_unavailable():
+    policy = hstrat.stochastic_algo.Policy()
+    assert policy.IterRetainedRanks is None
+    assert policy.CalcRetainedRanksBatched is None
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from hstrat.hstrat import fixed_resolution_algo
+
+
+@pytest.mark.parametrize(
+    "fixed_resolution",
+    [
+        1,
+        2,
+        3,
+        7,
+        42,
+        100,
+    ],
+)
+@pytest.mark.parametrize(
+    "num_strata_deposited",
+    [
+        np.array([], dtype=int),
+        np.array([0, 1, 2]),
+        np.arange(10**2),
+        np.random.default_rng(1).integers(
+            low=0,
+            high=10**3,
+            size=10**2,
+        ),
+    ],
+)
+def test_matches_IterRetainedRanks(fixed_resolution, num_strata_deposited):
+    policy = fixed_resolution_algo.Policy(fixed_resolution)
+    spec = policy.GetSpec()
+    instance = fixed_resolution_algo.CalcRetainedRanksBatched(spec)
+    for which in (instance, policy.CalcRetainedRanksBatched):
+        offsets, ranks = (
+            which(policy, num_strata_deposited)
+            if which is instance
+            else which(num_strata_deposited)
+        )
+        assert len(offsets) == len(num_strata_deposited) + 1
+        assert offsets[0] == 0
+        assert offsets[-1] == len(ranks)
+        for i, n in enumerate(num_strata_deposited):
+            assert [*ranks[offsets[i] : offsets[i + 1]]] == [
+                *fixed_resolution_algo.IterRetainedRanks(spec)(policy, int(n))
+            ]
@@ -0,0 +1,170 @@
+from concurrent import futures
+import math
+
+import pytest
+
+from hstrat import hstrat
+from hstrat.stratum_retention_strategy.stratum_retention_algorithms._detail import (
+    PolicyCouplerFactory,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    maxsize = hstrat.get_gen_drop_ranks_cache_info().maxsize
+    hstrat.set_gen_drop_ranks_cache_maxsize(1024)
+    hstrat.clear_gen_drop_ranks_cache()
+    yield
+    hstrat.set_gen_drop_ranks_cache_maxsize(maxsize)
+    hstrat.clear_gen_drop_ranks_cache()
+
+
+def _evolve_synchronous(policy, num_columns, num_generations):
+    columns = [
+        hstrat.HereditaryStratigraphicColumn(policy)
+        for __ in range(num_columns)
+    ]
+    for __ in range(num_generations):
+        columns = [column.CloneDescendant() for column in columns]
+    return columns
+
+
+def test_info_empty():
+    info = hstrat.get_gen_drop_ranks_cache_info()
+    assert info.hits == info.misses == info.currsize == 0
+    assert math.isnan(info.hit_rate)
+
+
+def test_disabled_bypass():
+    hstrat.set_gen_drop_ranks_cache_maxsize(0)
+    assert not hstrat.is_gen_drop_ranks_cache_enabled()
+    policy = hstrat.fixed_resolution_algo.Policy(4)
+    _evolve_synchronous(policy, num_columns=3, num_generations=20)
+
+    hstrat.set_gen_drop_ranks_cache_maxsize(1024)
+    assert hstrat.is_gen_drop_ranks_cache_enabled()
+    # policy constructed while disabled never consults cache
+    _evolve_synchronous(policy, num_columns=3, num_generations=20)
+    info = hstrat.get_gen_drop_ranks_cache_info()
+    assert info.hits == info.misses == info.currsize == 0
+
+
+def test_pred_keep_rank_uncached():
+    (from_pred_keep_rank,) = (
+        impl
+        for impl in hstrat.fixed_resolution_algo._GenDropRanks_impls
+        if impl is not hstrat.fixed_resolution_algo.GenDropRanks
+    )
+    policy_t = PolicyCouplerFactory(
+        policy_spec_t=hstrat.fixed_resolution_algo.PolicySpec,
+        gen_drop_ranks_ftor_t=from_pred_keep_rank,
+    )
+    policy = policy_t(4)
+    column = hstrat.HereditaryStratigraphicColumn(policy)
+    column.DepositStrata(20)
+    # results depend on retained ranks passed in, so must not be shared
+    assert [*policy.GenDropRanks(20, [0, 1, 2, 3, 4, 8, 12, 16, 20])] == [
+        1,
+        2,
+        3,
+    ]
+    assert [*policy.GenDropRanks(20, [0, 3, 4, 20])] == [3]
+    info = hstrat.get_gen_drop_ranks_cache_info()
+    assert info.hits == info.misses == info.currsize == 0
+
+
+def test_synchronous_hits():
+    policy = hstrat.fixed_resolution_algo.Policy(4)
+    _evolve_synchronous(policy, num_columns=10, num_generations=20)
+
+    info = hstrat.get_gen_drop_ranks_cache_info()
+    # one miss per generation, including initial deposition
+    assert info.misses == 21
+    assert info.hits == 9 * 21
+    assert info.currsize == 21
+    assert info.hit_rate == pytest.approx(0.9)
+
+    # distinct but equivalent policy instance shares entries
+    _evolve_synchronous(
+        hstrat.fixed_resolution_algo.Policy(4),
+        num_columns=1,
+        num_generations=20,
+    )
+    assert hstrat.get_gen_drop_ranks_cache_info().misses == 21
+
+
+@pytest.mark.parametrize(
+    "make_policy",
+    [
+        lambda: hstrat.depth_proportional_resolution_algo.Policy(3),
+        lambda: hstrat.depth_proportional_resolution_tapered_algo.Policy(3),
+        lambda: hstrat.fixed_resolution_algo.Policy(3),
+        lambda: hstrat.geom_seq_nth_root_algo.Policy(2, 2),
+        lambda: hstrat.geom_seq_nth_root_tapered_algo.Policy(2, 2),
+        lambda: hstrat.nominal_resolution_algo.Policy(),
+        lambda: hstrat.perfect_resolution_algo.Policy(),
+        lambda: hstrat.pseudostochastic_algo.Policy(1),
+        lambda: hstrat.recency_proportional_resolution_algo.Policy(2),
+        lambda: hstrat.recency_proportional_resolution_curbed_algo.Policy(8),
+    ],
+)
+def test_matches_uncached(make_policy):
+    policy = make_policy()
+    cached = _evolve_synchronous(policy, num_columns=3, num_generations=100)
+    assert hstrat.get_gen_drop_ranks_cache_info().hits
+
+    hstrat.set_gen_drop_ranks_cache_maxsize(0)
+    (uncached,) = _evolve_synchronous(
+        make_policy(), num_columns=1, num_generations=100
+    )
+    assert hstrat.get_gen_drop_ranks_cache_info().currsize == 0
+
+    for column in cached:
+        assert [*column.IterRetainedRanks()] == [*uncached.IterRetainedRanks()]
+
+
+def test_stochastic_uncached():
+    _evolve_synchronous(
+        hstrat.stochastic_algo.Policy(retention_probability=0.5),
+        num_columns=3,
+        num_generations=20,
+    )
+    info = hstrat.get_gen_drop_ranks_cache_info()
+    assert info.hits == info.misses == info.currsize == 0
+
+
+def test_maxsize_eviction():
+    hstrat.set_gen_drop_ranks_cache_maxsize(5)
+    _evolve_synchronous(
+        hstrat.fixed_resolution_algo.Policy(4),
+        num_columns=1,
+        num_generations=20,
+    )
+    info = hstrat.get_gen_drop_ranks_cache_info()
+    assert info.maxsize == 5
+    assert info.currsize == 5
+
+    hstrat.set_gen_drop_ranks_cache_maxsize(2)
+    assert hstrat.get_gen_drop_ranks_cache_info().currsize == 2
+
+    with pytest.raises(ValueError):
+        hstrat.set_gen_drop_ranks_cache_maxsize(-1)
+
+
+def test_threads():
+    policy = hstrat.recency_proportional_resolution_algo.Policy(3)
+    with futures.ThreadPoolExecutor(max_workers=4) as executor:
+        results = [
+            *executor.map(
+                lambda __: _evolve_synchronous(policy, 5, 200),
+                range(4),
+            ),
+        ]
+
+    expected = [*policy.IterRetainedRanks(201)]
+    for columns in results:
+        for column in columns:
+            assert [*column.IterRetainedRanks()] == expected
+
+    info = hstrat.get_gen_drop_ranks_cache_info()
+    assert info.hits + info.misses == 4 * 5 * 201